@@ -3,6 +3,7 @@ import os
 from fastapi import APIRouter
 from app.models.personalization import PersonalizationIngestRequest, PersonalizationIngestResponse
 from app.services.personalization_service import PersonalizationService
+from app.services.planner.response_cache import get_planner_response_cache
 
 router = APIRouter()
 service = PersonalizationService()
@@ -15,4 +16,11 @@ async def ingest_personalization_data(request: PersonalizationIngestRequest):
     
     - 특정 날짜(targetDate)에 대해, 지정된 사용자 목록(userIds)의 개인화 파라미터 생성을 요청합니다.
     """
-    return await service.process_ingest_request(request)
+    response = await service.process_ingest_request(request)
+
+    # 사용자 일정(USER_FINAL)이 갱신되었으므로 플래너 응답 캐시 무효화
+    cache = get_planner_response_cache()
+    for user_id in request.user_ids:
+        await cache.invalidate_user(user_id)
+
+    return response
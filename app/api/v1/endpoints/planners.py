@@ -1,14 +1,23 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Body
-from app.models.planner.request import ArrangementState
-from app.models.planner.response import PlannerResponse, AssignmentResult
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Body, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from app.models.planner.request import ArrangementState, ReplanRequest
+from app.models.planner.response import PlannerResponse, AssignmentResult, PlannerDiagnostics, StageDiagnostics
 from app.models.planner.internal import PlannerGraphState, FreeSession
-from app.models.planner.weights import WeightParams
-from app.services.planner.nodes.node1_structure import node1_structure_analysis
-from app.services.planner.nodes.node2_importance import node2_importance
-from app.services.planner.nodes.node3_chain_generator import node3_chain_generator
-from app.services.planner.nodes.node4_chain_judgement import node4_chain_judgement
-from app.services.planner.nodes.node5_time_assignment import node5_time_assignment
-from app.services.planner.utils.session_utils import calculate_free_sessions
+from app.services.planner.pipeline import (
+    run_planner_pipeline, iter_planner_pipeline, run_degraded_pipeline, combine_results
+)
+from app.services.planner.progress import stage_payload
+from app.services.planner.admission import get_planner_admission, PLANNER_DEGRADED_TOTAL
+from app.services.planner.replan import replan_pipeline
+from app.services.planner.state_store import get_planner_state_store
+from app.services.planner.response_cache import get_planner_response_cache
+from app.services.planner.utils.fingerprint import day_plan_key, request_fingerprint
+from app.core.config import settings
+from app.core.disconnect import CLIENT_CLOSED_REQUEST, ClientDisconnected, run_until_disconnected
+from app.core.single_flight import SingleFlight
+from app.core.sse import StreamFormat, get_stream_formatter
+from app.core.timing import current_timings, timed
+import asyncio
 import time
 import logfire
 import json
@@ -30,153 +39,320 @@ except Exception as e:
     print(f"WARNING: Failed to load test_request.json for Swagger example: {e}")
     REQUEST_EXAMPLE = {}
 
+# 동일 요청(정규화 해시 기준) 동시 실행 병합 (기다리는 클라이언트가 모두 떠나면 실행 취소)
+_planner_flight = SingleFlight("planner", cancel_abandoned=True)
+
+# 병합 실행 결과의 후처리 Task (완료 전 GC되지 않도록 참조 보관)
+_side_effect_tasks: set[asyncio.Task] = set()
+
+
+async def _drain_side_effects(tasks: BackgroundTasks) -> None:
+    try:
+        await tasks()
+    except Exception as e:
+        logfire.error(f"Planner side effects failed: {e}")
+
+
+def _run_side_effects(tasks: BackgroundTasks) -> None:
+    """AI Draft 저장 / 캐시 영속화를 특정 요청의 응답 수명과 무관한 Task로 실행"""
+    task = asyncio.create_task(_drain_side_effects(tasks))
+    _side_effect_tasks.add(task)
+    task.add_done_callback(_side_effect_tasks.discard)
+
+
 @router.post("", response_model=PlannerResponse)
 async def generate_planner(
-    background_tasks: BackgroundTasks,
+    http_request: Request,
     request: ArrangementState = Body(
         ...,
         example=REQUEST_EXAMPLE
-    )
+    ),
+    diagnostics: bool = Query(False, description="구간별 지연 시간(diagnostics) 포함 여부")
 ):
     """
     Custom Linear Pipeline-based Planner Generation (V1)
     """
     start_time = time.time()
     trace_id = str(uuid.uuid4())
-    
-    from app.models.planner.errors import map_exception_to_error_code, is_retryable_error
-    from fastapi.encoders import jsonable_encoder
-    from fastapi.responses import JSONResponse
 
     with logfire.span("api.v1.planners.generate"):
         try:
-            # 1. State Initialization
-            # Calculate Free Sessions
-            from app.services.planner.utils.task_utils import filter_parent_tasks
-            
-            # Calculate Free Sessions
-            fixed_tasks = [t for t in request.schedules if t.type == "FIXED"]
-            
-            # Filter out Parent Tasks (Container Tasks) from Flex Tasks
-            flex_tasks = filter_parent_tasks(request.schedules)
-            
-            sessions = calculate_free_sessions(
-                start_arrange_str=request.startArrange,
-                day_end_time_str=request.user.dayEndTime,
-                fixed_schedules=fixed_tasks
-            )
-            
-            state = PlannerGraphState(
-                request=request,
-                weights=WeightParams(), # Use default weights for now
-                fixedTasks=fixed_tasks,
-                flexTasks=flex_tasks,
-                freeSessions=sessions
-            )
+            # 0. Response Cache (동일 요청 재전송: 새로고침, 타임아웃 후 재시도 등)
+            cache = get_planner_response_cache()
+            with timed("cache"):
+                cached_response = await cache.get(request)
+            if cached_response is not None:
+                return _finalize_response(cached_response, start_time, diagnostics)
+
+            # 동시에 들어온 동일 요청은 한 번만 실행하고 결과를 공유 (Single-flight)
+            async def _generate() -> PlannerResponse:
+                # 1~2. State Initialization + Pipeline Execution
+                # 포화 상태(LLM 진행 중 호출 / 최근 지연 초과)이면 LLM 없이 Degraded 경로로 처리
+                with get_planner_admission().admit() as shed_reason:
+                    if shed_reason is None:
+                        state = await run_planner_pipeline(request)
+                        message = "Planner generated successfully"
+                    else:
+                        with timed("degraded"):
+                            state = run_degraded_pipeline(request, reason=f"load shedding ({shed_reason})")
+                        message = "Planner generated in degraded mode (load shedding)"
+
+                # 3. Response Construction
+                # 후처리는 이 요청의 BackgroundTasks가 아닌 공유 실행 쪽에서 수행
+                # (먼저 들어온 요청이 끊겨 499로 끝나도 병합된 다른 요청을 위해 저장은 유지)
+                side_effects = BackgroundTasks()
+                response = _build_success_response(
+                    state, side_effects, start_time, trace_id, message=message
+                )
+
+                # Fallback(경고)이 발생한 결과는 캐시하지 않음
+                if not state.warnings:
+                    cache.put(request, response)
+                    side_effects.add_task(cache.persist, request, response)
+
+                _run_side_effects(side_effects)
+                return response
 
-            # [Logfire] Initial State Logging
-            logfire.info("Initial State", state=state)
-            
-            # 2. Pipeline Execution
-            # Node 1
-            state = await node1_structure_analysis(state)
-            
-            # Node 2
-            state = node2_importance(state)
-            
-            # Node 3
-            state = await node3_chain_generator(state)
-            
-            # Node 4
-            state = node4_chain_judgement(state)
-            
-            # Node 5
-            state = node5_time_assignment(state)
-            
-            # 3. Response Construction
-            final_results = state.finalResults
-            
-            # Mix with Fixed Tasks
-            combined_results = []
-            
-            # 3.1 FLEX Results
-            for res in final_results:
-                res_dict = res.model_dump()
-                res_dict['userId'] = request.user.userId
-                combined_results.append(AssignmentResult(**res_dict))
-                
-            # 3.2 FIXED Results
-            for ft in state.fixedTasks:
-                combined_results.append(AssignmentResult(
-                    userId=request.user.userId,
-                    taskId=ft.taskId,
-                    dayPlanId=ft.dayPlanId,
-                    title=ft.title,
-                    type="FIXED",
-                    assignedBy="USER",
-                    assignmentStatus="ASSIGNED",
-                    startAt=ft.startAt,
-                    endAt=ft.endAt,
-                    children=None
-                ))
-            
-            # Sort by startAt
-            combined_results.sort(key=lambda x: x.startAt if x.startAt else "99:99")
-            
-            process_time = time.time() - start_time
-            
-            # [DB Integration] Save AI Draft Record asynchronously
-            try:
-                from app.db.repositories.planner_repository import PlannerRepository
-                repo = PlannerRepository()
-                
-                # Check DB connection using logfire or print
-                # We simply add task to background
-                background_tasks.add_task(repo.save_ai_draft, state)
-                print(f"[API] Background task scheduled for save_ai_draft")
-                
-            except Exception as db_e:
-                print(f"[Warning] Failed to schedule save_ai_draft: {db_e}")
-            
-            return PlannerResponse(
-                success=True,
-                processTime=round(process_time, 2),
-                results=combined_results,
-                message="Planner generated successfully",
-                traceId=trace_id
+            # 클라이언트 연결이 끊기면 유예 시간 후 Node 1 / Node 3 LLM 호출과 재시도 대기까지 취소
+            response = await run_until_disconnected(
+                http_request,
+                _planner_flight.do(request_fingerprint(request), _generate),
+                grace_seconds=settings.planner_disconnect_grace_seconds,
+                route="planner"
             )
-            
+            return _finalize_response(response, start_time, diagnostics)
+
+        except ClientDisconnected:
+            logfire.info("Planner Client Disconnected", trace_id=trace_id)
+            return Response(status_code=CLIENT_CLOSED_REQUEST)
         except Exception as e:
-            process_time = time.time() - start_time
-            error_code = map_exception_to_error_code(e)
-            
-            logfire.error(f"Generate Planner Error: {e}", error_code=error_code)
-            
-            error_response = PlannerResponse(
-                success=False,
-                processTime=round(process_time, 2),
-                message=str(e),
-                errorCode=error_code,
-                traceId=trace_id
-            )
-            
-            status_code = 500
-            if "BAD_REQUEST" in error_code or "INVALID" in error_code:
-                status_code = 400
-            elif "UNAUTHENTICATED" in error_code:
-                status_code = 401
-            elif "PERMISSION" in error_code:
-                status_code = 403
-            elif "NOT_FOUND" in error_code:
-                status_code = 404
-            elif "TIMEOUT" in error_code:
-                status_code = 504
-            elif "SERVICE_UNAVAILABLE" in error_code:
-                status_code = 503
-            elif "RESOURCE_EXHAUSTED" in error_code:
-                status_code = 429
-                
-            return JSONResponse(
-                status_code=status_code,
-                content=jsonable_encoder(error_response, exclude_unset=True)
+            return _build_error_response(e, start_time, trace_id, log_label="Generate Planner Error")
+
+
+@router.post("/stream", response_class=StreamingResponse)
+async def stream_planner(
+    background_tasks: BackgroundTasks,
+    request: ArrangementState = Body(
+        ...,
+        example=REQUEST_EXAMPLE
+    ),
+    stream_format: StreamFormat = Query("sse", alias="format", description="이벤트 포맷 (sse | ndjson)")
+):
+    """
+    Progressive Planner Generation (V1, SSE / NDJSON)
+    - 단계가 끝날 때마다 이벤트 전송: sessions -> features -> chain -> result
+    - result: PlannerResponse와 동일한 형식, 실패 시 error 이벤트 (에러 PlannerResponse)
+    - 캐시 Hit 시 result 이벤트만 전송
+    """
+    start_time = time.time()
+    trace_id = str(uuid.uuid4())
+    formatter, media_type = get_stream_formatter(stream_format)
+
+    async def event_stream():
+        try:
+            cache = get_planner_response_cache()
+            cached_response = await cache.get(request)
+            if cached_response is not None:
+                cached_response.processTime = round(time.time() - start_time, 2)
+                yield formatter("result", cached_response.model_dump(mode="json"))
+                return
+
+            with get_planner_admission().admit() as shed_reason:
+                if shed_reason is None:
+                    async for stage, state in iter_planner_pipeline(request):
+                        if stage != "assignments":
+                            yield formatter(stage, stage_payload(stage, state))
+                    message = "Planner generated successfully"
+                else:
+                    with timed("degraded"):
+                        state = run_degraded_pipeline(request, reason=f"load shedding ({shed_reason})")
+                    for stage in ("sessions", "features", "chain"):
+                        yield formatter(stage, stage_payload(stage, state))
+                    message = "Planner generated in degraded mode (load shedding)"
+
+            response = _build_success_response(state, background_tasks, start_time, trace_id, message=message)
+            if not state.warnings:
+                cache.put(request, response)
+                background_tasks.add_task(cache.persist, request, response)
+
+            logfire.info("Planner Stream Completed", trace_id=trace_id, process_time=response.processTime)
+            yield formatter("result", response.model_dump(mode="json"))
+
+        except Exception as e:
+            error_response, _ = _build_error(e, start_time, trace_id, log_label="Stream Planner Error")
+            yield formatter("error", error_response.model_dump(mode="json", exclude_unset=True))
+
+    return StreamingResponse(event_stream(), media_type=media_type)
+
+
+@router.post("/replan", response_model=PlannerResponse)
+async def replan_planner(
+    background_tasks: BackgroundTasks,
+    request: ReplanRequest = Body(
+        ...,
+        example=REQUEST_EXAMPLE
+    ),
+    diagnostics: bool = Query(False, description="구간별 지연 시간(diagnostics) 포함 여부")
+):
+    """
+    Incremental Re-plan (V1)
+    - 이전 결과(traceId 또는 dayPlanId 기준)를 불러와 바뀐 일정만 다시 배정
+    - 신규 작업이 없으면 LLM 호출 없이 처리
+    - 이전 결과를 찾지 못하면 전체 파이프라인으로 생성
+    - 포화 상태이면 generate_planner와 같이 LLM 없이 Degraded 경로로 처리
+    """
+    start_time = time.time()
+    trace_id = str(uuid.uuid4())
+
+    with logfire.span("api.v1.planners.replan"):
+        try:
+            arrangement = request.to_arrangement()
+            day_plan_id = request.dayPlanId
+            if day_plan_id is None:
+                _, day_plan_id = day_plan_key(arrangement)
+
+            # 일정이 바뀌었으므로 이전 응답 캐시 무효화
+            await get_planner_response_cache().invalidate_user(arrangement.user.userId, day_plan_id)
+
+            prior = get_planner_state_store().get(
+                trace_id=request.traceId,
+                user_id=arrangement.user.userId,
+                day_plan_id=day_plan_id
             )
+
+            if prior is None:
+                logfire.info("Replan Prior State Not Found", trace_id=request.traceId, day_plan_id=day_plan_id)
+
+            # 전체 파이프라인 / 신규 작업 Node 1 호출도 LLM을 사용하므로 같은 Admission Control 적용
+            with get_planner_admission().admit() as shed_reason:
+                if shed_reason is not None:
+                    with timed("degraded"):
+                        state = run_degraded_pipeline(arrangement, reason=f"load shedding ({shed_reason})")
+                    message = "Planner generated in degraded mode (load shedding)"
+                elif prior is None:
+                    state = await run_planner_pipeline(arrangement)
+                    message = "Prior plan not found; planner generated successfully"
+                else:
+                    with timed("replan"):
+                        state = await replan_pipeline(prior, arrangement)
+                    message = "Planner re-planned successfully"
+
+            response = _build_success_response(state, background_tasks, start_time, trace_id, message=message)
+            return _finalize_response(response, start_time, diagnostics)
+
+        except Exception as e:
+            return _build_error_response(e, start_time, trace_id, log_label="Replan Planner Error")
+
+
+def _build_success_response(
+    state: PlannerGraphState,
+    background_tasks: BackgroundTasks,
+    start_time: float,
+    trace_id: str,
+    message: str
+) -> PlannerResponse:
+    """결과 조합 + 재배치용 state 보관 + AI Draft 저장 예약"""
+    with timed("response"):
+        combined_results = combine_results(state)
+
+    process_time = time.time() - start_time
+
+    # 재배치(Re-plan) 요청 시 재사용할 수 있도록 보관
+    get_planner_state_store().save(trace_id, state)
+
+    # [DB Integration] Save AI Draft Record asynchronously
+    try:
+        from app.db.repositories.planner_repository import PlannerRepository
+        repo = PlannerRepository()
+
+        # Check DB connection using logfire or print
+        # We simply add task to background
+        background_tasks.add_task(repo.save_ai_draft, state)
+        print(f"[API] Background task scheduled for save_ai_draft")
+
+    except Exception as db_e:
+        print(f"[Warning] Failed to schedule save_ai_draft: {db_e}")
+
+    # Fallback / Degraded 경로를 거친 결과는 warnings가 남음
+    degraded = bool(state.warnings)
+    if degraded:
+        PLANNER_DEGRADED_TOTAL.inc()
+
+    return PlannerResponse(
+        success=True,
+        processTime=round(process_time, 2),
+        results=combined_results,
+        message=message,
+        traceId=trace_id,
+        degraded=degraded
+    )
+
+
+def _finalize_response(response: PlannerResponse, start_time: float, diagnostics: bool) -> PlannerResponse:
+    """응답별 processTime 갱신 + (요청 시) 구간별 지연 시간 첨부 (캐시/병합된 응답은 공유 객체이므로 복사)"""
+    update = {"processTime": round(time.time() - start_time, 2)}
+    timings = current_timings()
+    if diagnostics and timings is not None:
+        update["diagnostics"] = PlannerDiagnostics(
+            totalMs=round(timings.elapsed_ms(), 1),
+            stages={
+                name: StageDiagnostics(
+                    wallMs=round(t.wall_ms, 1),
+                    llmAttempts=t.llm_attempts,
+                    retrySleepMs=round(t.retry_sleep_ms, 1),
+                    inputTokens=t.input_tokens,
+                    outputTokens=t.output_tokens
+                )
+                for name, t in timings.stages.items()
+            }
+        )
+    return response.model_copy(update=update)
+
+
+def _build_error(e: Exception, start_time: float, trace_id: str, log_label: str) -> tuple[PlannerResponse, int]:
+    """예외 -> (에러 응답, HTTP 상태 코드) 매핑"""
+    from app.models.planner.errors import map_exception_to_error_code
+
+    process_time = time.time() - start_time
+    error_code = map_exception_to_error_code(e)
+
+    logfire.error(f"{log_label}: {e}", error_code=error_code)
+
+    error_response = PlannerResponse(
+        success=False,
+        processTime=round(process_time, 2),
+        message=str(e),
+        errorCode=error_code,
+        traceId=trace_id
+    )
+
+    status_code = 500
+    if "BAD_REQUEST" in error_code or "INVALID" in error_code:
+        status_code = 400
+    elif "UNAUTHENTICATED" in error_code:
+        status_code = 401
+    elif "PERMISSION" in error_code:
+        status_code = 403
+    elif "NOT_FOUND" in error_code:
+        status_code = 404
+    elif "TIMEOUT" in error_code:
+        status_code = 504
+    elif "SERVICE_UNAVAILABLE" in error_code:
+        status_code = 503
+    elif "RESOURCE_EXHAUSTED" in error_code:
+        status_code = 429
+
+    return error_response, status_code
+
+
+def _build_error_response(e: Exception, start_time: float, trace_id: str, log_label: str):
+    """예외 -> 에러 코드 / HTTP 상태 코드 매핑"""
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+
+    error_response, status_code = _build_error(e, start_time, trace_id, log_label)
+
+    return JSONResponse(
+        status_code=status_code,
+        content=jsonable_encoder(error_response, exclude_unset=True)
+    )
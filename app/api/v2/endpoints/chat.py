@@ -1,5 +1,5 @@
 import logging
-from fastapi import APIRouter, Path, Request
+from fastapi import APIRouter, Header, Path, Request
 from fastapi.responses import StreamingResponse, HTMLResponse
 from starlette.status import HTTP_200_OK, HTTP_204_NO_CONTENT
 
@@ -56,12 +56,14 @@ async def chat_test_page(reportId: int = Path(...)):
 async def chat_stream(
     reportId: int = Path(..., description="리포트 식별자"),
     messageId: int = Path(..., description="구독할 스트림의 messageId"),
+    lastEventId: int = Header(0, alias="Last-Event-ID", ge=0, description="재연결 시 마지막으로 받은 이벤트 id (이후 이벤트부터 전송)"),
 ):
     """
     GET /ai/v2/reports/{reportId}/chat/respond/{messageId}/stream
+    - 각 이벤트에 id 필드 포함, 연결이 끊기면 Last-Event-ID 헤더로 이어서 구독 (LLM 재호출 없음)
     """
     return StreamingResponse(
-        chat_service.stream(report_id=reportId, message_id=messageId),
+        chat_service.stream(report_id=reportId, message_id=messageId, last_event_id=lastEventId),
         media_type="text/event-stream"
     )
 
@@ -1,3 +1,4 @@
+from typing import Literal
 
 from pydantic import AnyHttpUrl, field_validator
 from pydantic_settings import BaseSettings
@@ -19,6 +20,14 @@ class Settings(BaseSettings):
     # Logging
     log_level: str = "INFO" # 로그의 상세 수준
     logfire_token: str | None = None # Logfire 토큰
+    payload_log_level: Literal["off", "summary", "sampled", "full"] = "sampled" # 노드 입출력 Payload 로깅 수준
+    payload_log_sample_rate: float = 0.05 # sampled 수준에서 전체 Payload를 기록할 요청 비율 (Head Sampling)
+
+    # Profiling (On-demand)
+    profiling_admin_token: str | None = None # X-Profile-Token 헤더가 일치하는 요청을 프로파일링 (미설정 시 비활성화)
+    profiling_sample_rate: float = 0.0 # 무작위로 프로파일링할 요청 비율 (0이면 비활성화)
+    profiling_interval_ms: int = 5 # 스택 샘플링 간격(ms)
+    profiling_output_dir: str | None = None # 설정 시 Collapsed Stack(.folded) 파일 저장 경로
 
     # 환경 변수에서 콤마로 구분된 문자열이 들어오면 파이썬 리스트 형태로 변환
     @field_validator("cors_origins", mode="before")
@@ -30,6 +39,14 @@ class Settings(BaseSettings):
 
     # API Keys
     gemini_api_key: str | None = None # Gemini API 키
+
+    # LLM Backend
+    llm_backend: Literal["gemini", "fake"] = "gemini" # fake: 결정론적 로컬 LLM (부하 테스트용, Gemini 호출 없음)
+    fake_llm_profile: str = "realistic" # instant | realistic | flaky | quota (지연 시간 / 에러율 / 429 비율 프리셋)
+    fake_llm_latency_seconds: float | None = None # 프로파일의 평균 지연 시간 덮어쓰기
+    fake_llm_error_rate: float | None = None # 프로파일의 503 에러율 덮어쓰기
+    fake_llm_rate_limit_rate: float | None = None # 프로파일의 429 비율 덮어쓰기
+    fake_llm_seed: int | None = None # 지연 / 에러 주입 난수 시드 (고정 시 재현 가능)
     
     # Supabase (Legacy - for Auth/Storage if needed)
     supabase_url: str | None = None # Supabase URL
@@ -38,6 +55,37 @@ class Settings(BaseSettings):
     # Database (Direct PostgreSQL)
     database_url: str | None = None # PostgreSQL 접속 URL (sqlalchemy+asyncpg)
 
+    # Planner
+    planner_local_search_ms: int = 0 # Node 4 이후 로컬 서치 CPU 예산(ms), 0이면 비활성화
+    planner_state_store_size: int = 256 # 재배치용으로 보관하는 최근 파이프라인 state 수 (In-process LRU)
+    planner_cache_size: int = 512 # 플래너 응답 캐시 최대 항목 수 (In-process LRU), 0이면 비활성화
+    planner_cache_ttl_seconds: int = 600 # 플래너 응답 캐시 유효 시간(초)
+    planner_cache_db_enabled: bool = False # Postgres(planner_response_cache) 2차 캐시 사용 여부
+    planner_max_inflight: int = 32 # LLM 진행 중 호출 / 동시 플래너 요청 상한, 초과 시 Degraded 경로로 처리 (0이면 비활성화)
+    planner_shed_latency_seconds: float = 20.0 # 최근 LLM 지연(p90) 상한(초), 초과 시 Degraded 경로로 처리 (0이면 비활성화)
+    planner_shed_probe_seconds: float = 5.0 # 지연 기준 차단 중 전체 파이프라인으로 보내는 Probe 요청 간격(초)
+    planner_speculative_node3: bool = False # Node 1과 겹쳐 Node 3를 추측 실행 (Miss 시 LLM 호출 1회 추가)
+    planner_speculative_max_divergence: float = 0.1 # 추측 체인을 유지할 중요도 순위 차이 상한 (상대 순서가 다른 작업 쌍 비율, 한쪽만 동점인 쌍 포함)
+    planner_compact_prompts: bool = False # Node 1 / Node 3 LLM 입력을 표(CSV) + 짧은 ID 형식으로 전송 (토큰 절약, 출력 품질 검증 전까지 opt-in)
+    planner_capture_dir: str | None = None # 플래너 트래픽 캡처 파일 디렉터리 (benchmarks/replay_traffic.py로 재생), None이면 비활성화
+    planner_capture_sample_rate: float = 0.0 # 캡처할 플래너 요청 비율 (0.0 ~ 1.0)
+    planner_capture_max_file_mb: int = 64 # 캡처 파일 하나의 최대 크기(MB), 초과 시 새 파일로 교체
+    planner_capture_secret: str | None = None # 캡처 userId 가명 처리(HMAC) 키, None이면 프로세스마다 임의 키 (재시작 / 워커 간 가명 불일치)
+    planner_disconnect_grace_seconds: float = 2.0 # 클라이언트 연결이 끊긴 뒤 이 시간(초) 안에 끝나지 않으면 플래너 생성 취소 (음수면 비활성화)
+
+    # Chat (SSE Streaming)
+    chat_stream_pacing: Literal["passthrough", "coalesce", "typing"] = "coalesce" # 모델 Chunk 전송 방식 (그대로 / 시간 단위 묶음 / 타이핑 효과)
+    chat_stream_flush_ms: int = 50 # coalesce 묶음 간격 / typing 전송 프레임 간격(ms)
+    chat_typing_chars_per_second: float = 120.0 # typing 모드 전송 속도(글자/초)
+    chat_stream_broker: Literal["memory", "postgres"] = "memory" # 스트림 브로커 (postgres: 여러 워커가 스트림 공유, LISTEN/NOTIFY)
+    chat_stream_poll_seconds: float = 1.0 # postgres 브로커의 NOTIFY 누락 대비 이벤트 재조회 간격(초)
+    chat_max_streams_per_user: int = 3 # 사용자별 동시 진행 스트림 상한, 초과 시 429 (0이면 비활성화)
+    chat_stream_max_buffered_events: int = 256 # memory 브로커의 스트림별 읽지 않은 이벤트 상한, 가득 차면 생성 대기 (0이면 무제한)
+    chat_stream_replay_events: int = 512 # memory 브로커의 스트림별 재연결(Last-Event-ID)용 보관 이벤트 수
+    chat_stream_idle_ttl_seconds: float = 120.0 # 구독자(GET) 없이 이 시간(초)이 지난 스트림은 생성 취소 후 삭제, 재연결 가능 시간 (0이면 비활성화)
+    chat_disconnect_grace_seconds: float = 15.0 # 생성 중 SSE 연결이 끊긴 뒤 이 시간(초) 안에 재연결되지 않으면 생성 취소 (음수면 비활성화)
+    chat_tool_prefetch_days: int = 0 # 응답 생성 시작 시 최근 N일 일정을 첫 모델 호출과 병렬로 선조회 (도구 호출이 없으면 DB 조회 1회 낭비, 0이면 비활성화)
+
     class Config:
         env_file = ".env" # 환경 변수 파일
         case_sensitive = False # 대소문자 구분 하지 않음
@@ -0,0 +1,74 @@
+"""
+클라이언트 연결 끊김 감지 (끊긴 요청의 LLM 작업 취소)
+
+- 일반(JSON) 응답 엔드포인트는 클라이언트가 떠나도 핸들러가 끝까지 실행되므로, 작업을 Task로 돌리면서
+  request.is_disconnected()를 주기적으로 확인하고 끊긴 뒤 grace_seconds 안에 끝나지 않으면 Task를 취소
+- 취소는 진행 중인 Gemini 호출(비동기 클라이언트)과 재시도 대기(asyncio.sleep)까지 전파됨
+- 스트리밍 응답(StreamingResponse)은 연결 종료 후 Starlette가 생성기를 닫으므로(다음 이벤트 전송 시점) 적용하지 않음
+"""
+import asyncio
+import logging
+from typing import Awaitable, TypeVar
+
+from starlette.requests import Request
+
+from app.core.metrics import get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# 클라이언트가 응답을 받기 전에 연결을 끊음 (nginx 관례)
+CLIENT_CLOSED_REQUEST = 499
+
+CLIENT_DISCONNECT_CANCELLED_TOTAL = get_metrics_registry().counter(
+    "client_disconnect_cancelled_total", "In-flight work cancelled because the client disconnected", ("route",)
+)
+
+
+class ClientDisconnected(Exception):
+    """작업 완료 전에 클라이언트 연결이 끊겨 작업을 취소함"""
+
+
+async def _wait_for_disconnect(request: Request, poll_seconds: float) -> None:
+    while not await request.is_disconnected():
+        await asyncio.sleep(poll_seconds)
+
+
+async def run_until_disconnected(
+    request: Request,
+    work: Awaitable[T],
+    grace_seconds: float,
+    route: str,
+    poll_seconds: float = 0.25
+) -> T:
+    """
+    work 실행 결과 반환, 실행 중 연결이 끊기면 grace_seconds 더 기다린 뒤 취소하고 ClientDisconnected
+    - grace_seconds가 음수면 연결 끊김을 확인하지 않음
+    """
+    if grace_seconds < 0:
+        return await work
+
+    task = asyncio.ensure_future(work)
+    watcher = asyncio.create_task(_wait_for_disconnect(request, poll_seconds))
+    try:
+        await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+        if not task.done():
+            # 유예 시간 안에 끝나면 결과를 그대로 사용 (캐시 저장 등 후처리 유지)
+            await asyncio.wait({task}, timeout=grace_seconds)
+        if task.done():
+            return task.result()
+
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        CLIENT_DISCONNECT_CANCELLED_TOTAL.inc(route=route)
+        logger.info(f"Client disconnected, cancelled in-flight work ({route})")
+        raise ClientDisconnected(route)
+    finally:
+        watcher.cancel()
+        if not task.done():
+            # 핸들러 자체가 취소된 경우
+            task.cancel()
@@ -0,0 +1,109 @@
+"""
+노드 입출력 Payload 로깅 (logfire)
+
+- 수준(settings.payload_log_level)
+  - off: 기록하지 않음
+  - summary: 건수 / 식별자 등 요약만 기록
+  - sampled: 요청 단위 Head Sampling(payload_log_sample_rate)에 걸린 요청만 전체 Payload, 나머지는 요약
+  - full: 항상 전체 Payload
+- 전체 Payload는 함수(thunk)로 받아 실제로 기록할 때만 만들고 직렬화 (기록하지 않는 요청은 비용 없음)
+- 요청 중 에러(Fallback 등)가 발생하면 그 요청의 이후 Payload는 수준과 관계없이 전체 기록
+- State 전체 대신 바뀐 필드만 기록할 수 있도록 diff_fields 제공
+"""
+import random
+from contextvars import ContextVar
+from typing import Any, Callable, Optional
+
+import logfire
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+PayloadFactory = Callable[[], Any]
+
+# 요청 단위 샘플링 결정 (None이면 첫 기록 시점에 결정)
+_sampled: ContextVar[Optional[bool]] = ContextVar("payload_sampled", default=None)
+_errored: ContextVar[bool] = ContextVar("payload_errored", default=False)
+
+
+def start_payload_sampling(sample_rate: float | None = None) -> bool:
+    """새 요청(파이프라인 실행)의 Head Sampling 결정"""
+    rate = settings.payload_log_sample_rate if sample_rate is None else sample_rate
+    sampled = random.random() < rate
+    _sampled.set(sampled)
+    _errored.set(False)
+    return sampled
+
+
+def mark_payload_error() -> None:
+    """이후 Payload는 전체 기록 (에러 요청은 항상 전체 기록)"""
+    _errored.set(True)
+
+
+def _full_payload_enabled() -> bool:
+    level = settings.payload_log_level
+    if level == "full" or _errored.get():
+        return True
+    if level != "sampled":
+        return False
+    sampled = _sampled.get()
+    if sampled is None:
+        sampled = start_payload_sampling()
+    return sampled
+
+
+def summarize(value: Any) -> dict[str, Any]:
+    """
+    Pydantic 모델 / dict의 필드별 요약
+    - 컬렉션은 건수, 스칼라는 값 그대로, 중첩 모델은 생략
+    """
+    if isinstance(value, BaseModel):
+        items = ((name, getattr(value, name)) for name in type(value).model_fields)
+    elif isinstance(value, dict):
+        items = value.items()
+    else:
+        return {"value": value}
+
+    summary = {}
+    for name, field_value in items:
+        if isinstance(field_value, (list, tuple, dict, set)):
+            summary[name] = len(field_value)
+        elif field_value is None or isinstance(field_value, (str, int, float, bool)):
+            summary[name] = field_value
+    return summary
+
+
+def diff_fields(before: BaseModel, after: BaseModel) -> dict[str, Any]:
+    """
+    after에서 바뀐 필드만 추출
+    - model_copy(update=...)는 바뀌지 않은 필드 객체를 그대로 공유하므로 동일성(is) 비교로 충분
+    """
+    return {
+        name: getattr(after, name)
+        for name in type(after).model_fields
+        if getattr(after, name) is not getattr(before, name)
+    }
+
+
+def log_payload(
+    message: str,
+    payload: PayloadFactory,
+    summary: Optional[PayloadFactory] = None,
+    error: bool = False
+) -> None:
+    """
+    수준에 따라 요약 또는 전체 Payload 기록
+    - payload / summary는 기록 시점에만 호출
+    - summary 미지정 시 요약 수준에서는 기록하지 않음 (요약을 위해 전체 Payload를 만들지 않음)
+    - error=True면 이번 기록과 이후 기록 모두 전체 Payload
+    """
+    if error:
+        mark_payload_error()
+    if settings.payload_log_level == "off":
+        return
+
+    attributes = summary() if summary is not None else {}
+    if _full_payload_enabled():
+        logfire.info(message, payload=payload(), **attributes)
+    elif attributes:
+        logfire.info(message, **attributes)
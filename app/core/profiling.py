@@ -0,0 +1,173 @@
+"""
+On-demand 요청 프로파일링
+
+- SamplingProfiler: 별도 스레드가 일정 간격으로 대상 스레드(이벤트 루프)의 호출 스택을 샘플링 (표준 라이브러리만 사용)
+  - folded(): flamegraph.pl / speedscope에서 바로 열 수 있는 Collapsed Stack 형식
+  - top_functions(): Self / Total 샘플 기준 상위 N개 함수
+- ProfilingMiddleware: 관리자 헤더(X-Profile-Token) 또는 샘플링 비율에 걸린 요청만 프로파일링 후 logfire에 첨부
+- 이벤트 루프 스레드를 샘플링하므로 같은 시간대에 처리된 다른 요청의 코드도 함께 잡힐 수 있음
+  (LLM 호출은 비동기 클라이언트(client.aio)로 실행되어 응답을 기다리는 동안은 루프의 대기 구간으로 보임)
+- Collapsed Stack 파일 저장은 to_thread로 실행하여 이벤트 루프를 막지 않음
+"""
+import asyncio
+import random
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+import logfire
+
+from app.core.config import settings
+
+PROFILE_HEADER = b"x-profile-token"
+
+# 이벤트 루프가 다음 이벤트를 기다리는 구간 (Hot Spot 집계에서 제외)
+_IDLE_FUNCTIONS = {"select", "poll", "epoll", "_run_once", "run_forever", "wait"}
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", Path(code.co_filename).stem)
+    return f"{module}:{code.co_name}"
+
+
+class SamplingProfiler:
+    """대상 스레드의 호출 스택을 interval 초마다 수집하는 샘플링 프로파일러"""
+
+    def __init__(self, interval: float = 0.005, thread_id: Optional[int] = None, max_depth: int = 64):
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.max_depth = max_depth
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self.sample_count = 0
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+
+    def start(self) -> "SamplingProfiler":
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.perf_counter() - self._started
+        return self
+
+    def __enter__(self) -> "SamplingProfiler":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            self.stacks[tuple(reversed(stack))] += 1
+            self.sample_count += 1
+
+    def folded(self, limit: Optional[int] = None) -> str:
+        """Collapsed Stack 형식 (`root;child;leaf count`), 샘플이 많은 스택 순"""
+        return "\n".join(f"{';'.join(stack)} {count}" for stack, count in self.stacks.most_common(limit))
+
+    def top_functions(self, n: int = 15, include_idle: bool = False) -> list[dict]:
+        """
+        상위 N개 함수
+        - self: 스택 최상단(실제 실행 중)이었던 샘플 수, total: 스택 어딘가에 있었던 샘플 수
+        """
+        self_counts: Counter[str] = Counter()
+        total_counts: Counter[str] = Counter()
+        for stack, count in self.stacks.items():
+            if not include_idle and stack[-1].rsplit(":", 1)[-1] in _IDLE_FUNCTIONS:
+                continue
+            self_counts[stack[-1]] += count
+            for label in set(stack):
+                total_counts[label] += count
+
+        total_samples = max(self.sample_count, 1)
+        return [
+            {
+                "function": label,
+                "self": self_counts[label],
+                "total": total_counts[label],
+                "self_pct": round(100 * self_counts[label] / total_samples, 1),
+            }
+            for label, _ in self_counts.most_common(n)
+        ]
+
+
+def should_profile(token: Optional[str]) -> bool:
+    """관리자 토큰이 일치하거나 샘플링 비율에 걸리면 프로파일링"""
+    admin_token = settings.profiling_admin_token
+    if token and admin_token and secrets.compare_digest(token, admin_token):
+        return True
+    return settings.profiling_sample_rate > 0 and random.random() < settings.profiling_sample_rate
+
+
+def _write_artifact(output_dir: str, folded: str) -> Path:
+    """Collapsed Stack 파일 저장 (파일 I/O이므로 이벤트 루프 밖에서 호출)"""
+    directory = Path(output_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    artifact = directory / f"{time.strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(4)}.folded"
+    artifact.write_text(folded, encoding="utf-8")
+    return artifact
+
+
+async def report_profile(profiler: SamplingProfiler, method: str, path: str) -> None:
+    """프로파일 결과를 logfire에 첨부 (설정 시 Collapsed Stack 파일도 저장)"""
+    artifact = None
+    if settings.profiling_output_dir:
+        artifact = await asyncio.to_thread(_write_artifact, settings.profiling_output_dir, profiler.folded())
+
+    logfire.info(
+        "Request Profile",
+        method=method,
+        path=path,
+        duration_ms=round(profiler.duration * 1000, 1),
+        samples=profiler.sample_count,
+        top_functions=profiler.top_functions(),
+        folded_stacks=profiler.folded(limit=200),
+        artifact=str(artifact) if artifact else None
+    )
+
+
+class ProfilingMiddleware:
+    """
+    선택된 요청만 SamplingProfiler로 감싸서 실행
+    - 관리자 헤더: `X-Profile-Token: <PROFILING_ADMIN_TOKEN>`
+    - 샘플링: PROFILING_SAMPLE_RATE (기본 0, 비활성화)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = dict(scope.get("headers", [])).get(PROFILE_HEADER)
+        if not should_profile(token.decode("latin-1") if token else None):
+            await self.app(scope, receive, send)
+            return
+
+        profiler = SamplingProfiler(interval=settings.profiling_interval_ms / 1000).start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.stop()
+            await report_profile(profiler, scope["method"], scope["path"])
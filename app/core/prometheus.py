@@ -0,0 +1,104 @@
+"""
+Prometheus 텍스트 포맷 노출 (`GET /metrics`)
+
+- In-process MetricsRegistry를 Prometheus exposition format(0.0.4)으로 변환 (prometheus_client 의존성 없음)
+- PrometheusMiddleware: 라우트(경로 템플릿) 단위 HTTP 지연 시간 히스토그램 기록
+"""
+import math
+import time
+
+from app.core.metrics import Histogram, MetricsRegistry, get_metrics_registry
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+HTTP_REQUEST_DURATION_SECONDS = get_metrics_registry().histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route", "status")
+)
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: tuple[str, str] | None = None) -> str:
+    pairs = [f'{n}="{_escape_label_value(v)}"' for n, v in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def render_prometheus(registry: MetricsRegistry | None = None) -> str:
+    """레지스트리의 모든 메트릭을 Prometheus 텍스트 포맷으로 변환"""
+    registry = registry or get_metrics_registry()
+    lines: list[str] = []
+    for metric in sorted(registry.collect(), key=lambda m: m.name):
+        lines.append(f"# HELP {metric.name} {_escape_help(metric.documentation)}")
+        lines.append(f"# TYPE {metric.name} {metric.type_name}")
+
+        if isinstance(metric, Histogram):
+            for labels, buckets, total, count in metric.histogram_samples():
+                for bound, cumulative in buckets:
+                    le = _format_labels(metric.labelnames, labels, ("le", _format_value(bound)))
+                    lines.append(f"{metric.name}_bucket{le} {cumulative}")
+                inf = _format_labels(metric.labelnames, labels, ("le", "+Inf"))
+                lines.append(f"{metric.name}_bucket{inf} {_format_value(count)}")
+                plain = _format_labels(metric.labelnames, labels)
+                lines.append(f"{metric.name}_sum{plain} {_format_value(total)}")
+                lines.append(f"{metric.name}_count{plain} {_format_value(count)}")
+            continue
+
+        samples = metric.samples()
+        if not samples and not metric.labelnames:
+            # 라벨 없는 Counter / Gauge는 기록 전에도 0으로 노출
+            samples = [((), 0.0)]
+        for labels, value in samples:
+            lines.append(f"{metric.name}{_format_labels(metric.labelnames, labels)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+class PrometheusMiddleware:
+    """
+    요청마다 (method, 라우트 경로 템플릿, 상태 코드) 단위로 지연 시간 기록
+    - 실제 경로 대신 `/ai/v2/reports/{reportId}/...` 같은 템플릿을 라벨로 사용해 시계열 수를 제한
+    - 매칭되지 않은 경로는 "unmatched"
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION_SECONDS.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status)
+            )
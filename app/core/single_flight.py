@@ -0,0 +1,65 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, TypeVar
+
+import logfire  # [Logfire] Import
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    동일 키 동시 요청 병합 (Single-flight)
+    - 같은 키로 진행 중인 작업이 있으면 새로 실행하지 않고 그 결과를 함께 기다림
+    - 작업은 별도 Task로 실행되므로, 먼저 호출한 요청이 취소되어도 나머지 대기자는 결과를 받음
+    - cancel_abandoned: 모든 대기자가 취소되면 공유 작업도 취소 (클라이언트가 모두 떠난 LLM 호출 중단)
+    - 작업이 끝나면(성공/실패 모두) 키를 제거하므로 결과를 보관하지는 않음 (캐시와 별개)
+    """
+
+    def __init__(self, name: str, cancel_abandoned: bool = False):
+        self.name = name
+        self.cancel_abandoned = cancel_abandoned
+        self._inflight: dict[Any, asyncio.Task] = {}
+        self._waiters: dict[Any, int] = {}
+        self.executions = 0  # 실제 실행 횟수
+        self.coalesced = 0   # 진행 중인 작업에 합류한 횟수
+
+    async def do(self, key: Any, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._forget(k, t))
+        else:
+            self.coalesced += 1
+            logfire.info("Single-flight Coalesced", flight=self.name)
+
+        # 대기자 하나가 취소되어도 공유 작업은 계속 진행
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self.cancel_abandoned and self._waiters[key] == 1 and not task.done():
+                logfire.info("Single-flight Abandoned", flight=self.name)
+                task.cancel()
+            raise
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+
+    def _forget(self, key: Any, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 모든 대기자가 취소된 경우 "Task exception was never retrieved" 경고 방지
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"[SingleFlight:{self.name}] {key} failed: {task.exception()}")
+
+    def in_flight(self, key: Any) -> bool:
+        return key in self._inflight
+
+    def __len__(self) -> int:
+        return len(self._inflight)
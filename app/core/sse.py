@@ -0,0 +1,28 @@
+"""
+스트리밍 응답 이벤트 포맷 헬퍼 (SSE / NDJSON)
+"""
+import json
+from typing import Any, Callable, Literal
+
+StreamFormat = Literal["sse", "ndjson"]
+
+SSE_MEDIA_TYPE = "text/event-stream"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def format_sse(event: str, data: dict[str, Any], event_id: int | None = None) -> str:
+    """SSE 포맷에 맞춰 문자열을 생성 (event_id가 있으면 id 필드 포함, 재연결 시 Last-Event-ID 헤더로 전달됨)"""
+    id_line = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{id_line}event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def format_ndjson(event: str, data: dict[str, Any]) -> str:
+    """NDJSON 포맷 (한 줄에 이벤트 하나, event 필드로 구분)"""
+    return json.dumps({"event": event, "data": data}, ensure_ascii=False) + "\n"
+
+
+def get_stream_formatter(fmt: StreamFormat) -> tuple[Callable[[str, dict[str, Any]], str], str]:
+    """포맷 이름 -> (포맷 함수, media type)"""
+    if fmt == "ndjson":
+        return format_ndjson, NDJSON_MEDIA_TYPE
+    return format_sse, SSE_MEDIA_TYPE
@@ -0,0 +1,171 @@
+"""
+요청 단위 구간별 지연 시간 측정
+
+- 요청마다 RequestTimings를 ContextVar로 보관 (asyncio Task는 생성 시점의 Context를 복사하므로 하위 Task도 같은 객체에 기록)
+- timed(stage): 구간 Wall time 측정 + 히스토그램 기록, 구간 안에서의 LLM 시도/재시도 대기/토큰 사용량을 해당 구간에 귀속
+- ServerTimingMiddleware: 응답에 `Server-Timing` 헤더 추가
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+from app.core.metrics import get_metrics_registry
+from app.llm.load_monitor import last_llm_model
+
+_registry = get_metrics_registry()
+STAGE_DURATION_SECONDS = _registry.histogram(
+    "request_stage_duration_seconds", "Wall time of each request stage (pipeline node, cache, response)", ("stage",)
+)
+LLM_ATTEMPTS_TOTAL = _registry.counter(
+    "llm_attempts_total", "LLM call attempts including retries", ("stage",)
+)
+LLM_RETRIES_TOTAL = _registry.counter(
+    "llm_retries_total", "LLM call retries after a failed attempt", ("model", "stage")
+)
+LLM_FALLBACK_TOTAL = _registry.counter(
+    "llm_fallback_total", "Stages that gave up on the LLM and used a rule-based fallback", ("stage",)
+)
+LLM_RETRY_SLEEP_SECONDS = _registry.histogram(
+    "llm_retry_sleep_seconds", "Backoff sleep before an LLM retry", ("stage",)
+)
+LLM_CALL_TOKENS = _registry.histogram(
+    "llm_call_tokens", "Tokens used per LLM call", ("model", "direction"),
+    buckets=(50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000)
+)
+
+
+@dataclass
+class StageTiming:
+    wall_ms: float = 0.0
+    llm_attempts: int = 0
+    retry_sleep_ms: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+
+@dataclass
+class RequestTimings:
+    """요청 하나의 구간별 측정값 (구간 이름 -> StageTiming, 기록 순서 유지)"""
+    started: float = field(default_factory=time.perf_counter)
+    stages: dict[str, StageTiming] = field(default_factory=dict)
+
+    def stage(self, name: str) -> StageTiming:
+        timing = self.stages.get(name)
+        if timing is None:
+            timing = self.stages[name] = StageTiming()
+        return timing
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self) -> str:
+        """`Server-Timing` 헤더 값 (구간별 dur + 전체 total)"""
+        entries = [f"{name};dur={t.wall_ms:.1f}" for name, t in self.stages.items()]
+        entries.append(f"total;dur={self.elapsed_ms():.1f}")
+        return ", ".join(entries)
+
+
+_current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+_current_stage: ContextVar[Optional[str]] = ContextVar("request_stage", default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current_timings.get()
+
+
+@contextmanager
+def stage_scope(stage: str) -> Iterator[None]:
+    """시간 측정 없이 LLM 시도/토큰 기록의 귀속 구간만 지정 (별도 Task로 실행되는 작업 생성 시 사용)"""
+    token = _current_stage.set(stage)
+    try:
+        yield
+    finally:
+        _current_stage.reset(token)
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """구간 Wall time 측정 (요청 밖에서도 히스토그램은 기록)"""
+    started = time.perf_counter()
+    try:
+        with stage_scope(stage):
+            yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_DURATION_SECONDS.observe(elapsed, stage=stage)
+        timings = _current_timings.get()
+        if timings is not None:
+            timings.stage(stage).wall_ms += elapsed * 1000
+
+
+def current_stage() -> Optional[str]:
+    return _current_stage.get()
+
+
+def _stage_name() -> str:
+    return _current_stage.get() or "unknown"
+
+
+def record_llm_attempt() -> None:
+    stage = _stage_name()
+    LLM_ATTEMPTS_TOTAL.inc(stage=stage)
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.stage(stage).llm_attempts += 1
+
+
+def record_retry_sleep(seconds: float) -> None:
+    """재시도 전 Backoff 대기 기록 (모델은 같은 Task에서 직전에 호출한 모델)"""
+    stage = _stage_name()
+    LLM_RETRIES_TOTAL.inc(model=last_llm_model(), stage=stage)
+    LLM_RETRY_SLEEP_SECONDS.observe(seconds, stage=stage)
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.stage(stage).retry_sleep_ms += seconds * 1000
+
+
+def record_llm_fallback() -> None:
+    LLM_FALLBACK_TOTAL.inc(stage=_stage_name())
+
+
+def record_llm_tokens(input_tokens: int | None, output_tokens: int | None, model: str = "unknown") -> None:
+    input_tokens, output_tokens = input_tokens or 0, output_tokens or 0
+    LLM_CALL_TOKENS.observe(input_tokens, model=model, direction="input")
+    LLM_CALL_TOKENS.observe(output_tokens, model=model, direction="output")
+    timings = _current_timings.get()
+    if timings is not None:
+        stage = timings.stage(_stage_name())
+        stage.input_tokens += input_tokens
+        stage.output_tokens += output_tokens
+
+
+class ServerTimingMiddleware:
+    """
+    요청마다 RequestTimings를 시작하고, 기록된 구간이 있으면 `Server-Timing` 헤더 추가
+    (스트리밍 응답은 헤더가 먼저 전송되므로 그 시점까지의 구간만 포함)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current_timings.set(timings)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start" and timings.stages:
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timings.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_timings.reset(token)
@@ -0,0 +1,179 @@
+import json
+from typing import Any
+
+from sqlalchemy import text
+from app.db.session import AsyncSessionLocal
+
+# LISTEN / NOTIFY 채널 (payload는 messageId만 전송, 이벤트 본문은 테이블에서 조회)
+CHAT_EVENT_CHANNEL = "chat_stream_events"
+CHAT_CANCEL_CHANNEL = "chat_stream_cancel"
+
+
+class ChatStreamRepository:
+    """
+    챗봇 스트림 이벤트 저장소 (chat_streams / chat_stream_events)
+    - 여러 워커가 같은 스트림을 읽을 수 있도록 이벤트를 순번(seq)과 함께 저장하고 NOTIFY로 알림
+    - 스트림 생성 워커(owner)만 이벤트를 기록하므로 seq는 owner가 부여
+    """
+    def __init__(self):
+        pass
+
+    async def create_stream(self, message_id: int, user_id: int | None, owner: str) -> bool:
+        """스트림 등록 (이미 있으면 False)"""
+        async with AsyncSessionLocal() as session:
+            stmt = text("""
+                INSERT INTO chat_streams (message_id, user_id, owner)
+                VALUES (:message_id, :user_id, :owner)
+                ON CONFLICT (message_id) DO NOTHING
+                RETURNING message_id
+            """)
+            res = await session.execute(stmt, {"message_id": message_id, "user_id": user_id, "owner": owner})
+            created = res.first() is not None
+            await session.commit()
+            return created
+
+    async def stream_exists(self, message_id: int) -> bool:
+        async with AsyncSessionLocal() as session:
+            res = await session.execute(
+                text("SELECT 1 FROM chat_streams WHERE message_id = :message_id"),
+                {"message_id": message_id}
+            )
+            return res.first() is not None
+
+    async def append_event(
+        self,
+        message_id: int,
+        seq: int,
+        event: str,
+        data: dict[str, Any],
+        finished: bool = False
+    ) -> None:
+        """
+        이벤트 저장 + NOTIFY (같은 트랜잭션, 커밋 시점에 알림 전달 / 삭제된 스트림에는 기록하지 않음)
+        - finished: 종료 이벤트면 스트림을 종료 상태로 표시 (사용자별 진행 중 스트림 수에서 제외)
+        """
+        async with AsyncSessionLocal() as session:
+            stmt = text("""
+                INSERT INTO chat_stream_events (message_id, seq, event, data)
+                SELECT :message_id, :seq, :event, CAST(:data AS JSONB)
+                WHERE EXISTS (SELECT 1 FROM chat_streams WHERE message_id = :message_id)
+            """)
+            await session.execute(stmt, {
+                "message_id": message_id,
+                "seq": seq,
+                "event": event,
+                "data": json.dumps(data, ensure_ascii=False)
+            })
+            if finished:
+                await session.execute(
+                    text("UPDATE chat_streams SET finished = TRUE WHERE message_id = :message_id"),
+                    {"message_id": message_id}
+                )
+            await session.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": CHAT_EVENT_CHANNEL, "payload": str(message_id)}
+            )
+            await session.commit()
+
+    async def fetch_events(self, message_id: int, after_seq: int) -> list[tuple[int, str, dict[str, Any]]]:
+        """after_seq 이후 이벤트 (seq, event, data)"""
+        async with AsyncSessionLocal() as session:
+            stmt = text("""
+                SELECT seq, event, data FROM chat_stream_events
+                WHERE message_id = :message_id AND seq > :after_seq
+                ORDER BY seq
+            """)
+            res = await session.execute(stmt, {"message_id": message_id, "after_seq": after_seq})
+            return [
+                (row[0], row[1], json.loads(row[2]) if isinstance(row[2], str) else row[2])
+                for row in res.fetchall()
+            ]
+
+    async def attach_subscriber(self, message_id: int) -> None:
+        """구독 시작 (구독자 수 증가)"""
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                text("UPDATE chat_streams SET subscribers = subscribers + 1 WHERE message_id = :message_id"),
+                {"message_id": message_id}
+            )
+            await session.commit()
+
+    async def detach_subscriber(self, message_id: int) -> None:
+        """구독 종료 (구독자 수 감소, 마지막 구독자면 재연결 대기 시작 시각 기록)"""
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                text("""
+                    UPDATE chat_streams
+                    SET subscribers = GREATEST(subscribers - 1, 0), idle_since = NOW()
+                    WHERE message_id = :message_id
+                """),
+                {"message_id": message_id}
+            )
+            await session.commit()
+
+    async def fetch_stream_finished(self, message_id: int) -> bool | None:
+        """종료 이벤트 기록 여부 (스트림이 없으면 None)"""
+        async with AsyncSessionLocal() as session:
+            res = await session.execute(
+                text("SELECT finished FROM chat_streams WHERE message_id = :message_id"),
+                {"message_id": message_id}
+            )
+            row = res.first()
+            return None if row is None else bool(row[0])
+
+    async def count_active_streams(self, user_id: int) -> int:
+        """사용자의 진행 중(종료 이벤트 전) 스트림 수"""
+        async with AsyncSessionLocal() as session:
+            res = await session.execute(
+                text("SELECT COUNT(*) FROM chat_streams WHERE user_id = :user_id AND NOT finished"),
+                {"user_id": user_id}
+            )
+            return int(res.scalar() or 0)
+
+    async def find_orphaned_streams(self, idle_seconds: float) -> list[int]:
+        """구독자 없이 idle_seconds가 지난 스트림 (GET 미연결 / 연결이 끊긴 뒤 재연결 없음)"""
+        async with AsyncSessionLocal() as session:
+            res = await session.execute(
+                text("""
+                    SELECT message_id FROM chat_streams
+                    WHERE subscribers = 0
+                    AND idle_since < NOW() - make_interval(secs => :idle_seconds)
+                """),
+                {"idle_seconds": idle_seconds}
+            )
+            return [row[0] for row in res.fetchall()]
+
+    async def fetch_abandoned_seconds(self, message_id: int) -> float | None:
+        """생성 중인 스트림에 구독자가 없었던 시간(초) (구독 중 / 종료 / 없는 스트림이면 None)"""
+        async with AsyncSessionLocal() as session:
+            res = await session.execute(
+                text("""
+                    SELECT EXTRACT(EPOCH FROM NOW() - idle_since) FROM chat_streams
+                    WHERE message_id = :message_id AND subscribers = 0 AND NOT finished
+                """),
+                {"message_id": message_id}
+            )
+            row = res.first()
+            return None if row is None else float(row[0])
+
+    async def notify_cancel(self, message_id: int) -> None:
+        """스트림 생성 워커에 취소 요청"""
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": CHAT_CANCEL_CHANNEL, "payload": str(message_id)}
+            )
+            await session.commit()
+
+    async def delete_stream(self, message_id: int) -> None:
+        """스트림 / 이벤트 삭제"""
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                text("DELETE FROM chat_stream_events WHERE message_id = :message_id"),
+                {"message_id": message_id}
+            )
+            await session.execute(
+                text("DELETE FROM chat_streams WHERE message_id = :message_id"),
+                {"message_id": message_id}
+            )
+            await session.commit()
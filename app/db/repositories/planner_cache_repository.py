@@ -0,0 +1,78 @@
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import text
+from app.db.session import AsyncSessionLocal
+
+
+class PlannerCacheRepository:
+    """
+    플래너 응답 캐시의 Postgres 2차 저장소 (planner_response_cache)
+    - 여러 인스턴스가 같은 캐시를 공유하고, 재시작 후에도 TTL 동안 재사용하기 위한 용도
+    """
+    def __init__(self):
+        pass
+
+    async def get(self, cache_key: str) -> dict[str, Any] | None:
+        """만료되지 않은 캐시 응답(JSON) 조회"""
+        async with AsyncSessionLocal() as session:
+            stmt = text("""
+                SELECT response FROM planner_response_cache
+                WHERE cache_key = :cache_key
+                AND expires_at > NOW()
+            """)
+            res = await session.execute(stmt, {"cache_key": cache_key})
+            row = res.first()
+            if not row:
+                return None
+            response = row[0]
+            # 드라이버 설정에 따라 JSONB가 문자열로 올 수 있음
+            return json.loads(response) if isinstance(response, str) else response
+
+    async def put(
+        self,
+        cache_key: str,
+        user_id: int,
+        day_plan_id: int,
+        response: dict[str, Any],
+        ttl_seconds: int
+    ) -> None:
+        """캐시 응답 저장 (같은 키가 있으면 갱신)"""
+        async with AsyncSessionLocal() as session:
+            stmt = text("""
+                INSERT INTO planner_response_cache (
+                    cache_key, user_id, day_plan_id, response, expires_at
+                ) VALUES (
+                    :cache_key, :user_id, :day_plan_id, CAST(:response AS JSONB), :expires_at
+                )
+                ON CONFLICT (cache_key) DO UPDATE SET
+                    response = EXCLUDED.response,
+                    expires_at = EXCLUDED.expires_at
+            """)
+            await session.execute(stmt, {
+                "cache_key": cache_key,
+                "user_id": user_id,
+                "day_plan_id": day_plan_id,
+                "response": json.dumps(response, ensure_ascii=False),
+                "expires_at": datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds)
+            })
+            await session.commit()
+
+    async def delete_for_user(self, user_id: int, day_plan_id: int | None = None) -> None:
+        """사용자(및 dayPlan)의 캐시 삭제 + 만료된 항목 정리"""
+        async with AsyncSessionLocal() as session:
+            if day_plan_id is None:
+                stmt = text("""
+                    DELETE FROM planner_response_cache
+                    WHERE user_id = :user_id OR expires_at <= NOW()
+                """)
+                params = {"user_id": user_id}
+            else:
+                stmt = text("""
+                    DELETE FROM planner_response_cache
+                    WHERE (user_id = :user_id AND day_plan_id = :day_plan_id) OR expires_at <= NOW()
+                """)
+                params = {"user_id": user_id, "day_plan_id": day_plan_id}
+            await session.execute(stmt, params)
+            await session.commit()
@@ -3,6 +3,111 @@ from datetime import datetime
 from app.db.session import AsyncSessionLocal
 from app.models.planner.internal import PlannerGraphState, TaskFeature
 from app.models.planner.response import AssignmentResult
+from app.models.planner.weights import WEIGHTS_VERSION
+from app.services.planner.utils.state_index import get_state_index
+
+RECORD_TASK_COLUMNS = [
+    "record_id", "task_id", "day_plan_id", "parent_schedule_id", "title",
+    "status", "task_type", "assigned_by", "assignment_status", "start_at",
+    "end_at", "estimated_time_range", "focus_level", "is_urgent", "category",
+    "cognitive_load", "group_id", "group_label", "order_in_group",
+    "importance_score", "fatigue_cost", "duration_avg_min", "duration_plan_min",
+    "duration_min_chunk", "duration_max_chunk", "is_split", "created_at"
+]
+
+
+def build_record_task_rows(state: PlannerGraphState, record_id: int) -> list[dict]:
+    """
+    record_tasks INSERT용 행 생성 (DB 접근 없음)
+    - FLEX: taskFeatures 기준 + 배정 결과, 분할된 작업은 부모 행 뒤에 자식 행 추가
+    - FIXED: 사용자 고정 일정 (FLEX 전용 컬럼은 None)
+    """
+    task_rows = []
+    assignment_map = {res.taskId: res for res in state.finalResults}
+    flex_by_id = get_state_index(state).flex_by_id
+
+    for task_id, feature in state.taskFeatures.items():
+        original_task = flex_by_id.get(task_id)
+        if not original_task: continue
+
+        assign_res = assignment_map.get(task_id)
+        assignment_status = assign_res.assignmentStatus if assign_res else "NOT_ASSIGNED"
+
+        start_at = assign_res.startAt if assign_res else None
+        end_at = assign_res.endAt if assign_res else None
+        children_data = [c.model_dump() for c in assign_res.children] if assign_res and assign_res.children else None
+        is_split = bool(children_data)
+
+        if is_split:
+            start_at = None
+            end_at = None
+
+        row = {
+            "record_id": record_id,
+            "task_id": task_id,
+            "day_plan_id": original_task.dayPlanId,
+            "parent_schedule_id": original_task.parentScheduleId,
+            "title": original_task.title,
+            "status": "TODO",
+            "task_type": "FLEX",
+            "assigned_by": "AI",
+            "assignment_status": assignment_status,
+            "start_at": start_at,
+            "end_at": end_at,
+            "estimated_time_range": original_task.estimatedTimeRange,
+            "focus_level": original_task.focusLevel,
+            "is_urgent": original_task.isUrgent,
+            "category": feature.category,
+            "cognitive_load": feature.cognitiveLoad,
+            "group_id": feature.groupId,
+            "group_label": feature.groupLabel,
+            "order_in_group": feature.orderInGroup,
+            "importance_score": float(feature.importanceScore) if feature.importanceScore is not None else None,
+            "fatigue_cost": float(feature.fatigueCost) if feature.fatigueCost is not None else None,
+            "duration_avg_min": feature.durationAvgMin,
+            "duration_plan_min": feature.durationPlanMin,
+            "duration_min_chunk": feature.durationMinChunk,
+            "duration_max_chunk": feature.durationMaxChunk,
+            "is_split": is_split,
+            "created_at": datetime.now()
+        }
+        task_rows.append(row)
+
+        if is_split and children_data:
+            for child in children_data:
+                child_row = row.copy()
+                child_row["title"] = child["title"]
+                child_row["start_at"] = child["startAt"]
+                child_row["end_at"] = child["endAt"]
+                child_row["is_split"] = False
+                child_row["created_at"] = datetime.now()
+                task_rows.append(child_row)
+
+    # Get the set of keys from the first row to ensure consistency
+    # (If no flex tasks, use the default set of keys for fixed tasks)
+    all_keys = task_rows[0].keys() if task_rows else RECORD_TASK_COLUMNS
+
+    for ft in state.fixedTasks:
+        fixed_row = {k: None for k in all_keys}
+        fixed_row.update({
+            "record_id": record_id,
+            "task_id": ft.taskId,
+            "day_plan_id": ft.dayPlanId,
+            "parent_schedule_id": ft.parentScheduleId,
+            "title": ft.title,
+            "status": "TODO",
+            "task_type": "FIXED",
+            "assigned_by": "USER",
+            "assignment_status": "ASSIGNED",
+            "start_at": ft.startAt,
+            "end_at": ft.endAt,
+            "is_split": False,
+            "created_at": datetime.now()
+        })
+        task_rows.append(fixed_row)
+
+    return task_rows
+
 
 class PlannerRepository:
     def __init__(self):
@@ -36,7 +141,7 @@ class PlannerRepository:
                 "assigned_count": assigned_real_count,
                 "excluded_count": excluded_count,
                 "fill_rate": fill_rate,
-                "weights_version": 1,
+                "weights_version": WEIGHTS_VERSION,
                 "created_at": datetime.now()
             }
             
@@ -62,99 +167,8 @@ class PlannerRepository:
                     return False
                 
                 # 2. Prepare Tasks Data
-                task_rows = []
-                assignment_map = {res.taskId: res for res in state.finalResults}
-                
-                for task_id, feature in state.taskFeatures.items():
-                    original_task = next((t for t in state.flexTasks if t.taskId == task_id), None)
-                    if not original_task: continue
-                    
-                    assign_res = assignment_map.get(task_id)
-                    assignment_status = assign_res.assignmentStatus if assign_res else "NOT_ASSIGNED"
-                    
-                    start_at = assign_res.startAt if assign_res else None
-                    end_at = assign_res.endAt if assign_res else None
-                    children_data = [c.model_dump() for c in assign_res.children] if assign_res and assign_res.children else None
-                    is_split = bool(children_data)
-                    
-                    if is_split:
-                        start_at = None
-                        end_at = None
-                    
-                    row = {
-                        "record_id": record_id,
-                        "task_id": task_id,
-                        "day_plan_id": original_task.dayPlanId,
-                        "parent_schedule_id": original_task.parentScheduleId,
-                        "title": original_task.title,
-                        "status": "TODO",
-                        "task_type": "FLEX",
-                        "assigned_by": "AI",
-                        "assignment_status": assignment_status,
-                        "start_at": start_at,
-                        "end_at": end_at,
-                        "estimated_time_range": original_task.estimatedTimeRange,
-                        "focus_level": original_task.focusLevel,
-                        "is_urgent": original_task.isUrgent,
-                        "category": feature.category,
-                        "cognitive_load": feature.cognitiveLoad,
-                        "group_id": feature.groupId,
-                        "group_label": feature.groupLabel,
-                        "order_in_group": feature.orderInGroup,
-                        "importance_score": float(feature.importanceScore) if feature.importanceScore is not None else None,
-                        "fatigue_cost": float(feature.fatigueCost) if feature.fatigueCost is not None else None,
-                        "duration_avg_min": feature.durationAvgMin,
-                        "duration_plan_min": feature.durationPlanMin,
-                        "duration_min_chunk": feature.durationMinChunk,
-                        "duration_max_chunk": feature.durationMaxChunk,
-                        "is_split": is_split,
-                        "created_at": datetime.now()
-                    }
-                    task_rows.append(row)
-                    
-                    if is_split and children_data:
-                        for child in children_data:
-                            child_row = row.copy()
-                            child_row["title"] = child["title"]
-                            child_row["start_at"] = child["startAt"]
-                            child_row["end_at"] = child["endAt"]
-                            child_row["is_split"] = False
-                            child_row["created_at"] = datetime.now()
-                            task_rows.append(child_row)
-                    
-                # Get the set of keys from the first row to ensure consistency
-                if task_rows:
-                    all_keys = task_rows[0].keys()
-                else:
-                    # If no flex tasks, we'll need a default set of keys for fixed tasks later
-                    all_keys = [
-                        "record_id", "task_id", "day_plan_id", "parent_schedule_id", "title",
-                        "status", "task_type", "assigned_by", "assignment_status", "start_at",
-                        "end_at", "estimated_time_range", "focus_level", "is_urgent", "category",
-                        "cognitive_load", "group_id", "group_label", "order_in_group",
-                        "importance_score", "fatigue_cost", "duration_avg_min", "duration_plan_min",
-                        "duration_min_chunk", "duration_max_chunk", "is_split", "created_at"
-                    ]
-
-                for ft in state.fixedTasks:
-                    fixed_row = {k: None for k in all_keys}
-                    fixed_row.update({
-                        "record_id": record_id,
-                        "task_id": ft.taskId,
-                        "day_plan_id": ft.dayPlanId,
-                        "parent_schedule_id": ft.parentScheduleId,
-                        "title": ft.title,
-                        "status": "TODO",
-                        "task_type": "FIXED",
-                        "assigned_by": "USER",
-                        "assignment_status": "ASSIGNED",
-                        "start_at": ft.startAt,
-                        "end_at": ft.endAt,
-                        "is_split": False,
-                        "created_at": datetime.now()
-                    })
-                    task_rows.append(fixed_row)
-                    
+                task_rows = build_record_task_rows(state, record_id)
+
                 if task_rows:
                     first_row_keys = task_rows[0].keys()
                     cols = ", ".join(first_row_keys)
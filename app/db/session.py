@@ -1,6 +1,28 @@
+import time
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.core.metrics import get_metrics_registry
+
+_registry = get_metrics_registry()
+DB_POOL_CHECKOUT_SECONDS = _registry.histogram(
+    "db_pool_checkout_seconds", "Time spent waiting to check out a DB connection from the pool"
+)
+DB_POOL_IN_USE = _registry.gauge("db_pool_connections_in_use", "DB connections currently checked out")
+DB_POOL_IDLE = _registry.gauge("db_pool_connections_idle", "Idle DB connections in the pool")
+DB_POOL_OVERFLOW = _registry.gauge("db_pool_overflow", "DB connections opened beyond pool_size")
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Checkout 대기 시간(풀 고갈 시 대기 + 신규 연결 생성 포함)을 기록하는 커넥션 풀"""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - started)
 
 if not settings.database_url:
     # Fallback or error if DATABASE_URL is missing
@@ -11,9 +33,20 @@ if not settings.database_url:
 engine = create_async_engine(
     settings.database_url,
     pool_pre_ping=True,
+    poolclass=InstrumentedAsyncQueuePool,
     echo=False, # Set to True for debugging SQL
 )
 
+
+def _collect_pool_metrics() -> None:
+    pool = engine.pool
+    DB_POOL_IN_USE.set(pool.checkedout())
+    DB_POOL_IDLE.set(pool.checkedin())
+    DB_POOL_OVERFLOW.set(max(pool.overflow(), 0))
+
+
+_registry.register_collector(_collect_pool_metrics)
+
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
     class_=AsyncSession,
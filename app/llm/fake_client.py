@@ -0,0 +1,224 @@
+"""
+결정론적 로컬 LLM 대체 구현 (LLM_BACKEND=fake)
+
+- GeminiClient와 같은 인터페이스(generate / generate_text / client.aio.models.generate_content_stream / embed_content)
+  - generate: Node 1(작업 분류) / Node 3(체인 후보) 프롬프트에 응답 (Compact / 기존 형식 모두 지원)
+  - generate_text: 주간 레포트 Markdown
+  - generate_content_stream: 챗봇 SSE 스트리밍 (도구 호출 없이 텍스트 Chunk만)
+  - client.models.embed_content / client.aio.models.embed_content: 텍스트 해시로 정해지는 단위 벡터
+    (임베딩 스케줄러, 유사 작업 검색용, 지연 / 에러 주입 없음)
+- 응답 내용은 입력의 taskId / 프롬프트 해시로 결정되어 항상 같음
+- 지연 시간 / 5xx 에러율 / 429(Quota) 비율은 프로파일로 설정 (seed 고정 시 주입 순서도 재현 가능)
+- 호출 부하 추적 / 토큰 기록은 실제 클라이언트와 동일하게 수행 (Admission Control, 메트릭, diagnostics 검증용)
+"""
+import asyncio
+import math
+import random
+import re
+import threading
+import zlib
+from dataclasses import dataclass, replace
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Optional
+
+from google.genai import errors as genai_errors
+
+from app.core.timing import current_stage, record_llm_tokens
+from app.llm.load_monitor import get_llm_load_monitor
+
+CATEGORIES = ["학업", "업무", "운동", "취미", "생활", "기타"]
+COG_LOADS = ["LOW", "MED", "HIGH"]
+TIME_ZONES = ["MORNING", "AFTERNOON", "EVENING", "NIGHT"]
+
+_COMPACT_ROW = re.compile(r"^(\d+),", re.M)
+_DEFAULT_EMBEDDING_DIM = 768
+_VERBOSE_ID = re.compile(r'(?:TaskID: |"taskId": )(\d+)')
+
+
+@dataclass(frozen=True)
+class FakeLLMProfile:
+    """Fake LLM 동작 프로파일 (지연 시간은 초 단위, 비율은 0.0 ~ 1.0)"""
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0  # 503 UNAVAILABLE
+    rate_limit_rate: float = 0.0  # 429 RESOURCE_EXHAUSTED
+    stream_chunk_latency: float = 0.0  # 챗봇 스트리밍 Chunk 간격
+
+
+FAKE_LLM_PROFILES: dict[str, FakeLLMProfile] = {
+    "instant": FakeLLMProfile(),
+    "realistic": FakeLLMProfile(latency=1.5, jitter=0.5, error_rate=0.01, stream_chunk_latency=0.05),
+    "flaky": FakeLLMProfile(latency=1.5, jitter=1.0, error_rate=0.2, stream_chunk_latency=0.05),
+    "quota": FakeLLMProfile(latency=1.0, jitter=0.3, rate_limit_rate=0.3, stream_chunk_latency=0.05),
+}
+
+
+def _task_ids(user: str) -> list[int]:
+    """프롬프트에 포함된 작업 ID (Compact 표의 짧은 ID 또는 기존 형식의 taskId)"""
+    ids = _COMPACT_ROW.findall(user) or _VERBOSE_ID.findall(user)
+    return list(dict.fromkeys(int(i) for i in ids))
+
+
+def _pick(options: list[str], key: Any, salt: str) -> str:
+    return options[zlib.crc32(f"{salt}:{key}".encode()) % len(options)]
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _embed_vector(text: str, dimensionality: int) -> list[float]:
+    """텍스트로 시드를 정한 결정론적 단위 벡터"""
+    rng = random.Random(zlib.crc32(text.encode()))
+    values = [rng.gauss(0.0, 1.0) for _ in range(dimensionality)]
+    norm = math.sqrt(sum(v * v for v in values)) or 1.0
+    return [v / norm for v in values]
+
+
+def _embed_response(contents: Any, config: Any) -> Any:
+    """embed_content 응답 형식 (contents는 문자열 또는 문자열 목록, config는 dict 또는 EmbedContentConfig)"""
+    if isinstance(config, dict):
+        dimensionality = config.get("output_dimensionality")
+    else:
+        dimensionality = getattr(config, "output_dimensionality", None)
+    texts = [contents] if isinstance(contents, str) else list(contents)
+    return SimpleNamespace(embeddings=[
+        SimpleNamespace(values=_embed_vector(str(text), dimensionality or _DEFAULT_EMBEDDING_DIM))
+        for text in texts
+    ])
+
+
+class _FakeModels:
+    """client.models 대체 (동기 임베딩, 임베딩 스케줄러에서 to_thread로 호출)"""
+
+    def embed_content(self, model: str, contents: Any, config: Any = None) -> Any:
+        return _embed_response(contents, config)
+
+
+class _FakeAsyncModels:
+    """client.aio.models 대체 (챗봇 스트리밍, 유사 작업 검색 임베딩)"""
+
+    def __init__(self, owner: "FakeGeminiClient"):
+        self._owner = owner
+
+    async def embed_content(self, model: str, contents: Any, config: Any = None) -> Any:
+        return _embed_response(contents, config)
+
+    async def generate_content_stream(self, model: str, contents: list, config: Any = None) -> AsyncIterator[Any]:
+        owner = self._owner
+        async with get_llm_load_monitor().track(model, record_latency=False, stage=current_stage()):
+            await owner._simulate_call()
+        last_text = ""
+        for content in reversed(contents):
+            texts = [p.text for p in (content.parts or []) if getattr(p, "text", None)]
+            if content.role == "user" and texts:
+                last_text = texts[-1]
+                break
+        return owner._stream_chunks(owner._chat_reply(last_text))
+
+
+class FakeGeminiClient:
+    """
+    GeminiClient 대체 구현
+    profile: 지연 시간 / 에러 주입 설정, seed: 지연 / 에러 주입 난수 시드 (None이면 비결정적)
+    """
+
+    def __init__(self, profile: FakeLLMProfile = FakeLLMProfile(), seed: Optional[int] = 0):
+        self.profile = profile
+        self.model_name = "fake-gemini"
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.client = SimpleNamespace(models=_FakeModels(), aio=SimpleNamespace(models=_FakeAsyncModels(self)))
+
+    def _draw(self) -> tuple[float, float]:
+        with self._rng_lock:
+            return self._rng.random(), self._rng.uniform(-1.0, 1.0)
+
+    async def _simulate_call(self) -> None:
+        """프로파일에 따라 지연 후 429 / 503 에러 주입"""
+        self.calls += 1
+        roll, jitter = self._draw()
+        delay = max(0.0, self.profile.latency + jitter * self.profile.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if roll < self.profile.rate_limit_rate:
+            raise genai_errors.ClientError(
+                429, {"error": {"code": 429, "message": "Fake quota exceeded", "status": "RESOURCE_EXHAUSTED"}}
+            )
+        if roll < self.profile.rate_limit_rate + self.profile.error_rate:
+            raise genai_errors.ServerError(
+                503, {"error": {"code": 503, "message": "Fake model overloaded", "status": "UNAVAILABLE"}}
+            )
+
+    async def generate(self, system: str, user: str) -> dict[str, Any]:
+        async with get_llm_load_monitor().track(self.model_name, stage=current_stage()):
+            await self._simulate_call()
+        task_ids = _task_ids(user)
+
+        if "timeZoneQueues" in system:
+            result = {"candidates": [
+                {
+                    "chainId": f"C{offset + 1}",
+                    "timeZoneQueues": {
+                        tz: [t for i, t in enumerate(task_ids) if (i + offset) % len(TIME_ZONES) == z]
+                        for z, tz in enumerate(TIME_ZONES)
+                    },
+                    "rationaleTags": ["fake"]
+                }
+                for offset in range(2)
+            ]}
+        else:
+            result = {"tasks": [
+                {
+                    "taskId": t,
+                    "category": _pick(CATEGORIES, t, "category"),
+                    "cognitiveLoad": _pick(COG_LOADS, t, "load"),
+                }
+                for t in task_ids
+            ]}
+
+        record_llm_tokens(_estimate_tokens(system + user), 20 * len(task_ids), model=self.model_name)
+        return result
+
+    async def generate_text(self, system: str, user: str, model_name: str = "fake-gemini") -> str:
+        async with get_llm_load_monitor().track(model_name, stage=current_stage()):
+            await self._simulate_call()
+        digest = zlib.crc32(user.encode()) % 100
+        text = (
+            "# 주간 레포트 (Fake)\n\n"
+            f"### 1. 이번 주 요약\n입력 데이터 {len(user)}자를 기준으로 생성한 결정론적 레포트입니다. (#{digest})\n\n"
+            "### 2. 다음 주 조언\n집중 시간대에 중요한 작업을 먼저 배치해 보세요."
+        )
+        record_llm_tokens(_estimate_tokens(system + user), _estimate_tokens(text), model=model_name)
+        return text
+
+    def _chat_reply(self, message: str) -> str:
+        tip = _pick(["오전", "오후", "저녁"], message, "chat")
+        return f"요청하신 내용을 바탕으로 보면, {tip} 시간대에 가장 중요한 작업 하나를 먼저 끝내는 것을 추천드려요."
+
+    async def _stream_chunks(self, text: str) -> AsyncIterator[Any]:
+        words = text.split(" ")
+        for i in range(0, len(words), 4):
+            if self.profile.stream_chunk_latency:
+                await asyncio.sleep(self.profile.stream_chunk_latency)
+            chunk = " ".join(words[i:i + 4]) + (" " if i + 4 < len(words) else "")
+            yield SimpleNamespace(text=chunk, function_calls=None)
+
+
+def build_fake_client(
+    profile_name: str = "instant",
+    latency: Optional[float] = None,
+    error_rate: Optional[float] = None,
+    rate_limit_rate: Optional[float] = None,
+    seed: Optional[int] = 0
+) -> FakeGeminiClient:
+    """프로파일 이름 + 개별 값 덮어쓰기(None이면 프로파일 값 사용)로 Fake 클라이언트 생성"""
+    if profile_name not in FAKE_LLM_PROFILES:
+        raise ValueError(f"Unknown fake LLM profile: {profile_name} (choose from {sorted(FAKE_LLM_PROFILES)})")
+    overrides = {
+        name: value
+        for name, value in (("latency", latency), ("error_rate", error_rate), ("rate_limit_rate", rate_limit_rate))
+        if value is not None
+    }
+    return FakeGeminiClient(replace(FAKE_LLM_PROFILES[profile_name], **overrides), seed=seed)
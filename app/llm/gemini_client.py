@@ -1,4 +1,3 @@
-import asyncio
 import json
 import logging
 from typing import AsyncGenerator, Annotated, Any, Dict, Optional
@@ -7,6 +6,9 @@ from google.genai import types
 import logfire
 from langfuse import observe
 from app.core.config import settings
+from app.core.timing import current_stage, record_llm_tokens
+from app.llm.load_monitor import get_llm_load_monitor
+from app.llm.recording import wrap_for_recording
 
 logger = logging.getLogger(__name__)
 
@@ -32,8 +34,8 @@ class GeminiClient:
             span.set_attribute("gen_ai.prompt", user)
             
             try:
-                def _do_generate():
-                    return self.client.models.generate_content(
+                async def _do_generate():
+                    return await self.client.aio.models.generate_content(
                         model=self.model_name,
                         contents=[
                             types.Content(
@@ -48,13 +50,19 @@ class GeminiClient:
                         )
                     )
                 
-                # 메인 이벤트 루프 블로킹 방지를 위한 비동기 처리
-                response = await asyncio.to_thread(_do_generate)
+                # 비동기 클라이언트 사용 (요청 취소 시 진행 중인 HTTP 호출도 중단, 호출 부하 추적 포함)
+                async with get_llm_load_monitor().track(self.model_name, stage=current_stage()):
+                    response = await _do_generate()
                 
                 # Set Response & Usage Attributes
                 if response.usage_metadata:
                     span.set_attribute("gen_ai.usage.input_tokens", response.usage_metadata.prompt_token_count)
                     span.set_attribute("gen_ai.usage.output_tokens", response.usage_metadata.candidates_token_count)
+                    record_llm_tokens(
+                        response.usage_metadata.prompt_token_count,
+                        response.usage_metadata.candidates_token_count,
+                        model=self.model_name
+                    )
                 
                 if response.text:
                     span.set_attribute("gen_ai.completion", response.text)
@@ -87,8 +95,8 @@ class GeminiClient:
             span.set_attribute("gen_ai.prompt", user)
             
             try:
-                def _do_generate_text():
-                    return self.client.models.generate_content(
+                async def _do_generate_text():
+                    return await self.client.aio.models.generate_content(
                         model=model_name,
                         contents=[
                             types.Content(
@@ -103,12 +111,18 @@ class GeminiClient:
                         )
                     )
                 
-                # 메인 이벤트 루프 블로킹 방지
-                response = await asyncio.to_thread(_do_generate_text)
+                # 비동기 클라이언트 사용 (요청 취소 시 진행 중인 HTTP 호출도 중단, 호출 부하 추적 포함)
+                async with get_llm_load_monitor().track(model_name, stage=current_stage()):
+                    response = await _do_generate_text()
                 
                 if response.usage_metadata:
                     span.set_attribute("gen_ai.usage.input_tokens", response.usage_metadata.prompt_token_count)
                     span.set_attribute("gen_ai.usage.output_tokens", response.usage_metadata.candidates_token_count)
+                    record_llm_tokens(
+                        response.usage_metadata.prompt_token_count,
+                        response.usage_metadata.candidates_token_count,
+                        model=model_name
+                    )
                 
                 if response.text:
                     span.set_attribute("gen_ai.completion", response.text)
@@ -128,11 +142,26 @@ class GeminiClient:
                 logger.error(f"Gemini API Error (generate_text): {str(e)}")
                 raise e
 
+def _create_llm_client():
+    """LLM_BACKEND 설정에 따라 실제 Gemini 또는 결정론적 Fake 클라이언트 생성"""
+    if settings.llm_backend == "fake":
+        from app.llm.fake_client import build_fake_client
+        logger.warning(f"LLM_BACKEND=fake: Gemini 대신 Fake LLM 사용 (profile={settings.fake_llm_profile})")
+        return build_fake_client(
+            settings.fake_llm_profile,
+            latency=settings.fake_llm_latency_seconds,
+            error_rate=settings.fake_llm_error_rate,
+            rate_limit_rate=settings.fake_llm_rate_limit_rate,
+            seed=settings.fake_llm_seed
+        )
+    return GeminiClient()
+
 # Singleton instance
 _gemini_client: Optional[GeminiClient] = None
 
 def get_gemini_client() -> GeminiClient:
     global _gemini_client
     if _gemini_client is None:
-        _gemini_client = GeminiClient()
-    return _gemini_client
+        _gemini_client = _create_llm_client()
+    # 트래픽 캡처 중인 요청이면 generate 호출을 기록하는 래퍼 반환
+    return wrap_for_recording(_gemini_client)
@@ -0,0 +1,104 @@
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Collection, Optional
+
+from app.core.metrics import get_metrics_registry
+
+# 현재 Task에서 마지막으로 호출한 모델 (재시도 메트릭의 모델 라벨용)
+_last_model: ContextVar[str] = ContextVar("last_llm_model", default="unknown")
+
+
+def last_llm_model() -> str:
+    return _last_model.get()
+
+
+class LLMLoadMonitor:
+    """
+    LLM 호출 부하 추적
+    - 진행 중인(In-flight) 호출 수
+    - 최근 호출 지연 시간 (최근 N건, horizon 초 이내)
+    - 호출마다 요청 구간(stage, 예: node1 / weekly_report)을 함께 기록하여 구간별로 조회 가능
+    플래너 Admission Control(부하 차단) 판단에 사용
+    """
+
+    def __init__(self, window: int = 50, horizon_seconds: float = 60.0):
+        self._samples: deque[tuple[float, float, Optional[str]]] = deque(maxlen=window)  # (종료 시각, 소요 시간, 구간)
+        self._horizon_seconds = horizon_seconds
+        self._in_flight = 0
+        self._in_flight_by_stage: dict[Optional[str], int] = {}
+        self._lock = threading.Lock()
+        registry = get_metrics_registry()
+        self._in_flight_gauge = registry.gauge(
+            "llm_in_flight_calls", "In-flight LLM calls", ("model",)
+        )
+        self._duration_histogram = registry.histogram(
+            "llm_call_duration_seconds", "LLM call latency", ("model",)
+        )
+        self._calls_total = registry.counter(
+            "llm_calls_total", "LLM calls by outcome", ("model", "outcome")
+        )
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def in_flight_for(self, stages: Collection[str]) -> int:
+        """지정한 구간들에서 진행 중인 호출 수"""
+        with self._lock:
+            return sum(self._in_flight_by_stage.get(stage, 0) for stage in stages)
+
+    @asynccontextmanager
+    async def track(
+        self, model: str, record_latency: bool = True, stage: Optional[str] = None
+    ) -> AsyncIterator[None]:
+        """LLM 호출 구간 추적 (스트리밍처럼 지연 시간이 의미 없는 호출은 record_latency=False)"""
+        with self._lock:
+            self._in_flight += 1
+            self._in_flight_by_stage[stage] = self._in_flight_by_stage.get(stage, 0) + 1
+        self._in_flight_gauge.inc(model=model)
+        _last_model.set(model)
+        started = time.monotonic()
+        outcome = "error"
+        try:
+            yield
+            outcome = "ok"
+        finally:
+            self._calls_total.inc(model=model, outcome=outcome)
+            ended = time.monotonic()
+            with self._lock:
+                self._in_flight -= 1
+                remaining = self._in_flight_by_stage[stage] - 1
+                if remaining:
+                    self._in_flight_by_stage[stage] = remaining
+                else:
+                    del self._in_flight_by_stage[stage]
+                if record_latency:
+                    self._samples.append((ended, ended - started, stage))
+            self._in_flight_gauge.dec(model=model)
+            if record_latency:
+                self._duration_histogram.observe(ended - started, model=model)
+
+    def recent_latency(self, quantile: float = 0.9, stages: Optional[Collection[str]] = None) -> float | None:
+        """최근 호출 지연 시간의 분위수 (stages 지정 시 해당 구간 호출만, 표본이 없으면 None)"""
+        cutoff = time.monotonic() - self._horizon_seconds
+        with self._lock:
+            durations = sorted(
+                d for ended, d, stage in self._samples
+                if ended >= cutoff and (stages is None or stage in stages)
+            )
+        if not durations:
+            return None
+        index = min(len(durations) - 1, int(quantile * len(durations)))
+        return durations[index]
+
+
+_llm_load_monitor: Optional[LLMLoadMonitor] = None
+
+def get_llm_load_monitor() -> LLMLoadMonitor:
+    global _llm_load_monitor
+    if _llm_load_monitor is None:
+        _llm_load_monitor = LLMLoadMonitor()
+    return _llm_load_monitor
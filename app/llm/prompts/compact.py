@@ -0,0 +1,58 @@
+"""
+토큰 절약형(Compact) 프롬프트 인코딩 유틸
+
+- 들여쓰기 없는 표(CSV) 형식: 헤더 한 줄 + 행마다 값만 나열 (라벨 반복 제거)
+- 긴 ID(DB bigint)를 1부터 시작하는 짧은 ID로 치환하고, LLM 응답 파싱 후 원래 ID로 복원
+- 자주 쓰는 Enum 값은 한 글자 코드로 축약
+"""
+import csv
+import io
+from typing import Any, Iterable, Sequence
+
+# 예상 소요 시간 코드 (시스템 프롬프트의 범례와 일치해야 함)
+ESTIMATE_CODES = {
+    "MINUTE_UNDER_30": "S",
+    "MINUTE_30_TO_60": "M",
+    "HOUR_1_TO_2": "L",
+}
+
+
+class ShortIdCodec:
+    """
+    원래 ID <-> 짧은 ID(1, 2, 3, ...) 양방향 매핑
+    - 입력 순서대로 번호를 부여하므로 같은 입력이면 항상 같은 결과
+    """
+
+    def __init__(self, ids: Iterable[Any]):
+        self._short: dict[Any, int] = {}
+        self._original: dict[int, Any] = {}
+        for original in ids:
+            if original not in self._short:
+                short = len(self._short) + 1
+                self._short[original] = short
+                self._original[short] = original
+
+    def encode(self, original: Any) -> int:
+        return self._short[original]
+
+    def decode(self, short: Any) -> Any:
+        """LLM이 반환한 짧은 ID -> 원래 ID (목록에 없으면 ValueError: Hallucination)"""
+        try:
+            return self._original[int(short)]
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"AI hallucinated invalid short id: {short}")
+
+    def __len__(self) -> int:
+        return len(self._short)
+
+
+def format_table(name: str, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> str:
+    """
+    `name(col1,col2,...)` 헤더 + CSV 행
+    - None은 빈 칸, 쉼표/따옴표가 포함된 값만 따옴표 처리
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    for row in rows:
+        writer.writerow(["" if value is None else value for value in row])
+    return f"{name}({','.join(columns)})\n{buffer.getvalue()}".rstrip("\n")
@@ -1,5 +1,6 @@
 from typing import AsyncGenerator, Annotated, Any, Optional
 from app.models.planner.request import ScheduleItem
+from app.llm.prompts.compact import ESTIMATE_CODES, ShortIdCodec, format_table
 
 NODE1_SYSTEM_PROMPT = """
 당신은 일정 관리 플래너의 작업(Task)을 분석하여 구조화하는 전문가입니다.
@@ -64,3 +65,35 @@ def format_tasks_for_llm(flex_tasks: list[ScheduleItem]) -> str:
         task_lines.append(line)
     
     return "\n".join(task_lines)
+
+
+# Compact 입력 형식용 시스템 프롬프트 (표 형식 입력 설명 추가)
+NODE1_COMPACT_SYSTEM_PROMPT = NODE1_SYSTEM_PROMPT.replace(
+    "(Prompt에 ParentID: null로 표시됨)", "(입력 표의 parent 칸이 비어 있음)"
+) + """
+5. **입력 형식 (표)**
+   - 첫 줄은 `tasks(id,title,est,parent)` 헤더, 이후 한 줄에 작업 하나 (CSV).
+   - **id**: 작업 식별자. 출력의 `taskId`에 이 값을 그대로 사용하세요.
+   - **est**: 예상 소요 시간 (S: 30분 미만, M: 30~60분, L: 1~2시간, 빈 칸: 미입력)
+   - **parent**: 그룹(parentScheduleId) 식별자. 같은 값이면 같은 그룹입니다.
+"""
+
+
+def format_tasks_compact(flex_tasks: list[ScheduleItem]) -> tuple[str, ShortIdCodec]:
+    """
+    LLM 입력용 작업 목록 포맷팅 (Compact)
+    - 표 형식 + 짧은 ID, 응답의 taskId는 반환된 codec으로 원래 ID 복원
+    """
+    codec = ShortIdCodec(t.taskId for t in flex_tasks)
+    groups = ShortIdCodec(t.parentScheduleId for t in flex_tasks if t.parentScheduleId is not None)
+
+    rows = [
+        (
+            codec.encode(task.taskId),
+            task.title,
+            ESTIMATE_CODES.get(task.estimatedTimeRange),
+            f"g{groups.encode(task.parentScheduleId)}" if task.parentScheduleId is not None else None,
+        )
+        for task in flex_tasks
+    ]
+    return format_table("tasks", ("id", "title", "est", "parent"), rows), codec
@@ -1,7 +1,8 @@
 import json
-import logfire  # [Logfire] Import
 from typing import AsyncGenerator, Annotated, Any
+from app.core.payload_logging import log_payload
 from app.models.planner.internal import TaskFeature
+from app.llm.prompts.compact import ShortIdCodec, format_table
 
 NODE3_SYSTEM_PROMPT = """
 당신은 일정 최적화 전문가(Scheduler Agent)입니다.
@@ -65,16 +66,10 @@ NODE3_SYSTEM_PROMPT = """
 ```
 """
 
-def format_node3_input(
-    task_features: dict[int, TaskFeature],
-    fixed_schedules: list[dict[str, Any]],
-    capacity: dict[str, int],
-    focus_timezone: str
-) -> str:
+def _rank_tasks(task_features: dict[int, TaskFeature]) -> list[tuple[TaskFeature, float]]:
     """
-    Node 3 LLM 입력용 데이터 포맷팅
+    LLM 배치 대상 작업을 중요도 순으로 정렬하고 정규화된 중요도(0~1)와 함께 반환
     """
-    tasks_list = []
     # "ERROR" 카테고리인 작업은 LLM 배치 대상에서 제외
     filtered_features = [f for f in task_features.values() if f.category != "ERROR"]
     
@@ -91,13 +86,28 @@ def format_node3_input(
         min_score = min(scores)
         max_score = max(scores)
 
+    ranked = []
     for f in sorted_features:
         # Min-Max Normalization
         if max_score == min_score:
             norm_importance = 1.0 # 모든 점수가 같거나 하나뿐이면 1.0
         else:
             norm_importance = (f.importanceScore - min_score) / (max_score - min_score)
+        ranked.append((f, norm_importance))
+    return ranked
+
 
+def format_node3_input(
+    task_features: dict[int, TaskFeature],
+    fixed_schedules: list[dict[str, Any]],
+    capacity: dict[str, int],
+    focus_timezone: str
+) -> str:
+    """
+    Node 3 LLM 입력용 데이터 포맷팅
+    """
+    tasks_list = []
+    for f, norm_importance in _rank_tasks(task_features):
         task_info = {
             "taskId": f.taskId,
             "title": f.title,
@@ -126,6 +136,73 @@ def format_node3_input(
     }
     
     # [Logfire] LLM 입력 데이터 로깅 (Capacity 확인용)
-    logfire.info("Node 3 Input Data", input=user_input)
+    log_payload(
+        "Node 3 Input Data",
+        lambda: user_input,
+        lambda: {"focusTimeZone": focus_timezone, "capacity": capacity, "tasks": len(tasks_list)}
+    )
 
     return json.dumps(user_input, ensure_ascii=False, indent=2)
+
+
+# Compact 입력 형식용 시스템 프롬프트 (표 형식 입력 설명 추가)
+NODE3_COMPACT_SYSTEM_PROMPT = NODE3_SYSTEM_PROMPT + """
+# 입력 형식 (표)
+- `focus=...`: Focus TimeZone, `capacity(...)=...`: 시간대별 가용 시간(분)
+- `fixed(start,end,title)`, `tasks(id,title,cat,imp,dur,group,order)` 헤더 이후 한 줄에 하나씩 (CSV)
+- **id**: 작업 식별자. `timeZoneQueues`에는 이 값을 그대로 사용하세요.
+- **imp**: importance, **dur**: durationAvg, **group**: groupId, **order**: orderInGroup (빈 칸은 없음)
+"""
+
+TIME_ZONES = ("MORNING", "AFTERNOON", "EVENING", "NIGHT")
+
+
+def format_node3_input_compact(
+    task_features: dict[int, TaskFeature],
+    fixed_schedules: list[dict[str, Any]],
+    capacity: dict[str, int],
+    focus_timezone: str
+) -> tuple[str, ShortIdCodec]:
+    """
+    Node 3 LLM 입력용 데이터 포맷팅 (Compact)
+    - 표 형식 + 짧은 ID, 응답 큐의 taskId는 반환된 codec으로 원래 ID 복원
+    """
+    ranked = _rank_tasks(task_features)
+    codec = ShortIdCodec(f.taskId for f, _ in ranked)
+    groups = ShortIdCodec(f.groupId for f, _ in ranked if f.groupId is not None)
+
+    capacity_values = ",".join(str(capacity.get(tz, 0)) for tz in TIME_ZONES)
+    fixed_table = format_table(
+        "fixed", ("start", "end", "title"),
+        ((s.get("startAt"), s.get("endAt"), s.get("title")) for s in fixed_schedules)
+    )
+    task_table = format_table(
+        "tasks", ("id", "title", "cat", "imp", "dur", "group", "order"),
+        (
+            (
+                codec.encode(f.taskId),
+                f.title,
+                f.category,
+                round(norm_importance, 2),
+                f.durationAvgMin,
+                f"g{groups.encode(f.groupId)}" if f.groupId is not None else None,
+                f.orderInGroup,
+            )
+            for f, norm_importance in ranked
+        )
+    )
+
+    user_input = "\n".join([
+        f"focus={focus_timezone}",
+        f"capacity({','.join(TIME_ZONES)})={capacity_values}",
+        fixed_table,
+        task_table,
+    ])
+
+    # [Logfire] LLM 입력 데이터 로깅 (Capacity 확인용)
+    log_payload(
+        "Node 3 Input Data",
+        lambda: user_input,
+        lambda: {"focusTimeZone": focus_timezone, "capacity": capacity, "tasks": len(ranked)}
+    )
+    return user_input, codec
@@ -0,0 +1,144 @@
+"""
+LLM 호출 기록 / 재생 (플래너 트래픽 Record & Replay)
+
+- start_llm_recording(): 현재 컨텍스트의 generate 호출(구간 / 응답 또는 에러 / 지연 시간)을 목록에 기록
+  - 기록 중에는 get_gemini_client()가 RecordingClient로 감싼 클라이언트를 반환
+  - 하위 Task(추측 실행 Node 3 등)도 생성 시점의 Context를 복사하므로 같은 목록에 기록
+- ReplayGeminiClient: 기록된 응답을 구간별 순서대로 반환 (실제 LLM 호출 없음)
+  - 기록된 에러는 같은 종류의 google-genai 에러로 다시 발생 (재시도 / Fallback 경로 재현)
+"""
+import asyncio
+import json
+from collections import defaultdict, deque
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Optional
+
+from google.genai import errors as genai_errors
+
+from app.core.timing import current_stage
+
+# 에러 메시지 최대 길이 (프롬프트 / 응답 일부가 섞일 수 있으므로 잘라서 기록)
+ERROR_MESSAGE_MAX_CHARS = 300
+
+_exchanges: ContextVar[Optional[list[dict]]] = ContextVar("llm_exchanges", default=None)
+
+
+def start_llm_recording() -> list[dict]:
+    """
+    현재 컨텍스트의 LLM generate 호출 기록 시작, 기록이 쌓일 목록 반환
+    - 비동기 제너레이터(파이프라인) 안에서도 쓸 수 있도록 Token 대신 stop_llm_recording()으로 해제
+    """
+    exchanges: list[dict] = []
+    _exchanges.set(exchanges)
+    return exchanges
+
+
+def stop_llm_recording() -> None:
+    _exchanges.set(None)
+
+
+def wrap_for_recording(client: Any) -> Any:
+    """기록 중이면 RecordingClient로 감싸서 반환"""
+    exchanges = _exchanges.get()
+    return client if exchanges is None else RecordingClient(client, exchanges)
+
+
+def _serialize_error(e: Exception) -> dict[str, Any]:
+    return {
+        "type": type(e).__name__,
+        "code": getattr(e, "code", None),
+        "status": getattr(e, "status", None),
+        "message": str(e)[:ERROR_MESSAGE_MAX_CHARS],
+    }
+
+
+def _rebuild_error(error: dict[str, Any]) -> Exception:
+    """기록된 에러를 같은 종류의 예외로 복원 (google-genai 에러 외에는 ValueError)"""
+    error_class = {"ClientError": genai_errors.ClientError, "ServerError": genai_errors.ServerError}.get(error["type"])
+    if error_class is not None and error.get("code"):
+        return error_class(
+            error["code"],
+            {"error": {"code": error["code"], "message": error["message"], "status": error.get("status")}}
+        )
+    return ValueError(f"{error['type']}: {error['message']}")
+
+
+class RecordingClient:
+    """generate 호출을 기록하는 LLM 클라이언트 래퍼 (그 외 속성은 원본 클라이언트로 위임)"""
+
+    def __init__(self, inner: Any, exchanges: list[dict]):
+        self._inner = inner
+        self._exchanges = exchanges
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._inner, name)
+
+    async def generate(self, system: str, user: str) -> dict[str, Any]:
+        entry: dict[str, Any] = {"stage": current_stage() or "unknown", "promptChars": len(system) + len(user)}
+        started = perf_counter()
+        try:
+            response = await self._inner.generate(system, user)
+        except Exception as e:
+            entry["error"] = _serialize_error(e)
+            raise
+        else:
+            entry["response"] = response
+            return response
+        finally:
+            entry["ms"] = round((perf_counter() - started) * 1000, 1)
+            self._exchanges.append(entry)
+
+
+def _stage_family(stage: str) -> str:
+    """추측 실행 Node 3 응답은 일반 Node 3 응답과 같은 묶음으로 취급"""
+    return "node3" if stage.startswith("node3") else stage
+
+
+class ReplayExhaustedError(RuntimeError):
+    """재생할 기록이 남아 있지 않음 (현재 코드가 기록 시점보다 LLM을 더 많이 호출)"""
+
+
+class ReplayGeminiClient:
+    """
+    기록된 generate 응답을 구간별 순서대로 반환
+    - 같은 구간 기록이 없으면 같은 묶음(node3 / node3_speculative)의 기록 사용
+    - 호출마다 프롬프트 길이를 기록해 기록 시점과의 차이(프롬프트 변경) 비교에 사용
+    - latency_scale > 0이면 기록된 호출 지연 시간 x latency_scale만큼 대기 (추측 실행 등 겹침 효과 재현)
+    """
+
+    def __init__(self, exchanges: list[dict], latency_scale: float = 0.0):
+        self._latency_scale = latency_scale
+        self._queues: dict[str, deque] = defaultdict(deque)
+        for exchange in exchanges:
+            self._queues[exchange["stage"]].append(exchange)
+        self.calls: list[dict[str, Any]] = []
+
+    def _next(self, stage: str) -> Optional[dict]:
+        if self._queues[stage]:
+            return self._queues[stage].popleft()
+        family = _stage_family(stage)
+        for name, queue in self._queues.items():
+            if queue and _stage_family(name) == family:
+                return queue.popleft()
+        return None
+
+    @property
+    def remaining(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    async def generate(self, system: str, user: str) -> dict[str, Any]:
+        stage = current_stage() or "unknown"
+        call = {"stage": stage, "promptChars": len(system) + len(user)}
+        self.calls.append(call)
+        exchange = self._next(stage)
+        if exchange is None:
+            call["exhausted"] = True
+            raise ReplayExhaustedError(f"no recorded LLM response left for stage '{stage}'")
+        call["recordedPromptChars"] = exchange.get("promptChars")
+        if self._latency_scale > 0:
+            await asyncio.sleep(exchange.get("ms", 0.0) * self._latency_scale / 1000)
+        if "error" in exchange:
+            raise _rebuild_error(exchange["error"])
+        # 호출 측이 응답을 수정해도 기록이 바뀌지 않도록 복사본 반환
+        return json.loads(json.dumps(exchange["response"]))
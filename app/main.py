@@ -8,7 +8,7 @@ import logging
 import asyncio
 from contextlib import asynccontextmanager
 from dotenv import load_dotenv
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 # .env 파일 로드
@@ -17,6 +17,11 @@ load_dotenv()
 from app.core.config import settings
 from app.api import v1, v2
 from app.core.scheduler import run_embedding_scheduler
+from app.core.timing import ServerTimingMiddleware
+from app.core.prometheus import CONTENT_TYPE, PrometheusMiddleware, render_prometheus
+from app.core.profiling import ProfilingMiddleware
+from app.services.report.chat_broker import shutdown_chat_stream_broker
+from app.services.report.chat_sessions import shutdown_chat_sessions
 import logfire
 
 # Logfire 설정 (관측성)
@@ -57,6 +62,10 @@ async def lifespan(app: FastAPI):
     except asyncio.CancelledError:
         pass
 
+    # 챗봇 스트림 정리 Task / 브로커 LISTEN 연결 정리
+    await shutdown_chat_sessions()
+    await shutdown_chat_stream_broker()
+
 # FastAPI 앱 초기화
 app = FastAPI(
     title=settings.app_name, # 지정한 애플리케이션 이름
@@ -76,8 +85,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
+# 구간별 지연 시간 헤더 (Server-Timing)
+app.add_middleware(ServerTimingMiddleware)
+
+# On-demand 프로파일링 (관리자 헤더 / 샘플링에 걸린 요청만)
+app.add_middleware(ProfilingMiddleware)
+
+# 라우트별 HTTP 지연 시간 히스토그램 (Prometheus)
+app.add_middleware(PrometheusMiddleware)
+
 # 라우터 등록
 ## 외부 파일에 정의된 API 경로들을 앱에 포함
 app.include_router(v1.router, prefix="/ai/v1") # v1 통합 라우터 등록
@@ -101,6 +120,19 @@ async def health_check():
     }
 
 
+# Prometheus 메트릭 엔드포인트
+## 자체 모니터링 스택에서 스크랩 (In-process 레지스트리를 텍스트 포맷으로 노출)
+@app.get("/metrics", tags=["Health"], include_in_schema=False)
+async def metrics():
+    """
+    Prometheus 메트릭 노출
+
+    Returns:
+        Response: Prometheus exposition format (text/plain; version=0.0.4)
+    """
+    return Response(content=render_prometheus(), media_type=CONTENT_TYPE)
+
+
 # Root 엔드포인트
 ## 루트 경로에 접속했을 때 기본 정보를 반환
 @app.get("/", tags=["Root"])
@@ -115,6 +147,7 @@ async def root():
         "message": "MOLIP AI Server",
         "docs": "/docs",
         "health": "/health",
+        "metrics": "/metrics",
     }
 
 
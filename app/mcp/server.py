@@ -18,6 +18,81 @@ logfire.configure(token=settings.logfire_token, send_to_logfire='if-token-presen
 # FastMCP 서버 인스턴스 생성
 mcp = FastMCP("MOLIP Scheduler")
 
+def _query_schedule_records(user_id: int, start_date: str, end_date: str) -> tuple[list[dict], list[dict]]:
+    """planner_records + record_tasks 원본 조회 (동기 Supabase 클라이언트)"""
+    client = get_supabase_client()
+
+    # 1. planner_records 조회 (record_type이 'USER_FINAL'인 것만, 지정된 날짜 범위 내)
+    response = client.table("planner_records") \
+        .select("id, start_arrange, day_end_time, focus_time_zone, planner_date") \
+        .eq("user_id", user_id) \
+        .eq("record_type", "USER_FINAL") \
+        .gte("planner_date", start_date) \
+        .lte("planner_date", end_date) \
+        .execute()
+
+    planner_data = response.data
+    if not planner_data:
+        return [], []
+
+    record_ids = [record["id"] for record in planner_data]
+
+    # 2. planner_records의 id (record_id)를 사용하여 관련된 record_tasks를 조회
+    tasks_response = client.table("record_tasks") \
+        .select("*") \
+        .in_("record_id", record_ids) \
+        .eq("assignment_status", "ASSIGNED") \
+        .execute()
+
+    return planner_data, tasks_response.data
+
+
+async def fetch_schedule_records(user_id: int, start_date: str, end_date: str) -> tuple[list[dict], list[dict]]:
+    """
+    날짜 범위의 플래너 기록 / 배정된 작업 원본 (planner_data, tasks_data)
+    - 동기 클라이언트 호출은 스레드에서 실행 (이벤트 루프 블로킹 방지, 여러 도구 호출을 동시에 실행 가능)
+    """
+    return await asyncio.to_thread(_query_schedule_records, user_id, start_date, end_date)
+
+
+def format_schedule_records(start_date: str, end_date: str, planner_data: list[dict], tasks_data: list[dict]) -> str:
+    """조회 결과 -> 일정 검색 결과 Markdown"""
+    if not planner_data:
+        return f"[{start_date} ~ {end_date}] 기간 동안 완료된 플래너 기록이 없습니다."
+
+    # 데이터 조립 및 Markdown 포맷팅
+    result_md = f"## 📅 일정 검색 결과 ({start_date} ~ {end_date})\n\n"
+    result_md += "> **메타데이터 가이드**\n"
+    result_md += "> - **status**: `TODO`(미완료) / `DONE`(완료)\n"
+    result_md += "> - **focus_level**: 1~10 (작업 몰입도/피로도)\n"
+    result_md += "> - **is_urgent**: True/False (긴급 여부)\n"
+    result_md += "> - **focus_time_zone**: 사용자의 의도된 집중 시간대\n\n"
+    
+    for record in planner_data:
+        result_md += f"### 🗓️ {record['planner_date']} (기상: {record['start_arrange']}, 취침: {record['day_end_time']}, 집중시간대: {record['focus_time_zone']})\n"
+        
+        # 현재 레코드에 속한 작업들 필터링
+        matched_tasks = [t for t in tasks_data if t["record_id"] == record["id"]]
+        
+        if not matched_tasks:
+            result_md += "- 등록된 세부 작업이 없습니다.\n\n"
+            continue
+            
+        for task in matched_tasks:
+            # 상태 이모지
+            status_emoji = "✅" if task.get("status") == "DONE" else "⏳"
+            urgent_badge = "🚨 [긴급]" if task.get("is_urgent") else ""
+            focus_lvl = task.get("focus_level", "N/A")
+            
+            result_md += f"- {status_emoji} {urgent_badge} **{task.get('title', '제목 없음')}**\n"
+            result_md += f"  - 시간: {task.get('start_at', '미정')} ~ {task.get('end_at', '미정')}\n"
+            result_md += f"  - 몰입요구도: {focus_lvl}/10, 상태: {task.get('status', 'TODO')}\n"
+        
+        result_md += "\n"
+
+    return result_md
+
+
 @mcp.tool()
 @logfire.instrument("mcp.tool.search_schedules_by_date")
 async def search_schedules_by_date(
@@ -38,65 +113,10 @@ async def search_schedules_by_date(
     if not end_date:
         end_date = datetime.now().strftime("%Y-%m-%d")
 
-    client = get_supabase_client()
-    
     try:
-        # 1. planner_records 조회 (record_type이 'USER_FINAL'인 것만, 지정된 날짜 범위 내)
-        response = client.table("planner_records") \
-            .select("id, start_arrange, day_end_time, focus_time_zone, planner_date") \
-            .eq("user_id", user_id) \
-            .eq("record_type", "USER_FINAL") \
-            .gte("planner_date", start_date) \
-            .lte("planner_date", end_date) \
-            .execute()
-            
-        planner_data = response.data
-        if not planner_data:
-            return f"[{start_date} ~ {end_date}] 기간 동안 완료된 플래너 기록이 없습니다."
+        planner_data, tasks_data = await fetch_schedule_records(user_id, start_date, end_date)
+        return format_schedule_records(start_date, end_date, planner_data, tasks_data)
 
-        record_ids = [record["id"] for record in planner_data]
-        
-        # 2. planner_records의 id (record_id)를 사용하여 관련된 record_tasks를 조회
-        tasks_response = client.table("record_tasks") \
-            .select("*") \
-            .in_("record_id", record_ids) \
-            .eq("assignment_status", "ASSIGNED") \
-            .execute()
-            
-        tasks_data = tasks_response.data
-        
-        # 3. 데이터 조립 및 Markdown 포맷팅
-        result_md = f"## 📅 일정 검색 결과 ({start_date} ~ {end_date})\n\n"
-        result_md += "> **메타데이터 가이드**\n"
-        result_md += "> - **status**: `TODO`(미완료) / `DONE`(완료)\n"
-        result_md += "> - **focus_level**: 1~10 (작업 몰입도/피로도)\n"
-        result_md += "> - **is_urgent**: True/False (긴급 여부)\n"
-        result_md += "> - **focus_time_zone**: 사용자의 의도된 집중 시간대\n\n"
-        
-        for record in planner_data:
-            result_md += f"### 🗓️ {record['planner_date']} (기상: {record['start_arrange']}, 취침: {record['day_end_time']}, 집중시간대: {record['focus_time_zone']})\n"
-            
-            # 현재 레코드에 속한 작업들 필터링
-            matched_tasks = [t for t in tasks_data if t["record_id"] == record["id"]]
-            
-            if not matched_tasks:
-                result_md += "- 등록된 세부 작업이 없습니다.\n\n"
-                continue
-                
-            for task in matched_tasks:
-                # 상태 이모지
-                status_emoji = "✅" if task.get("status") == "DONE" else "⏳"
-                urgent_badge = "🚨 [긴급]" if task.get("is_urgent") else ""
-                focus_lvl = task.get("focus_level", "N/A")
-                
-                result_md += f"- {status_emoji} {urgent_badge} **{task.get('title', '제목 없음')}**\n"
-                result_md += f"  - 시간: {task.get('start_at', '미정')} ~ {task.get('end_at', '미정')}\n"
-                result_md += f"  - 몰입요구도: {focus_lvl}/10, 상태: {task.get('status', 'TODO')}\n"
-            
-            result_md += "\n"
-            
-        return result_md
-        
     except Exception as e:
         return f"데이터베이스 조회 중 오류가 발생했습니다: {str(e)}"
 
@@ -131,14 +151,14 @@ async def search_tasks_by_similarity(
 
         # Supabase RPC(Stored Procedure)를 호출하여 DB 내부(pgvector)에서 코사인 유사도 연산 및 JOIN 수행
         # 파라미터는 p_user_id, query_embedding, match_count
-        response = client.rpc(
+        response = await asyncio.to_thread(client.rpc(
             "match_record_tasks",
             {
                 "p_user_id": user_id,
                 "query_embedding": json.dumps(embedding_vector), # 벡터 리스트를 Text로 전송하여 DB에서 변환
                 "match_count": top_k
             }
-        ).execute()
+        ).execute)
         
         tasks_data = response.data
         if not tasks_data:
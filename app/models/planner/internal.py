@@ -1,5 +1,5 @@
 from typing import AsyncGenerator, Annotated, Literal
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from app.models.planner.request import TimeZone, ArrangementState, ScheduleItem
 from app.models.planner.weights import WeightParams
 from app.models.planner.response import AssignmentResult
@@ -59,4 +59,9 @@ class PlannerGraphState(BaseModel):
     replan_loops: int = 0
     warnings: list[str] = Field(default_factory=list)
     fillRate: float = 1.0
+    localSearchGain: float = 0.0  # 로컬 서치로 개선된 체인 점수 (0이면 개선 없음/미실행)
+
+    # 파생 데이터 메모이제이션 캐시 (utils/state_index.py 참고)
+    # model_copy 시 얕은 복사되어 이후 state들과 공유됨
+    _derived_cache: dict = PrivateAttr(default_factory=dict)
 
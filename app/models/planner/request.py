@@ -28,3 +28,16 @@ class ArrangementState(BaseModel):
     user: UserInfo
     startArrange: str
     schedules: list[ScheduleItem]
+
+
+class ReplanRequest(ArrangementState):
+    """
+    증분 재배치 요청: 수정된 전체 일정 + 이전 결과 식별자
+    - traceId가 있으면 해당 결과를, 없으면 (userId, dayPlanId)의 최신 결과를 기준으로 사용
+    - dayPlanId도 없으면 schedules의 최대 dayPlanId 사용
+    """
+    traceId: str | None = None
+    dayPlanId: int | None = None
+
+    def to_arrangement(self) -> ArrangementState:
+        return ArrangementState(user=self.user, startArrange=self.startArrange, schedules=self.schedules)
@@ -25,6 +25,17 @@ class PlannerErrorDetail(BaseModel):
     field: str
     reason: str
 
+class StageDiagnostics(BaseModel):
+    wallMs: float = Field(..., description="구간 Wall time(ms)")
+    llmAttempts: int = Field(0, description="LLM 호출 시도 횟수 (재시도 포함)")
+    retrySleepMs: float = Field(0.0, description="재시도 전 Backoff 대기 시간(ms)")
+    inputTokens: int = 0
+    outputTokens: int = 0
+
+class PlannerDiagnostics(BaseModel):
+    totalMs: float = Field(..., description="요청 수신부터 응답 생성까지(ms)")
+    stages: dict[str, StageDiagnostics] = Field(default_factory=dict, description="구간명(node1, node3 등) -> 측정값")
+
 class PlannerResponse(BaseModel):
     success: bool
     processTime: float
@@ -33,3 +44,6 @@ class PlannerResponse(BaseModel):
     errorCode: str | None = None
     details: list[PlannerErrorDetail] | None = None
     traceId: str | None = None
+    cached: bool = Field(False, description="응답 캐시에서 반환된 결과인지 여부")
+    degraded: bool = Field(False, description="LLM 분석 없이(Fallback / 부하 차단) 생성된 결과인지 여부")
+    diagnostics: PlannerDiagnostics | None = Field(None, description="구간별 지연 시간 (diagnostics=true 요청 시)")
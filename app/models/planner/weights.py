@@ -1,5 +1,9 @@
 from pydantic import BaseModel
 
+# 가중치 파라미터/점수 수식 버전 (planner_records.weights_version, 응답 캐시 키에 사용)
+# 기본값이나 수식이 바뀌면 올려서 이전 결과가 재사용되지 않도록 한다.
+WEIGHTS_VERSION = 1
+
 class WeightParams(BaseModel):
     w_focus: float = 1.0
     w_urgent: float = 5.0
@@ -0,0 +1,111 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+import logfire  # [Logfire] Import
+
+from app.core.config import settings
+from app.core.metrics import get_metrics_registry
+from app.llm.load_monitor import LLMLoadMonitor, get_llm_load_monitor
+
+_registry = get_metrics_registry()
+PLANNER_SHED_TOTAL = _registry.counter(
+    "planner_requests_shed_total", "Planner requests routed to the degraded path by admission control", ("reason",)
+)
+PLANNER_DEGRADED_TOTAL = _registry.counter(
+    "planner_requests_degraded_total", "Planner responses marked as degraded"
+)
+PLANNER_ADMITTED_GAUGE = _registry.gauge(
+    "planner_admitted_in_flight", "Planner requests running the full LLM pipeline"
+)
+
+# 플래너 LLM 호출이 일어나는 구간 (timed / stage_scope 이름), 주간 레포트 등 다른 호출은 판단에서 제외
+PLANNER_LLM_STAGES = frozenset({"node1", "node3", "node3_speculative", "replan"})
+
+
+class PlannerAdmissionController:
+    """
+    플래너 Admission Control (부하 차단)
+    - 전체 파이프라인(LLM 포함)을 실행 중인 요청 수, 플래너 LLM 진행 중 호출 수, 최근 플래너 LLM 지연(p90)을 기준으로 판단
+      (PLANNER_LLM_STAGES 구간의 호출만 집계, 주간 레포트 배치 등은 플래너 차단에 영향 없음)
+    - 포화 상태이면 LLM을 호출하지 않는 Degraded 경로로 보내 지연 시간 상한을 보장
+    - 지연 기준 차단 중에는 새 지연 표본이 쌓이지 않으므로 probe_interval_seconds마다 1건을 허용(Probe)하여 회복 여부 확인
+    """
+
+    def __init__(
+        self,
+        max_inflight: int,
+        shed_latency_seconds: float,
+        monitor: Optional[LLMLoadMonitor] = None,
+        probe_interval_seconds: float = 5.0
+    ):
+        self.max_inflight = max_inflight
+        self.shed_latency_seconds = shed_latency_seconds
+        self.probe_interval_seconds = probe_interval_seconds
+        self._monitor = monitor or get_llm_load_monitor()
+        self._admitted = 0
+        self._latency_shed_since: float | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def admitted(self) -> int:
+        return self._admitted
+
+    def _shed_reason(self) -> str | None:
+        if self.max_inflight > 0:
+            in_flight = self._monitor.in_flight_for(PLANNER_LLM_STAGES)
+            if self._admitted >= self.max_inflight or in_flight >= self.max_inflight:
+                return "inflight"
+        if self.shed_latency_seconds > 0:
+            latency = self._monitor.recent_latency(stages=PLANNER_LLM_STAGES)
+            if latency is None or latency <= self.shed_latency_seconds:
+                self._latency_shed_since = None
+                return None
+            now = time.monotonic()
+            if self._latency_shed_since is None or now - self._latency_shed_since < self.probe_interval_seconds:
+                if self._latency_shed_since is None:
+                    self._latency_shed_since = now
+                return "latency"
+            # Probe: 차단 구간마다 1건은 전체 파이프라인으로 보내 지연 표본 갱신
+            self._latency_shed_since = now
+            logfire.info("Planner Latency Probe Admitted", latency=latency)
+        return None
+
+    @contextmanager
+    def admit(self) -> Iterator[str | None]:
+        """
+        요청 허용 여부 판단
+        - 허용 시 None을 넘기고 블록이 끝날 때까지 슬롯을 점유
+        - 차단 시 사유("inflight" / "latency")를 넘기며 슬롯은 점유하지 않음
+        """
+        with self._lock:
+            reason = self._shed_reason()
+            if reason is None:
+                self._admitted += 1
+        if reason is not None:
+            PLANNER_SHED_TOTAL.inc(reason=reason)
+            logfire.warning("Planner Request Shed", reason=reason, admitted=self._admitted)
+            yield reason
+            return
+
+        PLANNER_ADMITTED_GAUGE.inc()
+        try:
+            yield None
+        finally:
+            with self._lock:
+                self._admitted -= 1
+            PLANNER_ADMITTED_GAUGE.dec()
+
+
+_planner_admission: Optional[PlannerAdmissionController] = None
+
+def get_planner_admission() -> PlannerAdmissionController:
+    global _planner_admission
+    if _planner_admission is None:
+        _planner_admission = PlannerAdmissionController(
+            max_inflight=settings.planner_max_inflight,
+            shed_latency_seconds=settings.planner_shed_latency_seconds,
+            probe_interval_seconds=settings.planner_shed_probe_seconds
+        )
+    return _planner_admission
@@ -7,9 +7,15 @@ from typing import AsyncGenerator, Annotated, Any, Optional, Literal
 
 from app.models.planner.internal import TaskFeature, PlannerGraphState
 from app.llm.gemini_client import get_gemini_client
-from app.llm.prompts.node1_prompt import NODE1_SYSTEM_PROMPT, format_tasks_for_llm
+from app.core.config import settings
+from app.core.payload_logging import diff_fields, log_payload
+from app.core.timing import record_llm_attempt, record_llm_fallback, record_retry_sleep
+from app.llm.prompts.node1_prompt import (
+    NODE1_SYSTEM_PROMPT, NODE1_COMPACT_SYSTEM_PROMPT, format_tasks_for_llm, format_tasks_compact
+)
 from app.models.planner.request import EstimatedTimeRange, ScheduleItem
 from app.models.planner.errors import map_exception_to_error_code, is_retryable_error
+from app.services.planner.utils.state_index import get_state_index
 
 logger = logging.getLogger(__name__)
 
@@ -25,10 +31,16 @@ async def node1_structure_analysis(state: PlannerGraphState) -> PlannerGraphStat
     
     # 1. 입력 준비
     client = get_gemini_client()
-    formatted_tasks = format_tasks_for_llm(flex_tasks)
+    # Compact 형식: 표 + 짧은 ID (응답의 taskId는 id_codec으로 복원)
+    if settings.planner_compact_prompts:
+        system_prompt = NODE1_COMPACT_SYSTEM_PROMPT
+        formatted_tasks, id_codec = format_tasks_compact(flex_tasks)
+    else:
+        system_prompt = NODE1_SYSTEM_PROMPT
+        formatted_tasks, id_codec = format_tasks_for_llm(flex_tasks), None
     
     # [Logfire] LLM 입력 데이터 로깅
-    logfire.info("Node 1 Input Data", input=formatted_tasks)
+    log_payload("Node 1 Input Data", lambda: formatted_tasks, lambda: {"tasks": len(flex_tasks)})
     
     # taskId와 original task를 매핑
     task_map = {t.taskId: t for t in flex_tasks}
@@ -45,16 +57,27 @@ async def node1_structure_analysis(state: PlannerGraphState) -> PlannerGraphStat
     for attempt in range(max_retries + 1):
         try:
             logger.info(f"Node 1 작업 구조 분석 시도 {attempt + 1}/{max_retries + 1}")
+            record_llm_attempt()
             
             # LLM 호출
             response_json = await client.generate(
-                system=NODE1_SYSTEM_PROMPT,
+                system=system_prompt,
                 user=formatted_tasks
             )
             
             # JSON 형식의 응답을 받았는지 확인
             if not isinstance(response_json, dict) or "tasks" not in response_json:
                 raise ValueError("Invalid JSON format: missing 'tasks' key")
+
+            # 짧은 ID -> 원래 taskId 복원 (목록에 없는 ID는 Hallucination으로 처리)
+            if id_codec is not None:
+                response_json = {
+                    **response_json,
+                    "tasks": [
+                        {**item, "taskId": id_codec.decode(item.get("taskId"))}
+                        for item in response_json.get("tasks", [])
+                    ]
+                }
                 
             # 응답된 데이터를 처리
             for item in response_json.get("tasks", []):
@@ -94,6 +117,7 @@ async def node1_structure_analysis(state: PlannerGraphState) -> PlannerGraphStat
                 delay = 1.0 * (2 ** attempt)  # 1s, 2s, 4s, 8s...
                 logger.info(f"Node 1: Retrying in {delay} seconds... (Attempt {attempt + 1}/{max_retries})")
                 await asyncio.sleep(delay)
+                record_retry_sleep(delay)
             
             continue
     
@@ -103,6 +127,13 @@ async def node1_structure_analysis(state: PlannerGraphState) -> PlannerGraphStat
     # 4번의 재시도가 전부 실패했을 경우
     if not parsed_result:
         logger.error(f"Node 1 failed after {max_retries + 1} attempts. Using Fallback.")
+        record_llm_fallback()
+        log_payload(
+            "Node 1 Fallback",
+            lambda: {"input": formatted_tasks, "error": validation_error},
+            lambda: {"tasks": len(flex_tasks), "attempts": max_retries + 1},
+            error=True
+        )
         # Fallback 로직 적용
         ## 자동으로 fallback feature를 생성
         for task in flex_tasks:
@@ -117,6 +148,7 @@ async def node1_structure_analysis(state: PlannerGraphState) -> PlannerGraphStat
 
     # LLM이 성공했을 경우
     llm_items = {item["taskId"]: item for item in parsed_result.get("tasks", [])}
+    schedule_by_id = get_state_index(state).schedule_by_id # 그룹 부모 조회용
     
     for task in flex_tasks:
         llm_item = llm_items.get(task.taskId)
@@ -150,7 +182,7 @@ async def node1_structure_analysis(state: PlannerGraphState) -> PlannerGraphStat
             
             # 그룹이 존재할 경우 groupLabel 채우기
             if task.parentScheduleId:
-                parent_task = next((t for t in state.request.schedules if t.taskId == task.parentScheduleId), None)
+                parent_task = schedule_by_id.get(task.parentScheduleId)
                 if parent_task:
                     feature.groupLabel = parent_task.title
             
@@ -167,8 +199,12 @@ async def node1_structure_analysis(state: PlannerGraphState) -> PlannerGraphStat
         "retry_node1": attempt # 재시도 횟수 업데이트
     })
     
-    # [Logfire] 결과 명시적 기록
-    logfire.info("Node 1 Result", result=result_state)
+    # [Logfire] 결과 명시적 기록 (바뀐 필드만)
+    log_payload(
+        "Node 1 Result",
+        lambda: diff_fields(state, result_state),
+        lambda: {"features": len(task_features), "retry_node1": attempt}
+    )
     
     return result_state
 
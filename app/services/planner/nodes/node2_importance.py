@@ -1,6 +1,9 @@
 import logfire  # [Logfire] Import
+from app.core.payload_logging import diff_fields, log_payload
 from app.models.planner.internal import PlannerGraphState, TaskFeature
 from app.models.planner.request import ScheduleItem
+from app.services.planner.utils.state_index import get_state_index
+from app.services.planner.utils.score_arrays import compute_importance_columns
 
 DURATION_PARAMS = {
     "MINUTE_UNDER_30": {"avg": 30, "plan": 30, "min": 30, "max": 40},
@@ -28,56 +31,48 @@ def node2_importance(state: PlannerGraphState) -> PlannerGraphState:
     new_task_features: dict[int, TaskFeature] = {} 
     
     # [Logfire] 입력 데이터 로깅
-    logfire.info("Node 2 Input Data", input={"taskFeatures": state.taskFeatures, "weights": state.weights})
+    log_payload(
+        "Node 2 Input Data",
+        lambda: {"taskFeatures": state.taskFeatures, "weights": state.weights},
+        lambda: {"taskFeatures": len(state.taskFeatures)}
+    )
     
-    flex_task_map: dict[int, ScheduleItem] = {t.taskId: t for t in state.flexTasks}
+    flex_task_map: dict[int, ScheduleItem] = get_state_index(state).flex_by_id
 
-    for task_id, feature in state.taskFeatures.items():
-        original_task: ScheduleItem | None = flex_task_map.get(task_id)
-        
-        # Node 1 결과 검정
-        if not original_task:
-            continue
-            
-        importance = 0.0
-        # 1. 중요도 계산
-        if feature.category == "ERROR":
-            # ERROR 카테고리는 최하위 중요도 부여 및 계산 건너뜀
-            importance = -1.0
-        else:
-            # importanceScore = (focusLevel * w_focus) + (isUrgent ? w_urgent : 0) + w_category.get(category, 0)
-            focus_level = original_task.focusLevel if original_task.focusLevel is not None else 5
-            is_urgent_score = weights.w_urgent if original_task.isUrgent else 0.0
-            category_score = weights.w_category.get(feature.category, 0.0)
-            importance = (focus_level * weights.w_focus) + is_urgent_score + category_score
-        
-        # 2. 예상 시간 파라미터
-        est_range = original_task.estimatedTimeRange
-        range_params = DURATION_PARAMS.get(est_range, DURATION_PARAMS["MINUTE_30_TO_60"])
-        
-        # 3. 피로도 계산
-        # fatigueCost = (durationPlanMin * alpha_duration) + (cognitiveLoad_value * beta_load)
-        cog_load_str = feature.cognitiveLoad or "MED" 
-        cog_val = COG_LOAD_VALUE.get(cog_load_str, 1) # Default to MED=1
-        
-        fatigue = (range_params["plan"] * weights.alpha_duration) + (cog_val * weights.beta_load)
+    # Node 1 결과 검정: 원본 Task가 있는 feature만 대상
+    target_features: list[TaskFeature] = [
+        f for task_id, f in state.taskFeatures.items() if task_id in flex_task_map
+    ]
+    target_tasks: list[ScheduleItem] = [flex_task_map[f.taskId] for f in target_features]
 
-        # 4. 피쳐 업데이트
-        updated_feature = feature.model_copy(update={
-            "importanceScore": importance,
-            "fatigueCost": fatigue,
-            "durationAvgMin": range_params["avg"],
-            "durationPlanMin": range_params["plan"],
-            "durationMinChunk": range_params["min"],
-            "durationMaxChunk": range_params["max"]
+    # 1~3. 중요도 / 예상 시간 파라미터 / 피로도를 컬럼 단위로 일괄 계산
+    # importanceScore = (focusLevel * w_focus) + (isUrgent ? w_urgent : 0) + w_category.get(category, 0)
+    #   ("ERROR" 카테고리는 최하위 중요도 -1.0 부여)
+    # fatigueCost = (durationPlanMin * alpha_duration) + (cognitiveLoad_value * beta_load)
+    columns = compute_importance_columns(
+        tasks=target_tasks,
+        categories=[f.category for f in target_features],
+        cognitive_loads=[f.cognitiveLoad for f in target_features],
+        weights=weights,
+        duration_params=DURATION_PARAMS,
+        cog_load_value=COG_LOAD_VALUE
+    )
+    column_values = {name: values.tolist() for name, values in columns.items()}
+
+    # 4. 피쳐 업데이트 (파이프라인 계약인 TaskFeature로 materialize)
+    for i, feature in enumerate(target_features):
+        new_task_features[feature.taskId] = feature.model_copy(update={
+            name: values[i] for name, values in column_values.items()
         })
-        
-        new_task_features[task_id] = updated_feature
 
     # state 업데이트
     result_state = state.model_copy(update={"taskFeatures": new_task_features})
     
-    # [Logfire] 결과 명시적 기록
-    logfire.info("Node 2 Result", result=result_state)
+    # [Logfire] 결과 명시적 기록 (바뀐 필드만)
+    log_payload(
+        "Node 2 Result",
+        lambda: diff_fields(state, result_state),
+        lambda: {"taskFeatures": len(new_task_features)}
+    )
     
     return result_state
@@ -6,8 +6,13 @@ from typing import AsyncGenerator, Annotated, Any
 
 from app.models.planner.internal import PlannerGraphState, ChainCandidate
 from app.llm.gemini_client import get_gemini_client
-from app.llm.prompts.node3_prompt import NODE3_SYSTEM_PROMPT, format_node3_input
-from app.services.planner.utils.session_utils import calculate_capacity
+from app.core.config import settings
+from app.core.payload_logging import diff_fields, log_payload
+from app.core.timing import record_llm_attempt, record_llm_fallback, record_retry_sleep
+from app.llm.prompts.node3_prompt import (
+    NODE3_SYSTEM_PROMPT, NODE3_COMPACT_SYSTEM_PROMPT, format_node3_input, format_node3_input_compact
+)
+from app.services.planner.utils.state_index import get_state_index
 from app.models.planner.errors import map_exception_to_error_code, is_retryable_error
 
 logger = logging.getLogger(__name__)
@@ -23,8 +28,8 @@ async def node3_chain_generator(state: PlannerGraphState) -> PlannerGraphState:
     free_sessions = state.freeSessions
     
     # 1. 입력 준비
-    # 시간대별 가용 용량 계산 (분 단위)
-    capacity = calculate_capacity(free_sessions)
+    # 시간대별 가용 용량 계산 (분 단위, state 인덱스에 캐시되어 Node 4와 공유)
+    capacity = get_state_index(state).capacity
     
     # Fixed Task 추출 (Prompt Context용)
     fixed_tasks_list = []
@@ -37,12 +42,19 @@ async def node3_chain_generator(state: PlannerGraphState) -> PlannerGraphState:
             })
 
     # LLM 입력 포맷팅
-    user_input_str = format_node3_input(
+    # Compact 형식: 표 + 짧은 ID (응답 큐의 taskId는 id_codec으로 복원)
+    format_kwargs = dict(
         task_features=task_features,
         fixed_schedules=fixed_tasks_list,
         capacity=capacity,
         focus_timezone=state.request.user.focusTimeZone
     )
+    if settings.planner_compact_prompts:
+        system_prompt = NODE3_COMPACT_SYSTEM_PROMPT
+        user_input_str, id_codec = format_node3_input_compact(**format_kwargs)
+    else:
+        system_prompt = NODE3_SYSTEM_PROMPT
+        user_input_str, id_codec = format_node3_input(**format_kwargs), None
     
     client = get_gemini_client()
     max_retries = 4
@@ -52,9 +64,10 @@ async def node3_chain_generator(state: PlannerGraphState) -> PlannerGraphState:
     for attempt in range(max_retries + 1):
         try:
             logger.info(f"Node 3 체인 생성 시도 {attempt + 1}/{max_retries + 1}")
+            record_llm_attempt()
             
             response_json = await client.generate(
-                system=NODE3_SYSTEM_PROMPT,
+                system=system_prompt,
                 user=user_input_str
             )
             
@@ -76,6 +89,10 @@ async def node3_chain_generator(state: PlannerGraphState) -> PlannerGraphState:
                 # 필수 필드 검사
                 if not chainId or not queues:
                     continue
+
+                # 짧은 ID -> 원래 taskId 복원 (목록에 없는 ID는 Hallucination으로 처리)
+                if id_codec is not None and isinstance(queues, dict):
+                    queues = {tz: [id_codec.decode(tid) for tid in q] for tz, q in queues.items()}
                 
                 # 큐 검증 (MORNING, etc 존재 여부)
                 # (간단히 pass, Pydantic validation에서 걸러짐 or default dict)
@@ -121,22 +138,41 @@ async def node3_chain_generator(state: PlannerGraphState) -> PlannerGraphState:
                 delay = 1.0 * (2 ** attempt)  # 1s, 2s, 4s, 8s...
                 logger.info(f"Node 3: Retrying in {delay} seconds... (Attempt {attempt + 1}/{max_retries})")
                 await asyncio.sleep(delay)
+                record_retry_sleep(delay)
 
             if attempt == max_retries:
                 logger.error("Node 3 Max retries reached. Using Fallback.")
     
     # 3. 실패 시 Fallback 전략
     if not candidates_result:
+        record_llm_fallback()
+        log_payload(
+            "Node 3 Fallback",
+            lambda: {"input": user_input_str},
+            lambda: {"tasks": len(state.taskFeatures)},
+            error=True
+        )
         candidates_result = [_create_fallback_chain(state)]
-    
+        # Node 1 Fallback과 마찬가지로 Degraded 결과로 표시 (응답 캐시 제외)
+        state_update = {
+            "retry_node3": max_retries + 1,
+            "warnings": state.warnings + ["Node 3 Fallback triggered: using distributed fallback chain"]
+        }
+    else:
+        state_update = {"retry_node3": state.retry_node3}
+
     # 4. State 업데이트
     result_state = state.model_copy(update={
         "chainCandidates": candidates_result,
-        "retry_node3": state.retry_node3 # 재시도 횟수 등은 필요 시 증가
+        **state_update
     })
     
-    # [Logfire] 결과 명시적 기록
-    logfire.info("Node 3 Result", result=result_state)
+    # [Logfire] 결과 명시적 기록 (바뀐 필드만)
+    log_payload(
+        "Node 3 Result",
+        lambda: diff_fields(state, result_state),
+        lambda: {"candidates": len(candidates_result), "chainIds": [c.chainId for c in candidates_result]}
+    )
     
     return result_state
 
@@ -154,7 +190,7 @@ def _create_fallback_chain(state: PlannerGraphState) -> ChainCandidate:
     )
     
     # 2. Capacity 및 Limit 계산 (120%)
-    capacity = calculate_capacity(state.freeSessions)
+    capacity = get_state_index(state).capacity
     limits = {tz: cap * 1.2 for tz, cap in capacity.items()}
     usage = {tz: 0 for tz in capacity} # 현재 사용량 상태
     
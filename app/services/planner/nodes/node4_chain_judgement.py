@@ -1,16 +1,26 @@
 from typing import AsyncGenerator, Annotated, Set, Tuple
 from collections import defaultdict
 import math
+import numpy as np
 import logfire  # [Logfire] Import
 
+from app.core.payload_logging import diff_fields, log_payload
 from app.models.planner.internal import PlannerGraphState, ChainCandidate, TaskFeature
-from app.services.planner.utils.session_utils import calculate_capacity
+from app.services.planner.utils.state_index import get_state_index
+from app.services.planner.utils.score_arrays import build_membership_matrix, score_candidates
 
-def apply_closure(chain: ChainCandidate, task_features: dict[int, TaskFeature]) -> ChainCandidate:
+def apply_closure(
+    chain: ChainCandidate,
+    task_features: dict[int, TaskFeature],
+    group_orders: dict[str, dict[int, int]] | None = None
+) -> ChainCandidate:
     """
     그룹 작업의 순서(Closure)를 강제합니다.
     규칙: 그룹 내 순서 N이 포함되려면 1..N-1도 반드시 포함되어야 함.
     위반 시: 위반된 작업(N)을 제거(Excluded 처리).
+
+    group_orders: groupId -> {orderInGroup: taskId} (PlannerStateIndex.group_orders)
+                  없으면 task_features를 한 번 순회하여 생성
     """
     # 1. 현재 체인에 포함된 작업 ID 집합
     included_ids = set()
@@ -24,36 +34,40 @@ def apply_closure(chain: ChainCandidate, task_features: dict[int, TaskFeature])
         feature = task_features.get(tid)
         if feature and feature.groupId and feature.orderInGroup is not None:
             group_map[feature.groupId].append((tid, feature.orderInGroup))
+
+    if not group_map:
+        return chain
+
+    # 해당 그룹의 전체 Order 집합 (그룹마다 전체 feature를 스캔하지 않도록 1회만 구성)
+    if group_orders is None:
+        group_orders = defaultdict(dict)
+        for f in task_features.values():
+            if f.groupId and f.orderInGroup is not None:
+                group_orders[f.groupId][f.orderInGroup] = f.taskId
             
     # 3. 위반 작업 식별
     to_remove = set()
     
     for group_id, items in group_map.items():
-        # 순서대로 정렬
-        items.sort(key=lambda x: x[1])
         # "그룹 내 task들 중, 현재 chain에 포함된 것들의 orderSet을 확인했을 때,
         #  만약 order K가 포함되어 있다면, 1 ~ K-1에 해당하는 모든 task도 포함되어 있어야 한다."
-        # 해당 그룹의 전체 Order 집합 파악
-        all_group_tasks = [
-            f for f in task_features.values() 
-            if f.groupId == group_id and f.orderInGroup is not None
-        ]
-        all_group_orders = {f.orderInGroup: f.taskId for f in all_group_tasks}
+        all_group_orders = group_orders.get(group_id, {})
         
         # 현재 체인에 포함된 order 집합
         current_included_orders = {order for _, order in items}
+
+        # 그룹에 존재하지만(all_group_orders) 체인에는 빠진 가장 작은 순서(1 이상)
+        # -> 이보다 큰 순서의 작업은 모두 위반
+        missing_orders = [
+            order for order in all_group_orders
+            if order >= 1 and order not in current_included_orders
+        ]
+        if not missing_orders:
+            continue
+        first_missing = min(missing_orders)
         
         for tid, order in items:
-            # 1부터 order-1까지의 모든 순서가 포함되어 있는지 확인
-            is_valid = True
-            for prev_order in range(1, order):
-                # 만약 prev_order에 해당하는 작업이 존재하는데(all_group_orders에 있음)
-                # 현재 체인에는 없다면(current_included_orders에 없음) -> 위반
-                if prev_order in all_group_orders and prev_order not in current_included_orders:
-                    is_valid = False
-                    break
-            
-            if not is_valid:
+            if order > first_missing:
                 to_remove.add(tid)
                 
     # 4. 위반 작업 제거하여 새 체인 반환
@@ -177,83 +191,68 @@ def calculate_chain_score(
 @logfire.instrument  # [Logfire] Instrument
 def node4_chain_judgement(state: PlannerGraphState) -> PlannerGraphState:
     # [Logfire] Input Logging
-    logfire.info("Node 4 Input Data", input={
-        "candidates": state.chainCandidates,
-        "taskFeatures": state.taskFeatures,
-        "weights": state.weights,
-        "focusTimeZone": state.request.user.focusTimeZone
-    })
+    log_payload(
+        "Node 4 Input Data",
+        lambda: {
+            "candidates": state.chainCandidates,
+            "taskFeatures": state.taskFeatures,
+            "weights": state.weights,
+            "focusTimeZone": state.request.user.focusTimeZone
+        },
+        lambda: {"candidates": len(state.chainCandidates), "taskFeatures": len(state.taskFeatures)}
+    )
     
     candidates = state.chainCandidates
     task_features = state.taskFeatures
     weights = state.weights
     start_arrange = state.request.startArrange
     
-    # Capacity 계산
-    capacity = calculate_capacity(state.freeSessions)
-    
-    best_chain = None
-    best_score = float("-inf")
-    best_details = {}
+    # Capacity 및 Closure 결과는 state 인덱스에서 재사용 (후보별 1회만 계산)
+    index = get_state_index(state)
+    capacity = index.capacity
     
     # 만약 후보가 없다면? (Node3 실패 등) -> Fallback 처리 또는 빈 상태
     if not candidates:
         # 후보가 아예 없으면 selectedChainId=None으로 남김 (Node5에서 처리하거나 에러)
         return state
-        
-    for chain in candidates:
-        # 1. Closure 강제
-        closed_chain = apply_closure(chain, task_features)
-        
-        # 2. 점수 계산
-        score, details = calculate_chain_score(
-            closed_chain,
-            task_features,
-            capacity,
-            weights,
-            state.request.user.focusTimeZone
-        )
-        
-        if score > best_score:
-            best_score = score
-            best_chain = closed_chain
-            best_details = details
+
+    # 모든 후보에 대해 closure를 적용한 결과로 candidates를 교체한다.
+    # (선택 안 된 후보들도 closure 적용된 상태가 논리적으로 맞음)
+    # 선택된 체인이 수정되었을 수 있으므로(Closure) Node5가 수정된 버전을 찾을 수 있도록
+    # 동일한 chainId로 덮어쓴다.
+    final_candidates = [index.closed_chain(chain) for chain in candidates]
+
+    # 점수 계산: 모든 후보를 멤버십 행렬로 변환하여 한 번에 계산 (배열 기반)
+    # (calculate_chain_score와 동일한 수식, 후보가 많아져도 행렬 연산 몇 번으로 처리)
+    membership = build_membership_matrix(final_candidates, index.feature_arrays)
+    scores, details = score_candidates(
+        membership,
+        index.feature_arrays,
+        capacity,
+        weights,
+        state.request.user.focusTimeZone
+    )
+
+    # 동점이면 먼저 나온 후보 우선 (기존 '>' 비교와 동일)
+    best_idx = int(np.argmax(scores))
+    best_chain = final_candidates[best_idx]
+    best_score = float(scores[best_idx])
+    best_details = {name: float(values[best_idx]) for name, values in details.items()}
             
     # 로그나 디버깅 정보 저장 가능
     # state.internal_logs["best_chain_score"] = best_score
     # state.internal_logs["best_chain_details"] = best_details
     
-    # 선택된 체인이 수정되었을 수 있으므로(Closure), candidates 목록 자체를 업데이트할지,
-    # 아니면 selectedChainId만 저장하고 Node5에서 재참조할지 결정해야 함.
-    # 구조상 selectedChainId는 string ID임. 
-    # 따라서, 만약 chain이 수정되었다면(closed_chain), 이를 candidates 리스트에 업데이트해줘야 Node5가 수정된 버전을 찾을 수 있음.
-    
-    # 수정된 체인을 candidates에 반영 (ID가 같다면 덮어쓰기 or 새 ID?)
-    # ID가 같으면 덮어쓰는게 안전함.
-    
-    updated_candidates = []
-    # 선택된 체인만 업데이트해서 넣거나, 전체를 다시 넣거나.
-    # 여기서는 선택된 Best Chain을 확실히 리스트에 포함시킴.
-    
-    # 주의: best_chain이 candidates에 있는 원본 객체와 다를 수 있음(new object).
-    # 따라서 candidates 리스트를 교체하거나 업데이트해야 함.
-    
-    # 전략: 모든 후보에 대해 closure를 적용한 결과로 candidates를 교체한다.
-    # (선택 안 된 후보들도 closure 적용된 상태가 논리적으로 맞음)
-    
-    final_candidates = []
-    for chain in candidates:
-        final_candidates.append(apply_closure(chain, task_features))
-        
-    # 점수 계산은 이미 위에서 수행했음. (순서가 약간 비효율적일 수 있으나 명확성을 위해)
-    # 최적화를 위해 위 루프에서 final_candidates를 만들면서 점수 계산
-    
     result_state = state.model_copy(update={
         "chainCandidates": final_candidates,
         "selectedChainId": best_chain.chainId if best_chain else None
     })
     
     # [Logfire] Result Logging
-    logfire.info("Node 4 Result", result=result_state)
+    log_payload(
+        "Node 4 Result",
+        lambda: diff_fields(state, result_state),
+        lambda: {"selectedChainId": result_state.selectedChainId, "score": best_score}
+    )
     
     return result_state
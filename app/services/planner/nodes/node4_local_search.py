@@ -0,0 +1,359 @@
+import math
+import random
+import time
+import logging
+import zlib
+import logfire  # [Logfire] Import
+
+from app.core.config import settings
+from app.models.planner.internal import PlannerGraphState, ChainCandidate, TaskFeature
+from app.services.planner.nodes.node4_chain_judgement import apply_closure, calculate_chain_score, overflow_penalty
+from app.services.planner.utils.state_index import get_state_index
+
+logger = logging.getLogger(__name__)
+
+ALL_ZONES = ["MORNING", "AFTERNOON", "EVENING", "NIGHT"]
+
+# 예산 확인 주기 (매 반복마다 CPU 시간을 조회하지 않도록)
+BUDGET_CHECK_INTERVAL = 32
+
+
+def local_search_seed(state: PlannerGraphState) -> int:
+    """
+    요청별 고정 탐색 시드 (같은 작업 구성이면 같은 난수열)
+    - userId 대신 작업 ID로 계산: 가명 처리된 트래픽 캡처를 재생해도 같은 시드
+    """
+    return zlib.crc32(",".join(str(task.taskId) for task in state.flexTasks).encode())
+
+
+@logfire.instrument  # [Logfire] Instrument
+def node4_local_search(
+    state: PlannerGraphState,
+    budget_ms: int | None = None,
+    seed: int | None = None
+) -> PlannerGraphState:
+    """
+    Node 4.5: 선택된 체인 로컬 서치 최적화 (선택 단계)
+    - Node 4가 고른 체인을 시작점으로 시뮬레이티드 어닐링(Simulated Annealing) 수행
+    - 이동(시간대 변경) / 교환(Swap) / 포함 / 제외 4가지 Move를 증분(Delta) 점수로 평가
+    - 그룹 Closure(1..N-1 포함) 및 그룹 내 시간대 순서를 깨는 Move는 시도하지 않음
+    - CPU 예산(ms)을 넘으면 즉시 중단하고, 개선된 경우에만 새 체인을 선택
+    - 동기 CPU 작업이므로 이벤트 루프에서는 워커 스레드로 실행 (pipeline 참고)
+    """
+    budget_ms = settings.planner_local_search_ms if budget_ms is None else budget_ms
+    if budget_ms <= 0 or not state.selectedChainId:
+        return state
+
+    selected_chain = next((c for c in state.chainCandidates if c.chainId == state.selectedChainId), None)
+    if not selected_chain or not state.taskFeatures:
+        return state
+
+    index = get_state_index(state)
+    capacity = index.capacity
+    weights = state.weights
+    focus_tz = state.request.user.focusTimeZone
+
+    initial_score, _ = calculate_chain_score(
+        selected_chain, state.taskFeatures, capacity, weights, focus_tz
+    )
+
+    search = _ChainLocalSearch(
+        chain=selected_chain,
+        task_features=state.taskFeatures,
+        group_members=index.group_members,
+        capacity=capacity,
+        weights=weights,
+        focus_timezone=focus_tz,
+        rng=random.Random(local_search_seed(state) if seed is None else seed)
+    )
+    stats = search.run(budget_ms)
+
+    optimized = apply_closure(search.best_chain(), state.taskFeatures, group_orders=index.group_orders)
+    final_score, _ = calculate_chain_score(optimized, state.taskFeatures, capacity, weights, focus_tz)
+    gain = final_score - initial_score
+
+    logfire.info(
+        "Node 4 Local Search Result",
+        chain_id=selected_chain.chainId,
+        initial_score=initial_score,
+        final_score=final_score,
+        gain=gain,
+        **stats
+    )
+
+    if gain <= 1e-9:
+        return state
+
+    return state.model_copy(update={
+        "chainCandidates": state.chainCandidates + [optimized],
+        "selectedChainId": optimized.chainId,
+        "localSearchGain": gain
+    })
+
+
+class _ChainLocalSearch:
+    """
+    체인 점수(calculate_chain_score)의 증분 계산 상태
+    - 시간대별 소요시간/피로도 합, 포함 작업 중요도 합, 집중 시간대 중요도 합만 유지
+    - Move 하나의 점수 변화는 영향받는 시간대(최대 2개)만 다시 계산 (O(1))
+    """
+
+    def __init__(
+        self,
+        chain: ChainCandidate,
+        task_features: dict[int, TaskFeature],
+        group_members: dict[str, list[tuple[int, int]]],
+        capacity: dict[str, int],
+        weights,  # WeightParams
+        focus_timezone: str,
+        rng: random.Random
+    ):
+        self.chain = chain
+        self.features = task_features
+        self.group_members = group_members
+        self.weights = weights
+        self.rng = rng
+        self.zones = list(ALL_ZONES)
+        self.cap = {z: capacity.get(z, 0) for z in self.zones}
+        self.focus = focus_timezone
+        # capacity가 0인 시간대로는 옮기지 않음 (Node 3 배치 규칙과 동일)
+        self.open_zones = [z for z in self.zones if self.cap[z] > 0]
+
+        # taskId -> 시간대 (None이면 제외) - 중복 등장 시 첫 번째 시간대 기준
+        self.zone_of: dict[int, str | None] = {tid: None for tid in task_features}
+        for z, ids in chain.timeZoneQueues.items():
+            for tid in ids:
+                if tid in self.zone_of and self.zone_of[tid] is None:
+                    self.zone_of[tid] = z
+
+        self.task_ids = list(task_features.keys())
+        self.total_importance = sum(f.importanceScore for f in task_features.values())
+        self.dur = {z: 0.0 for z in self.zones}
+        self.fat = {z: 0.0 for z in self.zones}
+        self.included = 0.0
+        self.focus_sum = 0.0
+        for tid, z in self.zone_of.items():
+            if z is not None:
+                self._add(tid, z, 1)
+
+        self.score = self._total_score()
+        self.best_score = self.score
+        self.best_zone_of = dict(self.zone_of)
+
+    # --- 증분 점수 계산 ---
+
+    def _add(self, tid: int, zone: str, sign: int) -> None:
+        f = self.features[tid]
+        if zone not in self.dur:
+            return
+        self.dur[zone] += sign * f.durationAvgMin
+        self.fat[zone] += sign * f.fatigueCost
+        self.included += sign * f.importanceScore
+        if zone == self.focus:
+            self.focus_sum += sign * f.importanceScore
+
+    def _zone_penalty(self, zone: str, dur: float, fat: float) -> float:
+        cap = self.cap[zone]
+        penalty = overflow_penalty(max(0, dur - cap), cap, self.weights.w_overflow)
+        if fat > cap:
+            penalty += (fat - cap) * self.weights.w_fatigue_risk
+        return penalty
+
+    def _total_score(self) -> float:
+        w = self.weights
+        return (
+            w.w_included * self.included
+            - w.w_excluded * (self.total_importance - self.included)
+            - sum(self._zone_penalty(z, self.dur[z], self.fat[z]) for z in self.zones)
+            + w.w_focus_align * self.focus_sum
+        )
+
+    def _delta(self, changes: list[tuple[int, str | None, str | None]]) -> float:
+        """changes: [(taskId, from_zone, to_zone)] 적용 시 점수 변화량 (상태는 변경하지 않음)"""
+        w = self.weights
+        d_dur: dict[str, float] = {}
+        d_fat: dict[str, float] = {}
+        d_included = 0.0
+        d_focus = 0.0
+        for tid, src, dst in changes:
+            f = self.features[tid]
+            if src is not None:
+                d_dur[src] = d_dur.get(src, 0.0) - f.durationAvgMin
+                d_fat[src] = d_fat.get(src, 0.0) - f.fatigueCost
+                d_included -= f.importanceScore
+                if src == self.focus:
+                    d_focus -= f.importanceScore
+            if dst is not None:
+                d_dur[dst] = d_dur.get(dst, 0.0) + f.durationAvgMin
+                d_fat[dst] = d_fat.get(dst, 0.0) + f.fatigueCost
+                d_included += f.importanceScore
+                if dst == self.focus:
+                    d_focus += f.importanceScore
+
+        delta = (w.w_included + w.w_excluded) * d_included + w.w_focus_align * d_focus
+        for z in d_dur:
+            before = self._zone_penalty(z, self.dur[z], self.fat[z])
+            after = self._zone_penalty(z, self.dur[z] + d_dur[z], self.fat[z] + d_fat[z])
+            delta -= after - before
+        return delta
+
+    def _apply(self, changes: list[tuple[int, str | None, str | None]], delta: float) -> None:
+        for tid, src, dst in changes:
+            if src is not None:
+                self._add(tid, src, -1)
+            if dst is not None:
+                self._add(tid, dst, 1)
+            self.zone_of[tid] = dst
+        self.score += delta
+
+    # --- 제약 조건 (Closure / 그룹 내 시간대 순서) ---
+
+    def _group_ok(self, tid: int, new_zone: str | None) -> bool:
+        f = self.features[tid]
+        if not f.groupId or f.orderInGroup is None:
+            return True
+        rank = {z: i for i, z in enumerate(self.zones)}
+        for order, other in self.group_members.get(f.groupId, []):
+            if other == tid:
+                continue
+            other_zone = self.zone_of.get(other)
+            if new_zone is None:
+                # 제외: 뒤 순서 작업이 포함되어 있으면 Closure 위반
+                if order > f.orderInGroup and other_zone is not None:
+                    return False
+                continue
+            if order < f.orderInGroup:
+                # 앞 순서 작업은 포함되어 있어야 하며, 같거나 이른 시간대여야 함
+                if other_zone is None or rank[other_zone] > rank[new_zone]:
+                    return False
+            elif order > f.orderInGroup and other_zone is not None:
+                if rank[other_zone] < rank[new_zone]:
+                    return False
+        return True
+
+    # --- Move 생성 ---
+
+    def _propose(self) -> list[tuple[int, str | None, str | None]] | None:
+        rng = self.rng
+        tid = rng.choice(self.task_ids)
+        zone = self.zone_of[tid]
+        kind = rng.random()
+
+        if zone is None:
+            # 포함 (ERROR 카테고리는 배치 대상 아님)
+            if not self.open_zones or self.features[tid].category == "ERROR":
+                return None
+            dst = rng.choice(self.open_zones)
+            return [(tid, None, dst)] if self._group_ok(tid, dst) else None
+
+        if kind < 0.5:
+            # 시간대 이동
+            choices = [z for z in self.open_zones if z != zone]
+            if not choices:
+                return None
+            dst = rng.choice(choices)
+            return [(tid, zone, dst)] if self._group_ok(tid, dst) else None
+
+        if kind < 0.85:
+            # 교환 (서로 다른 시간대의 포함 작업)
+            other = rng.choice(self.task_ids)
+            other_zone = self.zone_of[other]
+            if other == tid or other_zone is None or other_zone == zone:
+                return None
+            # 교환 후 상태 기준으로 그룹 제약 확인
+            self.zone_of[tid], self.zone_of[other] = other_zone, zone
+            ok = self._group_ok(tid, other_zone) and self._group_ok(other, zone)
+            self.zone_of[tid], self.zone_of[other] = zone, other_zone
+            return [(tid, zone, other_zone), (other, other_zone, zone)] if ok else None
+
+        # 제외
+        return [(tid, zone, None)] if self._group_ok(tid, None) else None
+
+    # --- Simulated Annealing ---
+
+    def run(self, budget_ms: int) -> dict[str, float]:
+        # 이 스레드의 CPU 시간만 측정 (process_time은 to_thread 워커 등 다른 스레드의 CPU 시간까지 포함)
+        cpu_start = time.thread_time()
+        deadline = cpu_start + budget_ms / 1000.0
+
+        # 초기 온도: 평균 |중요도| 수준의 악화는 초반에 어느 정도 허용
+        mean_importance = (
+            sum(abs(self.features[t].importanceScore) for t in self.task_ids) / len(self.task_ids)
+        )
+        t0 = max(mean_importance * 0.5, 1e-3)
+        temperature = t0
+
+        iterations = 0
+        accepted = 0
+        while True:
+            if iterations % BUDGET_CHECK_INTERVAL == 0:
+                now = time.thread_time()
+                if now >= deadline:
+                    break
+                # 예산 소진 비율에 따라 선형 냉각
+                progress = (now - cpu_start) / (deadline - cpu_start)
+                temperature = max(t0 * (1.0 - progress), 1e-6)
+            iterations += 1
+
+            changes = self._propose()
+            if changes is None:
+                continue
+            delta = self._delta(changes)
+            if delta >= 0 or self.rng.random() < math.exp(delta / temperature):
+                self._apply(changes, delta)
+                accepted += 1
+                if self.score > self.best_score + 1e-9:
+                    self.best_score = self.score
+                    self.best_zone_of = dict(self.zone_of)
+
+        return {
+            "iterations": iterations,
+            "accepted": accepted,
+            "cpu_ms": round((time.thread_time() - cpu_start) * 1000, 2),
+        }
+
+    def best_chain(self) -> ChainCandidate:
+        """
+        최적 배치를 체인으로 변환
+        - 기존 큐 순서를 최대한 유지하고, 새로 들어온 작업은 중요도 내림차순으로 뒤에 추가
+        - 같은 큐 안의 그룹 작업은 orderInGroup 순서로 재정렬
+        """
+        queues: dict[str, list[int]] = {z: [] for z in self.chain.timeZoneQueues}
+        placed: set[int] = set()
+        for z, ids in self.chain.timeZoneQueues.items():
+            for tid in ids:
+                if tid not in placed and self.best_zone_of.get(tid) == z:
+                    queues[z].append(tid)
+                    placed.add(tid)
+
+        newcomers = sorted(
+            (tid for tid, z in self.best_zone_of.items() if z is not None and tid not in placed),
+            key=lambda tid: -self.features[tid].importanceScore
+        )
+        for tid in newcomers:
+            queues.setdefault(self.best_zone_of[tid], []).append(tid)
+
+        for z, ids in queues.items():
+            queues[z] = _sort_groups_in_queue(ids, self.features)
+
+        return ChainCandidate(
+            chainId=f"{self.chain.chainId}_ls",
+            timeZoneQueues=queues,
+            rationaleTags=self.chain.rationaleTags + ["local_search"]
+        )
+
+
+def _sort_groups_in_queue(ids: list[int], task_features: dict[int, TaskFeature]) -> list[int]:
+    """큐 내 그룹 작업들이 차지한 자리는 유지하고, 그 자리 안에서 orderInGroup 순으로 재배치"""
+    slots: dict[str, list[int]] = {}
+    for pos, tid in enumerate(ids):
+        f = task_features[tid]
+        if f.groupId and f.orderInGroup is not None:
+            slots.setdefault(f.groupId, []).append(pos)
+
+    result = list(ids)
+    for positions in slots.values():
+        members = sorted((ids[p] for p in positions), key=lambda t: task_features[t].orderInGroup)
+        for pos, tid in zip(positions, members):
+            result[pos] = tid
+    return result
@@ -1,8 +1,10 @@
 import logfire  # [Logfire] Import
 import math
+from collections import deque
 from typing import AsyncGenerator, Annotated, Tuple, Set
 from pydantic import BaseModel
 
+from app.core.payload_logging import log_payload
 from app.models.planner.internal import PlannerGraphState, FreeSession, TaskFeature, ChainCandidate
 from app.models.planner.response import AssignmentResult, SubTaskResult
 from app.services.planner.utils.time_utils import hhmm_to_minutes, minutes_to_hhmm
@@ -21,11 +23,15 @@ def node5_time_assignment(state: PlannerGraphState) -> PlannerGraphState:
     - Gap 기반 휴식 처리
     """
     # [Logfire] Input Logging
-    logfire.info("Node 5 Input Data", input={
-        "selectedChainId": state.selectedChainId,
-        "chainCandidates": state.chainCandidates,
-        "session_count": len(state.freeSessions)
-    })
+    log_payload(
+        "Node 5 Input Data",
+        lambda: {
+            "selectedChainId": state.selectedChainId,
+            "chainCandidates": state.chainCandidates,
+            "session_count": len(state.freeSessions)
+        },
+        lambda: {"selectedChainId": state.selectedChainId, "session_count": len(state.freeSessions)}
+    )
 
     # 1. 입력 데이터 준비
     selected_chain_id = state.selectedChainId
@@ -39,29 +45,107 @@ def node5_time_assignment(state: PlannerGraphState) -> PlannerGraphState:
     if not selected_chain:
         return state
 
-    # 세션 정렬: 시간 순서대로 (startAt 오름차순)
-    sessions = sorted(state.freeSessions, key=lambda s: s.start)
-    
     task_features = state.taskFeatures
+
+    # 2. 배정 엔진 실행 (세션 정렬 / 큐 복사는 엔진 내부에서 수행)
+    results, assigned_task_ids = assign_tasks_to_sessions(
+        sessions=state.freeSessions,
+        time_zone_queues=selected_chain.timeZoneQueues,
+        task_features=task_features,
+        user_id=user_id
+    )
+
+    # 3. 미배정 작업 처리 (Tail Drop) -> EXCLUDED
+    # pending_remainder가 남아있다면? -> 이것도 결국 배정 못 한 것.
+    # 하지만 이미 앞부분은 배정되었으므로 'ASSIGNED' 상태는 유지하되, 뒷부분은 잘림.
+    # (사용자에게 "시간 부족으로 일부만 배정됨"을 알릴 방법이 현재 스펙엔 없음. 그냥 둔다.)
+    
+    # 아예 배정 안 된 작업들 처리
+    all_flex_ids = task_features.keys()
+    
+    for tid in all_flex_ids:
+        if tid not in assigned_task_ids:
+            feat = task_features[tid]
+            results.append(AssignmentResult(
+                userId=user_id,
+                taskId=feat.taskId,
+                dayPlanId=feat.dayPlanId,
+                title=feat.title,
+                type="FLEX",
+                assignedBy="AI",
+                assignmentStatus="EXCLUDED",
+                startAt=None,
+                endAt=None,
+                children=None
+            ))
+            
+    # Soft Rollback (그룹 일관성) - V1에서는 생략 가능하지만, 안전장치로 구현 권장
+    # 구현 복잡도상 V1에서는 "배정된 건 유지" 정책으로 가되 
+    # 차후 고도화 시 추가
+
+    # 4. 결과 반환
+    # 내부 상태 업데이트
+    state.finalResults = results
+    
+    # 가동률(Fill Rate) 계산: 배정된 작업 수 / 전체 FLEX 수
+    if len(all_flex_ids) > 0:
+        state.fillRate = len(assigned_task_ids) / len(all_flex_ids)
+    else:
+        state.fillRate = 1.0
+        
+    # [Logfire] 결과 명시적 기록
+    log_payload(
+        "Node 5 Result",
+        lambda: results,
+        lambda: {"final_results": len(results), "fill_rate": state.fillRate}
+    )
+    
+    return state
+
+
+def assign_tasks_to_sessions(
+    sessions: list[FreeSession],
+    time_zone_queues: dict[str, list[int]],
+    task_features: dict[int, TaskFeature],
+    user_id: int
+) -> Tuple[list[AssignmentResult], Set[int]]:
+    """
+    Node 5 배정 엔진
+    - 세션을 시간순으로 채우며 시간대별 큐(deque)에서 작업을 꺼내 배정
+    - 부모 결과는 taskId -> AssignmentResult 인덱스로 O(1) 조회
+    - 마지막에 한 번의 순회로 단일 자식(Single Child)을 평탄화하여 반환
+    - 배치/여러 날(Multi-day) 배정에서도 재사용할 수 있도록 state와 독립적으로 동작
+
+    Returns: (배정된 결과 리스트 - EXCLUDED 제외, 배정된 taskId 집합)
+    """
+    # 세션 정렬: 시간 순서대로 (startAt 오름차순)
+    sorted_sessions = sorted(sessions, key=lambda s: s.start)
     
     # 작업 큐 준비 (Node 3가 제안한 시간대별 작업 목록)
-    # 복사해서 사용 (pop으로 소모할 것이므로)
-    queues: dict[str, list[int]] = {
-        tz: list(ids) for tz, ids in selected_chain.timeZoneQueues.items()
+    # 복사해서 사용 (popleft로 소모할 것이므로)
+    queues: dict[str, deque[int]] = {
+        tz: deque(ids) for tz, ids in time_zone_queues.items()
     }
     
     # 결과 저장소
     results: list[AssignmentResult] = []
+    # taskId -> 최초로 생성된 결과 (child 추가 시 부모 조회용)
+    result_by_id: dict[int, AssignmentResult] = {}
     assigned_task_ids: Set[int] = set()
 
+    def _emit(result: AssignmentResult) -> None:
+        results.append(result)
+        result_by_id.setdefault(result.taskId, result)
+
     # --- 배정 로직 시작 ---
     
     # 자투리(Remainder) 보관함: (parent_task_id, sequence_start_index)
     # Node 5 V1 정책: 자투리는 무조건 다음 가용 세션의 최우선 순위로 들어간다.
     pending_remainder_id: int | None = None
+    pending_remainder_duration: int = 0
     pending_sequence: int = 1
 
-    for session in sessions:
+    for session in sorted_sessions:
         # 세션의 가용 시간 범위 (분 단위)
         # [V2 Logic] Start/End 10분 단위 정렬 Guarantee
         # 예: 09:03 -> 09:10으로 올림 (math.ceil)
@@ -75,7 +159,9 @@ def node5_time_assignment(state: PlannerGraphState) -> PlannerGraphState:
         dominant_tz = _get_dominant_timezone(session)
         
         # 해당 시간대의 대기열 가져오기
-        queue = queues.get(dominant_tz, [])
+        queue = queues.get(dominant_tz)
+        if queue is None:
+            queue = deque()
 
         # 세션 채우기 루프
         while current_time < session_end:
@@ -121,13 +207,13 @@ def node5_time_assignment(state: PlannerGraphState) -> PlannerGraphState:
                 # 결과 생성
                 if pending_remainder_id is not None:
                     # 이전에 분할된 작업의 마지막 조각
-                    _append_child_to_result(results, pending_remainder_id, feature.title, start_at_str, end_at_str, pending_sequence)
+                    _append_child_to_result(result_by_id, pending_remainder_id, feature.title, start_at_str, end_at_str, pending_sequence)
                     pending_remainder_id = None
                     pending_remainder_duration = 0
                     pending_sequence = 1
                 else:
                     # 새로운 작업 배정 (분할 없음)
-                    results.append(AssignmentResult(
+                    _emit(AssignmentResult(
                         userId=user_id,
                         taskId=feature.taskId,
                         dayPlanId=feature.dayPlanId,
@@ -141,7 +227,7 @@ def node5_time_assignment(state: PlannerGraphState) -> PlannerGraphState:
                     ))
                     # 큐에서 제거
                     if queue and queue[0] == feature.taskId:
-                        queue.pop(0)
+                        queue.popleft()
                 
                 assigned_task_ids.add(feature.taskId)
                 current_time += current_task_duration
@@ -180,10 +266,10 @@ def node5_time_assignment(state: PlannerGraphState) -> PlannerGraphState:
             # 자투리 여부에 따라 처리
             if pending_remainder_id is not None:
                 # 기존 부모에 child 추가
-                _append_child_to_result(results, pending_remainder_id, feature.title, start_at_str, end_at_str, pending_sequence)
+                _append_child_to_result(result_by_id, pending_remainder_id, feature.title, start_at_str, end_at_str, pending_sequence)
             else:
                 # 새 부모 생성 (Status=ASSIGNED, but Time=Null)
-                results.append(AssignmentResult(
+                _emit(AssignmentResult(
                     userId=user_id,
                     taskId=feature.taskId,
                     dayPlanId=feature.dayPlanId,
@@ -196,11 +282,11 @@ def node5_time_assignment(state: PlannerGraphState) -> PlannerGraphState:
                     children=[]
                 ))
                 # 첫 번째 child 추가
-                _append_child_to_result(results, feature.taskId, feature.title, start_at_str, end_at_str, 1)
+                _append_child_to_result(result_by_id, feature.taskId, feature.title, start_at_str, end_at_str, 1)
                 
                 # 큐에서 제거 (이제 pending으로 관리됨)
                 if queue and queue[0] == feature.taskId:
-                    queue.pop(0)
+                    queue.popleft()
 
             assigned_task_ids.add(feature.taskId)
             
@@ -228,68 +314,19 @@ def node5_time_assignment(state: PlannerGraphState) -> PlannerGraphState:
             # 하지만 논리적으로 current_time은 session_end가 됨.
             break
 
-    # 3. 미배정 작업 처리 (Tail Drop) -> EXCLUDED
-    # pending_remainder가 남아있다면? -> 이것도 결국 배정 못 한 것.
-    # 하지만 이미 앞부분은 배정되었으므로 'ASSIGNED' 상태는 유지하되, 뒷부분은 잘림.
-    # (사용자에게 "시간 부족으로 일부만 배정됨"을 알릴 방법이 현재 스펙엔 없음. 그냥 둔다.)
-    
-    # 아예 배정 안 된 작업들 처리
-    all_flex_ids = state.taskFeatures.keys()
-    
-    for tid in all_flex_ids:
-        if tid not in assigned_task_ids:
-            feat = task_features[tid]
-            results.append(AssignmentResult(
-                userId=user_id,
-                taskId=feat.taskId,
-                dayPlanId=feat.dayPlanId,
-                title=feat.title,
-                type="FLEX",
-                assignedBy="AI",
-                assignmentStatus="EXCLUDED",
-                startAt=None,
-                endAt=None,
-                children=None
-            ))
-            
-    # Soft Rollback (그룹 일관성) - V1에서는 생략 가능하지만, 안전장치로 구현 권장
-    # 구현 복잡도상 V1에서는 "배정된 건 유지" 정책으로 가되 
-    # 차후 고도화 시 추가
-
-    # 4. [Post-Processing] 단일 자식(Single Child) Flattening
+    # [Post-Processing] 단일 자식(Single Child) Flattening
     # 분할되었으나(Branch B), Tail Drop 등으로 인해 자식이 하나만 남은 경우
     # 굳이 Parent-Child 구조를 유지할 필요가 없으므로 일반 Task로 변환한다.
-    final_results_processed = []
+    # -> V1 정책상 부분 배정도 ASSIGNED로 본다면, 그냥 Start/End를 채우고 Children 제거
+    # (결과 리스트를 새로 만들지 않고 한 번의 순회로 제자리 변환)
     for res in results:
         if res.children and len(res.children) == 1:
             child = res.children[0]
-            # 부모(res)를 자식(child)의 내용으로 덮어씀
-            # 단, taskId나 title 등은 부모 원본 유지 (child.subTaskId 대신 parentId 사용)
-            # 여기서는 '하나뿐인 조각'이 곧 '전체 배정'이 된 셈 (비록 duration은 짧아졌을 수 있지만)
-            # -> V1 정책상 부분 배정도 ASSIGNED로 본다면, 그냥 Start/End를 채우고 Children 제거
             res.startAt = child.startAt
             res.endAt = child.endAt
             res.children = None
-            final_results_processed.append(res)
-        else:
-            final_results_processed.append(res)
 
-    results = final_results_processed
-
-    # 4. 결과 반환
-    # 내부 상태 업데이트
-    state.finalResults = results
-    
-    # 가동률(Fill Rate) 계산: 배정된 작업 수 / 전체 FLEX 수
-    if len(all_flex_ids) > 0:
-        state.fillRate = len(assigned_task_ids) / len(all_flex_ids)
-    else:
-        state.fillRate = 1.0
-        
-    # [Logfire] 결과 명시적 기록
-    logfire.info("Node 5 Result", final_results=results, fill_rate=state.fillRate)
-    
-    return state
+    return results, assigned_task_ids
 
 
 def _get_dominant_timezone(session: FreeSession) -> str:
@@ -317,12 +354,10 @@ def _get_dominant_timezone(session: FreeSession) -> str:
     return sorted_tz[0][0]
 
 
-def _append_child_to_result(results: list[AssignmentResult], parent_id: int | None, 
+def _append_child_to_result(result_by_id: dict[int, AssignmentResult], parent_id: int | None, 
                             parent_title: str, start: str, end: str, seq: int):
-    """결과 리스트에서 부모를 찾아 child 추가"""
-    # results는 순차적으로 append 되므로, 뒤에서부터 찾는 게 빠를 수 있음
-    # 혹은 map을 안쓰므로 순회해야 함.
-    parent = next((r for r in results if r.taskId == parent_id), None)
+    """taskId 인덱스에서 부모를 찾아 child 추가"""
+    parent = result_by_id.get(parent_id)
     if not parent:
         # 혹시 모를 에러 방지 (부모가 없는데 자식이 생길 순 없음)
         return
@@ -0,0 +1,201 @@
+import asyncio
+from typing import AsyncIterator, Literal
+
+import logfire  # [Logfire] Import
+
+from app.core.config import settings
+from app.core.payload_logging import log_payload, start_payload_sampling, summarize
+from app.core.timing import timed
+from app.models.planner.request import ArrangementState
+from app.models.planner.response import AssignmentResult
+from app.models.planner.internal import PlannerGraphState
+from app.models.planner.weights import WeightParams
+from app.services.planner.nodes.node1_structure import node1_structure_analysis, _create_fallback_feature
+from app.services.planner.nodes.node2_importance import node2_importance
+from app.services.planner.nodes.node3_chain_generator import node3_chain_generator, _create_fallback_chain
+from app.services.planner.nodes.node4_chain_judgement import node4_chain_judgement
+from app.services.planner.nodes.node4_local_search import node4_local_search
+from app.services.planner.nodes.node5_time_assignment import node5_time_assignment
+from app.services.planner.speculative import start_speculative_node3
+from app.services.planner.traffic_capture import start_traffic_capture
+from app.services.planner.utils.session_utils import calculate_free_sessions
+from app.services.planner.utils.task_utils import filter_parent_tasks
+
+PipelineStage = Literal["sessions", "features", "chain", "assignments"]
+
+
+def build_initial_state(request: ArrangementState) -> PlannerGraphState:
+    """
+    요청으로부터 파이프라인 초기 상태 생성
+    - FIXED 작업 분리, 부모(Container) 작업 제외한 FLEX 작업 추출
+    - FIXED 일정 사이의 가용 세션(Free Session) 계산
+    """
+    fixed_tasks = [t for t in request.schedules if t.type == "FIXED"]
+
+    # Filter out Parent Tasks (Container Tasks) from Flex Tasks
+    flex_tasks = filter_parent_tasks(request.schedules)
+
+    sessions = calculate_free_sessions(
+        start_arrange_str=request.startArrange,
+        day_end_time_str=request.user.dayEndTime,
+        fixed_schedules=fixed_tasks
+    )
+
+    return PlannerGraphState(
+        request=request,
+        weights=WeightParams(), # Use default weights for now
+        fixedTasks=fixed_tasks,
+        flexTasks=flex_tasks,
+        freeSessions=sessions
+    )
+
+
+async def iter_planner_pipeline(request: ArrangementState) -> AsyncIterator[tuple[PipelineStage, PlannerGraphState]]:
+    """
+    전체 파이프라인 실행 (Node 1 ~ Node 5), 단계가 끝날 때마다 (단계명, state)를 yield
+    - "sessions": FIXED 작업 / 가용 세션 계산 완료
+    - "features": Node 1 (구조 분석) 완료
+    - "chain": Node 2 ~ Node 4.5 (체인 선택) 완료
+    - "assignments": Node 5 (시간 배정) 완료
+    """
+    # 요청 단위 Payload 로깅 샘플링 결정
+    start_payload_sampling()
+    # 트래픽 캡처 대상이면 요청 / LLM 응답 기록 시작 (benchmarks/replay_traffic.py로 재생)
+    capture = start_traffic_capture(request)
+    last_state: PlannerGraphState | None = None
+    try:
+        async for stage, state in _iter_pipeline_stages(request):
+            last_state = state
+            yield stage, state
+    except BaseException as e:
+        if isinstance(e, Exception):
+            # 실패한 요청은 마지막으로 완료된 단계의 state를 항상 전체 기록
+            log_payload(
+                "Planner Pipeline Failed",
+                lambda: last_state,
+                lambda: summarize(last_state) if last_state is not None else {},
+                error=True
+            )
+        # 취소(CancelledError) / 중단된 스트림(GeneratorExit)도 마지막 단계까지 기록 (cancelled로 표시)
+        if capture is not None:
+            capture.finish(last_state, error=e)
+        raise
+    if capture is not None:
+        capture.finish(last_state)
+
+
+async def _iter_pipeline_stages(request: ArrangementState) -> AsyncIterator[tuple[PipelineStage, PlannerGraphState]]:
+    with timed("sessions"):
+        state = build_initial_state(request)
+
+    # [Logfire] Initial State Logging
+    log_payload("Initial State", lambda: state, lambda: summarize(state))
+    yield "sessions", state
+
+    # Node 3 추측 실행 (설정 시 Node 1과 병렬로 시작)
+    speculation = start_speculative_node3(state)
+    try:
+        # Node 1
+        with timed("node1"):
+            state = await node1_structure_analysis(state)
+        yield "features", state
+
+        # Node 2
+        with timed("node2"):
+            state = node2_importance(state)
+
+        # Node 3
+        with timed("node3"):
+            if speculation is not None:
+                state = await speculation.resolve(state)
+            else:
+                state = await node3_chain_generator(state)
+    finally:
+        # 예외 / 스트림 중단 시 추측 실행 정리
+        if speculation is not None:
+            speculation.cancel()
+
+    # Node 4
+    with timed("node4"):
+        state = node4_chain_judgement(state)
+
+    # Node 4.5 (Local Search, 설정된 CPU 예산 내에서만 수행)
+    # 예산 동안 이벤트 루프를 막지 않도록 워커 스레드에서 실행
+    if settings.planner_local_search_ms > 0:
+        with timed("local_search"):
+            state = await asyncio.to_thread(node4_local_search, state)
+    yield "chain", state
+
+    # Node 5
+    with timed("node5"):
+        state = node5_time_assignment(state)
+    yield "assignments", state
+
+
+async def run_planner_pipeline(request: ArrangementState) -> PlannerGraphState:
+    """전체 파이프라인 실행 (Node 1 ~ Node 5)"""
+    async for _, state in iter_planner_pipeline(request):
+        pass
+    return state
+
+
+def run_degraded_pipeline(request: ArrangementState, reason: str) -> PlannerGraphState:
+    """
+    Degraded 경로 (LLM 호출 없음, 부하 차단 시 사용)
+    - Node 1 대신 Fallback Feature, Node 3 대신 Fallback Chain을 사용하고 Node 2 / 4 / 5는 그대로 실행
+    - 로컬 서치는 생략
+    """
+    state = build_initial_state(request)
+
+    task_features = {task.taskId: _create_fallback_feature(task) for task in state.flexTasks}
+    state = state.model_copy(update={
+        "taskFeatures": task_features,
+        "warnings": state.warnings + [f"Degraded mode: {reason}"]
+    })
+
+    state = node2_importance(state)
+    state = state.model_copy(update={"chainCandidates": [_create_fallback_chain(state)]})
+    state = node4_chain_judgement(state)
+    state = node5_time_assignment(state)
+
+    logfire.info("Degraded Pipeline Result", reason=reason, results=len(state.finalResults))
+    return state
+
+
+def combine_results(state: PlannerGraphState) -> list[AssignmentResult]:
+    """FLEX 배정 결과와 FIXED 일정을 합쳐 시작 시각 순으로 정렬"""
+    user_id = state.request.user.userId
+    combined_results = []
+
+    # 1. FLEX Results
+    for res in state.finalResults:
+        res_dict = res.model_dump()
+        res_dict['userId'] = user_id
+        combined_results.append(AssignmentResult(**res_dict))
+
+    # 2. FIXED Results
+    combined_results.extend(fixed_results(state))
+
+    # Sort by startAt
+    combined_results.sort(key=lambda x: x.startAt if x.startAt else "99:99")
+    return combined_results
+
+
+def fixed_results(state: PlannerGraphState) -> list[AssignmentResult]:
+    """FIXED 일정을 응답 형식(assignedBy=USER)으로 변환"""
+    user_id = state.request.user.userId
+    return [
+        AssignmentResult(
+            userId=user_id,
+            taskId=ft.taskId,
+            dayPlanId=ft.dayPlanId,
+            title=ft.title,
+            type="FIXED",
+            assignedBy="USER",
+            assignmentStatus="ASSIGNED",
+            startAt=ft.startAt,
+            endAt=ft.endAt,
+            children=None
+        )
+        for ft in state.fixedTasks
+    ]
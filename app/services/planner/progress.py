@@ -0,0 +1,50 @@
+from typing import Any
+
+from app.models.planner.internal import PlannerGraphState
+from app.services.planner.pipeline import PipelineStage, fixed_results
+from app.services.planner.utils.time_utils import minutes_to_hhmm
+
+
+def stage_payload(stage: PipelineStage, state: PlannerGraphState) -> dict[str, Any]:
+    """
+    스트리밍 플래너의 단계별 이벤트 데이터
+    - 최종 배정("assignments")은 PlannerResponse 형식으로 별도 전송하므로 여기서 다루지 않음
+    """
+    if stage == "sessions":
+        return {
+            "fixedTasks": [r.model_dump() for r in fixed_results(state)],
+            "freeSessions": [
+                {
+                    "startAt": minutes_to_hhmm(s.start),
+                    "endAt": minutes_to_hhmm(s.end),
+                    "durationMin": s.duration,
+                }
+                for s in state.freeSessions
+            ],
+        }
+
+    if stage == "features":
+        return {
+            "tasks": [
+                {
+                    "taskId": f.taskId,
+                    "title": f.title,
+                    "category": f.category,
+                    "cognitiveLoad": f.cognitiveLoad,
+                    "groupId": f.groupId,
+                    "groupLabel": f.groupLabel,
+                    "orderInGroup": f.orderInGroup,
+                }
+                for f in state.taskFeatures.values()
+            ],
+        }
+
+    if stage == "chain":
+        chain = next((c for c in state.chainCandidates if c.chainId == state.selectedChainId), None)
+        return {
+            "chainId": state.selectedChainId,
+            "timeZoneQueues": chain.timeZoneQueues if chain else {},
+            "rationaleTags": chain.rationaleTags if chain else [],
+        }
+
+    raise ValueError(f"Unsupported stage: {stage}")
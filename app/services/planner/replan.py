@@ -0,0 +1,419 @@
+"""
+증분 재배치(Incremental Re-plan)
+
+작업 하나 추가, FIXED 일정 하나 이동처럼 작은 수정에 대해 전체 파이프라인(LLM 2회)을
+다시 돌리지 않고, 이전 파이프라인 state를 재사용하여 바뀐 부분만 다시 계산한다.
+
+- 일정 Diff: 신규/제목·부모 변경/속성 변경/삭제 작업, FIXED 변경 여부
+- Node 1: 신규(및 제목·부모가 바뀐) 작업만 분석 (없으면 LLM 호출 없음)
+- Node 2: 결정론적 계산이므로 전체 재계산
+- 체인: 이전 선택 체인을 유지하고, 신규 작업만 점수가 가장 좋은 시간대 큐 뒤에 삽입
+- Node 5: 바뀐 세션(및 영향받는 작업이 있던 세션)만 다시 배정, 나머지 배정은 그대로 유지
+"""
+import math
+from bisect import bisect_right
+from dataclasses import dataclass, field
+
+import numpy as np
+import logfire  # [Logfire] Import
+
+from app.models.planner.internal import PlannerGraphState, ChainCandidate, FreeSession, TaskFeature
+from app.models.planner.request import ArrangementState, ScheduleItem
+from app.models.planner.response import AssignmentResult
+from app.services.planner.nodes.node1_structure import node1_structure_analysis
+from app.services.planner.nodes.node2_importance import node2_importance
+from app.services.planner.nodes.node4_chain_judgement import apply_closure
+from app.services.planner.nodes.node5_time_assignment import (
+    GAP_MINUTES, assign_tasks_to_sessions, _get_dominant_timezone
+)
+from app.services.planner.pipeline import build_initial_state, run_planner_pipeline
+from app.services.planner.utils.score_arrays import (
+    TIME_ZONE_ORDER, TIME_ZONE_POSITION, build_membership_matrix, score_candidates
+)
+from app.services.planner.utils.state_index import get_state_index
+from app.services.planner.utils.time_utils import hhmm_to_minutes
+
+# 연속 증분 재배치 허용 횟수 (초과 시 전체 파이프라인으로 재생성하여 누적 편차 해소)
+MAX_REPLAN_LOOPS = 5
+
+# Node 2 재계산만 필요한 속성 / Node 1 재분석이 필요한 속성
+PLANNING_FIELDS = ("estimatedTimeRange", "focusLevel", "isUrgent")
+STRUCTURE_FIELDS = ("title", "parentScheduleId")
+
+
+@dataclass
+class ScheduleDiff:
+    """이전 요청과 새 요청의 FLEX/FIXED 일정 차이"""
+    added: list[int] = field(default_factory=list)      # 신규 FLEX 작업
+    relabeled: list[int] = field(default_factory=list)  # 제목/부모 변경 (Node 1 재분석)
+    updated: list[int] = field(default_factory=list)    # 예상 시간/집중도/긴급도 변경 (Node 2만)
+    removed: list[int] = field(default_factory=list)    # 삭제된 FLEX 작업
+    fixed_changed: bool = False
+
+    @property
+    def needs_analysis(self) -> list[int]:
+        return self.added + self.relabeled
+
+    @property
+    def affected(self) -> set[int]:
+        """이전 배정을 그대로 유지할 수 없는 작업"""
+        return set(self.relabeled) | set(self.updated) | set(self.removed)
+
+
+def diff_schedules(prior: PlannerGraphState, state: PlannerGraphState) -> ScheduleDiff:
+    """이전 state와 새 초기 state(build_initial_state 결과)의 일정 비교"""
+    diff = ScheduleDiff()
+    prior_flex = {t.taskId: t for t in prior.flexTasks}
+    new_flex_ids = set()
+
+    for task in state.flexTasks:
+        new_flex_ids.add(task.taskId)
+        old = prior_flex.get(task.taskId)
+        if old is None:
+            diff.added.append(task.taskId)
+        elif any(getattr(old, f) != getattr(task, f) for f in STRUCTURE_FIELDS):
+            diff.relabeled.append(task.taskId)
+        elif any(getattr(old, f) != getattr(task, f) for f in PLANNING_FIELDS):
+            diff.updated.append(task.taskId)
+
+    diff.removed = [tid for tid in prior_flex if tid not in new_flex_ids]
+
+    def _fixed_key(tasks: list[ScheduleItem]) -> set[tuple]:
+        return {(t.taskId, t.startAt, t.endAt) for t in tasks}
+
+    diff.fixed_changed = _fixed_key(prior.fixedTasks) != _fixed_key(state.fixedTasks)
+    return diff
+
+
+def _full_replan_reason(prior: PlannerGraphState, state: PlannerGraphState, diff: ScheduleDiff) -> str | None:
+    """증분 재배치가 부적절한 경우 그 사유 (None이면 증분 재배치 가능)"""
+    if prior.request.user.userId != state.request.user.userId:
+        return "user_mismatch"
+    if prior.request.user.focusTimeZone != state.request.user.focusTimeZone:
+        return "focus_time_zone_changed"
+    if prior.replan_loops >= MAX_REPLAN_LOOPS:
+        return "max_replan_loops"
+    if not any(c.chainId == prior.selectedChainId for c in prior.chainCandidates):
+        return "no_prior_chain"
+    # 절반 이상이 새로 분석되어야 하면 체인 자체를 다시 만드는 편이 낫다
+    if len(diff.needs_analysis) > max(1, len(state.flexTasks) // 2):
+        return "too_many_new_tasks"
+    return None
+
+
+@logfire.instrument  # [Logfire] Instrument
+async def replan_pipeline(prior: PlannerGraphState, request: ArrangementState) -> PlannerGraphState:
+    """
+    이전 state를 기준으로 새 요청을 증분 재배치
+    - 증분 재배치가 부적절하면 전체 파이프라인을 실행
+    """
+    state = build_initial_state(request)
+    diff = diff_schedules(prior, state)
+
+    reason = _full_replan_reason(prior, state, diff)
+    if reason:
+        logfire.info("Replan Fallback to Full Pipeline", reason=reason)
+        return await run_planner_pipeline(request)
+
+    # 1. Features: 유지 작업은 이전 feature 재사용, 신규 작업만 Node 1 분석
+    prior_chain = next(c for c in prior.chainCandidates if c.chainId == prior.selectedChainId)
+    schedule_by_id = get_state_index(state).schedule_by_id
+
+    new_features: dict[int, TaskFeature] = {}
+    retry_node1 = prior.retry_node1
+    warnings = list(prior.warnings)
+    if diff.needs_analysis:
+        targets = set(diff.needs_analysis)
+        analyzed = await node1_structure_analysis(state.model_copy(update={
+            "flexTasks": [t for t in state.flexTasks if t.taskId in targets],
+            "taskFeatures": {}
+        }))
+        new_features = analyzed.taskFeatures
+        retry_node1 = analyzed.retry_node1
+        warnings = warnings + analyzed.warnings[len(state.warnings):]
+
+    kept_features = {
+        tid: _refresh_group_label(prior.taskFeatures[tid], schedule_by_id)
+        for tid in (t.taskId for t in state.flexTasks)
+        if tid not in new_features and tid in prior.taskFeatures
+    }
+    new_features = _assign_group_orders(kept_features, new_features)
+
+    # 요청 순서 유지 (EXCLUDED 결과 순서 등 전체 파이프라인과 동일하게)
+    merged = {}
+    for task in state.flexTasks:
+        feature = kept_features.get(task.taskId) or new_features.get(task.taskId)
+        if feature is not None:
+            merged[task.taskId] = feature
+    state = node2_importance(state.model_copy(update={"taskFeatures": merged}))
+
+    # 2. 체인: 이전 선택 체인 유지 + 신규 작업 삽입
+    chain, inserted_zones = _rebuild_chain(prior_chain, state, inserted=list(new_features))
+
+    # 3. Node 5: 바뀐 세션만 다시 배정
+    affected = diff.affected | set(new_features)
+    results, assigned_ids, dirty_count = _reassign_changed_sessions(
+        prior, state, chain, affected, inserted_zones
+    )
+
+    task_features = state.taskFeatures
+    user_id = state.request.user.userId
+    for tid, feat in task_features.items():
+        if tid not in assigned_ids:
+            results.append(AssignmentResult(
+                userId=user_id,
+                taskId=feat.taskId,
+                dayPlanId=feat.dayPlanId,
+                title=feat.title,
+                type="FLEX",
+                assignedBy="AI",
+                assignmentStatus="EXCLUDED",
+                startAt=None,
+                endAt=None,
+                children=None
+            ))
+
+    result_state = state.model_copy(update={
+        "chainCandidates": [chain],
+        "selectedChainId": chain.chainId,
+        "finalResults": results,
+        "fillRate": len(assigned_ids) / len(task_features) if task_features else 1.0,
+        "retry_node1": retry_node1,
+        "retry_node3": prior.retry_node3,
+        "replan_loops": prior.replan_loops + 1,
+        "warnings": warnings
+    })
+
+    # [Logfire] 결과 명시적 기록
+    logfire.info(
+        "Replan Result",
+        added=diff.added,
+        relabeled=diff.relabeled,
+        updated=diff.updated,
+        removed=diff.removed,
+        fixed_changed=diff.fixed_changed,
+        dirty_sessions=dirty_count,
+        total_sessions=len(state.freeSessions),
+        replan_loops=result_state.replan_loops
+    )
+
+    return result_state
+
+
+def _refresh_group_label(feature: TaskFeature, schedule_by_id: dict[int, ScheduleItem]) -> TaskFeature:
+    """부모 작업 제목이 바뀐 경우 groupLabel만 갱신"""
+    if not feature.groupId:
+        return feature
+    parent = schedule_by_id.get(int(feature.groupId)) if feature.groupId.isdigit() else None
+    if parent is None or parent.title == feature.groupLabel:
+        return feature
+    return feature.model_copy(update={"groupLabel": parent.title})
+
+
+def _assign_group_orders(
+    kept_features: dict[int, TaskFeature],
+    new_features: dict[int, TaskFeature]
+) -> dict[int, TaskFeature]:
+    """
+    신규 작업의 orderInGroup 보정
+    - Node 1은 신규 작업만 보고 순서를 매기므로, 기존 그룹과 순서가 겹치면 그룹 맨 뒤로 보낸다
+    """
+    used: dict[str, set[int]] = {}
+    for f in kept_features.values():
+        if f.groupId and f.orderInGroup is not None:
+            used.setdefault(f.groupId, set()).add(f.orderInGroup)
+
+    ordered = sorted(
+        new_features.values(),
+        key=lambda f: (f.orderInGroup if f.orderInGroup is not None else math.inf, f.taskId)
+    )
+    result = dict(new_features)
+    for f in ordered:
+        if not f.groupId:
+            continue
+        orders = used.setdefault(f.groupId, set())
+        order = f.orderInGroup
+        if order is None or order in orders:
+            order = max(orders, default=0) + 1
+            result[f.taskId] = f.model_copy(update={"orderInGroup": order})
+        orders.add(order)
+    return result
+
+
+def _rebuild_chain(
+    prior_chain: ChainCandidate,
+    state: PlannerGraphState,
+    inserted: list[int]
+) -> tuple[ChainCandidate, set[str]]:
+    """
+    이전 체인에서 사라진 작업을 빼고, 신규 작업을 점수가 가장 좋은 시간대 큐 뒤에 삽입
+    - 각 신규 작업마다 (시간대별 삽입 / 미삽입) 후보를 배열 기반으로 한 번에 채점
+    - 그룹 작업은 앞 순서 작업보다 이른 시간대에 넣지 않음
+
+    Returns: (Closure 적용된 체인, 신규 작업이 들어간 시간대 집합)
+    """
+    task_features = state.taskFeatures
+    index = get_state_index(state)
+    capacity = index.capacity
+    inserted_set = set(inserted)
+
+    queues: dict[str, list[int]] = {
+        tz: [tid for tid in ids if tid in task_features and tid not in inserted_set]
+        for tz, ids in prior_chain.timeZoneQueues.items()
+    }
+    zone_of = {tid: tz for tz, ids in queues.items() for tid in ids}
+    open_zones = [tz for tz in TIME_ZONE_ORDER if capacity.get(tz, 0) > 0]
+    inserted_zones: set[str] = set()
+
+    position = {tid: i for i, tid in enumerate(task_features)}
+    ordered = sorted(inserted, key=lambda tid: (task_features[tid].orderInGroup or 0, position[tid]))
+    for tid in ordered:
+        feature = task_features[tid]
+        if feature.category == "ERROR":
+            continue
+
+        min_position = 0
+        if feature.groupId and feature.orderInGroup is not None:
+            earlier = [
+                other for order, other in index.group_members.get(feature.groupId, [])
+                if order < feature.orderInGroup
+            ]
+            # 앞 순서 작업이 빠져 있으면 Closure에 의해 어차피 제외됨
+            if any(other not in zone_of for other in earlier):
+                continue
+            min_position = max((TIME_ZONE_POSITION[zone_of[o]] for o in earlier), default=0)
+
+        zones = [tz for tz in open_zones if TIME_ZONE_POSITION[tz] >= min_position]
+        if not zones:
+            continue
+
+        candidates = [ChainCandidate(chainId="current", timeZoneQueues=queues)]
+        for tz in zones:
+            trial = dict(queues)
+            trial[tz] = queues.get(tz, []) + [tid]
+            candidates.append(ChainCandidate(chainId=tz, timeZoneQueues=trial))
+
+        scores, _ = score_candidates(
+            build_membership_matrix(candidates, index.feature_arrays),
+            index.feature_arrays,
+            capacity,
+            state.weights,
+            state.request.user.focusTimeZone
+        )
+        best_idx = int(np.argmax(scores))
+        if best_idx == 0:
+            continue
+
+        best_zone = zones[best_idx - 1]
+        queues = candidates[best_idx].timeZoneQueues
+        zone_of[tid] = best_zone
+        inserted_zones.add(best_zone)
+
+    rationale_tags = prior_chain.rationaleTags
+    if "replan" not in rationale_tags:
+        rationale_tags = rationale_tags + ["replan"]
+
+    chain = ChainCandidate(chainId=prior_chain.chainId, timeZoneQueues=queues, rationaleTags=rationale_tags)
+    return apply_closure(chain, task_features, group_orders=index.group_orders), inserted_zones
+
+
+def _result_spans(result: AssignmentResult) -> list[tuple[int, int]]:
+    """배정 결과의 (시작, 종료) 분 단위 구간 목록 (분할 작업은 자식별)"""
+    if result.children:
+        return [(hhmm_to_minutes(c.startAt), hhmm_to_minutes(c.endAt)) for c in result.children]
+    if result.startAt and result.endAt:
+        return [(hhmm_to_minutes(result.startAt), hhmm_to_minutes(result.endAt))]
+    return []
+
+
+def _reassign_changed_sessions(
+    prior: PlannerGraphState,
+    state: PlannerGraphState,
+    chain: ChainCandidate,
+    affected: set[int],
+    inserted_zones: set[str]
+) -> tuple[list[AssignmentResult], set[int], int]:
+    """
+    바뀐 세션만 Node 5 배정 엔진으로 다시 채우고, 나머지 세션의 이전 배정은 유지
+
+    다시 배정하는 세션(Dirty):
+    - 이전에 없던 세션 (FIXED 이동, 시작/종료 시각 변경 등)
+    - 영향받는 작업(삭제/변경/체인에서 빠진 작업)이 배정되어 있던 세션
+    - 신규 작업이 들어간 시간대의 세션 중 빈 시간이 남아 있던 세션
+    - 분할 작업이 Dirty 세션과 유지 세션에 걸쳐 있으면 해당 세션들 모두
+
+    Returns: (배정 결과 - EXCLUDED 제외, 배정된 taskId 집합, Dirty 세션 수)
+    """
+    sessions: list[FreeSession] = sorted(state.freeSessions, key=lambda s: s.start)
+    starts = [s.start for s in sessions]
+    prior_keys = {(s.start, s.end) for s in prior.freeSessions}
+    in_chain = {tid for ids in chain.timeZoneQueues.values() for tid in ids}
+
+    def _session_index(minute: int) -> int | None:
+        i = bisect_right(starts, minute) - 1
+        if i >= 0 and sessions[i].start <= minute < sessions[i].end:
+            return i
+        return None
+
+    dirty: set[int] = {i for i, s in enumerate(sessions) if (s.start, s.end) not in prior_keys}
+
+    # 이전 배정 -> 세션 매핑
+    prior_assigned: dict[int, AssignmentResult] = {}
+    sessions_of: dict[int, set[int]] = {}
+    last_end: dict[int, int] = {}
+    unmappable: set[int] = set()
+    for res in prior.finalResults:
+        if res.assignmentStatus != "ASSIGNED":
+            continue
+        prior_assigned[res.taskId] = res
+        for start, end in _result_spans(res):
+            i = _session_index(start)
+            if i is None:
+                unmappable.add(res.taskId)
+                continue
+            sessions_of.setdefault(res.taskId, set()).add(i)
+            last_end[i] = max(last_end.get(i, 0), end)
+
+    # 유지할 수 없는 작업이 있던 세션
+    for tid in prior_assigned:
+        if tid in affected or tid not in in_chain or tid in unmappable:
+            dirty.update(sessions_of.get(tid, ()))
+
+    # 신규 작업이 들어갈 수 있는 빈 세션
+    for i, s in enumerate(sessions):
+        if i in dirty or _get_dominant_timezone(s) not in inserted_zones:
+            continue
+        used_until = last_end[i] + GAP_MINUTES if i in last_end else math.ceil(s.start / 10.0) * 10
+        if s.end - used_until >= 10:
+            dirty.add(i)
+
+    # 분할 작업이 걸친 세션 확장 (Fixpoint)
+    changed = True
+    while changed:
+        changed = False
+        for idxs in sessions_of.values():
+            if idxs & dirty and not idxs <= dirty:
+                dirty.update(idxs)
+                changed = True
+
+    kept_ids = {
+        tid for tid in prior_assigned
+        if tid not in affected and tid in in_chain and tid not in unmappable
+        and not (sessions_of.get(tid, set()) & dirty)
+    }
+    results = [
+        prior_assigned[tid].model_copy(deep=True)
+        for tid in prior_assigned if tid in kept_ids
+    ]
+
+    remaining_queues = {
+        tz: [tid for tid in ids if tid not in kept_ids]
+        for tz, ids in chain.timeZoneQueues.items()
+    }
+    new_results, new_assigned = assign_tasks_to_sessions(
+        sessions=[sessions[i] for i in sorted(dirty)],
+        time_zone_queues=remaining_queues,
+        task_features=state.taskFeatures,
+        user_id=state.request.user.userId
+    )
+    return results + new_results, kept_ids | new_assigned, len(dirty)
@@ -0,0 +1,190 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import logfire  # [Logfire] Import
+
+from app.core.config import settings
+from app.models.planner.request import ArrangementState
+from app.models.planner.response import PlannerResponse
+from app.services.planner.utils.fingerprint import request_fingerprint, schedules_fingerprint, day_plan_key
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _CacheEntry:
+    expires_at: float  # time.monotonic() 기준
+    day_plan: tuple[int, int]
+    response: dict[str, Any]  # PlannerResponse JSON (공유 객체 변경 방지를 위해 dump 형태로 보관)
+
+
+class PlannerResponseCache:
+    """
+    플래너 응답 캐시
+    - 키: 정규화된 요청 해시 + 가중치 버전 (utils/fingerprint.py)
+    - 1차: In-process LRU (TTL), 2차(선택): Postgres planner_response_cache (TTL)
+    - 같은 (userId, dayPlanId)로 다른 일정이 들어오면 해당 사용자의 이전 캐시를 무효화
+    - 캐시 오류는 요청 처리에 영향을 주지 않음 (경고 로그 후 Miss 처리)
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int, repository=None):
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._repository = repository
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        # (userId, dayPlanId) -> 마지막 일정 해시 (LRU, max_entries개까지, 해당 dayPlan의 항목이 모두 밀려나면 제거)
+        self._schedules_fp: OrderedDict[tuple[int, int], str] = OrderedDict()
+        self._day_plan_entries: dict[tuple[int, int], int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0 and self._ttl_seconds > 0
+
+    @property
+    def persistent(self) -> bool:
+        return self.enabled and self._repository is not None
+
+    async def get(self, request: ArrangementState) -> PlannerResponse | None:
+        """캐시된 응답 조회 (cached=True로 표시하여 반환)"""
+        if not self.enabled:
+            return None
+
+        day_plan = day_plan_key(request)
+        fingerprint = schedules_fingerprint(request.schedules)
+        with self._lock:
+            previous = self._schedules_fp.get(day_plan)
+            self._set_schedules_fp(day_plan, fingerprint)
+        if previous is not None and previous != fingerprint:
+            # 사용자의 일정이 바뀜 -> 이전 일정 기준 캐시 폐기
+            await self.invalidate_user(day_plan[0], day_plan[1])
+            return None
+
+        key = request_fingerprint(request)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                self._evict(key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                payload = entry.response
+
+        if entry is None:
+            payload = await self._get_persistent(key)
+            if payload is None:
+                return None
+            self._remember(key, day_plan, payload)
+
+        logfire.info("Planner Response Cache Hit", user_id=day_plan[0], day_plan_id=day_plan[1])
+        return PlannerResponse.model_validate({**payload, "cached": True})
+
+    def put(self, request: ArrangementState, response: PlannerResponse) -> None:
+        """In-process 캐시에 저장 (Postgres 저장은 persist로 별도 수행)"""
+        if not self.enabled or not response.success:
+            return
+        day_plan = day_plan_key(request)
+        with self._lock:
+            self._set_schedules_fp(day_plan, schedules_fingerprint(request.schedules))
+        self._remember(request_fingerprint(request), day_plan, response.model_dump(mode="json"))
+
+    async def persist(self, request: ArrangementState, response: PlannerResponse) -> None:
+        """Postgres 2차 캐시에 저장 (BackgroundTasks에서 호출)"""
+        if not self.persistent or not response.success:
+            return
+        user_id, day_plan_id = day_plan_key(request)
+        try:
+            await self._repository.put(
+                request_fingerprint(request), user_id, day_plan_id,
+                response.model_dump(mode="json"), self._ttl_seconds
+            )
+        except Exception as e:
+            logger.warning(f"Planner cache persist failed: {e}")
+
+    async def invalidate_user(self, user_id: int, day_plan_id: int | None = None) -> None:
+        """사용자(및 dayPlan)의 캐시 항목 무효화"""
+        with self._lock:
+            stale = [
+                key for key, entry in self._entries.items()
+                if entry.day_plan[0] == user_id and (day_plan_id is None or entry.day_plan[1] == day_plan_id)
+            ]
+            for key in stale:
+                self._drop(key)
+            if day_plan_id is None:
+                for day_plan in [k for k in self._schedules_fp if k[0] == user_id]:
+                    del self._schedules_fp[day_plan]
+
+        if self.persistent:
+            try:
+                await self._repository.delete_for_user(user_id, day_plan_id)
+            except Exception as e:
+                logger.warning(f"Planner cache invalidation failed: {e}")
+
+    def _remember(self, key: str, day_plan: tuple[int, int], payload: dict[str, Any]) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = _CacheEntry(
+                expires_at=time.monotonic() + self._ttl_seconds,
+                day_plan=day_plan,
+                response=payload
+            )
+            self._day_plan_entries[day_plan] = self._day_plan_entries.get(day_plan, 0) + 1
+            while len(self._entries) > self._max_entries:
+                self._evict(next(iter(self._entries)))
+
+    def _set_schedules_fp(self, day_plan: tuple[int, int], fingerprint: str) -> None:
+        # lock 보유 상태에서 호출
+        self._schedules_fp[day_plan] = fingerprint
+        self._schedules_fp.move_to_end(day_plan)
+        while len(self._schedules_fp) > self._max_entries:
+            self._schedules_fp.popitem(last=False)
+
+    def _drop(self, key: str) -> tuple[int, int]:
+        """항목 제거 + dayPlan별 항목 수 갱신, 해당 dayPlan 반환 (lock 보유 상태에서 호출)"""
+        day_plan = self._entries.pop(key).day_plan
+        remaining = self._day_plan_entries[day_plan] - 1
+        if remaining:
+            self._day_plan_entries[day_plan] = remaining
+        else:
+            del self._day_plan_entries[day_plan]
+        return day_plan
+
+    def _evict(self, key: str) -> None:
+        """LRU / TTL 만료 제거: dayPlan의 마지막 항목이면 일정 해시도 제거 (lock 보유 상태에서 호출)"""
+        day_plan = self._drop(key)
+        if day_plan not in self._day_plan_entries:
+            self._schedules_fp.pop(day_plan, None)
+
+    async def _get_persistent(self, key: str) -> dict[str, Any] | None:
+        if not self.persistent:
+            return None
+        try:
+            return await self._repository.get(key)
+        except Exception as e:
+            logger.warning(f"Planner cache lookup failed: {e}")
+            return None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_planner_response_cache: Optional[PlannerResponseCache] = None
+
+def get_planner_response_cache() -> PlannerResponseCache:
+    global _planner_response_cache
+    if _planner_response_cache is None:
+        repository = None
+        if settings.planner_cache_db_enabled:
+            from app.db.repositories.planner_cache_repository import PlannerCacheRepository
+            repository = PlannerCacheRepository()
+        _planner_response_cache = PlannerResponseCache(
+            max_entries=settings.planner_cache_size,
+            ttl_seconds=settings.planner_cache_ttl_seconds,
+            repository=repository
+        )
+    return _planner_response_cache
@@ -0,0 +1,99 @@
+"""
+Node 3 추측 실행 (Speculative Execution)
+
+- Node 1(LLM)이 끝나기를 기다리지 않고, Fallback Feature + Node 2 수식으로 만든 임시 중요도로 Node 3(LLM)를 먼저 시작
+- Node 1 결과로 다시 계산한 중요도 순위가 임시 순위와 충분히 비슷하면 추측 체인을 그대로 사용 (Hit)
+- 순위가 크게 달라지면 추측 실행을 취소하고 실제 Feature로 Node 3를 다시 실행 (Miss)
+- Hit이면 임계 경로가 LLM 호출 약 1회로 줄어듦
+"""
+import asyncio
+from typing import Optional
+
+import logfire  # [Logfire] Import
+import numpy as np
+
+from app.core.config import settings
+from app.core.metrics import get_metrics_registry
+from app.core.timing import stage_scope
+from app.models.planner.internal import PlannerGraphState, TaskFeature
+from app.services.planner.nodes.node1_structure import _create_fallback_feature
+from app.services.planner.nodes.node2_importance import node2_importance
+from app.services.planner.nodes.node3_chain_generator import node3_chain_generator
+
+SPECULATIVE_NODE3_TOTAL = get_metrics_registry().counter(
+    "planner_speculative_node3_total", "Speculative Node 3 outcomes", ("outcome",)
+)
+
+
+def ranking_divergence(speculative: dict[int, TaskFeature], actual: dict[int, TaskFeature]) -> float:
+    """
+    두 중요도 순위의 차이 (정규화 Kendall tau 거리, 0.0 ~ 1.0)
+    - 작업 쌍 중 상대 순서가 다른 쌍의 비율 (한쪽만 동점인 쌍도 다른 것으로 봄)
+      - 동점을 무시하면 Fallback Feature처럼 임시 점수가 모두 같을 때 항상 0.0이 되어 Miss 판정이 불가능
+    - 대상 작업 집합이 다르면 1.0
+    """
+    if speculative.keys() != actual.keys():
+        return 1.0
+    task_ids = list(actual.keys())
+    n = len(task_ids)
+    if n < 2:
+        return 0.0
+
+    a = np.fromiter((speculative[t].importanceScore for t in task_ids), dtype=np.float64, count=n)
+    b = np.fromiter((actual[t].importanceScore for t in task_ids), dtype=np.float64, count=n)
+    upper = np.triu_indices(n, k=1)
+    discordant = (np.sign(a[:, None] - a[None, :]) != np.sign(b[:, None] - b[None, :]))[upper]
+    return float(discordant.sum()) / len(discordant)
+
+
+class SpeculativeNode3:
+    """
+    Node 1과 겹쳐 실행되는 추측 Node 3
+    - start(): Node 1 실행 전에 호출, 임시 Feature로 Node 3 Task 시작
+    - resolve(): Node 1 + Node 2 이후의 state로 Hit/Miss 판정 후 체인 후보가 채워진 state 반환
+    - cancel(): 파이프라인이 중단된 경우 추측 실행 정리
+    """
+
+    def __init__(self, max_divergence: float):
+        self.max_divergence = max_divergence
+        self._speculative_state: Optional[PlannerGraphState] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, state: PlannerGraphState) -> None:
+        features = {task.taskId: _create_fallback_feature(task) for task in state.flexTasks}
+        self._speculative_state = node2_importance(state.model_copy(update={"taskFeatures": features}))
+        # 추측 Task의 LLM 시도/토큰은 별도 구간으로 기록
+        with stage_scope("node3_speculative"):
+            self._task = asyncio.create_task(node3_chain_generator(self._speculative_state))
+
+    async def resolve(self, state: PlannerGraphState) -> PlannerGraphState:
+        divergence = ranking_divergence(self._speculative_state.taskFeatures, state.taskFeatures)
+        if divergence <= self.max_divergence:
+            SPECULATIVE_NODE3_TOTAL.inc(outcome="hit")
+            logfire.info("Speculative Node 3 Hit", divergence=divergence)
+            speculative = await self._task
+            # 추측 실행 중 발생한 Node 3 Fallback 경고 / 재시도 횟수도 반영 (Degraded 표시 / 캐시 제외)
+            node3_warnings = speculative.warnings[len(self._speculative_state.warnings):]
+            return state.model_copy(update={
+                "chainCandidates": speculative.chainCandidates,
+                "retry_node3": speculative.retry_node3,
+                "warnings": state.warnings + node3_warnings
+            })
+
+        SPECULATIVE_NODE3_TOTAL.inc(outcome="miss")
+        logfire.info("Speculative Node 3 Miss", divergence=divergence)
+        self.cancel()
+        return await node3_chain_generator(state)
+
+    def cancel(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+
+def start_speculative_node3(state: PlannerGraphState) -> Optional[SpeculativeNode3]:
+    """설정이 켜져 있으면 추측 Node 3를 시작 (꺼져 있으면 None)"""
+    if not settings.planner_speculative_node3 or not state.flexTasks:
+        return None
+    speculation = SpeculativeNode3(max_divergence=settings.planner_speculative_max_divergence)
+    speculation.start(state)
+    return speculation
@@ -0,0 +1,69 @@
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from app.core.config import settings
+from app.models.planner.internal import PlannerGraphState
+from app.services.planner.utils.fingerprint import day_plan_key
+
+
+class PlannerStateStore:
+    """
+    최근 플래너 파이프라인 결과 state 보관소 (In-process LRU)
+    - traceId로 저장하고, (userId, dayPlanId) -> 최신 traceId 보조 인덱스 유지
+    - 재배치(Re-plan) 요청 시 이전 state를 불러오는 용도
+    - 프로세스 메모리에만 보관하므로, 찾지 못하면 호출 측에서 전체 파이프라인으로 대체해야 함
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self._max_entries = max_entries
+        self._states: OrderedDict[str, PlannerGraphState] = OrderedDict()
+        self._latest: dict[tuple[int, int], str] = {}
+        self._lock = threading.Lock()
+
+    def save(self, trace_id: str, state: PlannerGraphState) -> None:
+        key = day_plan_key(state.request)
+        with self._lock:
+            self._states[trace_id] = state
+            self._states.move_to_end(trace_id)
+            self._latest[key] = trace_id
+
+            while len(self._states) > self._max_entries:
+                old_trace_id, old_state = self._states.popitem(last=False)
+                old_key = day_plan_key(old_state.request)
+                if self._latest.get(old_key) == old_trace_id:
+                    del self._latest[old_key]
+
+    def get(
+        self,
+        trace_id: str | None = None,
+        user_id: int | None = None,
+        day_plan_id: int | None = None
+    ) -> PlannerGraphState | None:
+        """traceId 우선 조회, 없으면 (userId, dayPlanId)의 최신 state 조회"""
+        with self._lock:
+            if trace_id is None and user_id is not None and day_plan_id is not None:
+                trace_id = self._latest.get((user_id, day_plan_id))
+            if trace_id is None:
+                return None
+
+            state = self._states.get(trace_id)
+            if state is None:
+                return None
+            # 다른 사용자의 traceId로는 조회 불가
+            if user_id is not None and state.request.user.userId != user_id:
+                return None
+            self._states.move_to_end(trace_id)
+            return state
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+
+_planner_state_store: Optional[PlannerStateStore] = None
+
+def get_planner_state_store() -> PlannerStateStore:
+    global _planner_state_store
+    if _planner_state_store is None:
+        _planner_state_store = PlannerStateStore(max_entries=settings.planner_state_store_size)
+    return _planner_state_store
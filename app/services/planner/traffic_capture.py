@@ -0,0 +1,209 @@
+"""
+플래너 트래픽 캡처 (Record & Replay의 Record)
+
+- settings.planner_capture_dir가 설정되어 있으면 planner_capture_sample_rate 비율의 요청을 기록
+- 기록 내용 (1요청 = 1줄, JSON Lines)
+  - request: 개인정보를 제거한 ArrangementState (제목은 같은 길이의 마스킹, userId는 HMAC 가명 처리)
+  - config: 파이프라인 동작에 영향을 주는 설정 (재생 시 같은 설정으로 실행)
+  - llm: Node 1 / Node 3 Gemini 원본 응답(또는 에러)과 호출별 지연 시간
+  - stages: 구간별 Wall time(ms), output: 선택 체인 / 배정 결과 요약 (재생 결과 비교용)
+  - localSearchSeed: 로컬 서치 난수 시드 (재생 시 같은 시드로 탐색)
+- 파일 형식: gzip JSON Lines (레코드마다 gzip 멤버 추가, 프로세스가 중단되어도 이전 레코드는 읽을 수 있음)
+  - 파일 크기가 planner_capture_max_file_mb를 넘으면 새 파일로 교체
+- 파일 기록은 스레드에서 수행하고 요청 응답을 기다리게 하지 않음
+"""
+import asyncio
+import gzip
+import hashlib
+import hmac
+import json
+import os
+import random
+import re
+import secrets
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+import logfire
+
+from app.core.config import settings
+from app.core.timing import current_timings
+from app.llm.recording import start_llm_recording, stop_llm_recording
+from app.models.planner.internal import PlannerGraphState
+from app.models.planner.request import ArrangementState
+from app.services.planner.nodes.node4_local_search import local_search_seed
+
+CAPTURE_FORMAT_VERSION = 1
+CAPTURE_FILE_GLOB = "planner-*.jsonl.gz"
+
+_NON_SPACE = re.compile(r"\S")
+
+# planner_capture_secret 미설정 시 사용하는 프로세스별 임의 키
+_process_key = secrets.token_bytes(32)
+
+
+def pseudonymize_user_id(user_id: int) -> int:
+    """
+    사용자 ID 가명 처리 (HMAC-SHA256 앞 48비트, 같은 키에서 같은 사용자는 항상 같은 값)
+    - 키 없는 해시는 순차 정수 ID 조회표로 되돌릴 수 있으므로 비밀 키 사용
+    - planner_capture_secret 미설정 시 프로세스별 임의 키 (재시작 / 워커 간 가명이 달라짐)
+    """
+    key = settings.planner_capture_secret.encode() if settings.planner_capture_secret else _process_key
+    digest = hmac.new(key, str(user_id).encode(), hashlib.sha256).digest()
+    return int.from_bytes(digest[:6], "big")
+
+
+def sanitize_request(request: ArrangementState) -> dict[str, Any]:
+    """
+    캡처용 요청 변환
+    - 제목은 공백을 제외한 모든 글자를 'x'로 마스킹 (글자 수 유지 → 프롬프트 길이 / 토큰 규모 유지)
+    - userId는 가명 처리, 나머지 필드(시간 / 작업 ID / 집중도 등)는 그대로 유지
+    """
+    data = request.model_dump(mode="json")
+    data["user"]["userId"] = pseudonymize_user_id(request.user.userId)
+    for schedule in data["schedules"]:
+        schedule["title"] = _NON_SPACE.sub("x", schedule["title"])
+    return data
+
+
+def capture_config() -> dict[str, Any]:
+    """파이프라인 결과에 영향을 주는 설정"""
+    return {
+        "compactPrompts": settings.planner_compact_prompts,
+        "speculativeNode3": settings.planner_speculative_node3,
+        "speculativeMaxDivergence": settings.planner_speculative_max_divergence,
+        "localSearchMs": settings.planner_local_search_ms,
+    }
+
+
+def summarize_output(state: Optional[PlannerGraphState]) -> dict[str, Any]:
+    """비교용 결과 요약: 선택 체인 + [taskId, 상태, 시작, 종료, 분할 조각 [[시작, 종료], ...]]"""
+    if state is None:
+        return {"selectedChainId": None, "results": []}
+    return {
+        "selectedChainId": state.selectedChainId,
+        "results": [
+            [r.taskId, r.assignmentStatus, r.startAt, r.endAt, [[c.startAt, c.endAt] for c in r.children or []]]
+            for r in state.finalResults
+        ],
+    }
+
+
+class TrafficCaptureWriter:
+    """캡처 레코드 파일 기록 (크기 기준 교체, 스레드 안전)"""
+
+    def __init__(self, directory: str | Path, max_file_bytes: int = 64 * 1024 * 1024):
+        self._directory = Path(directory)
+        self._max_file_bytes = max_file_bytes
+        self._path: Optional[Path] = None
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def _new_path(self) -> Path:
+        self._sequence += 1
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        return self._directory / f"planner-{stamp}-{os.getpid()}-{self._sequence:04d}.jsonl.gz"
+
+    def write(self, record: dict[str, Any]) -> Path:
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._path is None or self._path.stat().st_size >= self._max_file_bytes:
+                self._directory.mkdir(parents=True, exist_ok=True)
+                self._path = self._new_path()
+            with gzip.open(self._path, "ab") as f:
+                f.write(line.encode())
+            return self._path
+
+
+def iter_capture_records(path: str | Path) -> Iterator[dict[str, Any]]:
+    """캡처 파일의 레코드 (기록 도중 잘린 마지막 레코드는 건너뜀)"""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        try:
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                record = json.loads(line)
+                if record.get("v") == CAPTURE_FORMAT_VERSION:
+                    yield record
+        except (EOFError, gzip.BadGzipFile):
+            return
+
+
+def load_capture_records(paths: list[str | Path]) -> list[dict[str, Any]]:
+    """파일 / 디렉터리 목록의 캡처 레코드 (디렉터리는 planner-*.jsonl.gz를 이름순으로)"""
+    records = []
+    for path in map(Path, paths):
+        files = sorted(path.glob(CAPTURE_FILE_GLOB)) if path.is_dir() else [path]
+        for file in files:
+            records.extend(iter_capture_records(file))
+    return records
+
+
+class TrafficCapture:
+    """요청 1건의 캡처 (LLM 응답 기록 시작 ~ finish에서 레코드 생성 / 기록 예약)"""
+
+    def __init__(self, writer: TrafficCaptureWriter, request: ArrangementState):
+        self._writer = writer
+        self._record: dict[str, Any] = {
+            "v": CAPTURE_FORMAT_VERSION,
+            "ts": round(time.time(), 3),
+            "config": capture_config(),
+            "request": sanitize_request(request),
+        }
+        self._exchanges = start_llm_recording()
+
+    def build_record(self, state: Optional[PlannerGraphState], error: Optional[BaseException] = None) -> dict[str, Any]:
+        timings = current_timings()
+        record = dict(self._record)
+        record["llm"] = self._exchanges
+        record["stages"] = {
+            name: round(t.wall_ms, 1) for name, t in timings.stages.items()
+        } if timings is not None else {}
+        record["output"] = summarize_output(state)
+        if state is not None:
+            record["localSearchSeed"] = local_search_seed(state)
+        if error is not None:
+            record["error"] = type(error).__name__
+            if isinstance(error, (asyncio.CancelledError, GeneratorExit)):
+                record["cancelled"] = True
+        return record
+
+    def finish(self, state: Optional[PlannerGraphState], error: Optional[BaseException] = None) -> None:
+        stop_llm_recording()
+        record = self.build_record(state, error)
+        task = asyncio.create_task(self._write(record))
+        _pending_writes.add(task)
+        task.add_done_callback(_pending_writes.discard)
+
+    async def _write(self, record: dict[str, Any]) -> None:
+        try:
+            await asyncio.to_thread(self._writer.write, record)
+        except Exception as e:
+            logfire.warning("Planner Traffic Capture Failed", error=str(e))
+
+
+# 기록 중인 Task 참조 유지 (GC 방지)
+_pending_writes: set[asyncio.Task] = set()
+
+_traffic_capture_writer: Optional[TrafficCaptureWriter] = None
+
+def get_traffic_capture_writer() -> Optional[TrafficCaptureWriter]:
+    global _traffic_capture_writer
+    if _traffic_capture_writer is None and settings.planner_capture_dir:
+        _traffic_capture_writer = TrafficCaptureWriter(
+            settings.planner_capture_dir,
+            max_file_bytes=settings.planner_capture_max_file_mb * 1024 * 1024
+        )
+    return _traffic_capture_writer
+
+
+def start_traffic_capture(request: ArrangementState) -> Optional[TrafficCapture]:
+    """캡처 대상 요청이면 LLM 응답 기록을 시작하고 TrafficCapture 반환 (아니면 None)"""
+    if settings.planner_capture_sample_rate <= 0 or random.random() >= settings.planner_capture_sample_rate:
+        return None
+    writer = get_traffic_capture_writer()
+    if writer is None:
+        return None
+    return TrafficCapture(writer, request)
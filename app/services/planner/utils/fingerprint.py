@@ -0,0 +1,39 @@
+import hashlib
+import json
+
+from app.models.planner.request import ArrangementState, ScheduleItem
+from app.models.planner.weights import WEIGHTS_VERSION
+
+
+def _canonical_json(payload) -> str:
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def _canonical_schedules(schedules: list[ScheduleItem]) -> list[dict]:
+    """일정 순서와 무관하도록 taskId 기준 정렬"""
+    return [s.model_dump(mode="json") for s in sorted(schedules, key=lambda s: s.taskId)]
+
+
+def schedules_fingerprint(schedules: list[ScheduleItem]) -> str:
+    """일정 목록의 정규화된 해시 (일정 변경 감지용)"""
+    return hashlib.sha256(_canonical_json(_canonical_schedules(schedules)).encode("utf-8")).hexdigest()
+
+
+def request_fingerprint(request: ArrangementState, weights_version: int = WEIGHTS_VERSION) -> str:
+    """
+    플래너 요청의 정규화된 해시
+    - 일정 순서, JSON 키 순서/공백과 무관하게 같은 요청이면 같은 값
+    - 가중치 버전이 바뀌면 다른 값
+    """
+    payload = {
+        "user": request.user.model_dump(mode="json"),
+        "startArrange": request.startArrange,
+        "schedules": _canonical_schedules(request.schedules),
+    }
+    digest = hashlib.sha256(_canonical_json(payload).encode("utf-8")).hexdigest()
+    return f"w{weights_version}:{digest}"
+
+
+def day_plan_key(request: ArrangementState) -> tuple[int, int]:
+    """(userId, 대표 dayPlanId) - save_ai_draft와 동일하게 요청 내 최대 dayPlanId 사용"""
+    return request.user.userId, max((t.dayPlanId for t in request.schedules), default=0)
@@ -0,0 +1,180 @@
+"""
+배열(NumPy) 기반 플래너 점수 계산 유틸
+
+- TaskFeature 목록을 컬럼 배열(중요도/피로도/소요시간)로 변환
+- 체인 후보들을 (후보 x 시간대 x 작업) 멤버십 행렬로 변환
+- 모든 후보의 점수를 몇 번의 행렬 연산으로 한 번에 계산
+  (node4_chain_judgement.calculate_chain_score와 동일한 수식)
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.models.planner.internal import ChainCandidate, TaskFeature
+from app.models.planner.request import ScheduleItem
+from app.models.planner.weights import WeightParams
+
+TIME_ZONE_ORDER = ("MORNING", "AFTERNOON", "EVENING", "NIGHT")
+TIME_ZONE_POSITION = {tz: i for i, tz in enumerate(TIME_ZONE_ORDER)}
+
+
+@dataclass(frozen=True)
+class FeatureArrays:
+    """TaskFeature 컬럼 배열 (task_ids[i]의 값이 각 배열의 i번째 원소)"""
+    task_ids: np.ndarray
+    position: dict[int, int]  # taskId -> 배열 인덱스
+    importance: np.ndarray
+    fatigue: np.ndarray
+    duration_avg: np.ndarray
+    duration_plan: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.task_ids)
+
+
+def build_feature_arrays(task_features: dict[int, TaskFeature]) -> FeatureArrays:
+    """taskFeatures(dict 순서 유지)를 컬럼 배열로 변환"""
+    features = list(task_features.values())
+    task_ids = np.fromiter((f.taskId for f in features), dtype=np.int64, count=len(features))
+    return FeatureArrays(
+        task_ids=task_ids,
+        position={tid: i for i, tid in enumerate(task_features.keys())},
+        importance=np.fromiter((f.importanceScore for f in features), dtype=np.float64, count=len(features)),
+        fatigue=np.fromiter((f.fatigueCost for f in features), dtype=np.float64, count=len(features)),
+        duration_avg=np.fromiter((f.durationAvgMin for f in features), dtype=np.float64, count=len(features)),
+        duration_plan=np.fromiter((f.durationPlanMin for f in features), dtype=np.float64, count=len(features)),
+    )
+
+
+def compute_importance_columns(
+    tasks: list[ScheduleItem],
+    categories: list[str | None],
+    cognitive_loads: list[str | None],
+    weights: WeightParams,
+    duration_params: dict[str, dict[str, int]],
+    cog_load_value: dict[str, int]
+) -> dict[str, np.ndarray]:
+    """
+    Node 2 수식을 컬럼 단위로 계산
+    - importanceScore = (focusLevel * w_focus) + (isUrgent ? w_urgent : 0) + w_category[category]
+      (category == "ERROR"이면 -1.0)
+    - fatigueCost = (durationPlanMin * alpha_duration) + (cognitiveLoad_value * beta_load)
+    """
+    n = len(tasks)
+    default_params = duration_params["MINUTE_30_TO_60"]
+    params = [duration_params.get(t.estimatedTimeRange, default_params) for t in tasks]
+
+    focus = np.fromiter(
+        (t.focusLevel if t.focusLevel is not None else 5 for t in tasks), dtype=np.float64, count=n
+    )
+    urgent = np.fromiter((bool(t.isUrgent) for t in tasks), dtype=bool, count=n)
+    category_score = np.fromiter(
+        (weights.w_category.get(c, 0.0) for c in categories), dtype=np.float64, count=n
+    )
+    is_error = np.fromiter((c == "ERROR" for c in categories), dtype=bool, count=n)
+    cog = np.fromiter(
+        (cog_load_value.get(c or "MED", 1) for c in cognitive_loads), dtype=np.float64, count=n
+    )
+
+    importance = (focus * weights.w_focus) + np.where(urgent, weights.w_urgent, 0.0) + category_score
+    importance = np.where(is_error, -1.0, importance)
+
+    plan = np.fromiter((p["plan"] for p in params), dtype=np.int64, count=n)
+    fatigue = (plan * weights.alpha_duration) + (cog * weights.beta_load)
+
+    return {
+        "importanceScore": importance,
+        "fatigueCost": fatigue,
+        "durationAvgMin": np.fromiter((p["avg"] for p in params), dtype=np.int64, count=n),
+        "durationPlanMin": plan,
+        "durationMinChunk": np.fromiter((p["min"] for p in params), dtype=np.int64, count=n),
+        "durationMaxChunk": np.fromiter((p["max"] for p in params), dtype=np.int64, count=n),
+    }
+
+
+def build_membership_matrix(candidates: list[ChainCandidate], arrays: FeatureArrays) -> np.ndarray:
+    """
+    후보 체인 -> (후보 수, 시간대 4, 작업 수) 정수 행렬
+    값은 해당 시간대 큐에 작업이 등장한 횟수 (중복 포함, 스칼라 계산과 동일한 의미)
+    """
+    membership = np.zeros((len(candidates), len(TIME_ZONE_ORDER), len(arrays)), dtype=np.int32)
+    position = arrays.position
+    for c, chain in enumerate(candidates):
+        for tz, ids in chain.timeZoneQueues.items():
+            z = TIME_ZONE_POSITION.get(tz)
+            if z is None:
+                # 스칼라 계산은 알 수 없는 시간대도 포함/페널티에 반영하므로 조용히 건너뛰면 선택 결과가 달라짐
+                # (TimeZone 검증을 거친 후보에서는 발생하지 않음)
+                raise ValueError(f"Unknown time zone {tz!r} in chain {chain.chainId}")
+            if not ids:
+                continue
+            # 존재하지 않는 taskId는 스칼라 계산과 마찬가지로 KeyError
+            np.add.at(membership[c, z], [position[tid] for tid in ids], 1)
+    return membership
+
+
+def capacity_vector(capacity: dict[str, int]) -> np.ndarray:
+    return np.array([capacity.get(tz, 0) for tz in TIME_ZONE_ORDER], dtype=np.float64)
+
+
+def overflow_penalty_array(overflow: np.ndarray, capacity: np.ndarray, w_overflow: float) -> np.ndarray:
+    """node4_chain_judgement.overflow_penalty의 배열 버전 (capacity는 overflow에 broadcast)"""
+    capacity = np.broadcast_to(capacity, overflow.shape)
+    safe_buffer = capacity * 0.2
+    excess = overflow - safe_buffer
+    with_capacity = np.where(overflow <= safe_buffer, 0.001 * overflow, w_overflow * (excess ** 2))
+    no_capacity = np.where(overflow > 0, w_overflow * (overflow ** 2), 0.0)
+    return np.where(capacity <= 0, no_capacity, with_capacity)
+
+
+def score_candidates(
+    membership: np.ndarray,
+    arrays: FeatureArrays,
+    capacity: dict[str, int],
+    weights: WeightParams,
+    focus_timezone: str
+) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    """
+    모든 후보의 체인 점수를 한 번에 계산
+    Returns: (후보별 Total Score 배열, 항목별 상세 배열 Dict)
+    """
+    counts = membership.astype(np.float64)
+    included = membership.sum(axis=1) > 0          # (C, N)
+    cap = capacity_vector(capacity)                # (4,)
+
+    # 1. Included Utility / 2. Excluded Cost
+    score_included = included.astype(np.float64) @ arrays.importance
+    score_excluded = (~included).astype(np.float64) @ arrays.importance
+
+    # 3. Overflow Penalty (시간대별)
+    tz_duration = counts @ arrays.duration_avg     # (C, 4)
+    overflow = np.maximum(0.0, tz_duration - cap)
+    penalty_overflow = overflow_penalty_array(overflow, cap, weights.w_overflow).sum(axis=1)
+
+    # 4. Fatigue Risk Penalty (시간대별)
+    tz_fatigue = counts @ arrays.fatigue           # (C, 4)
+    penalty_fatigue = (np.maximum(0.0, tz_fatigue - cap) * weights.w_fatigue_risk).sum(axis=1)
+
+    # 5. Focus Alignment Bonus
+    focus_idx = TIME_ZONE_POSITION.get(focus_timezone)
+    if focus_idx is None:
+        score_focus_align = np.zeros(len(membership))
+    else:
+        score_focus_align = counts[:, focus_idx, :] @ arrays.importance
+
+    term_included = weights.w_included * score_included
+    term_excluded = weights.w_excluded * score_excluded
+    term_align = weights.w_focus_align * score_focus_align
+
+    final_score = term_included - term_excluded - penalty_overflow - penalty_fatigue + term_align
+
+    details = {
+        "included_utility": term_included,
+        "excluded_cost": term_excluded,
+        "overflow_penalty": penalty_overflow,
+        "fatigue_penalty": penalty_fatigue,
+        "focus_align_bonus": term_align,
+        "raw_included": score_included,
+        "raw_excluded": score_excluded
+    }
+    return final_score, details
@@ -0,0 +1,113 @@
+from collections import defaultdict
+from typing import Any, Callable
+
+from app.models.planner.internal import PlannerGraphState, ChainCandidate
+from app.models.planner.request import ScheduleItem
+from app.services.planner.utils.session_utils import calculate_capacity
+from app.services.planner.utils.score_arrays import FeatureArrays, build_feature_arrays
+
+
+class PlannerStateIndex:
+    """
+    PlannerGraphState에서 파생되는 조회용 데이터(Index)를 지연 계산 + 메모이제이션
+
+    - 최초 접근 시에만 계산하고, 이후에는 캐시된 값을 반환
+    - 캐시는 state의 private 속성에 저장되며 model_copy 시 함께 공유됨
+    - 계산에 사용한 원본 필드(list/dict)의 identity가 바뀌면 자동으로 재계산
+      (노드들은 필드를 제자리 수정하지 않고 새 객체로 교체하므로 안전함)
+    """
+
+    def __init__(self, state: PlannerGraphState, cache: dict[Any, tuple]):
+        self._state = state
+        self._cache = cache
+
+    def _memo(self, key: Any, sources: tuple, build: Callable[[], Any]) -> Any:
+        hit = self._cache.get(key)
+        if hit is not None and len(hit[0]) == len(sources) and all(a is b for a, b in zip(hit[0], sources)):
+            return hit[1]
+        value = build()
+        self._cache[key] = (sources, value)
+        return value
+
+    @property
+    def capacity(self) -> dict[str, int]:
+        """시간대별 총 가용 시간(분). 읽기 전용으로 사용할 것"""
+        sessions = self._state.freeSessions
+        return self._memo("capacity", (sessions,), lambda: calculate_capacity(sessions))
+
+    @property
+    def schedule_by_id(self) -> dict[int, ScheduleItem]:
+        """요청 전체 schedules의 taskId -> ScheduleItem"""
+        request = self._state.request
+        return self._memo(
+            "schedule_by_id", (request,),
+            lambda: {t.taskId: t for t in request.schedules}
+        )
+
+    @property
+    def flex_by_id(self) -> dict[int, ScheduleItem]:
+        """flexTasks의 taskId -> ScheduleItem"""
+        flex_tasks = self._state.flexTasks
+        return self._memo("flex_by_id", (flex_tasks,), lambda: {t.taskId: t for t in flex_tasks})
+
+    @property
+    def parent_of(self) -> dict[int, ScheduleItem]:
+        """taskId -> 부모 ScheduleItem (parentScheduleId가 실제 요청에 존재하는 경우만)"""
+        request = self._state.request
+
+        def _build() -> dict[int, ScheduleItem]:
+            by_id = self.schedule_by_id
+            return {
+                t.taskId: by_id[t.parentScheduleId]
+                for t in request.schedules
+                if t.parentScheduleId is not None and t.parentScheduleId in by_id
+            }
+
+        return self._memo("parent_of", (request,), _build)
+
+    @property
+    def group_members(self) -> dict[str, list[tuple[int, int]]]:
+        """groupId -> [(orderInGroup, taskId), ...] (orderInGroup 오름차순)"""
+        task_features = self._state.taskFeatures
+
+        def _build() -> dict[str, list[tuple[int, int]]]:
+            members: dict[str, list[tuple[int, int]]] = defaultdict(list)
+            for f in task_features.values():
+                if f.groupId and f.orderInGroup is not None:
+                    members[f.groupId].append((f.orderInGroup, f.taskId))
+            for items in members.values():
+                items.sort()
+            return dict(members)
+
+        return self._memo("group_members", (task_features,), _build)
+
+    @property
+    def group_orders(self) -> dict[str, dict[int, int]]:
+        """groupId -> {orderInGroup: taskId} (apply_closure 입력용)"""
+        task_features = self._state.taskFeatures
+        return self._memo(
+            "group_orders", (task_features,),
+            lambda: {gid: {order: tid for order, tid in items} for gid, items in self.group_members.items()}
+        )
+
+    @property
+    def feature_arrays(self) -> FeatureArrays:
+        """taskFeatures의 컬럼 배열 (배열 기반 점수 계산용)"""
+        task_features = self._state.taskFeatures
+        return self._memo("feature_arrays", (task_features,), lambda: build_feature_arrays(task_features))
+
+    def closed_chain(self, chain: ChainCandidate) -> ChainCandidate:
+        """체인별 apply_closure 결과 (체인 객체 단위로 1회만 계산)"""
+        # 순환 import 방지 (node4 -> state_index -> node4)
+        from app.services.planner.nodes.node4_chain_judgement import apply_closure
+
+        task_features = self._state.taskFeatures
+        return self._memo(
+            ("closure", id(chain)), (chain, task_features),
+            lambda: apply_closure(chain, task_features, group_orders=self.group_orders)
+        )
+
+
+def get_state_index(state: PlannerGraphState) -> PlannerStateIndex:
+    """state에 부착된 파생 데이터 인덱스를 반환"""
+    return PlannerStateIndex(state, state._derived_cache)
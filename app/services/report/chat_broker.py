@@ -0,0 +1,454 @@
+"""
+챗봇 스트림 브로커 (POST /chat/respond의 생성 결과를 GET /stream으로 전달)
+
+- ChatStreamBroker: 스트림 등록(open) / 이벤트 발행(publish) / 구독(subscribe) / 취소 요청 / 삭제(close)
+  - 이벤트는 스트림마다 1부터 증가하는 id를 가지며, 구독자는 지정한 id 이후 이벤트부터 읽음
+  - complete / error 이벤트가 오면 구독 종료
+  - 생성 Task는 POST를 받은 워커에만 있으므로, 취소 요청은 on_cancel로 등록한 핸들러를 통해 해당 워커에서 처리
+  - 사용자별 진행 중 스트림 수(count_streams) / 구독자 없이 오래된 스트림(orphaned_streams) 조회 (세션 관리용)
+  - 연결이 끊긴 클라이언트는 마지막으로 받은 id(Last-Event-ID) 이후부터 다시 구독 (LLM 재호출 없음)
+- memory: 프로세스 내 이벤트 버퍼 (단일 워커, 기본값)
+  - 읽지 않은 이벤트가 max_buffered_events개면 발행이 대기 (Backpressure)
+  - 모든 구독자가 읽은 이벤트는 최근 replay_events개만 재연결용으로 보관 (Ring Buffer)
+- postgres: chat_streams / chat_stream_events 테이블 + LISTEN/NOTIFY
+  - 어느 워커든 다른 워커가 생성 중인 스트림을 구독 가능 (여러 uvicorn 워커 / 로드 밸런서 뒤에서 사용)
+  - NOTIFY는 깨우기 용도이며, 누락되어도 chat_stream_poll_seconds 간격으로 테이블을 다시 조회
+  - 이벤트는 테이블에 쌓이므로 발행 대기(Backpressure)는 없고, 구독자 없는 스트림은 세션 관리자가 정리
+"""
+import asyncio
+import logging
+import os
+import socket
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Optional
+
+from app.core.config import settings
+from app.core.metrics import get_metrics_registry
+from app.db.repositories.chat_stream_repository import (
+    CHAT_CANCEL_CHANNEL, CHAT_EVENT_CHANNEL, ChatStreamRepository
+)
+
+logger = logging.getLogger(__name__)
+
+# 이 이벤트 이후에는 더 이상 이벤트가 없음 (구독 종료)
+TERMINAL_EVENTS = ("complete", "error")
+
+CancelHandler = Callable[[int], None]
+
+_registry = get_metrics_registry()
+CHAT_BACKPRESSURE_WAIT_SECONDS = _registry.histogram(
+    "chat_stream_backpressure_wait_seconds", "Time a chat generation waited for a full stream buffer to drain"
+)
+
+# 이벤트 1개의 고정 오버헤드 추정치(bytes, 객체 / dict 헤더)
+EVENT_OVERHEAD_BYTES = 200
+
+
+def estimate_event_bytes(data: dict[str, Any]) -> int:
+    """메모리 사용량 추정 (직렬화 없이 값 길이 합 + 고정 오버헤드)"""
+    return EVENT_OVERHEAD_BYTES + sum(len(str(value)) for value in data.values())
+
+
+@dataclass(frozen=True)
+class StreamEvent:
+    id: int
+    event: str
+    data: dict[str, Any]
+
+
+class ReplayGapError(LookupError):
+    """재연결 시 요청한 id 이후 이벤트 일부가 이미 버려져 이어서 전달할 수 없음"""
+
+
+class ChatStreamBroker(ABC):
+    """챗봇 스트림 브로커 인터페이스"""
+
+    def __init__(self):
+        self._cancel_handlers: list[CancelHandler] = []
+
+    @abstractmethod
+    async def open(self, message_id: int, user_id: int | None = None) -> bool:
+        """스트림 등록 (같은 messageId 스트림이 이미 있으면 False)"""
+
+    @abstractmethod
+    async def exists(self, message_id: int) -> bool:
+        ...
+
+    @abstractmethod
+    async def publish(self, message_id: int, event: str, data: dict[str, Any]) -> int:
+        """이벤트 발행, 부여된 이벤트 id 반환 (삭제된 스트림이면 기록하지 않고 0)"""
+
+    @abstractmethod
+    def subscribe(self, message_id: int, after: int = 0) -> AsyncIterator[StreamEvent]:
+        """after 이후 이벤트를 순서대로 (종료 이벤트 / 스트림 삭제 시 종료, 이미 버려진 이벤트가 필요하면 ReplayGapError)"""
+
+    @abstractmethod
+    async def count_streams(self, user_id: int) -> int:
+        """사용자의 진행 중(종료 이벤트 전) 스트림 수"""
+
+    @abstractmethod
+    async def orphaned_streams(self, idle_seconds: float) -> list[int]:
+        """구독자 없이 idle_seconds가 지난 스트림 (GET이 연결되지 않았거나, 연결이 끊긴 뒤 재연결되지 않음)"""
+
+    @abstractmethod
+    async def abandoned_seconds(self, message_id: int) -> float | None:
+        """생성 중(종료 이벤트 전)인 스트림에 구독자가 없었던 시간(초), 구독 중 / 종료 / 삭제된 스트림이면 None"""
+
+    @abstractmethod
+    async def request_cancel(self, message_id: int) -> None:
+        """스트림을 생성 중인 워커에 취소 요청"""
+
+    @abstractmethod
+    async def close(self, message_id: int) -> None:
+        """스트림 삭제 (구독 중인 소비자도 종료)"""
+
+    def stats(self) -> dict[str, int]:
+        """이 프로세스의 스트림 수 / 보관 이벤트 수 / 추정 메모리(bytes) (메트릭용)"""
+        return {"streams": 0, "buffered_events": 0, "max_buffered_events": 0, "buffered_bytes": 0}
+
+    async def shutdown(self) -> None:
+        pass
+
+    def on_cancel(self, handler: CancelHandler) -> None:
+        if handler not in self._cancel_handlers:
+            self._cancel_handlers.append(handler)
+
+    def _dispatch_cancel(self, message_id: int) -> None:
+        for handler in self._cancel_handlers:
+            try:
+                handler(message_id)
+            except Exception as e:
+                logger.error(f"Chat cancel handler failed for messageId {message_id}: {e}")
+
+
+@dataclass
+class _MemoryStream:
+    user_id: int | None
+    # 재연결용으로 보관 중인 전달된 이벤트 + 아직 읽지 않은 이벤트 (id 순)
+    events: deque = field(default_factory=deque)
+    last_id: int = 0
+    # 연결 중인 모든 구독자가 읽은 마지막 이벤트 id
+    delivered: int = 0
+    buffered_bytes: int = 0
+    finished: bool = False
+    closed: bool = False
+    # 구독자별 마지막으로 읽은 이벤트 id
+    cursors: dict[int, int] = field(default_factory=dict)
+    # 구독자가 없어진 시각 (구독 중이면 None)
+    idle_since: Optional[float] = field(default_factory=time.monotonic)
+    changed: asyncio.Condition = field(default_factory=asyncio.Condition)
+
+    def first_id(self) -> int:
+        """보관 중인 첫 이벤트 id (비어 있으면 다음에 발행될 id)"""
+        return self.events[0][0].id if self.events else self.last_id + 1
+
+    def trim(self, replay_events: int) -> None:
+        """모든 구독자가 읽은 이벤트 중 최근 replay_events개만 남기고 제거 (재연결해 뒤처진 구독자의 범위는 유지)"""
+        oldest = min(self.cursors.values(), default=self.delivered)
+        self.delivered = max(self.delivered, oldest)
+        floor = oldest - replay_events
+        while self.events and self.events[0][0].id <= floor:
+            _, size = self.events.popleft()
+            self.buffered_bytes -= size
+
+
+class InMemoryChatStreamBroker(ChatStreamBroker):
+    """
+    프로세스 내 스트림 브로커 (POST / GET이 같은 프로세스로 와야 함)
+    - max_buffered_events: 스트림별 읽지 않은 이벤트 상한 (0이면 무제한)
+    - replay_events: 스트림별로 보관하는 전달된 이벤트 수 (재연결 시 이 범위 안에서만 이어서 전달)
+    """
+
+    def __init__(self, max_buffered_events: int = 0, replay_events: int = 0):
+        super().__init__()
+        self._max_buffered_events = max_buffered_events
+        self._replay_events = replay_events
+        self._streams: dict[int, _MemoryStream] = {}
+
+    async def open(self, message_id: int, user_id: int | None = None) -> bool:
+        if message_id in self._streams:
+            return False
+        self._streams[message_id] = _MemoryStream(user_id=user_id)
+        return True
+
+    async def exists(self, message_id: int) -> bool:
+        return message_id in self._streams
+
+    def _is_full(self, stream: _MemoryStream) -> bool:
+        return 0 < self._max_buffered_events <= stream.last_id - stream.delivered
+
+    async def publish(self, message_id: int, event: str, data: dict[str, Any]) -> int:
+        stream = self._streams.get(message_id)
+        if stream is None:
+            return 0
+        async with stream.changed:
+            if self._is_full(stream):
+                # 구독자가 따라올 때까지 대기 (구독자가 없으면 세션 관리자가 정리할 때까지)
+                started = time.perf_counter()
+                await stream.changed.wait_for(lambda: stream.closed or not self._is_full(stream))
+                CHAT_BACKPRESSURE_WAIT_SECONDS.observe(time.perf_counter() - started)
+            if stream.closed:
+                return 0
+            stream.last_id += 1
+            item = StreamEvent(stream.last_id, event, data)
+            size = estimate_event_bytes(data)
+            stream.events.append((item, size))
+            stream.buffered_bytes += size
+            stream.finished = stream.finished or event in TERMINAL_EVENTS
+            stream.changed.notify_all()
+        return item.id
+
+    async def subscribe(self, message_id: int, after: int = 0) -> AsyncIterator[StreamEvent]:
+        stream = self._streams.get(message_id)
+        if stream is None:
+            return
+        if after + 1 < stream.first_id():
+            raise ReplayGapError(f"Events after id {after} are no longer buffered for messageId {message_id}")
+        token = object()
+        cursor = after
+        stream.cursors[id(token)] = cursor
+        stream.idle_since = None
+        try:
+            while not (stream.finished and cursor >= stream.last_id):
+                async with stream.changed:
+                    await stream.changed.wait_for(lambda: stream.last_id > cursor or stream.closed)
+                    if stream.closed:
+                        return
+                    # 자신의 cursor 이후 이벤트는 trim되지 않으므로 항상 이어서 전달 가능
+                    pending = [item for item, _ in stream.events if item.id > cursor]
+                    # 넘겨준 이벤트는 읽은 것으로 보고 재연결용 범위 밖 이벤트 제거 (대기 중인 발행 재개)
+                    stream.cursors[id(token)] = pending[-1].id
+                    stream.trim(self._replay_events)
+                    stream.changed.notify_all()
+                for item in pending:
+                    cursor = item.id
+                    yield item
+                    if item.event in TERMINAL_EVENTS:
+                        return
+        finally:
+            stream.cursors.pop(id(token), None)
+            if not stream.cursors:
+                stream.idle_since = time.monotonic()
+
+    async def count_streams(self, user_id: int) -> int:
+        return sum(1 for s in list(self._streams.values()) if s.user_id == user_id and not s.finished)
+
+    async def orphaned_streams(self, idle_seconds: float) -> list[int]:
+        deadline = time.monotonic() - idle_seconds
+        return [
+            message_id for message_id, s in list(self._streams.items())
+            if s.idle_since is not None and s.idle_since <= deadline
+        ]
+
+    async def abandoned_seconds(self, message_id: int) -> float | None:
+        stream = self._streams.get(message_id)
+        if stream is None or stream.finished or stream.idle_since is None:
+            return None
+        return time.monotonic() - stream.idle_since
+
+    async def request_cancel(self, message_id: int) -> None:
+        self._dispatch_cancel(message_id)
+
+    async def close(self, message_id: int) -> None:
+        stream = self._streams.pop(message_id, None)
+        if stream is None:
+            return
+        async with stream.changed:
+            stream.closed = True
+            stream.events.clear()
+            stream.buffered_bytes = 0
+            stream.changed.notify_all()
+
+    def stats(self) -> dict[str, int]:
+        streams = list(self._streams.values())
+        sizes = [len(s.events) for s in streams]
+        return {
+            "streams": len(sizes),
+            "buffered_events": sum(sizes),
+            "max_buffered_events": max(sizes, default=0),
+            "buffered_bytes": sum(s.buffered_bytes for s in streams),
+        }
+
+
+def _asyncpg_dsn(database_url: str) -> str:
+    """SQLAlchemy URL(postgresql+asyncpg://...) -> asyncpg DSN"""
+    return database_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+class PostgresChatStreamBroker(ChatStreamBroker):
+    """
+    Postgres 스트림 브로커 (이벤트는 테이블에 저장, LISTEN/NOTIFY로 구독자 / 생성 워커를 깨움)
+    - LISTEN 전용 asyncpg 연결은 첫 사용 시 생성 (연결 실패 시 폴링만으로 동작)
+    """
+
+    def __init__(
+        self,
+        repository: Optional[ChatStreamRepository] = None,
+        dsn: Optional[str] = None,
+        poll_seconds: float = 1.0
+    ):
+        super().__init__()
+        self._repo = repository or ChatStreamRepository()
+        self._dsn = dsn
+        self._poll_seconds = poll_seconds
+        self._owner = f"{socket.gethostname()}:{os.getpid()}"
+        # 이 워커가 생성 중인 스트림의 마지막 이벤트 id / 발행한 이벤트 추정 크기(bytes)
+        self._last_ids: dict[int, int] = {}
+        self._published_bytes: dict[int, int] = {}
+        self._wakeups: dict[int, set[asyncio.Event]] = defaultdict(set)
+        self._listener: Any = None
+        self._listener_lock = asyncio.Lock()
+
+    async def _ensure_listener(self) -> None:
+        if self._dsn is None or (self._listener is not None and not self._listener.is_closed()):
+            return
+        async with self._listener_lock:
+            if self._listener is not None and not self._listener.is_closed():
+                return
+            import asyncpg
+            try:
+                conn = await asyncpg.connect(self._dsn)
+                await conn.add_listener(CHAT_EVENT_CHANNEL, self._on_notify)
+                await conn.add_listener(CHAT_CANCEL_CHANNEL, self._on_notify)
+                self._listener = conn
+            except Exception as e:
+                logger.warning(f"Chat stream LISTEN connection failed, falling back to polling: {e}")
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        self.handle_notification(channel, payload)
+
+    def handle_notification(self, channel: str, payload: str) -> None:
+        """NOTIFY 수신: 이벤트 알림은 구독자 깨우기, 취소 알림은 생성 중인 워커에서 취소 핸들러 호출"""
+        try:
+            message_id = int(payload)
+        except ValueError:
+            return
+        if channel == CHAT_CANCEL_CHANNEL:
+            if message_id in self._last_ids:
+                self._dispatch_cancel(message_id)
+            return
+        for wakeup in self._wakeups.get(message_id, ()):
+            wakeup.set()
+
+    async def open(self, message_id: int, user_id: int | None = None) -> bool:
+        await self._ensure_listener()
+        if not await self._repo.create_stream(message_id, user_id, self._owner):
+            return False
+        self._last_ids[message_id] = 0
+        self._published_bytes[message_id] = 0
+        return True
+
+    async def exists(self, message_id: int) -> bool:
+        return await self._repo.stream_exists(message_id)
+
+    async def publish(self, message_id: int, event: str, data: dict[str, Any]) -> int:
+        if message_id not in self._last_ids:
+            return 0
+        event_id = self._last_ids[message_id] + 1
+        self._last_ids[message_id] = event_id
+        self._published_bytes[message_id] += estimate_event_bytes(data)
+        finished = event in TERMINAL_EVENTS
+        await self._repo.append_event(message_id, event_id, event, data, finished=finished)
+        if finished:
+            # 생성 종료 (이후 취소 요청은 무시)
+            self._last_ids.pop(message_id, None)
+            self._published_bytes.pop(message_id, None)
+        return event_id
+
+    async def subscribe(self, message_id: int, after: int = 0) -> AsyncIterator[StreamEvent]:
+        await self._ensure_listener()
+        await self._repo.attach_subscriber(message_id)
+        wakeup = asyncio.Event()
+        self._wakeups[message_id].add(wakeup)
+        try:
+            # 이벤트는 스트림 삭제 전까지 테이블에 모두 남아 있으므로 재연결 시 누락 없음
+            cursor = after
+            while True:
+                wakeup.clear()
+                rows = await self._repo.fetch_events(message_id, cursor)
+                for event_id, event, data in rows:
+                    cursor = event_id
+                    yield StreamEvent(event_id, event, data)
+                    if event in TERMINAL_EVENTS:
+                        return
+                if not rows:
+                    finished = await self._repo.fetch_stream_finished(message_id)
+                    if finished is None or finished:
+                        # 스트림 삭제 / 종료 이벤트 이후 재연결
+                        return
+                try:
+                    await asyncio.wait_for(wakeup.wait(), self._poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            waiters = self._wakeups.get(message_id)
+            if waiters is not None:
+                waiters.discard(wakeup)
+                if not waiters:
+                    del self._wakeups[message_id]
+            await self._repo.detach_subscriber(message_id)
+
+    async def count_streams(self, user_id: int) -> int:
+        return await self._repo.count_active_streams(user_id)
+
+    async def orphaned_streams(self, idle_seconds: float) -> list[int]:
+        # 종료된 워커가 남긴 스트림도 포함 (생성 워커와 무관하게 조회)
+        return await self._repo.find_orphaned_streams(idle_seconds)
+
+    async def abandoned_seconds(self, message_id: int) -> float | None:
+        return await self._repo.fetch_abandoned_seconds(message_id)
+
+    async def request_cancel(self, message_id: int) -> None:
+        if message_id in self._last_ids:
+            # 이 워커가 생성 중이면 바로 취소
+            self._dispatch_cancel(message_id)
+            return
+        await self._repo.notify_cancel(message_id)
+
+    async def close(self, message_id: int) -> None:
+        self._last_ids.pop(message_id, None)
+        self._published_bytes.pop(message_id, None)
+        await self._repo.delete_stream(message_id)
+        for wakeup in self._wakeups.get(message_id, ()):
+            wakeup.set()
+
+    def stats(self) -> dict[str, int]:
+        sizes = list(self._last_ids.values())
+        return {
+            "streams": len(sizes),
+            "buffered_events": sum(sizes),
+            "max_buffered_events": max(sizes, default=0),
+            "buffered_bytes": sum(self._published_bytes.values()),
+        }
+
+    async def shutdown(self) -> None:
+        if self._listener is not None and not self._listener.is_closed():
+            await self._listener.close()
+        self._listener = None
+
+
+_chat_stream_broker: Optional[ChatStreamBroker] = None
+
+def get_chat_stream_broker() -> ChatStreamBroker:
+    global _chat_stream_broker
+    if _chat_stream_broker is None:
+        if settings.chat_stream_broker == "postgres":
+            _chat_stream_broker = PostgresChatStreamBroker(
+                dsn=_asyncpg_dsn(settings.database_url or ""),
+                poll_seconds=settings.chat_stream_poll_seconds
+            )
+        else:
+            _chat_stream_broker = InMemoryChatStreamBroker(
+                max_buffered_events=settings.chat_stream_max_buffered_events,
+                replay_events=settings.chat_stream_replay_events
+            )
+    return _chat_stream_broker
+
+
+async def shutdown_chat_stream_broker() -> None:
+    """앱 종료 시 LISTEN 연결 정리"""
+    if _chat_stream_broker is not None:
+        await _chat_stream_broker.shutdown()
@@ -0,0 +1,122 @@
+"""
+챗봇 SSE 스트리밍 전송 속도 조절 (Pacing)
+
+모델이 보낸 텍스트 조각을 SSE chunk 이벤트(delta)로 내보내는 방식을 설정(settings.chat_stream_pacing)으로 선택
+- passthrough: 모델 Chunk를 받는 즉시 그대로 전송
+- coalesce: 첫 조각은 즉시 전송하고, 이후 chat_stream_flush_ms 안에 도착한 조각은 모아서 한 번에 전송
+- typing: chat_stream_flush_ms 프레임마다 chat_typing_chars_per_second 속도만큼 잘라서 전송 (타이핑 효과)
+
+이벤트 수가 어절 수가 아니라 프레임 수에 비례하므로, 동시 스트림이 많을 때 JSON 인코딩 / 큐 적재 비용이 줄어듦
+"""
+import asyncio
+import time
+from typing import Awaitable, Callable, Literal, Optional
+
+from app.core.config import settings
+
+ChatPacingMode = Literal["passthrough", "coalesce", "typing"]
+EmitFn = Callable[[str], Awaitable[None]]
+
+
+class ChunkPacer:
+    """
+    텍스트 조각 -> emit(delta) 호출
+    - feed(): 모델 텍스트 조각 입력, close(): 남은 텍스트 전송 후 종료 (typing은 남은 텍스트를 설정 속도로 전송)
+    - cancel(): 남은 텍스트를 버리고 예약된 전송 중단 (요청 취소 / 재시도 시)
+    """
+
+    def __init__(
+        self,
+        emit: EmitFn,
+        mode: ChatPacingMode = "coalesce",
+        flush_ms: float = 50.0,
+        chars_per_second: float = 120.0
+    ):
+        if mode == "typing" and chars_per_second <= 0:
+            raise ValueError("chars_per_second must be positive for typing mode")
+        self.mode = mode
+        self._emit = emit
+        self._interval = max(flush_ms, 0.0) / 1000
+        self._chars_per_second = chars_per_second
+        self._buffer = ""
+        self._last_flush = float("-inf")
+        self._background: Optional[asyncio.Task] = None
+        self._closing = False
+        # emit 순서 보장 (큐 적재 중 대기가 생겨도 조각 순서 유지)
+        self._lock = asyncio.Lock()
+
+    async def feed(self, text: str) -> None:
+        if not text:
+            return
+        if self.mode == "passthrough":
+            await self._emit(text)
+            return
+
+        self._buffer += text
+        if self.mode == "typing":
+            if self._background is None:
+                self._background = asyncio.create_task(self._type_out())
+            return
+
+        elapsed = time.monotonic() - self._last_flush
+        if elapsed >= self._interval:
+            await self._flush()
+        elif self._background is None:
+            self._background = asyncio.create_task(self._flush_later(self._interval - elapsed))
+
+    async def _flush(self) -> None:
+        async with self._lock:
+            text, self._buffer = self._buffer, ""
+            self._last_flush = time.monotonic()
+            if text:
+                await self._emit(text)
+
+    async def _flush_later(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._background = None
+        await self._flush()
+
+    async def _type_out(self) -> None:
+        """프레임마다 속도만큼 전송 (프레임 사이 남은 글자 수는 다음 프레임으로 이월)"""
+        frame = self._interval or 0.05
+        budget = 0.0
+        while self._buffer or not self._closing:
+            await asyncio.sleep(frame)
+            budget += self._chars_per_second * frame
+            size = int(budget)
+            if size <= 0 or not self._buffer:
+                # 보낼 텍스트가 없으면 이월하지 않음 (다음 조각이 한꺼번에 나가지 않도록)
+                budget = min(budget, 1.0)
+                continue
+            async with self._lock:
+                text, self._buffer = self._buffer[:size], self._buffer[size:]
+                budget -= len(text)
+                await self._emit(text)
+
+    async def close(self) -> None:
+        """남은 텍스트 전송 (typing은 설정 속도로 끝까지 전송)"""
+        self._closing = True
+        background, self._background = self._background, None
+        if self.mode == "typing" and background is not None:
+            await background
+            return
+        if background is not None:
+            background.cancel()
+        await self._flush()
+
+    def cancel(self) -> None:
+        self._closing = True
+        self._buffer = ""
+        if self._background is not None:
+            self._background.cancel()
+            self._background = None
+
+
+def build_chunk_pacer(emit: EmitFn) -> ChunkPacer:
+    """설정 기반 ChunkPacer 생성"""
+    return ChunkPacer(
+        emit,
+        mode=settings.chat_stream_pacing,
+        flush_ms=settings.chat_stream_flush_ms,
+        chars_per_second=settings.chat_typing_chars_per_second
+    )
@@ -1,5 +1,4 @@
 import asyncio
-import json
 import logging
 import time
 from typing import AsyncGenerator, Annotated, Any
@@ -8,8 +7,15 @@ from fastapi import HTTPException
 from google.genai import types
 from google.genai.errors import APIError
 
+from app.core.config import settings
+from app.core.metrics import get_metrics_registry
+from app.core.sse import format_sse
 from app.llm.gemini_client import get_gemini_client
 from app.llm.prompts.chat_prompt import CHAT_SYSTEM_PROMPT
+from app.services.report.chat_broker import ReplayGapError, get_chat_stream_broker
+from app.services.report.chat_pacing import build_chunk_pacer
+from app.services.report.chat_sessions import ChatSessionManager
+from app.services.report.chat_tools import ChatToolExecutor
 from app.models.chat import (
     ChatRespondRequest,
     ChatRespondAckResponse,
@@ -25,31 +31,68 @@ from app.models.chat import (
 
 logger = logging.getLogger(__name__)
 
-# 장기 연결 세션 및 큐 관리
-# Key: message_id, Value: dict("queue": asyncio.Queue, "task": asyncio.Task)
-_active_sessions: dict[int, dict[str, Any]] = {}
+# 이 프로세스에서 실행 중인 생성 Task (이벤트 전달은 스트림 브로커가 담당)
+# Key: message_id, Value: asyncio.Task
+_generation_tasks: dict[int, asyncio.Task] = {}
+
+_registry = get_metrics_registry()
+CHAT_ACTIVE_STREAMS = _registry.gauge("chat_active_streams", "Chat streams held by this process")
+CHAT_QUEUED_EVENTS = _registry.gauge("chat_stream_queued_events", "SSE events buffered for chat streams in this process")
+CHAT_MAX_QUEUE_DEPTH = _registry.gauge("chat_stream_queue_depth_max", "Most events buffered for a single chat stream")
+CHAT_BUFFERED_BYTES = _registry.gauge("chat_stream_buffered_bytes", "Estimated memory held by buffered chat stream events")
+
+
+def _collect_chat_metrics() -> None:
+    """스크랩 시점의 스트림 수 / 보관 이벤트 수 / 추정 메모리 (세션별 라벨은 시계열 폭증 방지를 위해 사용하지 않음)"""
+    stats = get_chat_stream_broker().stats()
+    CHAT_ACTIVE_STREAMS.set(stats["streams"])
+    CHAT_QUEUED_EVENTS.set(stats["buffered_events"])
+    CHAT_MAX_QUEUE_DEPTH.set(stats["max_buffered_events"])
+    CHAT_BUFFERED_BYTES.set(stats["buffered_bytes"])
+
+
+def _cancel_generation_task(message_id: int) -> None:
+    """브로커의 취소 요청 처리 (이 프로세스에서 생성 중인 Task만 취소)"""
+    task = _generation_tasks.get(message_id)
+    if task is not None and not task.done():
+        task.cancel()
+        logger.info(f"Cancelled active chat task for messageId: {message_id}")
+
+
+_registry.register_collector(_collect_chat_metrics)
 
 class ChatService:
     def __init__(self):
         self.gemini = get_gemini_client()
+        self.broker = get_chat_stream_broker()
+        self.broker.on_cancel(_cancel_generation_task)
+        self.sessions = ChatSessionManager(
+            self.broker,
+            max_streams_per_user=settings.chat_max_streams_per_user,
+            idle_ttl_seconds=settings.chat_stream_idle_ttl_seconds,
+            disconnect_grace_seconds=settings.chat_disconnect_grace_seconds
+        )
 
     async def respond(self, report_id: int, request: ChatRespondRequest) -> ChatRespondAckResponse:
         """
         POST API 로직: 응답 생성 접수 및 백그라운드 태스크 시작
         """
-        if request.message_id in _active_sessions:
+        # 사용자별 동시 스트림 상한 초과 시 429
+        await self.sessions.check_user_limit(request.user_id)
+
+        # 스트림 등록 (다른 워커에 같은 messageId 스트림이 있어도 409)
+        if not await self.broker.open(request.message_id, user_id=request.user_id):
             raise HTTPException(status_code=409, detail="A stream for this messageId is already active.")
 
-        # SSE 이벤트를 담을 큐 생성
-        queue = asyncio.Queue()
-        
-        # 백그라운드에서 Gemini API를 호출하고 큐에 이벤트를 넣는 태스크 시작
-        task = asyncio.create_task(self._generate_task(report_id, request.message_id, request.messages))
-        
-        _active_sessions[request.message_id] = {
-            "queue": queue,
-            "task": task
-        }
+        # 백그라운드에서 Gemini API를 호출하고 브로커에 이벤트를 발행하는 태스크 시작
+        message_id = request.message_id
+        task = asyncio.create_task(self._generate_task(report_id, message_id, request.messages))
+        _generation_tasks[message_id] = task
+        task.add_done_callback(
+            lambda t: _generation_tasks.pop(message_id, None) if _generation_tasks.get(message_id) is t else None
+        )
+        # GET이 연결되지 않은 스트림 정리
+        self.sessions.ensure_reaper()
 
         return ChatRespondAckResponse(
             success=True,
@@ -58,16 +101,15 @@ class ChatService:
         )
 
     async def _generate_task(self, report_id: int, message_id: int, messages: list):
-        """본격적인 API 호출 및 Queue 적재 로직 (백그라운드 실행)"""
-        session = _active_sessions.get(message_id)
-        if not session:
-            return
-        queue = session["queue"]
+        """본격적인 API 호출 및 브로커 이벤트 발행 로직 (백그라운드 실행)"""
+        publish = self.broker.publish
+        pacer = None
+        tool_executor = None
 
         try:
             # Event: Start 전송
             start_event = ChatStreamStartEvent(messageId=message_id)
-            await queue.put(("start", start_event.model_dump(by_alias=True)))
+            await publish(message_id, "start", start_event.model_dump(by_alias=True))
 
             gemini_contents = []
             for msg in messages:
@@ -114,6 +156,22 @@ class ChatService:
             # Gemini에 제공할 도구 목록
             tools = [search_schedules_by_date, search_tasks_by_similarity]
 
+            # 도구 실행기 (선조회가 켜져 있으면 첫 모델 호출과 병렬로 최근 일정 조회 시작)
+            tool_executor = ChatToolExecutor(user_id, prefetch_days=settings.chat_tool_prefetch_days)
+            tool_executor.start_prefetch()
+
+            async def emit_chunk(delta: str) -> None:
+                nonlocal seq
+                chunk_event = ChatStreamChunkEvent(
+                    messageId=message_id,
+                    delta=delta,
+                    sequence=seq
+                )
+                await publish(message_id, "chunk", chunk_event.model_dump(by_alias=True))
+                seq += 1
+
+            seq = 1
+
             while retry_count < max_retries and not is_success:
                 try:
                     logger.info(f"Chat stream attempt {retry_count+1} with model {current_model_name} for message_id: {message_id}")
@@ -125,6 +183,8 @@ class ChatService:
                     max_tool_loops = 5
                     loop_count = 0
                     seq = 1
+                    # 모델 Chunk 전송 방식 (settings.chat_stream_pacing)
+                    pacer = build_chunk_pacer(emit_chunk)
                     
                     while loop_count < max_tool_loops:
                         loop_count += 1
@@ -146,58 +206,16 @@ class ChatService:
                                 tool_calls.extend(chunk.function_calls)
                             elif chunk.text:
                                 is_success = True
-                                # Gemini의 chunk를 어절(공백) 단위로 쪼개서 지연 전송
-                                words = chunk.text.split(' ')
-                                for i, word in enumerate(words):
-                                    # 공백을 유지하기 위해 마지막 단어가 아니면 다시 붙여줌
-                                    delta = word + (' ' if i < len(words) - 1 else '')
-                                    if not delta:
-                                        continue
-                                        
-                                    chunk_event = ChatStreamChunkEvent(
-                                        messageId=message_id,
-                                        delta=delta,
-                                        sequence=seq
-                                    )
-                                    await queue.put(("chunk", chunk_event.model_dump(by_alias=True)))
-                                    seq += 1
-                                    # 어절 단위로 0.05초 지연 (체감상 톡톡 끊기는 느낌)
-                                    await asyncio.sleep(0.05)
+                                await pacer.feed(chunk.text)
                         
                         if not tool_calls:
                             # 툴 호출이 없었고 텍스트가 스트리밍되었다면 완료
                             is_success = True
                             break
                         
-                        # 도구를 호출해야 하는 경우 
-                        function_responses = []
-                        for call in tool_calls:
-                            tool_name = call.name
-                            args = call.args if call.args else {}
-                            
-                            # 만약 LLM이 user_id를 주지 않았다면 강제 주입
-                            if "user_id" not in args:
-                                args["user_id"] = user_id
-                                
-                            logger.info(f"Executing tool {tool_name} with args: {args}")
-                            try:
-                                if tool_name == "search_schedules_by_date":
-                                    result = await search_schedules_by_date(**args)
-                                elif tool_name == "search_tasks_by_similarity":
-                                    result = await search_tasks_by_similarity(**args)
-                                else:
-                                    result = f"Unknown tool: {tool_name}"
-                            except Exception as e:
-                                result = f"Error executing tool {tool_name}: {e}"
-                                logger.error(result)
-                            
-                            function_responses.append(
-                                types.Part.from_function_response(
-                                    name=tool_name,
-                                    response={"result": result}
-                                )
-                            )
-                            
+                        # 도구를 호출해야 하는 경우 (한 턴의 호출은 서로 독립적이므로 동시 실행)
+                        function_responses = await tool_executor.execute(tool_calls)
+
                         # LLM의 함수 호출과 실행 결과를 Messages 목록에 추가
                         gemini_contents.append(
                             types.Content(role="model", parts=[types.Part.from_function_call(name=c.name, args=c.args) for c in tool_calls])
@@ -211,10 +229,15 @@ class ChatService:
                     if loop_count >= max_tool_loops and not is_success:
                          logger.warning("Max tool execution depth reached.")
                          raise Exception("Max tool execution depth reached.")
-                         
+
+                    # 묶여 있거나(coalesce) 타이핑 중인(typing) 남은 텍스트 전송
+                    await pacer.close()
                     break # 성공 시 외부 재시도 루프 탈출
                 except Exception as e:
                     last_error = e
+                    if pacer is not None:
+                        # 실패한 시도의 남은 텍스트는 버림 (재시도에서 다시 생성)
+                        pacer.cancel()
                     status_code = getattr(e, "code", 500)
                     if status_code == 500 and "503" in str(e):
                         status_code = 503
@@ -241,8 +264,7 @@ class ChatService:
                     errorCode="GEMINI_API_ERROR",
                     message=str(last_error)
                 )
-                await queue.put(("error", err_event.model_dump(by_alias=True)))
-                await queue.put(None) # 스트림 종료 신호
+                await publish(message_id, "error", err_event.model_dump(by_alias=True))
                 return
 
             # Event: Complete
@@ -250,15 +272,17 @@ class ChatService:
                 messageId=message_id,
                 status=StreamStatus.COMPLETED,
             )
-            await queue.put(("complete", complete_event.model_dump(by_alias=True)))
+            await publish(message_id, "complete", complete_event.model_dump(by_alias=True))
 
         except asyncio.CancelledError:
+            if pacer is not None:
+                pacer.cancel()
             logger.info(f"Stream generation task for messageId {message_id} was cancelled.")
             cancel_event = ChatStreamCompleteEvent(
                 messageId=message_id,
                 status=StreamStatus.CANCELED,
             )
-            await queue.put(("complete", cancel_event.model_dump(by_alias=True)))
+            await publish(message_id, "complete", cancel_event.model_dump(by_alias=True))
             
         except Exception as e:
             logger.error(f"Unexpected error in stream {message_id}: {str(e)}", exc_info=True)
@@ -267,21 +291,21 @@ class ChatService:
                 errorCode="INTERNAL_SERVER_ERROR",
                 message=str(e)
             )
-            await queue.put(("error", err_event.model_dump(by_alias=True)))
-            
+            await publish(message_id, "error", err_event.model_dump(by_alias=True))
+
         finally:
-            await queue.put(None) # 종료 신호
-            
-            # 여기서 삭제하면 GET을 아직 연결 안했을때 사라질 수 있으므로, 삭제는 GET 혹은 일정시간 후 수행해야 함
-            # 일단 여기서는 삭제하지 않음 (GET 완료 시 혹은 Cancel 시 삭제)
+            if tool_executor is not None:
+                tool_executor.close()
+
+        # 여기서 스트림을 삭제하면 GET을 아직 연결 안했을때 사라질 수 있으므로, 삭제는 GET 완료 시 혹은 Cancel 시 수행
 
 
-    async def stream(self, report_id: int, message_id: int) -> AsyncGenerator[str, None]:
+    async def stream(self, report_id: int, message_id: int, last_event_id: int = 0) -> AsyncGenerator[str, None]:
         """
-        GET API 로직: 큐에서 이벤트를 읽어와 SSE로 yield
+        GET API 로직: 브로커에서 이벤트를 구독하여 SSE로 yield (다른 워커가 생성 중인 스트림도 구독 가능)
+        - last_event_id: 재연결 시 마지막으로 받은 이벤트 id (Last-Event-ID), 그 이후 이벤트부터 전달
         """
-        session = _active_sessions.get(message_id)
-        if not session:
+        if not await self.broker.exists(message_id):
             # 404 NOT_FOUND 
             yield self._format_sse("error", {
                 "status": "NOT_FOUND",
@@ -289,43 +313,39 @@ class ChatService:
             })
             return
 
-        queue = session["queue"]
-        
+        delivered = False
         try:
-            while True:
-                item = await queue.get()
-                if item is None:
-                    # 스트림 종료 신호
-                    break
-                
-                event_name, data = item
-                yield self._format_sse(event_name, data)
-                
-                # complete 나 error 이벤트면 종료
-                if event_name in ("complete", "error"):
-                    break
+            # complete 나 error 이벤트면 구독 종료
+            async for item in self.broker.subscribe(message_id, after=last_event_id):
+                yield self._format_sse(item.event, item.data, event_id=item.id)
+            delivered = True
+        except ReplayGapError as e:
+            logger.warning(str(e))
+            yield self._format_sse("error", {
+                "status": "REPLAY_UNAVAILABLE",
+                "message": f"Events after id {last_event_id} are no longer available for messageId {message_id}"
+            })
         finally:
-            # 스트리밍 종료 시 세션 정리
-            if message_id in _active_sessions:
-                del _active_sessions[message_id]
+            # 끝까지 전달한 경우에만 세션 정리 (연결이 끊기면 재연결을 위해 유지, 세션 관리자가 TTL 후 정리)
+            if delivered:
+                await self.broker.close(message_id)
+            else:
+                # 유예 시간 안에 재연결되지 않으면 생성 중단 (LLM 호출 / 도구 실행 비용 절약)
+                self.sessions.watch_disconnect(message_id)
 
     async def cancel(self, message_id: int) -> bool:
         """
-        DELETE API 로직: 진행 중인 생성 세션을 취소(Task.cancel)
+        DELETE API 로직: 진행 중인 생성 세션을 취소(생성 중인 워커에서 Task.cancel)
         """
-        session = _active_sessions.get(message_id)
-        if session:
-            task = session["task"]
-            if not task.done():
-                task.cancel()
-                logger.info(f"Cancelled active chat task for messageId: {message_id}")
-            # 삭제는 _generate_task나 stream finally 블록에서 처리될 수 있으나 명시적으로 여기서 지움
-            del _active_sessions[message_id]
-            return True
-        return False
-
-
-    def _format_sse(self, event: str, data: dict) -> str:
-        """SSE 포맷에 맞춰 문자열을 생성하는 헬퍼 함수"""
-        return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+        if not await self.broker.exists(message_id):
+            return False
+        await self.broker.request_cancel(message_id)
+        # 생성 Task의 취소 이벤트를 기다리지 않고 스트림을 바로 삭제
+        await self.broker.close(message_id)
+        return True
+
+
+    def _format_sse(self, event: str, data: dict, event_id: int | None = None) -> str:
+        """SSE 포맷에 맞춰 문자열을 생성하는 헬퍼 함수 (app.core.sse 공용 포맷 사용)"""
+        return format_sse(event, data, event_id=event_id)
 
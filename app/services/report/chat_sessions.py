@@ -0,0 +1,139 @@
+"""
+챗봇 스트림 세션 관리 (동시 스트림 상한 / 구독자 없는 스트림 정리 / 연결이 끊긴 스트림의 생성 취소)
+
+- 사용자별 진행 중 스트림 수가 chat_max_streams_per_user 이상이면 새 응답 생성을 거부 (HTTP 429)
+- 구독자(GET) 없이 chat_stream_idle_ttl_seconds가 지난 스트림은 생성 Task를 취소하고 삭제
+  - GET이 연결되지 않았거나, 연결이 끊긴 뒤 그 시간 안에 Last-Event-ID로 재연결하지 않은 경우
+  - 클라이언트가 떠나면 생성 Task / 이벤트 버퍼가 남아 메모리와 LLM 호출을 계속 점유하기 때문
+- 생성 중 SSE 연결이 끊기고 chat_disconnect_grace_seconds 안에 재연결되지 않으면 생성 Task 취소
+  - Gemini 스트림 / 도구 호출 / 재시도 대기를 중단 (스트림은 재연결용으로 TTL까지 유지, 취소 전까지의 이벤트는 재전송 가능)
+- 정리 Task(reaper)는 첫 응답 접수 시 시작 (이벤트 루프가 바뀌면 새로 시작)
+"""
+import asyncio
+import logging
+import weakref
+from typing import Optional
+
+from fastapi import HTTPException
+
+from app.core.disconnect import CLIENT_DISCONNECT_CANCELLED_TOTAL
+from app.core.metrics import get_metrics_registry
+from app.services.report.chat_broker import ChatStreamBroker
+
+logger = logging.getLogger(__name__)
+
+_registry = get_metrics_registry()
+CHAT_STREAMS_REAPED_TOTAL = _registry.counter(
+    "chat_streams_reaped_total", "Chat streams cancelled because no subscriber attached within the idle TTL"
+)
+CHAT_STREAM_LIMIT_REJECTIONS_TOTAL = _registry.counter(
+    "chat_stream_limit_rejections_total", "Chat respond requests rejected by the per-user concurrent stream limit"
+)
+
+# 종료 시 정리할 세션 관리자 (ChatService 인스턴스마다 하나)
+_managers: "weakref.WeakSet[ChatSessionManager]" = weakref.WeakSet()
+
+
+class ChatSessionManager:
+    """
+    스트림 브로커 위에서 동작하는 세션 정책
+    - max_streams_per_user: 사용자별 동시 스트림 상한 (0이면 비활성화)
+    - idle_ttl_seconds: 구독자 없는 스트림 유지 시간(초) (0이면 정리하지 않음)
+    - disconnect_grace_seconds: 연결이 끊긴 뒤 생성을 계속하는 시간(초) (음수면 취소하지 않음)
+    """
+
+    def __init__(
+        self,
+        broker: ChatStreamBroker,
+        max_streams_per_user: int = 0,
+        idle_ttl_seconds: float = 0.0,
+        disconnect_grace_seconds: float = -1.0
+    ):
+        self.broker = broker
+        self.max_streams_per_user = max_streams_per_user
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.disconnect_grace_seconds = disconnect_grace_seconds
+        self._reaper: Optional[asyncio.Task] = None
+        self._grace_timers: set[asyncio.Task] = set()
+        _managers.add(self)
+
+    async def check_user_limit(self, user_id: int | None) -> None:
+        """동시 스트림 상한 초과 시 HTTPException(429)"""
+        if self.max_streams_per_user <= 0 or user_id is None:
+            return
+        active = await self.broker.count_streams(user_id)
+        if active >= self.max_streams_per_user:
+            CHAT_STREAM_LIMIT_REJECTIONS_TOTAL.inc()
+            raise HTTPException(
+                status_code=429,
+                detail=f"Too many active chat streams for this user (limit {self.max_streams_per_user})."
+            )
+
+    def ensure_reaper(self) -> None:
+        """정리 Task 시작 (이미 현재 이벤트 루프에서 실행 중이면 무시)"""
+        if self.idle_ttl_seconds <= 0:
+            return
+        loop = asyncio.get_running_loop()
+        if self._reaper is not None and not self._reaper.done() and self._reaper.get_loop() is loop:
+            return
+        self._reaper = loop.create_task(self._reap_loop())
+
+    async def reap_once(self) -> list[int]:
+        """구독자 없이 TTL이 지난 스트림의 생성 Task 취소 + 삭제, 정리한 messageId 반환"""
+        orphaned = await self.broker.orphaned_streams(self.idle_ttl_seconds)
+        for message_id in orphaned:
+            await self.broker.request_cancel(message_id)
+            await self.broker.close(message_id)
+            CHAT_STREAMS_REAPED_TOTAL.inc()
+            logger.info(f"Reaped chat stream without subscriber: messageId {message_id}")
+        return orphaned
+
+    def watch_disconnect(self, message_id: int) -> None:
+        """구독자 연결이 끊김: 유예 시간 뒤에도 구독자 없이 생성 중이면 생성 Task 취소"""
+        if self.disconnect_grace_seconds < 0:
+            return
+        timer = asyncio.get_running_loop().create_task(self._cancel_if_abandoned(message_id))
+        self._grace_timers.add(timer)
+        timer.add_done_callback(self._grace_timers.discard)
+
+    async def _cancel_if_abandoned(self, message_id: int) -> None:
+        await asyncio.sleep(self.disconnect_grace_seconds)
+        try:
+            abandoned = await self.broker.abandoned_seconds(message_id)
+            if abandoned is None or abandoned < self.disconnect_grace_seconds:
+                # 재연결됨 / 이미 종료 / 유예 중 다시 끊김 (새 타이머가 처리)
+                return
+            await self.broker.request_cancel(message_id)
+            CLIENT_DISCONNECT_CANCELLED_TOTAL.inc(route="chat")
+            logger.info(f"Cancelled chat generation after client disconnect: messageId {message_id}")
+        except Exception as e:
+            logger.error(f"Chat disconnect cancel failed for messageId {message_id}: {e}")
+
+    async def _reap_loop(self) -> None:
+        # TTL의 1/4 간격으로 확인 (정리 지연은 최대 TTL * 1.25)
+        interval = max(1.0, self.idle_ttl_seconds / 4)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.reap_once()
+            except Exception as e:
+                logger.error(f"Chat stream reaper failed: {e}")
+
+    async def shutdown(self) -> None:
+        for timer in list(self._grace_timers):
+            timer.cancel()
+        reaper, self._reaper = self._reaper, None
+        if reaper is None or reaper.done():
+            return
+        reaper.cancel()
+        if reaper.get_loop() is asyncio.get_running_loop():
+            try:
+                await reaper
+            except asyncio.CancelledError:
+                pass
+
+
+async def shutdown_chat_sessions() -> None:
+    """앱 종료 시 정리 Task / 연결 끊김 타이머 중단"""
+    for manager in list(_managers):
+        await manager.shutdown()
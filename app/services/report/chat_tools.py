@@ -0,0 +1,116 @@
+"""
+챗봇 도구 호출(Function Calling) 실행
+
+- 모델이 한 턴에 요청한 도구 호출은 서로 독립적이므로 asyncio.gather로 동시에 실행 (응답 Part는 요청 순서 유지)
+- 일정 선조회(Prefetch, settings.chat_tool_prefetch_days > 0): 스트림 시작 시 최근 N일 일정 원본을 첫 모델 호출과 병렬로 조회
+  - 이후 search_schedules_by_date 요청 범위가 선조회 구간 안이면 DB를 다시 조회하지 않고 걸러서 결과 생성
+  - "어제", "이번 주", "최근 3일" 같은 질문의 첫 도구 호출이 대부분 이 구간에 포함됨
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from google.genai import types
+
+from app.core.metrics import get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+_registry = get_metrics_registry()
+CHAT_TOOL_CALLS_TOTAL = _registry.counter(
+    "chat_tool_calls_total", "Chat tool calls executed for model function calls", ("tool",)
+)
+CHAT_SCHEDULE_PREFETCH_TOTAL = _registry.counter(
+    "chat_schedule_prefetch_total", "search_schedules_by_date calls by prefetch outcome", ("result",)
+)
+
+
+class ChatToolExecutor:
+    """
+    한 챗봇 응답 생성 동안의 도구 호출 실행기
+    - user_id: 모델이 user_id를 주지 않은 호출에 주입
+    - prefetch_days: 선조회할 최근 일수 (0이면 비활성화)
+    """
+
+    def __init__(self, user_id: int, prefetch_days: int = 0):
+        self.user_id = user_id
+        self.prefetch_days = prefetch_days
+        today = datetime.now().date()
+        self._window = ((today - timedelta(days=prefetch_days)).isoformat(), today.isoformat())
+        self._prefetch: Optional[asyncio.Task] = None
+
+    def start_prefetch(self) -> None:
+        """최근 prefetch_days일 일정 원본 조회 시작 (결과는 첫 일정 검색 호출에서 사용)"""
+        if self.prefetch_days <= 0 or self._prefetch is not None:
+            return
+        from app.mcp.server import fetch_schedule_records
+        self._prefetch = asyncio.create_task(fetch_schedule_records(self.user_id, *self._window))
+
+    async def execute(self, calls: list[Any]) -> list[types.Part]:
+        """모델의 function call 목록 실행 -> function response Part 목록 (동시 실행)"""
+        results = await asyncio.gather(*(self._call(call) for call in calls))
+        return [
+            types.Part.from_function_response(name=call.name, response={"result": result})
+            for call, result in zip(calls, results)
+        ]
+
+    async def _call(self, call: Any) -> str:
+        from app.mcp.server import search_tasks_by_similarity
+
+        tool_name = call.name
+        args = dict(call.args) if call.args else {}
+        # 만약 LLM이 user_id를 주지 않았다면 강제 주입
+        if "user_id" not in args:
+            args["user_id"] = self.user_id
+
+        logger.info(f"Executing tool {tool_name} with args: {args}")
+        CHAT_TOOL_CALLS_TOTAL.inc(tool=tool_name)
+        try:
+            if tool_name == "search_schedules_by_date":
+                return await self._search_schedules(**args)
+            if tool_name == "search_tasks_by_similarity":
+                return await search_tasks_by_similarity(**args)
+            return f"Unknown tool: {tool_name}"
+        except Exception as e:
+            result = f"Error executing tool {tool_name}: {e}"
+            logger.error(result)
+            return result
+
+    async def _search_schedules(
+        self,
+        user_id: int,
+        start_date: str,
+        end_date: Optional[str] = None,
+        category: Optional[str] = None
+    ) -> str:
+        from app.mcp.server import format_schedule_records, search_schedules_by_date
+
+        window_start, window_end = self._window
+        end = end_date or window_end
+        if self._prefetch is not None and user_id == self.user_id and window_start <= start_date <= end <= window_end:
+            try:
+                planner_data, tasks_data = await self._prefetch
+            except Exception as e:
+                # 선조회 실패 시 일반 조회로 다시 시도
+                logger.warning(f"Chat schedule prefetch failed: {e}")
+            else:
+                CHAT_SCHEDULE_PREFETCH_TOTAL.inc(result="hit")
+                planner_data = [r for r in planner_data if start_date <= str(r["planner_date"]) <= end]
+                record_ids = {r["id"] for r in planner_data}
+                tasks_data = [t for t in tasks_data if t["record_id"] in record_ids]
+                return format_schedule_records(start_date, end, planner_data, tasks_data)
+
+        if self._prefetch is not None:
+            CHAT_SCHEDULE_PREFETCH_TOTAL.inc(result="miss")
+        return await search_schedules_by_date(user_id, start_date, end_date, category)
+
+    def close(self) -> None:
+        """응답 생성 종료 시 아직 진행 중인 선조회 취소"""
+        if self._prefetch is None:
+            return
+        if not self._prefetch.done():
+            self._prefetch.cancel()
+        elif not self._prefetch.cancelled():
+            # 사용하지 않은 선조회의 실패는 조용히 버림 (Task exception was never retrieved 방지)
+            self._prefetch.exception()
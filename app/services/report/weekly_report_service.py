@@ -8,9 +8,26 @@ from app.db.repositories.report_repository import ReportRepository
 from app.llm.gemini_client import get_gemini_client
 from app.llm.prompts.report_prompt import format_report_data_for_llm, WEEKLY_REPORT_SYSTEM_PROMPT
 from app.models.planner.errors import map_exception_to_error_code, is_retryable_error
+from app.core.single_flight import SingleFlight
+from app.core.metrics import get_metrics_registry
+from app.core.timing import record_llm_attempt, record_retry_sleep, stage_scope
 
 logger = logging.getLogger(__name__)
 
+_registry = get_metrics_registry()
+REPORT_BATCHES_IN_PROGRESS = _registry.gauge(
+    "weekly_report_batches_in_progress", "Weekly report batches currently running"
+)
+REPORT_BATCH_PENDING_USERS = _registry.gauge(
+    "weekly_report_batch_pending_users", "Users queued in running weekly report batches but not finished yet"
+)
+REPORT_BATCH_USERS_TOTAL = _registry.counter(
+    "weekly_report_batch_users_total", "Finished weekly report generations by outcome", ("outcome",)
+)
+
+# 레포트 대상별 동시 생성 병합
+_report_flight = SingleFlight("weekly_report")
+
 async def generate_batch_reports(request: WeeklyReportGenerateRequest) -> None:
     """
     여러 유저에 대한 주간 레포트를 배치로 생성합니다.
@@ -18,8 +35,27 @@ async def generate_batch_reports(request: WeeklyReportGenerateRequest) -> None:
     """
     logger.info(f"Starting batch report generation for {len(request.users)} users. Base Date: {request.base_date}")
     
-    # 10 RPS(초당 요청 수) 제한을 위해 10명씩 끊어서 처리
-    tasks = []
+    # 진행률 메트릭: 배치 시작 시 전체 인원을 대기로 잡고, 유저별 생성이 끝날 때마다 차감
+    REPORT_BATCHES_IN_PROGRESS.inc()
+    REPORT_BATCH_PENDING_USERS.inc(len(request.users))
+    tasks: list[asyncio.Task] = []
+    try:
+        await _run_batch(request, tasks)
+    finally:
+        REPORT_BATCHES_IN_PROGRESS.dec()
+        # 배치가 중간에 취소되면 Task를 만들지 못한 유저는 완료 콜백이 없으므로 여기서 차감
+        REPORT_BATCH_PENDING_USERS.dec(len(request.users) - len(tasks))
+
+
+def _on_report_done(task: asyncio.Task) -> None:
+    """유저별 레포트 생성 Task 종료 시 진행률 메트릭 갱신"""
+    REPORT_BATCH_PENDING_USERS.dec()
+    succeeded = not task.cancelled() and task.exception() is None and task.result() is True
+    REPORT_BATCH_USERS_TOTAL.inc(outcome="success" if succeeded else "failure")
+
+
+async def _run_batch(request: WeeklyReportGenerateRequest, tasks: list[asyncio.Task]) -> None:
+    # 10 RPS(초당 요청 수) 제한을 위해 10명씩 끊어서 처리 (생성한 Task는 tasks에 누적)
     chunk_size = 10
     
     for i in range(0, len(request.users), chunk_size):
@@ -27,11 +63,13 @@ async def generate_batch_reports(request: WeeklyReportGenerateRequest) -> None:
         logger.info(f"[BatchReport] Processing chunk {i//chunk_size + 1} ({len(chunk)} users)")
         
         for user_target in chunk:
-            tasks.append(asyncio.create_task(_generate_single_report(
+            task = asyncio.create_task(_generate_single_report_once(
                 user_id=user_target.user_id,
                 report_id=user_target.report_id,
                 base_date=request.base_date
-            )))
+            ))
+            task.add_done_callback(_on_report_done)
+            tasks.append(task)
             
         # 마지막 청크가 아니라면 1초 대기하여 RPS 제한 준수
         if i + chunk_size < len(request.users):
@@ -50,6 +88,17 @@ async def generate_batch_reports(request: WeeklyReportGenerateRequest) -> None:
     logger.info(f"Batch report generation completed. Success: {success_count}/{len(request.users)}")
 
 
+async def _generate_single_report_once(user_id: int, report_id: int, base_date: date) -> bool:
+    """
+    동일 (reportId, userId, baseDate) 레포트 생성이 이미 진행 중이면 그 결과를 공유
+    (이전 배치가 진행 중일 때 Backend가 재시도해도 LLM 호출은 한 번만 발생)
+    """
+    return await _report_flight.do(
+        (report_id, user_id, base_date),
+        lambda: _generate_single_report(user_id=user_id, report_id=report_id, base_date=base_date)
+    )
+
+
 @logfire.instrument
 async def _generate_single_report(user_id: int, report_id: int, base_date: date) -> bool:
     """
@@ -83,11 +132,13 @@ async def _generate_single_report(user_id: int, report_id: int, base_date: date)
                 attempt += 1
                 try:
                     logger.info(f"[Report] LLM {model_name} Attempt {attempt} for User {user_id}")
-                    generated_markdown = await client.generate_text(
-                        system=WEEKLY_REPORT_SYSTEM_PROMPT,
-                        user=user_prompt,
-                        model_name=model_name
-                    )
+                    with stage_scope("weekly_report"):
+                        record_llm_attempt()
+                        generated_markdown = await client.generate_text(
+                            system=WEEKLY_REPORT_SYSTEM_PROMPT,
+                            user=user_prompt,
+                            model_name=model_name
+                        )
                     if generated_markdown:
                         success = True
                         break
@@ -115,6 +166,8 @@ async def _generate_single_report(user_id: int, report_id: int, base_date: date)
                     delay = min(1.0 * (2 ** (attempt - 1)), 16.0)
                     logger.info(f"[Report] Retrying {model_name} in {delay}s...")
                     await asyncio.sleep(delay)
+                    with stage_scope("weekly_report"):
+                        record_retry_sleep(delay)
             
             if success:
                 break
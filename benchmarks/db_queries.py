@@ -0,0 +1,228 @@
+"""
+합성 데이터셋(benchmarks/synthetic_db.py) 대상 DB 조회 벤치마크
+
+서비스가 실제로 실행하는 조회와 같은 SQL을 무작위 합성 사용자에 대해 반복 실행하고
+지연 시간 분위수(p50 / p95 / max)를 출력합니다. --explain 지정 시 조회별 실행 계획(EXPLAIN ANALYZE, BUFFERS) 출력.
+
+- report_fetch: 주간 레포트 4주치 조회 (ReportRepository.fetch_past_4_weeks_data, 3개 쿼리)
+- mcp_schedules_by_date: MCP 날짜 범위 일정 검색 (search_schedules_by_date, 7일 범위)
+- mcp_similarity: MCP 유사 작업 검색 RPC (match_record_tasks, pgvector)
+- task_embeddings_knn: task_embeddings 사용자별 최근접 5개 (HNSW 인덱스)
+- embedding_sync_scan: 임베딩 동기화 대상 조회 (sync_task_embeddings, 최근 8일 전체 사용자)
+
+실행:
+    python -m benchmarks.synthetic_db --users 1000 --days 90
+    python -m benchmarks.db_queries --iterations 200
+    python -m benchmarks.db_queries --queries report_fetch mcp_similarity --explain
+"""
+import argparse
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Awaitable, Callable
+
+import numpy as np
+
+from benchmarks.synthetic_db import (
+    SYNTHETIC_DB_USER_OFFSET, SYNTHETIC_DB_USER_RANGE, asyncpg_dsn, embedding_pool, table_columns
+)
+
+
+@dataclass
+class QueryContext:
+    """조회 대상 합성 사용자 / 기준 날짜 / 질의 벡터"""
+    user_ids: list[int]
+    base_date: date
+    date_column: str
+    vectors: list[str]
+    explain: bool = False
+
+
+async def _run(conn: Any, ctx: QueryContext, sql: str, *args: Any) -> list:
+    if ctx.explain:
+        plan = await conn.fetch(f"EXPLAIN (ANALYZE, BUFFERS) {sql}", *args)
+        print("\n".join(r[0] for r in plan) + "\n")
+    return await conn.fetch(sql, *args)
+
+
+async def report_fetch(conn: Any, ctx: QueryContext, user_id: int) -> int:
+    records = await _run(
+        conn, ctx,
+        f"""SELECT * FROM planner_records
+            WHERE user_id = $1 AND record_type = 'USER_FINAL'
+            AND {ctx.date_column} >= $2 AND {ctx.date_column} <= $3""",
+        user_id, ctx.base_date - timedelta(days=28), ctx.base_date - timedelta(days=1)
+    )
+    if not records:
+        return 0
+    record_ids = [r["id"] for r in records]
+    tasks = await _run(conn, ctx, "SELECT * FROM record_tasks WHERE record_id = ANY($1::bigint[])", record_ids)
+    await _run(conn, ctx, "SELECT * FROM schedule_histories WHERE record_id = ANY($1::bigint[])", record_ids)
+    return len(tasks)
+
+
+async def mcp_schedules_by_date(conn: Any, ctx: QueryContext, user_id: int) -> int:
+    records = await _run(
+        conn, ctx,
+        f"""SELECT id, start_arrange, day_end_time, focus_time_zone, {ctx.date_column} FROM planner_records
+            WHERE user_id = $1 AND record_type = 'USER_FINAL'
+            AND {ctx.date_column} >= $2 AND {ctx.date_column} <= $3""",
+        user_id, ctx.base_date - timedelta(days=7), ctx.base_date
+    )
+    if not records:
+        return 0
+    tasks = await _run(
+        conn, ctx,
+        "SELECT * FROM record_tasks WHERE record_id = ANY($1::bigint[]) AND assignment_status = 'ASSIGNED'",
+        [r["id"] for r in records]
+    )
+    return len(tasks)
+
+
+async def mcp_similarity(conn: Any, ctx: QueryContext, user_id: int) -> int:
+    rows = await _run(
+        conn, ctx, "SELECT * FROM match_record_tasks($1, $2::text::vector, 5)",
+        user_id, random.choice(ctx.vectors)
+    )
+    return len(rows)
+
+
+async def task_embeddings_knn(conn: Any, ctx: QueryContext, user_id: int) -> int:
+    rows = await _run(
+        conn, ctx,
+        "SELECT id, content FROM task_embeddings WHERE user_id = $1 ORDER BY embedding <=> $2::text::vector LIMIT 5",
+        user_id, random.choice(ctx.vectors)
+    )
+    return len(rows)
+
+
+async def embedding_sync_scan(conn: Any, ctx: QueryContext, user_id: int) -> int:
+    records = await _run(
+        conn, ctx,
+        f"""SELECT id FROM planner_records
+            WHERE record_type = 'USER_FINAL' AND {ctx.date_column} >= $1 AND {ctx.date_column} <= $2""",
+        ctx.base_date - timedelta(days=8), ctx.base_date
+    )
+    if not records:
+        return 0
+    tasks = await _run(
+        conn, ctx,
+        """SELECT id, title FROM record_tasks
+           WHERE record_id = ANY($1::bigint[]) AND assignment_status = 'ASSIGNED'
+           AND combined_embedding_text IS NULL""",
+        [r["id"] for r in records]
+    )
+    return len(tasks)
+
+
+QUERIES: dict[str, Callable[[Any, QueryContext, int], Awaitable[int]]] = {
+    "report_fetch": report_fetch,
+    "mcp_schedules_by_date": mcp_schedules_by_date,
+    "mcp_similarity": mcp_similarity,
+    "task_embeddings_knn": task_embeddings_knn,
+    "embedding_sync_scan": embedding_sync_scan,
+}
+
+
+def summarize(name: str, latencies: list[float], rows: list[int], errors: list[str]) -> dict[str, Any]:
+    p50, p95 = np.percentile(latencies, [50, 95]) if latencies else (0.0, 0.0)
+    return {
+        "query": name,
+        "runs": len(latencies),
+        "p50_ms": round(float(p50) * 1000, 2),
+        "p95_ms": round(float(p95) * 1000, 2),
+        "max_ms": round(max(latencies, default=0.0) * 1000, 2),
+        "avg_rows": round(sum(rows) / len(rows), 1) if rows else 0.0,
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+    }
+
+
+async def build_context(conn: Any, sample_users: int, seed: int, dataset_seed: int = 0) -> QueryContext:
+    """적재된 합성 사용자 대역 / 마지막 날짜 조회 (base_date = 마지막 날짜 다음 날)"""
+    columns = await table_columns(conn, "planner_records")
+    date_column = "plan_date" if "plan_date" in columns else "planner_date"
+    bounds = (SYNTHETIC_DB_USER_OFFSET, SYNTHETIC_DB_USER_OFFSET + SYNTHETIC_DB_USER_RANGE)
+    row = await conn.fetchrow(
+        f"SELECT MIN(user_id) AS lo, MAX(user_id) AS hi, MAX({date_column}) AS last FROM planner_records "
+        "WHERE user_id >= $1 AND user_id < $2",
+        *bounds
+    )
+    if row["lo"] is None:
+        raise RuntimeError("no synthetic data found (run python -m benchmarks.synthetic_db first)")
+
+    rng = random.Random(seed)
+    user_ids = [rng.randint(row["lo"], row["hi"]) for _ in range(sample_users)]
+    # 적재 시와 같은 카테고리 중심, 다른 노이즈의 질의 벡터
+    vectors = [v for pool in embedding_pool(768, 16, dataset_seed, noise_seed=seed + 1_000).values() for v in pool]
+    return QueryContext(user_ids=user_ids, base_date=row["last"] + timedelta(days=1), date_column=date_column, vectors=vectors)
+
+
+async def run_queries(
+    dsn: str,
+    names: list[str],
+    iterations: int,
+    seed: int = 0,
+    dataset_seed: int = 0,
+    explain: bool = False
+) -> list[dict]:
+    import asyncpg
+
+    conn = await asyncpg.connect(dsn)
+    try:
+        ctx = await build_context(conn, iterations, seed, dataset_seed)
+        summaries = []
+        for name in names:
+            query = QUERIES[name]
+            if explain:
+                print(f"== {name} ==")
+                ctx.explain = True
+                try:
+                    await query(conn, ctx, ctx.user_ids[0])
+                except Exception as e:
+                    print(f"{type(e).__name__}: {e}\n")
+                ctx.explain = False
+
+            latencies, rows, errors = [], [], []
+            for user_id in ctx.user_ids:
+                started = time.perf_counter()
+                try:
+                    rows.append(await query(conn, ctx, user_id))
+                    latencies.append(time.perf_counter() - started)
+                except Exception as e:
+                    errors.append(f"{type(e).__name__}: {e}")
+            summaries.append(summarize(name, latencies, rows, errors))
+        return summaries
+    finally:
+        await conn.close()
+
+
+def main() -> None:
+    from app.core.config import settings
+
+    parser = argparse.ArgumentParser(description="DB query benchmarks against the synthetic dataset")
+    parser.add_argument("--dsn", default=None, help="Postgres DSN (기본: DATABASE_URL)")
+    parser.add_argument("--queries", nargs="+", choices=sorted(QUERIES), default=list(QUERIES))
+    parser.add_argument("--iterations", type=int, default=100, help="조회별 실행 횟수 (매번 무작위 합성 사용자)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dataset-seed", type=int, default=0, help="synthetic_db 적재 시 --seed (질의 벡터 분포)")
+    parser.add_argument("--explain", action="store_true", help="조회별 EXPLAIN (ANALYZE, BUFFERS) 출력")
+    args = parser.parse_args()
+
+    dsn = args.dsn or asyncpg_dsn(settings.database_url or "")
+    summaries = asyncio.run(run_queries(dsn, args.queries, args.iterations, args.seed, args.dataset_seed, args.explain))
+
+    print(f"{'query':<24} {'runs':>5} {'p50(ms)':>9} {'p95(ms)':>9} {'max(ms)':>9} {'rows':>8} {'err':>4}")
+    for s in summaries:
+        print(
+            f"{s['query']:<24} {s['runs']:>5} {s['p50_ms']:>9} {s['p95_ms']:>9} {s['max_ms']:>9} "
+            f"{s['avg_rows']:>8} {s['errors']:>4}"
+        )
+        if s["first_error"]:
+            print(f"  first error: {s['first_error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+오프라인 부하 테스트 하네스 (Gemini Quota 소모 없음)
+
+서버를 LLM_BACKEND=fake로 띄운 뒤(또는 --in-process) 목표 RPS로 요청을 보내고
+시나리오별 처리량 / 지연 시간 분위수 / Fallback(Degraded) 비율 / 에러율을 출력합니다.
+
+시나리오
+- planner: POST /ai/v1/planners (tests/data/test_request.json, 요청마다 userId / dayPlanId를 바꿔 캐시 적중 방지)
+- report:  POST /ai/v2/reports/weekly (배치 접수 응답까지)
+- chat:    POST /ai/v2/reports/{reportId}/chat/respond + GET .../stream (SSE complete 이벤트까지)
+
+요청 도착은 Open-loop (응답을 기다리지 않고 1/RPS 간격으로 발사, --max-inflight로 클라이언트 측 상한)
+
+실행:
+    LLM_BACKEND=fake FAKE_LLM_PROFILE=realistic uvicorn app.main:app
+    python -m benchmarks.load_test --scenario planner chat --rps 20 --duration 60
+    python -m benchmarks.load_test --in-process --profile flaky --scenario planner --rps 10 --duration 10
+"""
+import argparse
+import asyncio
+import copy
+import json
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import httpx
+import numpy as np
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "tests" / "data"
+
+# 실제 사용자 / 레포트와 겹치지 않는 부하 테스트 전용 ID 대역
+LOAD_TEST_ID_OFFSET = 900_000_000
+
+
+@dataclass
+class ScenarioStats:
+    """시나리오별 결과 (지연 시간은 초 단위)"""
+    name: str
+    latencies: list[float] = field(default_factory=list)
+    ok: int = 0
+    errors: int = 0
+    fallbacks: int = 0
+    statuses: Counter = field(default_factory=Counter)
+
+    def record(self, latency: float, status: int | str, ok: bool, fallback: bool = False) -> None:
+        self.latencies.append(latency)
+        self.statuses[str(status)] += 1
+        if ok:
+            self.ok += 1
+        else:
+            self.errors += 1
+        if fallback:
+            self.fallbacks += 1
+
+    def summary(self, elapsed: float) -> dict:
+        total = len(self.latencies)
+        p50, p90, p99 = np.percentile(self.latencies, [50, 90, 99]) if total else (0.0, 0.0, 0.0)
+        return {
+            "scenario": self.name,
+            "requests": total,
+            "ok": self.ok,
+            "errors": self.errors,
+            "throughput_rps": round(self.ok / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": round(float(p50) * 1000, 1),
+            "p90_ms": round(float(p90) * 1000, 1),
+            "p99_ms": round(float(p99) * 1000, 1),
+            "max_ms": round(max(self.latencies, default=0.0) * 1000, 1),
+            "fallback_rate": round(self.fallbacks / self.ok, 3) if self.ok else 0.0,
+            "statuses": dict(self.statuses),
+        }
+
+
+def planner_payload(i: int) -> dict:
+    with open(DATA_DIR / "test_request.json", "r", encoding="utf-8") as f:
+        payload = json.load(f)
+    payload["user"]["userId"] = LOAD_TEST_ID_OFFSET + i
+    for schedule in payload["schedules"]:
+        schedule["dayPlanId"] = LOAD_TEST_ID_OFFSET + i
+    return payload
+
+
+def report_payload(i: int) -> dict:
+    with open(DATA_DIR / "weekly_report_request.json", "r", encoding="utf-8") as f:
+        payload = json.load(f)
+    payload["users"] = [{"userId": LOAD_TEST_ID_OFFSET + i, "reportId": LOAD_TEST_ID_OFFSET + i}]
+    return payload
+
+
+def chat_payload(i: int) -> dict:
+    return {
+        "userId": LOAD_TEST_ID_OFFSET + i,
+        "messageId": LOAD_TEST_ID_OFFSET + i,
+        "messages": [
+            {"messageId": 1, "senderType": "USER", "messageType": "TEXT", "content": f"다음 주 목표를 추천해줘 ({i})"}
+        ],
+    }
+
+
+async def run_planner(client: httpx.AsyncClient, i: int) -> tuple[int, bool, bool]:
+    response = await client.post("/ai/v1/planners", json=planner_payload(i))
+    body = response.json() if response.headers.get("content-type", "").startswith("application/json") else {}
+    ok = response.status_code == 200 and body.get("success", False)
+    return response.status_code, ok, bool(body.get("degraded"))
+
+
+async def run_report(client: httpx.AsyncClient, i: int) -> tuple[int, bool, bool]:
+    response = await client.post("/ai/v2/reports/weekly", json=report_payload(i))
+    return response.status_code, response.status_code == 200, False
+
+
+async def run_chat(client: httpx.AsyncClient, i: int) -> tuple[int, bool, bool]:
+    report_id = LOAD_TEST_ID_OFFSET + i
+    payload = chat_payload(i)
+    response = await client.post(f"/ai/v2/reports/{report_id}/chat/respond", json=payload)
+    if response.status_code != 200:
+        return response.status_code, False, False
+
+    events = []
+    stream_url = f"/ai/v2/reports/{report_id}/chat/respond/{payload['messageId']}/stream"
+    async with client.stream("GET", stream_url) as stream:
+        async for line in stream.aiter_lines():
+            if line.startswith("event: "):
+                events.append(line[len("event: "):])
+    ok = "complete" in events and "error" not in events
+    return stream.status_code if ok else "sse_error", ok, False
+
+
+SCENARIOS: dict[str, Callable[[httpx.AsyncClient, int], Awaitable[tuple[int, bool, bool]]]] = {
+    "planner": run_planner,
+    "report": run_report,
+    "chat": run_chat,
+}
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    scenario: str,
+    rps: float,
+    duration: float,
+    max_inflight: int
+) -> tuple[ScenarioStats, float]:
+    """목표 RPS로 duration초 동안 Open-loop 요청 발사 후 모든 응답 대기"""
+    stats = ScenarioStats(scenario)
+    run = SCENARIOS[scenario]
+    limiter = asyncio.Semaphore(max_inflight)
+
+    async def one(i: int) -> None:
+        async with limiter:
+            started = time.perf_counter()
+            try:
+                status, ok, fallback = await run(client, i)
+            except Exception as e:
+                status, ok, fallback = type(e).__name__, False, False
+            stats.record(time.perf_counter() - started, status, ok, fallback)
+
+    started = time.perf_counter()
+    tasks = []
+    total = int(rps * duration)
+    for i in range(total):
+        delay = started + i / rps - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(i)))
+    await asyncio.gather(*tasks)
+    return stats, time.perf_counter() - started
+
+
+def build_client(base_url: str, in_process: bool, timeout: float) -> httpx.AsyncClient:
+    if in_process:
+        from app.main import app
+        return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://load-test", timeout=timeout)
+    return httpx.AsyncClient(base_url=base_url, timeout=timeout)
+
+
+def use_fake_llm(profile: str) -> None:
+    """--in-process 전용: 앱 import 전에 LLM 백엔드를 Fake로 전환"""
+    from app.core.config import settings
+    from app.llm import gemini_client
+
+    settings.llm_backend = "fake"
+    settings.fake_llm_profile = profile
+    gemini_client._gemini_client = None
+
+
+async def run_load_test(args: argparse.Namespace) -> list[dict]:
+    async with build_client(args.base_url, args.in_process, args.timeout) as client:
+        results = await asyncio.gather(*(
+            drive(client, scenario, args.rps, args.duration, args.max_inflight)
+            for scenario in args.scenario
+        ))
+    return [stats.summary(elapsed) for stats, elapsed in results]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline load test harness (fake LLM)")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--in-process", action="store_true", help="서버 없이 ASGI 앱을 직접 호출 (LLM은 Fake로 전환)")
+    parser.add_argument("--profile", default="realistic", help="--in-process 시 Fake LLM 프로파일")
+    parser.add_argument("--scenario", nargs="+", choices=sorted(SCENARIOS), default=["planner"])
+    parser.add_argument("--rps", type=float, default=5.0, help="시나리오별 목표 RPS")
+    parser.add_argument("--duration", type=float, default=30.0, help="요청 발사 시간(초)")
+    parser.add_argument("--max-inflight", type=int, default=200, help="클라이언트 측 동시 요청 상한")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--json", type=Path, default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    if args.in_process:
+        use_fake_llm(args.profile)
+
+    summaries = asyncio.run(run_load_test(args))
+
+    print(
+        f"{'scenario':<9} {'reqs':>6} {'ok':>6} {'err':>5} {'rps':>7} "
+        f"{'p50(ms)':>9} {'p90(ms)':>9} {'p99(ms)':>9} {'fallback':>9}"
+    )
+    for s in summaries:
+        print(
+            f"{s['scenario']:<9} {s['requests']:>6} {s['ok']:>6} {s['errors']:>5} {s['throughput_rps']:>7} "
+            f"{s['p50_ms']:>9} {s['p90_ms']:>9} {s['p99_ms']:>9} {s['fallback_rate']:>9.1%}"
+        )
+    if args.json:
+        args.json.write_text(json.dumps(summaries, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
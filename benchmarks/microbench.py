@@ -0,0 +1,319 @@
+"""
+플래너 결정론적 구간 마이크로벤치마크 + 회귀(Regression) 기준선
+
+LLM / DB 없이 합성 일정(작업 5 ~ 2000개)에 대해 아래 경로의 수행 시간을 측정하고,
+레포에 저장된 기준선(benchmarks/baselines/microbench.json)과 비교합니다.
+
+- calculate_free_sessions: 고정 일정 -> 가용 세션 계산
+- node2_importance / node4_chain_judgement / node5_time_assignment
+- apply_closure: 후보 체인 그룹 Closure
+- format_node3_input / format_node3_input_compact: Node 3 LLM 입력 포맷팅
+- format_report_data_for_llm: 주간 레포트 LLM 입력 포맷팅 (4주치 기록)
+- build_record_task_rows: save_ai_draft의 record_tasks 행 생성
+
+측정값은 케이스별 최소 1회 실행 시간(초)이며, 기계 간 속도 차이는 고정 참조 작업(calibration) 시간의 비율로 보정합니다.
+(기준선 x 보정 비율 x (1 + tolerance)를 넘으면 회귀로 판단, --check 시 종료 코드 1)
+
+실행:
+    python -m benchmarks.microbench
+    python -m benchmarks.microbench --check --tolerance 0.5
+    python -m benchmarks.microbench --update-baseline
+    python -m benchmarks.microbench --cases node5_time_assignment apply_closure --sizes 500 2000
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable
+
+from benchmarks.synthetic import build_synthetic_state
+from app.db.repositories.planner_repository import build_record_task_rows
+from app.llm.prompts.node3_prompt import format_node3_input, format_node3_input_compact
+from app.llm.prompts.report_prompt import format_report_data_for_llm
+from app.models.planner.internal import PlannerGraphState
+from app.models.planner.request import ScheduleItem
+from app.services.planner.nodes.node2_importance import node2_importance
+from app.services.planner.nodes.node4_chain_judgement import apply_closure, node4_chain_judgement
+from app.services.planner.nodes.node5_time_assignment import node5_time_assignment
+from app.services.planner.utils.session_utils import calculate_capacity, calculate_free_sessions
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines" / "microbench.json"
+
+DEFAULT_SIZES = [5, 50, 500, 2000]
+DEFAULT_TOLERANCE = 0.5
+
+# 케이스 1회 실행이 이 시간보다 짧으면 여러 번 묶어서 측정 (타이머 해상도 / 노이즈 보정)
+MIN_MEASURE_SECONDS = 0.02
+
+
+def _fresh(state: PlannerGraphState) -> PlannerGraphState:
+    """파생 데이터 캐시(state index)를 비운 state (반복 측정 시 캐시 적중 방지)"""
+    state._derived_cache.clear()
+    return state
+
+
+def _fixed_schedules(n: int, seed: int = 0) -> list[ScheduleItem]:
+    """08:00 ~ 24:00 사이 고정 일정 n개 (서로 겹칠 수 있음)"""
+    rng = random.Random(seed)
+    schedules = []
+    for i in range(n):
+        start = rng.randrange(480, 1410, 10)
+        end = min(start + rng.choice([10, 30, 60, 90]), 1439)
+        schedules.append(ScheduleItem(
+            taskId=i + 1, dayPlanId=1, title=f"Fixed {i + 1}", type="FIXED",
+            startAt=f"{start // 60:02d}:{start % 60:02d}", endAt=f"{end // 60:02d}:{end % 60:02d}"
+        ))
+    return schedules
+
+
+def _report_records(n: int, seed: int = 0) -> list[dict[str, Any]]:
+    """과거 4주(28일)에 작업 n개를 나눠 담은 planner_records 조회 결과 (record_tasks + schedule_histories)"""
+    rng = random.Random(seed)
+    base = date(2026, 1, 1)
+    records = [
+        {
+            "plan_date": str(base + timedelta(days=d)),
+            "start_arrange": "09:00",
+            "day_end_time": "23:00",
+            "focus_time_zone": "MORNING",
+            "record_tasks": [],
+            "schedule_histories": [],
+        }
+        for d in range(min(n, 28))
+    ]
+    for i in range(n):
+        record = records[i % len(records)]
+        start = rng.randrange(540, 1320, 10)
+        record["record_tasks"].append({
+            "task_id": i + 1,
+            "title": f"Task {i + 1}",
+            "task_type": rng.choice(["FLEX", "FIXED"]),
+            "status": rng.choice(["TODO", "DONE"]),
+            "assignment_status": rng.choice(["ASSIGNED", "ASSIGNED", "EXCLUDED"]),
+            "start_at": f"{start // 60:02d}:{start % 60:02d}",
+            "end_at": f"{(start + 60) // 60:02d}:{(start + 60) % 60:02d}",
+        })
+        if rng.random() < 0.3:
+            record["schedule_histories"].append({
+                "schedule_id": i + 1,
+                "event_type": "MOVE_TIME",
+                "prev_start_at": "10:00",
+                "prev_end_at": "11:00",
+                "new_start_at": "14:00",
+                "new_end_at": None,
+            })
+    rng.shuffle(records)
+    return records
+
+
+# 케이스 이름 -> setup(n): 측정 대상(인자 없는 호출)을 반환, setup 비용은 측정에서 제외
+def _setup_calculate_free_sessions(n: int) -> Callable[[], Any]:
+    fixed = _fixed_schedules(n)
+    return lambda: calculate_free_sessions("08:00", "23:50", fixed)
+
+
+def _setup_node2(n: int) -> Callable[[], Any]:
+    state = build_synthetic_state(n)
+    return lambda: node2_importance(_fresh(state))
+
+
+def _setup_node4(n: int) -> Callable[[], Any]:
+    state = build_synthetic_state(n, num_candidates=4)
+    return lambda: node4_chain_judgement(_fresh(state))
+
+
+def _setup_node5(n: int) -> Callable[[], Any]:
+    state = build_synthetic_state(n)
+    return lambda: node5_time_assignment(_fresh(state))
+
+
+def _setup_apply_closure(n: int) -> Callable[[], Any]:
+    state = build_synthetic_state(n)
+    chain = state.chainCandidates[0]
+    return lambda: apply_closure(chain, state.taskFeatures)
+
+
+def _node3_inputs(n: int) -> tuple:
+    state = build_synthetic_state(n)
+    fixed = [s.model_dump() for s in _fixed_schedules(max(1, n // 10))]
+    return state.taskFeatures, fixed, calculate_capacity(state.freeSessions), "AFTERNOON"
+
+
+def _setup_format_node3_input(n: int) -> Callable[[], Any]:
+    args = _node3_inputs(n)
+    return lambda: format_node3_input(*args)
+
+
+def _setup_format_node3_input_compact(n: int) -> Callable[[], Any]:
+    args = _node3_inputs(n)
+    return lambda: format_node3_input_compact(*args)
+
+
+def _setup_format_report_data(n: int) -> Callable[[], Any]:
+    records = _report_records(n)
+    return lambda: format_report_data_for_llm(date(2026, 1, 29), records)
+
+
+def _setup_record_task_rows(n: int) -> Callable[[], Any]:
+    state = node5_time_assignment(build_synthetic_state(n))
+    state.fixedTasks = _fixed_schedules(max(1, n // 10))
+    return lambda: build_record_task_rows(state, record_id=1)
+
+
+CASES: dict[str, Callable[[int], Callable[[], Any]]] = {
+    "calculate_free_sessions": _setup_calculate_free_sessions,
+    "node2_importance": _setup_node2,
+    "node4_chain_judgement": _setup_node4,
+    "node5_time_assignment": _setup_node5,
+    "apply_closure": _setup_apply_closure,
+    "format_node3_input": _setup_format_node3_input,
+    "format_node3_input_compact": _setup_format_node3_input_compact,
+    "format_report_data_for_llm": _setup_format_report_data,
+    "build_record_task_rows": _setup_record_task_rows,
+}
+
+
+def time_call(fn: Callable[[], Any], repeat: int = 5) -> float:
+    """fn 1회 실행의 최소 시간(초), 짧은 함수는 MIN_MEASURE_SECONDS 이상이 되도록 묶어서 측정"""
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= MIN_MEASURE_SECONDS or number >= 10_000:
+            break
+        number *= 10
+
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - started) / number)
+    return best
+
+
+def calibrate(repeat: int = 5) -> float:
+    """기계 속도 보정용 고정 참조 작업(순수 Python dict / 문자열 / 정렬) 수행 시간(초)"""
+    def reference() -> None:
+        rows = [{"id": i, "title": f"Task {i}", "score": (i * 7919) % 1000} for i in range(2000)]
+        rows.sort(key=lambda r: r["score"])
+        ",".join(r["title"] for r in rows)
+
+    return time_call(reference, repeat=repeat)
+
+
+def run_suite(
+    cases: list[str] | None = None,
+    sizes: list[int] | None = None,
+    repeat: int = 5
+) -> dict[str, dict[str, float]]:
+    """{case: {size: seconds}} (JSON 키 호환을 위해 size는 문자열)"""
+    results: dict[str, dict[str, float]] = {}
+    for name in cases or list(CASES):
+        setup = CASES[name]
+        results[name] = {str(n): time_call(setup(n), repeat=repeat) for n in sizes or DEFAULT_SIZES}
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, Any],
+    calibration: float,
+    tolerance: float = DEFAULT_TOLERANCE
+) -> list[dict[str, Any]]:
+    """
+    측정 결과와 기준선 비교 (기준선에 없는 케이스 / 크기는 건너뜀)
+    ratio: 보정된 기준선 대비 배율, regressed: ratio > 1 + tolerance
+    """
+    scale = calibration / baseline["calibration_seconds"] if baseline.get("calibration_seconds") else 1.0
+    rows = []
+    for name, by_size in results.items():
+        for size, seconds in by_size.items():
+            expected = baseline.get("results", {}).get(name, {}).get(size)
+            if not expected:
+                continue
+            ratio = seconds / (expected * scale)
+            rows.append({
+                "case": name,
+                "size": int(size),
+                "seconds": seconds,
+                "baseline_seconds": expected * scale,
+                "ratio": ratio,
+                "regressed": ratio > 1.0 + tolerance,
+            })
+    return rows
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> dict[str, Any] | None:
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_baseline(results: dict[str, dict[str, float]], calibration: float, path: Path = BASELINE_PATH) -> None:
+    """기존 기준선에 측정한 케이스 / 크기만 덮어쓰기"""
+    baseline = load_baseline(path) or {"results": {}}
+    for name, by_size in results.items():
+        baseline["results"].setdefault(name, {}).update(by_size)
+    baseline["calibration_seconds"] = calibration
+    baseline["python"] = platform.python_version()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Planner microbenchmarks with regression baselines")
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=None)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="허용 느려짐 비율 (0.5 = 50%%)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--check", action="store_true", help="회귀 발생 시 종료 코드 1")
+    parser.add_argument("--update-baseline", action="store_true", help="측정 결과로 기준선 갱신")
+    args = parser.parse_args()
+
+    # 측정 중 CPU 클럭 변동에 대비해 전후로 보정하고 느린 쪽을 사용 (회귀 오탐 방지)
+    calibration = calibrate(args.repeat)
+    results = run_suite(args.cases, args.sizes, args.repeat)
+    calibration = max(calibration, calibrate(args.repeat))
+
+    if args.update_baseline:
+        save_baseline(results, calibration, args.baseline)
+        print(f"baseline written to {args.baseline}")
+
+    baseline = load_baseline(args.baseline)
+    rows = compare(results, baseline, calibration, args.tolerance) if baseline and not args.update_baseline else []
+    if any(r["regressed"] for r in rows):
+        # 일시적인 노이즈와 구분하기 위해 회귀 케이스만 다시 측정 (두 측정 중 최솟값 사용)
+        for row in rows:
+            if row["regressed"]:
+                retry = run_suite([row["case"]], [row["size"]], args.repeat)[row["case"]][str(row["size"])]
+                results[row["case"]][str(row["size"])] = min(results[row["case"]][str(row["size"])], retry)
+        rows = compare(results, baseline, calibration, args.tolerance)
+    by_key = {(r["case"], r["size"]): r for r in rows}
+
+    print(f"calibration: {calibration * 1000:.3f} ms")
+    print(f"{'case':<28} {'tasks':>6} {'time(ms)':>10} {'base(ms)':>10} {'ratio':>7}")
+    for name, by_size in results.items():
+        for size, seconds in by_size.items():
+            row = by_key.get((name, int(size)))
+            base = f"{row['baseline_seconds'] * 1000:>10.3f}" if row else f"{'-':>10}"
+            ratio = f"{row['ratio']:>7.2f}" if row else f"{'-':>7}"
+            flag = "  REGRESSED" if row and row["regressed"] else ""
+            print(f"{name:<28} {size:>6} {seconds * 1000:>10.3f} {base} {ratio}{flag}")
+
+    regressed = [r for r in rows if r["regressed"]]
+    if regressed:
+        print(f"{len(regressed)} case(s) slower than baseline by more than {args.tolerance:.0%}")
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
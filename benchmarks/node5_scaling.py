@@ -0,0 +1,51 @@
+"""
+Node 5 시간 배정 엔진 스케일링 벤치마크
+
+수천 개의 작업/세션(팀 단위 또는 공유 캘린더, 여러 날 배정)에 대해
+assign_tasks_to_sessions의 수행 시간이 선형으로 증가하는지 확인합니다.
+
+실행:
+    python -m benchmarks.node5_scaling
+    python -m benchmarks.node5_scaling --sizes 1000 2000 4000 8000 --repeat 5
+"""
+import argparse
+import time
+
+from benchmarks.synthetic import build_synthetic_state
+from app.services.planner.nodes.node5_time_assignment import assign_tasks_to_sessions
+
+
+def measure(num_tasks: int, repeat: int = 3) -> float:
+    """작업 num_tasks개 / 세션 num_tasks개에 대한 최소 수행 시간(초)"""
+    state = build_synthetic_state(num_tasks, num_sessions=num_tasks)
+    chain = state.chainCandidates[0]
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        assign_tasks_to_sessions(
+            sessions=state.freeSessions,
+            time_zone_queues=chain.timeZoneQueues,
+            task_features=state.taskFeatures,
+            user_id=state.request.user.userId
+        )
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Node 5 scaling benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 1000, 2000, 4000, 8000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'tasks':>8} {'sessions':>9} {'time(ms)':>10} {'us/task':>9}")
+    prev = None
+    for n in args.sizes:
+        elapsed = measure(n, repeat=args.repeat)
+        growth = f"  x{elapsed / prev:.2f}" if prev else ""
+        print(f"{n:>8} {n:>9} {elapsed * 1000:>10.2f} {elapsed / n * 1e6:>9.2f}{growth}")
+        prev = elapsed
+
+
+if __name__ == "__main__":
+    main()
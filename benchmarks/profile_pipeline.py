@@ -0,0 +1,119 @@
+"""
+플래너 파이프라인 로컬 프로파일링 (Fake LLM)
+
+실제 Gemini 호출 대신 결정론적 Fake LLM으로 Node 1 ~ Node 5 전체 파이프라인을 반복 실행하며
+SamplingProfiler(운영 On-demand 프로파일링과 동일)로 Hot Spot을 찾습니다.
+(Pydantic 복사, 로깅, 분 단위 루프 등 결정론적 구간의 비용 확인용)
+
+- 입력: tests/data/test_request.json(기본) 또는 합성 대규모 일정(--tasks N)
+- 출력: 상위 N개 함수(Self / Total 샘플), --output 지정 시 Collapsed Stack 파일(flamegraph.pl / speedscope)
+- --cprofile: 결정론적 프로파일러(cProfile)로 누적 시간 상위 함수 출력
+
+실행:
+    python -m benchmarks.profile_pipeline
+    python -m benchmarks.profile_pipeline --tasks 200 --iterations 20 --output pipeline.folded
+"""
+import argparse
+import asyncio
+import cProfile
+import json
+import pstats
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from benchmarks.prompt_size import SYNTHETIC_ID_OFFSET, TEST_REQUEST_PATH
+from benchmarks.synthetic import build_synthetic_state
+from app.core.profiling import SamplingProfiler
+from app.llm.fake_client import FakeGeminiClient, FakeLLMProfile
+from app.models.planner.request import ArrangementState
+from app.services.planner.pipeline import run_planner_pipeline
+
+# Fake LLM으로 교체할 get_gemini_client 참조 위치
+LLM_PATCH_TARGETS = (
+    "app.services.planner.nodes.node1_structure.get_gemini_client",
+    "app.services.planner.nodes.node3_chain_generator.get_gemini_client",
+)
+
+
+def load_request(num_tasks: int | None = None) -> ArrangementState:
+    """test_request.json 또는 합성 대규모 일정 요청"""
+    if num_tasks:
+        return build_synthetic_state(num_tasks, id_offset=SYNTHETIC_ID_OFFSET).request
+    with open(TEST_REQUEST_PATH, "r", encoding="utf-8") as f:
+        return ArrangementState.model_validate(json.load(f))
+
+
+async def run_iterations(request: ArrangementState, iterations: int, llm: FakeGeminiClient) -> float:
+    """Fake LLM으로 파이프라인을 iterations회 실행, 총 소요 시간(초)"""
+    patches = [patch(target, return_value=llm) for target in LLM_PATCH_TARGETS]
+    for p in patches:
+        p.start()
+    try:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            await run_planner_pipeline(request)
+        return time.perf_counter() - started
+    finally:
+        for p in patches:
+            p.stop()
+
+
+def profile_pipeline(
+    request: ArrangementState,
+    iterations: int = 10,
+    interval: float = 0.001,
+    llm_latency: float = 0.0
+) -> tuple[SamplingProfiler, float]:
+    """SamplingProfiler로 감싼 파이프라인 반복 실행 (프로파일러, 총 소요 시간)"""
+    llm = FakeGeminiClient(FakeLLMProfile(latency=llm_latency))
+    # 샘플링 스레드가 GIL을 간격에 맞춰 얻을 수 있도록 스레드 전환 주기(기본 5ms)를 줄임
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(min(switch_interval, interval / 2))
+    try:
+        with SamplingProfiler(interval=interval) as profiler:
+            elapsed = asyncio.run(run_iterations(request, iterations, llm))
+    finally:
+        sys.setswitchinterval(switch_interval)
+    return profiler, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Planner pipeline profiler (fake LLM)")
+    parser.add_argument("--tasks", type=int, default=None, help="합성 일정 작업 수 (미지정 시 test_request.json)")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--interval-ms", type=float, default=1.0)
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Fake LLM 응답 지연(초)")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--output", type=Path, default=None, help="Collapsed Stack 파일 저장 경로")
+    parser.add_argument("--cprofile", action="store_true", help="cProfile(결정론적)로 측정")
+    args = parser.parse_args()
+
+    request = load_request(args.tasks)
+
+    if args.cprofile:
+        profile = cProfile.Profile()
+        profile.enable()
+        elapsed = asyncio.run(run_iterations(request, args.iterations, FakeGeminiClient(FakeLLMProfile(latency=args.llm_latency))))
+        profile.disable()
+        print(f"{args.iterations} runs in {elapsed * 1000:.1f} ms")
+        pstats.Stats(profile).sort_stats("cumulative").print_stats(args.top)
+        return
+
+    profiler, elapsed = profile_pipeline(request, args.iterations, args.interval_ms / 1000, args.llm_latency)
+    print(
+        f"{args.iterations} runs in {elapsed * 1000:.1f} ms "
+        f"({elapsed / args.iterations * 1000:.2f} ms/run, {profiler.sample_count} samples)"
+    )
+    print(f"{'self%':>6} {'self':>6} {'total':>6}  function")
+    for row in profiler.top_functions(args.top):
+        print(f"{row['self_pct']:>6.1f} {row['self']:>6} {row['total']:>6}  {row['function']}")
+
+    if args.output:
+        args.output.write_text(profiler.folded(), encoding="utf-8")
+        print(f"collapsed stacks written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
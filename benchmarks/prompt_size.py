@@ -0,0 +1,123 @@
+"""
+Node 1 / Node 3 프롬프트 크기 벤치마크 (기존 형식 vs Compact 형식)
+
+tests/data/test_request.json과 합성(Synthetic) 대규모 하루 일정에 대해
+LLM 입력(user prompt) 크기를 문자 수 / 추정 토큰 수로 비교합니다.
+
+- 기본: 오프라인 토큰 추정 (ASCII 4자당 1토큰, 한글 등 비ASCII 1자당 1토큰)
+- --gemini: Gemini count_tokens API로 실제 토큰 수 측정 (GEMINI_API_KEY 필요, 유료 호출 아님)
+
+실행:
+    python -m benchmarks.prompt_size
+    python -m benchmarks.prompt_size --sizes 20 100 500 --gemini
+"""
+import argparse
+import json
+import math
+from pathlib import Path
+from typing import Callable
+
+from benchmarks.synthetic import build_synthetic_state
+from app.llm.prompts.node1_prompt import format_tasks_for_llm, format_tasks_compact
+from app.llm.prompts.node3_prompt import format_node3_input, format_node3_input_compact
+from app.models.planner.internal import PlannerGraphState
+from app.models.planner.request import ArrangementState
+from app.services.planner.nodes.node1_structure import _create_fallback_feature
+from app.services.planner.nodes.node2_importance import node2_importance
+from app.services.planner.pipeline import build_initial_state
+from app.services.planner.utils.state_index import get_state_index
+
+TEST_REQUEST_PATH = Path(__file__).resolve().parent.parent / "tests" / "data" / "test_request.json"
+
+# 합성 데이터는 실제 DB처럼 큰(bigint) taskId를 사용
+SYNTHETIC_ID_OFFSET = 10_000_000_000
+
+
+def estimate_tokens(text: str) -> int:
+    """오프라인 토큰 수 근사 (ASCII 4자당 1토큰, 비ASCII 1자당 1토큰)"""
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return math.ceil(ascii_chars / 4) + (len(text) - ascii_chars)
+
+
+def gemini_token_counter() -> Callable[[str], int]:
+    """Gemini count_tokens API 기반 토큰 카운터"""
+    from app.llm.gemini_client import get_gemini_client
+
+    gemini = get_gemini_client()
+
+    def count(text: str) -> int:
+        return gemini.client.models.count_tokens(model=gemini.model_name, contents=text).total_tokens
+
+    return count
+
+
+def _node3_kwargs(state: PlannerGraphState) -> dict:
+    return dict(
+        task_features=state.taskFeatures,
+        fixed_schedules=[{"title": t.title, "startAt": t.startAt, "endAt": t.endAt} for t in state.fixedTasks],
+        capacity=get_state_index(state).capacity,
+        focus_timezone=state.request.user.focusTimeZone
+    )
+
+
+def prompt_pairs(state: PlannerGraphState) -> dict[str, tuple[str, str]]:
+    """노드별 (기존 형식, Compact 형식) 프롬프트"""
+    compact_node1, _ = format_tasks_compact(state.flexTasks)
+    compact_node3, _ = format_node3_input_compact(**_node3_kwargs(state))
+    return {
+        "node1": (format_tasks_for_llm(state.flexTasks), compact_node1),
+        "node3": (format_node3_input(**_node3_kwargs(state)), compact_node3),
+    }
+
+
+def sample_request_state() -> PlannerGraphState:
+    """tests/data/test_request.json + Fallback Feature / Node 2 (Node 3 입력 직전 상태)"""
+    with open(TEST_REQUEST_PATH, "r", encoding="utf-8") as f:
+        request = ArrangementState.model_validate(json.load(f))
+    state = build_initial_state(request)
+    features = {t.taskId: _create_fallback_feature(t) for t in state.flexTasks}
+    return node2_importance(state.model_copy(update={"taskFeatures": features}))
+
+
+def measure_prompt_sizes(
+    state: PlannerGraphState,
+    count_tokens: Callable[[str], int] = estimate_tokens
+) -> dict[str, dict[str, int]]:
+    """노드별 기존/Compact 문자 수와 토큰 수"""
+    sizes = {}
+    for node, (verbose, compact) in prompt_pairs(state).items():
+        sizes[node] = {
+            "chars_before": len(verbose),
+            "chars_after": len(compact),
+            "tokens_before": count_tokens(verbose),
+            "tokens_after": count_tokens(compact),
+        }
+    return sizes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Planner prompt size benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 100, 500])
+    parser.add_argument("--gemini", action="store_true", help="Gemini count_tokens API로 토큰 수 측정")
+    args = parser.parse_args()
+
+    count_tokens = gemini_token_counter() if args.gemini else estimate_tokens
+    cases = [("test_request.json", sample_request_state())]
+    cases += [
+        (f"synthetic({n})", build_synthetic_state(n, id_offset=SYNTHETIC_ID_OFFSET))
+        for n in args.sizes
+    ]
+
+    print(f"{'case':<20} {'node':<6} {'chars':>15} {'tokens':>15} {'saved':>7}")
+    for name, state in cases:
+        for node, s in measure_prompt_sizes(state, count_tokens).items():
+            saved = 1 - s["tokens_after"] / s["tokens_before"] if s["tokens_before"] else 0.0
+            print(
+                f"{name:<20} {node:<6} "
+                f"{s['chars_before']:>7}->{s['chars_after']:<7} "
+                f"{s['tokens_before']:>7}->{s['tokens_after']:<7} {saved:>6.0%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""
+캡처한 플래너 트래픽 재생 (Record & Replay의 Replay)
+
+운영에서 PLANNER_CAPTURE_DIR / PLANNER_CAPTURE_SAMPLE_RATE로 기록한 요청을
+기록된 Node 1 / Node 3 Gemini 응답(ReplayGeminiClient)으로 현재 코드에서 다시 실행합니다.
+
+- 출력
+  - 구간별 지연 시간 분위수 (기록 시점 vs 재생, p50 / p95)
+  - 결과 차이: 선택 체인 / 작업별 배정 결과(상태, 시각, 분할 조각)가 기록과 다른 요청
+  - LLM 호출 차이: 프롬프트 길이 변경, 기록보다 많은 호출(기록 소진), 사용되지 않은 기록
+  - 클라이언트 연결 종료 등으로 취소된 기록(cancelled)은 기록된 LLM 호출까지만 비교
+- 기본은 기록 시점의 설정(Compact 프롬프트, 추측 실행, 로컬 서치 예산)으로 실행, --current-config 지정 시 현재 설정 사용
+- 재시도 Backoff 대기는 생략, LLM 지연 시간은 0 (--llm-latency-scale 1.0이면 기록된 지연 시간만큼 대기)
+- 기록 시점 지연 시간에는 LLM 호출 시간이 포함되므로, 결정론적 구간(node2 / node4 / node5 등) 비교가 주 용도
+
+실행:
+    python -m benchmarks.replay_traffic /var/lib/molip/planner-capture
+    python -m benchmarks.replay_traffic capture/planner-*.jsonl.gz --repeat 5 --show-divergences 20
+    python -m benchmarks.replay_traffic capture/ --llm-latency-scale 1.0 --current-config
+"""
+import argparse
+import asyncio
+import functools
+import json
+import time
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional
+from unittest.mock import patch
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.timing import RequestTimings, _current_timings
+from app.llm.recording import ReplayGeminiClient
+from app.models.planner.request import ArrangementState
+from app.services.planner.nodes.node4_local_search import node4_local_search
+from app.services.planner.pipeline import run_planner_pipeline
+from app.services.planner.traffic_capture import load_capture_records, summarize_output
+from benchmarks.profile_pipeline import LLM_PATCH_TARGETS
+
+PIPELINE_STAGES = ["sessions", "node1", "node2", "node3", "node4", "local_search", "node5"]
+
+# 캡처 레코드 config 키 -> settings 필드
+CONFIG_SETTINGS = {
+    "compactPrompts": "planner_compact_prompts",
+    "speculativeNode3": "planner_speculative_node3",
+    "speculativeMaxDivergence": "planner_speculative_max_divergence",
+    "localSearchMs": "planner_local_search_ms",
+}
+
+# 재시도 Backoff 대기를 생략할 노드 모듈
+SLEEP_PATCH_TARGETS = (
+    "app.services.planner.nodes.node1_structure.asyncio",
+    "app.services.planner.nodes.node3_chain_generator.asyncio",
+)
+
+
+class _NoSleepAsyncio:
+    """asyncio 모듈 대체 (sleep만 즉시 반환)"""
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(asyncio, name)
+
+    @staticmethod
+    async def sleep(delay: float, result: Any = None) -> Any:
+        return await asyncio.sleep(0, result)
+
+
+@dataclass
+class ReplayResult:
+    """레코드 1건 재생 결과 (지연 시간은 ms)"""
+    index: int
+    recorded_stages: dict[str, float]
+    replayed_stages: dict[str, float]
+    divergences: list[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+@contextmanager
+def replay_environment(record: dict[str, Any], client: ReplayGeminiClient, current_config: bool = False) -> Iterator[None]:
+    """기록된 LLM 응답 / 로컬 서치 시드 주입 + 재시도 대기 생략 + 기록 시점 설정 적용 (재생 중 캡처는 비활성화)"""
+    with ExitStack() as stack:
+        for target in LLM_PATCH_TARGETS:
+            stack.enter_context(patch(target, return_value=client))
+        for target in SLEEP_PATCH_TARGETS:
+            stack.enter_context(patch(target, _NoSleepAsyncio()))
+        stack.enter_context(patch.object(settings, "planner_capture_sample_rate", 0.0))
+        seed = record.get("localSearchSeed")
+        if seed is not None:
+            # 기록 시점과 같은 시드로 로컬 서치 (시드 계산 방식이 바뀌어도 기록과 비교 가능)
+            stack.enter_context(patch(
+                "app.services.planner.pipeline.node4_local_search",
+                functools.partial(node4_local_search, seed=seed)
+            ))
+        if not current_config:
+            for key, value in record.get("config", {}).items():
+                if key in CONFIG_SETTINGS:
+                    stack.enter_context(patch.object(settings, CONFIG_SETTINGS[key], value))
+        yield
+
+
+def _format_result(row: list) -> str:
+    _, status, start, end, children = row
+    pieces = f" {len(children)} pieces" if children else ""
+    return f"{status} {start}-{end}{pieces}"
+
+
+def diff_output(recorded: dict[str, Any], replayed: dict[str, Any]) -> list[str]:
+    """선택 체인 / 작업별 배정 결과 차이"""
+    divergences = []
+    if recorded.get("selectedChainId") != replayed.get("selectedChainId"):
+        divergences.append(f"selectedChainId {recorded.get('selectedChainId')} -> {replayed.get('selectedChainId')}")
+
+    before = {row[0]: row for row in recorded.get("results", [])}
+    after = {row[0]: row for row in replayed.get("results", [])}
+    for task_id in sorted(before.keys() | after.keys()):
+        old, new = before.get(task_id), after.get(task_id)
+        if old == new:
+            continue
+        old_text = _format_result(old) if old else "missing"
+        new_text = _format_result(new) if new else "missing"
+        divergences.append(f"task {task_id}: {old_text} -> {new_text}")
+    return divergences
+
+
+def diff_llm_calls(client: ReplayGeminiClient, partial: bool = False) -> list[str]:
+    """프롬프트 길이 변경 / 기록 소진 / 사용되지 않은 기록 (partial: 중간에 취소된 기록이라 소진은 차이가 아님)"""
+    divergences = []
+    for call in client.calls:
+        if call.get("exhausted"):
+            if not partial:
+                divergences.append(f"llm {call['stage']}: no recorded response left")
+        elif call["recordedPromptChars"] is not None and call["promptChars"] != call["recordedPromptChars"]:
+            divergences.append(f"llm {call['stage']}: prompt {call['recordedPromptChars']} -> {call['promptChars']} chars")
+    if client.remaining:
+        divergences.append(f"llm: {client.remaining} recorded responses unused")
+    return divergences
+
+
+async def replay_record(
+    index: int,
+    record: dict[str, Any],
+    current_config: bool = False,
+    latency_scale: float = 0.0
+) -> ReplayResult:
+    """레코드 1건을 기록된 LLM 응답으로 다시 실행"""
+    request = ArrangementState.model_validate(record["request"])
+    client = ReplayGeminiClient(record.get("llm", []), latency_scale=latency_scale)
+    timings = RequestTimings()
+    token = _current_timings.set(timings)
+    state, error = None, None
+    try:
+        with replay_environment(record, client, current_config):
+            state = await run_planner_pipeline(request)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        _current_timings.reset(token)
+
+    cancelled = record.get("cancelled", False)
+    divergences = diff_llm_calls(client, partial=cancelled)
+    if cancelled:
+        # 취소된 요청은 기록된 단계까지만 비교 (결과 / 에러 비교 생략)
+        pass
+    elif error is None and "error" not in record:
+        divergences = diff_output(record.get("output", {}), summarize_output(state)) + divergences
+    elif (error is None) != ("error" not in record):
+        divergences.insert(0, f"error {record.get('error')} -> {error}")
+
+    return ReplayResult(
+        index=index,
+        recorded_stages=record.get("stages", {}),
+        replayed_stages={name: t.wall_ms for name, t in timings.stages.items()},
+        divergences=divergences,
+        error=error,
+    )
+
+
+async def replay_records(
+    records: list[dict[str, Any]],
+    repeat: int = 1,
+    current_config: bool = False,
+    latency_scale: float = 0.0
+) -> list[ReplayResult]:
+    """레코드를 순서대로 repeat회씩 재생 (동시 실행 없음, 구간 지연 시간 간섭 방지)"""
+    results = []
+    for index, record in enumerate(records):
+        for _ in range(repeat):
+            results.append(await replay_record(index, record, current_config, latency_scale))
+    return results
+
+
+def _percentiles(values: list[float]) -> tuple[float, float]:
+    if not values:
+        return 0.0, 0.0
+    p50, p95 = np.percentile(values, [50, 95])
+    return round(float(p50), 2), round(float(p95), 2)
+
+
+def summarize_stages(records: list[dict[str, Any]], results: list[ReplayResult]) -> list[dict[str, Any]]:
+    """구간별 기록 / 재생 지연 시간 분위수 (ms)"""
+    names = PIPELINE_STAGES + sorted(
+        {name for r in results for name in r.replayed_stages} - set(PIPELINE_STAGES)
+    )
+    rows = []
+    for name in names:
+        recorded = [r["stages"][name] for r in records if name in r.get("stages", {})]
+        replayed = [r.replayed_stages[name] for r in results if name in r.replayed_stages]
+        if not recorded and not replayed:
+            continue
+        rec_p50, rec_p95 = _percentiles(recorded)
+        rep_p50, rep_p95 = _percentiles(replayed)
+        rows.append({
+            "stage": name,
+            "recorded_p50_ms": rec_p50, "recorded_p95_ms": rec_p95,
+            "replayed_p50_ms": rep_p50, "replayed_p95_ms": rep_p95,
+        })
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay captured planner traffic against the current code")
+    parser.add_argument("paths", nargs="+", help="캡처 파일(planner-*.jsonl.gz) 또는 디렉터리")
+    parser.add_argument("--limit", type=int, default=None, help="재생할 레코드 수 상한")
+    parser.add_argument("--repeat", type=int, default=1, help="레코드별 재생 횟수 (지연 시간 분포용)")
+    parser.add_argument("--current-config", action="store_true", help="기록 시점 설정 대신 현재 설정으로 실행")
+    parser.add_argument("--llm-latency-scale", type=float, default=0.0, help="기록된 LLM 지연 시간 배율 (0이면 대기 없음)")
+    parser.add_argument("--show-divergences", type=int, default=10, help="출력할 결과 차이 요청 수")
+    parser.add_argument("--json", default=None, help="요약을 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    records = load_capture_records(args.paths)[:args.limit]
+    if not records:
+        raise SystemExit("no capture records found")
+
+    started = time.perf_counter()
+    results = asyncio.run(replay_records(records, args.repeat, args.current_config, args.llm_latency_scale))
+    elapsed = time.perf_counter() - started
+
+    stages = summarize_stages(records, results)
+    diverged = [r for r in results if r.divergences]
+    print(f"replayed {len(results)} runs of {len(records)} records in {elapsed:.1f}s "
+          f"(errors={sum(1 for r in results if r.error)}, diverged={len(diverged)})\n")
+    print(f"{'stage':<14} {'rec p50':>9} {'rec p95':>9} {'replay p50':>11} {'replay p95':>11}")
+    for row in stages:
+        print(
+            f"{row['stage']:<14} {row['recorded_p50_ms']:>9} {row['recorded_p95_ms']:>9} "
+            f"{row['replayed_p50_ms']:>11} {row['replayed_p95_ms']:>11}"
+        )
+
+    shown = set()
+    for result in diverged:
+        if result.index in shown or len(shown) >= args.show_divergences:
+            continue
+        shown.add(result.index)
+        print(f"\n#{result.index}")
+        for line in result.divergences[:10]:
+            print(f"  {line}")
+
+    if args.json:
+        summary = {
+            "records": len(records),
+            "runs": len(results),
+            "stages": stages,
+            "diverged": sorted({r.index for r in diverged}),
+            "divergences": {r.index: r.divergences for r in diverged},
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+벤치마크용 합성(Synthetic) 플래너 데이터 생성기
+
+- 외부 API(LLM)나 DB 없이 대규모 PlannerGraphState를 만들기 위한 유틸
+- 팀/공유 캘린더 또는 여러 날(Multi-day) 배정을 흉내내기 위해
+  세션을 여러 날(1440분 단위 오프셋)에 걸쳐 생성할 수 있음
+"""
+import random
+
+from app.models.planner.internal import PlannerGraphState, TaskFeature, ChainCandidate, FreeSession
+from app.models.planner.request import ArrangementState, ScheduleItem
+from app.models.planner.weights import WeightParams
+from app.services.planner.nodes.node2_importance import DURATION_PARAMS
+from app.services.planner.utils.session_utils import _create_session
+
+TIME_ZONES = ["MORNING", "AFTERNOON", "EVENING", "NIGHT"]
+CATEGORIES = ["학업", "업무", "운동", "생활", "취미", "기타"]
+COG_LOADS = ["LOW", "MED", "HIGH"]
+EST_RANGES = list(DURATION_PARAMS.keys())
+
+
+def build_schedules(
+    num_tasks: int,
+    seed: int = 0,
+    group_ratio: float = 0.2,
+    id_offset: int = 0
+) -> list[ScheduleItem]:
+    """
+    FLEX 작업 목록 생성 (일부는 parentScheduleId로 그룹화)
+    id_offset: 실제 DB처럼 큰(bigint) taskId를 흉내낼 때 사용
+    """
+    rng = random.Random(seed)
+    schedules: list[ScheduleItem] = []
+    task_id = id_offset + 1
+    while len(schedules) < num_tasks:
+        if rng.random() < group_ratio and num_tasks - len(schedules) >= 3:
+            # 부모 + 자식 2~4개 그룹
+            parent_id = task_id
+            schedules.append(ScheduleItem(taskId=parent_id, dayPlanId=1, title=f"Group {parent_id}", type="FLEX"))
+            task_id += 1
+            for _ in range(rng.randint(2, 4)):
+                schedules.append(ScheduleItem(
+                    taskId=task_id, parentScheduleId=parent_id, dayPlanId=1,
+                    title=f"Task {task_id}", type="FLEX",
+                    estimatedTimeRange=rng.choice(EST_RANGES),
+                    focusLevel=rng.randint(1, 10), isUrgent=rng.random() < 0.2
+                ))
+                task_id += 1
+        else:
+            schedules.append(ScheduleItem(
+                taskId=task_id, dayPlanId=1, title=f"Task {task_id}", type="FLEX",
+                estimatedTimeRange=rng.choice(EST_RANGES),
+                focusLevel=rng.randint(1, 10), isUrgent=rng.random() < 0.2
+            ))
+            task_id += 1
+    return schedules[:num_tasks]
+
+
+def build_sessions(num_sessions: int, seed: int = 0) -> list[FreeSession]:
+    """하루(08:00~24:00)에 최대 8개씩, 필요하면 여러 날에 걸친 FreeSession 생성"""
+    rng = random.Random(seed)
+    sessions: list[FreeSession] = []
+    day = 0
+    while len(sessions) < num_sessions:
+        t = day * 1440 + 480
+        day_end = day * 1440 + 1440
+        for _ in range(8):
+            if len(sessions) >= num_sessions or t >= day_end:
+                break
+            end = min(t + rng.choice([40, 60, 90, 120, 150]), day_end)
+            sessions.append(_create_session(t, end))
+            t = end + rng.choice([10, 30, 60])
+        day += 1
+    return sessions
+
+
+def build_features(schedules: list[ScheduleItem], seed: int = 0) -> dict[int, TaskFeature]:
+    """Node 1 + Node 2 이후 상태의 TaskFeature 생성 (부모 Task 제외)"""
+    rng = random.Random(seed)
+    parent_ids = {t.parentScheduleId for t in schedules if t.parentScheduleId}
+    order_counter: dict[int, int] = {}
+    features: dict[int, TaskFeature] = {}
+    for t in schedules:
+        if t.taskId in parent_ids:
+            continue
+        params = DURATION_PARAMS[t.estimatedTimeRange or "MINUTE_30_TO_60"]
+        order = None
+        if t.parentScheduleId:
+            order_counter[t.parentScheduleId] = order_counter.get(t.parentScheduleId, 0) + 1
+            order = order_counter[t.parentScheduleId]
+        features[t.taskId] = TaskFeature(
+            taskId=t.taskId, dayPlanId=t.dayPlanId, title=t.title, type=t.type,
+            category=rng.choice(CATEGORIES), cognitiveLoad=rng.choice(COG_LOADS),
+            groupId=str(t.parentScheduleId) if t.parentScheduleId else None,
+            orderInGroup=order,
+            importanceScore=round(rng.uniform(1.0, 20.0), 2),
+            fatigueCost=round(rng.uniform(1.0, 8.0), 2),
+            durationAvgMin=params["avg"], durationPlanMin=params["plan"],
+            durationMinChunk=params["min"], durationMaxChunk=params["max"]
+        )
+    return features
+
+
+def build_chain(features: dict[int, TaskFeature], chain_id: str = "C1", seed: int = 0) -> ChainCandidate:
+    """모든 작업을 시간대 큐에 무작위 분배한 체인 후보 생성 (그룹 순서 유지)"""
+    rng = random.Random(seed)
+    queues: dict[str, list[int]] = {tz: [] for tz in TIME_ZONES}
+    for tid in features:
+        queues[rng.choice(TIME_ZONES)].append(tid)
+    return ChainCandidate(chainId=chain_id, timeZoneQueues=queues, rationaleTags=["synthetic"])
+
+
+def build_synthetic_state(
+    num_tasks: int,
+    num_sessions: int | None = None,
+    num_candidates: int = 1,
+    seed: int = 0,
+    id_offset: int = 0
+) -> PlannerGraphState:
+    """
+    Node 4 입력 직전 상태(특징 + 세션 + 후보 체인)를 생성
+    num_sessions가 없으면 작업 수에 비례하여(작업 2개당 1세션) 생성
+    """
+    schedules = build_schedules(num_tasks, seed=seed, id_offset=id_offset)
+    sessions = build_sessions(num_sessions or max(1, num_tasks // 2), seed=seed)
+    features = build_features(schedules, seed=seed)
+    parent_ids = {t.parentScheduleId for t in schedules if t.parentScheduleId}
+    flex_tasks = [t for t in schedules if t.taskId not in parent_ids]
+
+    request = ArrangementState(
+        user={"userId": 1, "focusTimeZone": "AFTERNOON", "dayEndTime": "23:50"},
+        startArrange="08:00",
+        schedules=schedules
+    )
+    candidates = [build_chain(features, chain_id=f"C{i + 1}", seed=seed + i) for i in range(num_candidates)]
+    return PlannerGraphState(
+        request=request,
+        weights=WeightParams(),
+        flexTasks=flex_tasks,
+        freeSessions=sessions,
+        taskFeatures=features,
+        chainCandidates=candidates,
+        selectedChainId=candidates[0].chainId if candidates else None
+    )
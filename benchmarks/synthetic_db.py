@@ -0,0 +1,475 @@
+"""
+로컬 Postgres용 대규모 합성(Synthetic) 데이터셋 생성기 (COPY 적재)
+
+insert_test_data*.py는 사용자 3명 분량의 수작업 데이터만 넣어 주간 레포트 / MCP / 임베딩 조회를
+운영 규모에서 측정할 수 없었음. N명 x M일 분량의
+planner_records / record_tasks / schedule_histories / task_embeddings(+ combined_embedding_text)를
+현실적인 분포로 생성하여 COPY로 적재합니다.
+
+분포 (사용자별 성향은 seed + 사용자 번호로 결정되어 재실행 시 동일)
+- 활동일 비율 40 ~ 95%, 주말은 작업 수 감소, 선호 집중 시간대 70%
+- 하루 FLEX 작업 수 ~ Poisson(3 ~ 9), 카테고리 선호도 사용자별 상이, 일부는 하위 작업(parentScheduleId)
+- 완료율 ~ Beta(5, 2), 하루 종료 시각을 넘기는 작업은 EXCLUDED
+- FLEX 작업의 25%에 수정 이력(MOVE_TIME / CHANGE_DURATION / ASSIGN_TIME)
+- AI_DRAFT 레코드(--draft-ratio), 임베딩은 카테고리 중심 + 노이즈 (같은 카테고리끼리 유사)
+
+- 대상 테이블은 docs/DB_SCHEMA_AND_API.md의 DDL 기준이며, DB에 없는 컬럼 / 테이블은 자동으로 제외
+- 사용자 ID는 SYNTHETIC_DB_USER_OFFSET 대역만 사용 (--clean으로 이 대역만 삭제)
+- 적재 중에는 planner_records의 사용자 트리거(planner_date 상속)를 끄고 planner_date를 직접 채움
+
+실행:
+    python -m benchmarks.synthetic_db --users 1000 --days 90
+    python -m benchmarks.synthetic_db --users 5000 --days 180 --embedding-ratio 0.1 --dsn postgresql://localhost/molip
+    python -m benchmarks.synthetic_db --clean
+"""
+import argparse
+import asyncio
+import csv
+import io
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from operator import itemgetter
+from typing import Any, Callable, Iterable, Optional
+
+import numpy as np
+
+# 실제 사용자 / 부하 테스트(900_000_000)와 겹치지 않는 합성 데이터 전용 사용자 ID 대역
+SYNTHETIC_DB_USER_OFFSET = 800_000_000
+SYNTHETIC_DB_USER_RANGE = 100_000_000
+
+COPY_NULL = r"\N"
+
+TIME_ZONES = ["MORNING", "AFTERNOON", "EVENING", "NIGHT"]
+EST_RANGES = [("MINUTE_UNDER_30", 30), ("MINUTE_30_TO_60", 60), ("HOUR_1_TO_2", 120)]
+HISTORY_EVENTS = ["MOVE_TIME", "CHANGE_DURATION", "ASSIGN_TIME"]
+HISTORY_EVENT_WEIGHTS = [0.6, 0.25, 0.15]
+
+TITLES: dict[str, list[str]] = {
+    "학업": ["전공 과제", "시험 공부", "논문 읽기", "강의 복습", "알고리즘 문제 풀이", "영어 단어 암기"],
+    "업무": ["주간 보고서 작성", "코드 리뷰", "API 개발", "회의 자료 준비", "버그 수정", "메일 정리"],
+    "운동": ["헬스장", "러닝", "요가", "수영", "홈트레이닝"],
+    "취미": ["독서", "기타 연습", "사이드 프로젝트", "블로그 글쓰기", "그림 그리기"],
+    "생활": ["장보기", "청소", "빨래", "병원 방문", "은행 업무"],
+    "기타": ["친구 약속", "가족 전화", "여행 계획", "자기계발 강의"],
+}
+CATEGORIES = list(TITLES)
+FIXED_SCHEDULES = [("점심 식사", 720, 780), ("저녁 식사", 1110, 1170)]
+WEEKDAY_FIXED = [("수업", 600, 690), ("팀 회의", 840, 900), ("스터디", 1200, 1290)]
+
+# 테이블별 컬럼 (docs/DB_SCHEMA_AND_API.md DDL 기준, 적재 시 실제 DB에 있는 컬럼만 사용)
+PLANNER_RECORD_COLUMNS = [
+    "id", "user_id", "day_plan_id", "record_type", "start_arrange", "day_end_time", "focus_time_zone",
+    "user_age", "user_gender", "planner_date", "plan_date", "total_tasks", "assigned_count",
+    "excluded_count", "fill_rate", "weights_version", "created_at",
+]
+RECORD_TASK_COLUMNS = [
+    "id", "record_id", "task_id", "day_plan_id", "title", "status", "task_type", "parent_schedule_id",
+    "estimated_time_range", "focus_level", "is_urgent", "category", "cognitive_load", "group_id",
+    "group_label", "order_in_group", "importance_score", "fatigue_cost", "duration_avg_min",
+    "duration_plan_min", "duration_min_chunk", "duration_max_chunk", "assignment_status", "assigned_by",
+    "start_at", "end_at", "is_split", "combined_embedding_text", "created_date", "created_at",
+]
+SCHEDULE_HISTORY_COLUMNS = [
+    "id", "record_id", "schedule_id", "event_type", "prev_start_at", "prev_end_at", "new_start_at",
+    "new_end_at", "created_date", "created_at_client", "created_at_server",
+]
+TASK_EMBEDDING_COLUMNS = [
+    "id", "user_id", "task_id", "record_task_id", "content", "embedding", "category", "created_date", "created_at",
+]
+
+# 적재 순서 (FK 참조 순서)
+TABLES: dict[str, list[str]] = {
+    "planner_records": PLANNER_RECORD_COLUMNS,
+    "record_tasks": RECORD_TASK_COLUMNS,
+    "schedule_histories": SCHEDULE_HISTORY_COLUMNS,
+    "task_embeddings": TASK_EMBEDDING_COLUMNS,
+}
+
+
+@dataclass
+class DatasetConfig:
+    """합성 데이터셋 크기 / 분포 설정 (end_date: 마지막 플래너 날짜)"""
+    users: int = 100
+    days: int = 28
+    end_date: date = field(default_factory=lambda: date.today() - timedelta(days=1))
+    seed: int = 0
+    user_id_offset: int = SYNTHETIC_DB_USER_OFFSET
+    draft_ratio: float = 0.5
+    embedding_ratio: float = 0.3
+    embedding_dim: int = 768
+    embedding_pool_size: int = 256
+
+
+@dataclass
+class DatasetRows:
+    """테이블별 행 (TABLES 컬럼 순서의 tuple)"""
+    tables: dict[str, list[tuple]] = field(default_factory=lambda: {name: [] for name in TABLES})
+
+    def counts(self) -> dict[str, int]:
+        return {name: len(rows) for name, rows in self.tables.items()}
+
+
+class IdAllocator:
+    """테이블별 BIGSERIAL id 선할당 (FK 연결을 COPY 전에 메모리에서 수행)"""
+
+    def __init__(self, start: Optional[dict[str, int]] = None):
+        self._next = {name: 1 for name in TABLES}
+        self._next.update(start or {})
+
+    def take(self, table: str) -> int:
+        value = self._next[table]
+        self._next[table] = value + 1
+        return value
+
+    def last(self, table: str) -> int:
+        return self._next[table] - 1
+
+
+def embedding_pool(dim: int, size: int, seed: int = 0, noise_seed: Optional[int] = None) -> dict[str, list[str]]:
+    """
+    카테고리별 임베딩 후보 (pgvector 텍스트 표현 '[x,y,...]')
+    카테고리 중심 벡터(seed) + 노이즈(noise_seed)를 정규화하여 같은 카테고리끼리 코사인 유사도가 높음
+    (조회 벤치마크는 같은 seed / 다른 noise_seed로 데이터와 같은 분포의 질의 벡터 생성)
+    """
+    centroids = np.random.default_rng(seed).normal(size=(len(CATEGORIES), dim))
+    rng = np.random.default_rng(seed + 1 if noise_seed is None else noise_seed)
+    pool: dict[str, list[str]] = {}
+    for category, centroid in zip(CATEGORIES, centroids):
+        vectors = centroid + 0.6 * rng.normal(size=(size, dim))
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        pool[category] = ["[" + ",".join(f"{x:.4f}" for x in v) + "]" for v in vectors]
+    return pool
+
+
+def _hhmm(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _poisson(rng: random.Random, lam: float) -> int:
+    """Knuth 방식 Poisson 샘플 (하루 작업 수 정도의 작은 lambda 전용)"""
+    threshold = math.exp(-lam)
+    k, p = 0, 1.0
+    while True:
+        p *= rng.random()
+        if p <= threshold:
+            return k
+        k += 1
+
+
+def generate_user(
+    cfg: DatasetConfig,
+    user_index: int,
+    ids: IdAllocator,
+    rows: DatasetRows,
+    pool: Optional[dict[str, list[str]]] = None
+) -> None:
+    """사용자 1명의 M일 분량 행을 rows에 추가"""
+    rng = random.Random(cfg.seed * 1_000_003 + user_index)
+    user_id = cfg.user_id_offset + user_index + 1
+
+    # 사용자 성향
+    active_prob = rng.uniform(0.4, 0.95)
+    preferred_tz = rng.choice(TIME_ZONES)
+    completion = rng.betavariate(5, 2)
+    tasks_per_day = rng.uniform(3, 9)
+    category_weights = [rng.gammavariate(1.0, 1.0) for _ in CATEGORIES]
+    start_min = rng.choice([420, 480, 540, 600])
+    day_end = rng.choice(["22:00", "23:00", "23:30", "23:50"])
+    end_min = int(day_end[:2]) * 60 + int(day_end[3:])
+    age = rng.randint(19, 45)
+    gender = rng.choice(["MALE", "FEMALE"])
+
+    records = rows.tables["planner_records"]
+    tasks = rows.tables["record_tasks"]
+    histories = rows.tables["schedule_histories"]
+    embeddings = rows.tables["task_embeddings"]
+
+    for day_index in range(cfg.days):
+        plan_date = cfg.end_date - timedelta(days=cfg.days - 1 - day_index)
+        if rng.random() > active_prob:
+            continue
+        weekend = plan_date.weekday() >= 5
+        day_plan_id = user_id * 1000 + day_index
+        day_start = datetime.combine(plan_date, datetime.min.time())
+        focus_tz = preferred_tz if rng.random() < 0.7 else rng.choice(TIME_ZONES)
+
+        # 고정 일정 + FLEX 작업 배치 (시작 시각부터 순서대로, 고정 일정과 겹치면 뒤로 밀림)
+        fixed = list(FIXED_SCHEDULES)
+        if not weekend:
+            fixed += rng.sample(WEEKDAY_FIXED, rng.randint(0, 2))
+        fixed.sort(key=itemgetter(1))
+
+        day_tasks: list[dict[str, Any]] = []
+        task_seq = 0
+        for title, s, e in fixed:
+            task_seq += 1
+            day_tasks.append({
+                "task_id": day_plan_id * 100 + task_seq, "title": title, "task_type": "FIXED",
+                "category": "생활", "status": "DONE" if rng.random() < 0.9 else "TODO",
+                "assignment_status": "ASSIGNED", "start": s, "end": e, "parent": None,
+                "est": None, "plan_min": e - s,
+            })
+
+        cursor = start_min
+        num_flex = _poisson(rng, tasks_per_day * (0.6 if weekend else 1.0))
+        for _ in range(num_flex):
+            task_seq += 1
+            category = rng.choices(CATEGORIES, weights=category_weights)[0]
+            est, plan_min = rng.choice(EST_RANGES)
+            parent = None
+            flex_before = [t for t in day_tasks if t["task_type"] == "FLEX" and t["parent"] is None]
+            if flex_before and rng.random() < 0.1:
+                parent = rng.choice(flex_before)["task_id"]
+
+            cursor += rng.choice([0, 0, 10, 20, 30])
+            for _, s, e in fixed:
+                if cursor < e and cursor + plan_min > s:
+                    cursor = e
+            if cursor + plan_min <= end_min:
+                start, end, assignment = cursor, cursor + plan_min, "ASSIGNED"
+                cursor = end
+            else:
+                start, end, assignment = None, None, "EXCLUDED"
+            day_tasks.append({
+                "task_id": day_plan_id * 100 + task_seq, "title": rng.choice(TITLES[category]),
+                "task_type": "FLEX", "category": category,
+                "status": "DONE" if assignment == "ASSIGNED" and rng.random() < completion else "TODO",
+                "assignment_status": assignment, "start": start, "end": end, "parent": parent,
+                "est": est, "plan_min": plan_min,
+            })
+
+        flex = [t for t in day_tasks if t["task_type"] == "FLEX"]
+        assigned = [t for t in flex if t["assignment_status"] == "ASSIGNED"]
+        fill_rate = round(min(1.0, sum(t["plan_min"] for t in assigned) / max(1, end_min - start_min)), 4)
+
+        record_types = ["USER_FINAL"] + (["AI_DRAFT"] if rng.random() < cfg.draft_ratio else [])
+        for record_type in record_types:
+            final = record_type == "USER_FINAL"
+            created_at = day_start + (timedelta(hours=23, minutes=59) if final else timedelta(minutes=start_min - 30))
+            record_id = ids.take("planner_records")
+            records.append((
+                record_id, user_id, day_plan_id, record_type, _hhmm(start_min), day_end, focus_tz,
+                age if final else None, gender if final else None, plan_date, plan_date,
+                len(flex), len(assigned), len(flex) - len(assigned), fill_rate,
+                None if final else 1, created_at,
+            ))
+
+            for t in day_tasks:
+                is_flex = t["task_type"] == "FLEX"
+                vector = None
+                if final and is_flex and pool and t["assignment_status"] == "ASSIGNED" and rng.random() < cfg.embedding_ratio:
+                    vector = rng.choice(pool[t["category"]])
+                task_row_id = ids.take("record_tasks")
+                tasks.append((
+                    task_row_id, record_id, t["task_id"], day_plan_id, t["title"],
+                    t["status"] if final else "TODO", t["task_type"], t["parent"], t["est"],
+                    rng.randint(1, 10) if is_flex else None, rng.random() < 0.15 if is_flex else None,
+                    t["category"], rng.choice(["LOW", "MED", "HIGH"]) if is_flex and not final else None,
+                    None, None, None,
+                    round(rng.uniform(1.0, 20.0), 4) if is_flex and not final else None,
+                    round(rng.uniform(1.0, 8.0), 4) if is_flex and not final else None,
+                    None, t["plan_min"], None, None,
+                    t["assignment_status"], "AI" if is_flex and not final else "USER",
+                    _hhmm(t["start"]) if t["start"] is not None else None,
+                    _hhmm(t["end"]) if t["end"] is not None else None,
+                    False, vector, plan_date, created_at,
+                ))
+
+                if not final or not is_flex:
+                    continue
+                if vector is not None:
+                    embeddings.append((
+                        ids.take("task_embeddings"), user_id, t["task_id"], task_row_id,
+                        f"카테고리: {t['category']} | 작업: {t['title']}", vector, t["category"],
+                        plan_date, created_at,
+                    ))
+                if t["start"] is not None and rng.random() < 0.25:
+                    event = rng.choices(HISTORY_EVENTS, weights=HISTORY_EVENT_WEIGHTS)[0]
+                    shift = rng.choice([-60, -30, 30, 60, 90])
+                    prev_start = max(0, t["start"] - shift) if event == "MOVE_TIME" else t["start"]
+                    prev_end = t["end"] - shift if event == "MOVE_TIME" else t["end"] - rng.choice([0, 15, 30])
+                    histories.append((
+                        ids.take("schedule_histories"), record_id, t["task_id"], event,
+                        None if event == "ASSIGN_TIME" else _hhmm(prev_start),
+                        None if event == "ASSIGN_TIME" else _hhmm(max(prev_start, prev_end)),
+                        _hhmm(t["start"]), _hhmm(t["end"]), plan_date,
+                        day_start + timedelta(minutes=rng.randint(start_min, end_min - 1)), created_at,
+                    ))
+
+
+def generate_rows(
+    cfg: DatasetConfig,
+    user_indexes: Iterable[int],
+    ids: IdAllocator,
+    pool: Optional[dict[str, list[str]]] = None
+) -> DatasetRows:
+    """지정한 사용자 번호들의 행 생성 (사용자 단위 배치 적재용)"""
+    rows = DatasetRows()
+    for user_index in user_indexes:
+        generate_user(cfg, user_index, ids, rows, pool)
+    return rows
+
+
+def encode_csv(rows: Iterable[tuple]) -> bytes:
+    """COPY ... (FORMAT csv, NULL '\\N')용 인코딩 (None -> \\N, bool -> t / f)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    for row in rows:
+        writer.writerow([
+            COPY_NULL if v is None else ("t" if v else "f") if isinstance(v, bool) else v
+            for v in row
+        ])
+    return buffer.getvalue().encode("utf-8")
+
+
+def asyncpg_dsn(database_url: str) -> str:
+    """SQLAlchemy URL(postgresql+asyncpg://...) -> asyncpg DSN"""
+    return database_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+async def table_columns(conn: Any, table: str) -> list[str]:
+    """DB에 실제로 존재하는 컬럼 (테이블이 없으면 빈 목록)"""
+    rows = await conn.fetch(
+        "SELECT column_name FROM information_schema.columns WHERE table_schema = current_schema() AND table_name = $1",
+        table
+    )
+    return [r["column_name"] for r in rows]
+
+
+async def _copy(conn: Any, table: str, columns: list[str], present: list[str], rows: list[tuple], chunk: int = 50_000) -> None:
+    """TABLES 컬럼 순서의 행을 DB에 존재하는 컬럼만 골라 COPY"""
+    indexes = [columns.index(c) for c in present]
+    project = itemgetter(*indexes) if len(indexes) > 1 else (lambda row: (row[indexes[0]],))
+
+    async def source():
+        for start in range(0, len(rows), chunk):
+            yield encode_csv(project(row) for row in rows[start:start + chunk])
+
+    await conn.copy_to_table(table, source=source(), columns=present, format="csv", null=COPY_NULL)
+
+
+async def load_dataset(
+    dsn: str,
+    cfg: DatasetConfig,
+    batch_users: int = 200,
+    disable_triggers: bool = True,
+    progress: Callable[[str], None] = print
+) -> dict[str, int]:
+    """
+    사용자 batch_users명 단위로 생성 -> COPY (배치마다 트랜잭션 커밋)
+    적재 후 id 시퀀스를 맞추고 ANALYZE 수행, 테이블별 적재 행 수 반환
+    """
+    import asyncpg
+
+    conn = await asyncpg.connect(dsn)
+    try:
+        present = {}
+        for table, columns in TABLES.items():
+            existing = set(await table_columns(conn, table))
+            present[table] = [c for c in columns if c in existing]
+        if not present["planner_records"]:
+            raise RuntimeError("planner_records table not found (apply docs/DB_SCHEMA_AND_API.md DDL first)")
+        skipped = [t for t, cols in present.items() if not cols]
+        if skipped:
+            progress(f"skipping missing tables: {', '.join(skipped)}")
+
+        start_ids = {
+            table: await conn.fetchval(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}")
+            for table, cols in present.items() if cols
+        }
+        ids = IdAllocator(start_ids)
+        pool = embedding_pool(cfg.embedding_dim, cfg.embedding_pool_size, cfg.seed) if cfg.embedding_ratio > 0 else None
+
+        if disable_triggers:
+            await conn.execute("ALTER TABLE planner_records DISABLE TRIGGER USER")
+        totals = {table: 0 for table in TABLES}
+        started = time.perf_counter()
+        try:
+            for first in range(0, cfg.users, batch_users):
+                users = range(first, min(first + batch_users, cfg.users))
+                rows = generate_rows(cfg, users, ids, pool)
+                async with conn.transaction():
+                    for table, columns in TABLES.items():
+                        if present[table] and rows.tables[table]:
+                            await _copy(conn, table, columns, present[table], rows.tables[table])
+                for table, count in rows.counts().items():
+                    totals[table] += count if present[table] else 0
+                elapsed = time.perf_counter() - started
+                progress(
+                    f"users {users.stop}/{cfg.users}: "
+                    + ", ".join(f"{t}={n:,}" for t, n in totals.items() if present[t])
+                    + f" ({sum(totals.values()) / elapsed:,.0f} rows/s)"
+                )
+        finally:
+            if disable_triggers:
+                await conn.execute("ALTER TABLE planner_records ENABLE TRIGGER USER")
+
+        for table, cols in present.items():
+            if cols:
+                await conn.execute(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), GREATEST($1::bigint, 1))", ids.last(table)
+                )
+                await conn.execute(f"ANALYZE {table}")
+        return totals
+    finally:
+        await conn.close()
+
+
+async def clean_dataset(dsn: str, user_id_offset: int = SYNTHETIC_DB_USER_OFFSET) -> dict[str, str]:
+    """합성 사용자 ID 대역의 데이터만 삭제 (record_tasks / schedule_histories는 CASCADE)"""
+    import asyncpg
+
+    conn = await asyncpg.connect(dsn)
+    try:
+        bounds = (user_id_offset, user_id_offset + SYNTHETIC_DB_USER_RANGE)
+        result = {}
+        for table in ("task_embeddings", "planner_records"):
+            if await table_columns(conn, table):
+                result[table] = await conn.execute(f"DELETE FROM {table} WHERE user_id >= $1 AND user_id < $2", *bounds)
+        return result
+    finally:
+        await conn.close()
+
+
+def main() -> None:
+    from app.core.config import settings
+
+    parser = argparse.ArgumentParser(description="Synthetic planner dataset generator (Postgres COPY)")
+    parser.add_argument("--dsn", default=None, help="Postgres DSN (기본: DATABASE_URL)")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--days", type=int, default=28)
+    parser.add_argument("--end-date", type=date.fromisoformat, default=None, help="마지막 플래너 날짜 (기본: 어제)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--draft-ratio", type=float, default=0.5, help="AI_DRAFT 레코드도 생성할 날의 비율")
+    parser.add_argument("--embedding-ratio", type=float, default=0.3, help="임베딩을 채울 ASSIGNED FLEX 작업 비율")
+    parser.add_argument("--batch-users", type=int, default=200, help="트랜잭션 1회에 적재할 사용자 수")
+    parser.add_argument("--keep-triggers", action="store_true", help="planner_records 트리거를 끄지 않음 (느림)")
+    parser.add_argument("--clean", action="store_true", help="합성 사용자 대역 데이터 삭제 후 종료")
+    args = parser.parse_args()
+
+    if not 1 <= args.days <= 999:
+        parser.error("--days must be between 1 and 999 (day_plan_id = user_id * 1000 + day)")
+
+    dsn = args.dsn or asyncpg_dsn(settings.database_url or "")
+    if args.clean:
+        print(asyncio.run(clean_dataset(dsn)))
+        return
+
+    cfg = DatasetConfig(
+        users=args.users, days=args.days, seed=args.seed,
+        draft_ratio=args.draft_ratio, embedding_ratio=args.embedding_ratio
+    )
+    if args.end_date:
+        cfg.end_date = args.end_date
+
+    started = time.perf_counter()
+    totals = asyncio.run(load_dataset(dsn, cfg, args.batch_users, disable_triggers=not args.keep_triggers))
+    elapsed = time.perf_counter() - started
+    print(f"loaded {sum(totals.values()):,} rows in {elapsed:.1f}s: {totals}")
+
+
+if __name__ == "__main__":
+    main()
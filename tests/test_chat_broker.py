@@ -0,0 +1,216 @@
+import unittest
+import os
+import sys
+import asyncio
+from unittest.mock import patch
+
+# Ensure project root is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.db.repositories.chat_stream_repository import CHAT_CANCEL_CHANNEL, CHAT_EVENT_CHANNEL
+from app.services.report import chat_broker
+from app.services.report.chat_broker import (
+    InMemoryChatStreamBroker, PostgresChatStreamBroker, get_chat_stream_broker
+)
+
+
+class _SharedTables:
+    """
+    chat_streams / chat_stream_events 테이블 + NOTIFY를 흉내 내는 저장소
+    - 같은 객체를 쓰는 브로커들이 서로 다른 워커 역할 (NOTIFY는 등록된 모든 브로커에 전달)
+    """
+
+    def __init__(self):
+        self.streams: dict[int, str] = {}
+        self.events: dict[int, list] = {}
+        self.users: dict[int, int | None] = {}
+        self.finished: set[int] = set()
+        self.subscribers: dict[int, int] = {}
+        self.brokers: list[PostgresChatStreamBroker] = []
+
+    def _notify(self, channel: str, message_id: int) -> None:
+        for broker in self.brokers:
+            broker.handle_notification(channel, str(message_id))
+
+    async def create_stream(self, message_id, user_id, owner):
+        if message_id in self.streams:
+            return False
+        self.streams[message_id] = owner
+        self.events[message_id] = []
+        self.users[message_id] = user_id
+        return True
+
+    async def stream_exists(self, message_id):
+        return message_id in self.streams
+
+    async def append_event(self, message_id, seq, event, data, finished=False):
+        if message_id in self.streams:
+            self.events[message_id].append((seq, event, data))
+            if finished:
+                self.finished.add(message_id)
+        self._notify(CHAT_EVENT_CHANNEL, message_id)
+
+    async def fetch_events(self, message_id, after_seq):
+        return [row for row in self.events.get(message_id, []) if row[0] > after_seq]
+
+    async def attach_subscriber(self, message_id):
+        self.subscribers[message_id] = self.subscribers.get(message_id, 0) + 1
+
+    async def detach_subscriber(self, message_id):
+        self.subscribers[message_id] -= 1
+
+    async def fetch_stream_finished(self, message_id):
+        if message_id not in self.streams:
+            return None
+        return message_id in self.finished
+
+    async def count_active_streams(self, user_id):
+        return sum(1 for m, u in self.users.items() if u == user_id and m in self.streams and m not in self.finished)
+
+    async def find_orphaned_streams(self, idle_seconds):
+        return [m for m in self.streams if not self.subscribers.get(m)]
+
+    async def notify_cancel(self, message_id):
+        self._notify(CHAT_CANCEL_CHANNEL, message_id)
+
+    async def delete_stream(self, message_id):
+        self.streams.pop(message_id, None)
+        self.events.pop(message_id, None)
+
+
+async def _collect(broker, message_id, after=0) -> list:
+    return [(e.id, e.event) async for e in broker.subscribe(message_id, after)]
+
+
+class TestInMemoryBroker(unittest.IsolatedAsyncioTestCase):
+    """
+    프로세스 내 스트림 브로커 검증
+    """
+
+    async def test_publish_subscribe(self):
+        """1. 구독 전 / 후 발행 이벤트를 순서대로 전달하고 종료 이벤트에서 구독 종료"""
+        broker = InMemoryChatStreamBroker(replay_events=1)
+        self.assertTrue(await broker.open(1, user_id=10))
+        self.assertFalse(await broker.open(1))
+
+        await broker.publish(1, "start", {})
+        reader = asyncio.create_task(_collect(broker, 1))
+        await asyncio.sleep(0.01)
+        await broker.publish(1, "chunk", {"delta": "a"})
+        await broker.publish(1, "complete", {})
+
+        self.assertEqual(await reader, [(1, "start"), (2, "chunk"), (3, "complete")])
+        # 모두 전달된 이벤트는 최근 replay_events개만 보관
+        self.assertEqual(broker.stats()["buffered_events"], 1)
+        self.assertEqual(await _collect(broker, 1, after=2), [(3, "complete")])
+        self.assertEqual(await asyncio.wait_for(_collect(broker, 1, after=3), 1), [])
+
+    async def test_close_ends_subscribers(self):
+        """2. 스트림 삭제 시 대기 중인 구독자 종료, 삭제된 스트림에는 발행하지 않음"""
+        broker = InMemoryChatStreamBroker()
+        await broker.open(2)
+        reader = asyncio.create_task(_collect(broker, 2))
+        await asyncio.sleep(0.01)
+        await broker.close(2)
+
+        self.assertEqual(await asyncio.wait_for(reader, 1), [])
+        self.assertEqual(await broker.publish(2, "chunk", {}), 0)
+        self.assertFalse(await broker.exists(2))
+
+
+class TestPostgresBroker(unittest.IsolatedAsyncioTestCase):
+    """
+    Postgres(LISTEN/NOTIFY) 스트림 브로커 검증 (테이블 / NOTIFY는 공유 저장소로 대체)
+    """
+
+    def _workers(self, poll_seconds: float = 5.0) -> tuple[PostgresChatStreamBroker, PostgresChatStreamBroker]:
+        tables = _SharedTables()
+        workers = (
+            PostgresChatStreamBroker(repository=tables, poll_seconds=poll_seconds),
+            PostgresChatStreamBroker(repository=tables, poll_seconds=poll_seconds),
+        )
+        tables.brokers.extend(workers)
+        return workers
+
+    async def test_cross_worker_stream(self):
+        """1. 워커 A가 생성 중인 스트림을 워커 B가 NOTIFY로 깨어나 구독, 중복 등록은 어느 워커에서든 거부"""
+        worker_a, worker_b = self._workers()
+        self.assertTrue(await worker_a.open(7, user_id=1))
+        self.assertFalse(await worker_b.open(7))
+
+        await worker_a.publish(7, "start", {})
+        reader = asyncio.create_task(_collect(worker_b, 7))
+        await asyncio.sleep(0.01)
+        await worker_a.publish(7, "chunk", {"delta": "hi"})
+        await worker_a.publish(7, "complete", {})
+
+        # poll_seconds(5초)보다 빨리 끝나면 NOTIFY로 깨어난 것
+        self.assertEqual(await asyncio.wait_for(reader, 1), [(1, "start"), (2, "chunk"), (3, "complete")])
+        self.assertEqual(worker_a.stats()["streams"], 0)
+
+        await worker_b.close(7)
+        self.assertFalse(await worker_a.exists(7))
+
+    async def test_cancel_routes_to_owner(self):
+        """2. 다른 워커의 취소 요청은 NOTIFY로 생성 중인 워커에만 전달"""
+        worker_a, worker_b = self._workers()
+        cancelled_a, cancelled_b = [], []
+        worker_a.on_cancel(cancelled_a.append)
+        worker_b.on_cancel(cancelled_b.append)
+
+        await worker_a.open(8)
+        await worker_b.request_cancel(8)
+        self.assertEqual(cancelled_a, [8])
+        self.assertEqual(cancelled_b, [])
+
+    async def test_polling_without_notify(self):
+        """3. NOTIFY가 누락되어도 재조회 간격마다 새 이벤트를 읽음"""
+        worker_a, worker_b = self._workers(poll_seconds=0.02)
+        await worker_a.open(9)
+        reader = asyncio.create_task(_collect(worker_b, 9))
+        await asyncio.sleep(0.01)
+
+        worker_a._repo.brokers.clear()
+        await worker_a.publish(9, "complete", {})
+        self.assertEqual(await asyncio.wait_for(reader, 1), [(1, "complete")])
+
+    async def test_session_queries(self):
+        """4. 진행 중 스트림 수는 종료 이벤트 전까지, 구독 중인 스트림은 정리 대상에서 제외"""
+        worker_a, worker_b = self._workers()
+        await worker_a.open(11, user_id=3)
+        await worker_a.open(12, user_id=3)
+        await worker_a.publish(11, "start", {})
+        await worker_a.publish(12, "complete", {})
+        self.assertEqual(await worker_b.count_streams(3), 1)
+
+        reader = asyncio.create_task(_collect(worker_b, 11))
+        await asyncio.sleep(0.01)
+        self.assertEqual(await worker_b.orphaned_streams(60), [12])
+        reader.cancel()
+        self.assertGreater(worker_a.stats()["buffered_bytes"], 0)
+
+    async def test_resume_from_last_event_id(self):
+        """5. 다른 워커로 재연결해도 after 이후 이벤트부터 읽고, 종료 이후 재연결은 바로 종료"""
+        worker_a, worker_b = self._workers()
+        await worker_a.open(13)
+        for event in ("start", "chunk", "complete"):
+            await worker_a.publish(13, event, {})
+        self.assertEqual(await asyncio.wait_for(_collect(worker_b, 13, after=1), 1), [(2, "chunk"), (3, "complete")])
+        self.assertEqual(await asyncio.wait_for(_collect(worker_b, 13, after=3), 1), [])
+
+    def test_backend_selection(self):
+        """6. CHAT_STREAM_BROKER 설정으로 구현 선택"""
+        original = chat_broker._chat_stream_broker
+        try:
+            chat_broker._chat_stream_broker = None
+            with patch.object(settings, "chat_stream_broker", "postgres"):
+                self.assertIsInstance(get_chat_stream_broker(), PostgresChatStreamBroker)
+            chat_broker._chat_stream_broker = None
+            self.assertIsInstance(get_chat_stream_broker(), InMemoryChatStreamBroker)
+        finally:
+            chat_broker._chat_stream_broker = original
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+import os
+import sys
+import asyncio
+import time
+from unittest.mock import patch
+
+# Ensure project root is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.services.report.chat_pacing import ChunkPacer, build_chunk_pacer
+
+
+class _Collector:
+    """emit 호출 기록 (전송 시각 포함)"""
+
+    def __init__(self):
+        self.deltas: list[str] = []
+        self.times: list[float] = []
+
+    async def __call__(self, delta: str) -> None:
+        self.deltas.append(delta)
+        self.times.append(time.monotonic())
+
+
+class TestChunkPacer(unittest.IsolatedAsyncioTestCase):
+    """
+    챗봇 SSE Chunk 전송 방식(passthrough / coalesce / typing) 검증
+    """
+
+    async def test_passthrough(self):
+        """1. passthrough는 모델 Chunk를 그대로 하나씩 전송"""
+        emit = _Collector()
+        pacer = ChunkPacer(emit, mode="passthrough")
+        for text in ["안녕", "하세요 ", "", "반갑습니다"]:
+            await pacer.feed(text)
+        await pacer.close()
+        self.assertEqual(emit.deltas, ["안녕", "하세요 ", "반갑습니다"])
+
+    async def test_coalesce(self):
+        """2. coalesce는 첫 조각을 즉시 보내고, 간격 안의 조각은 묶어서 전송 (500어절 응답도 즉시 완료)"""
+        emit = _Collector()
+        pacer = ChunkPacer(emit, mode="coalesce", flush_ms=1000)
+        words = [f"word{i} " for i in range(500)]
+        started = time.monotonic()
+        for word in words:
+            await pacer.feed(word)
+        await pacer.close()
+
+        self.assertEqual(emit.deltas, [words[0], "".join(words[1:])])
+        self.assertLess(time.monotonic() - started, 0.5)
+
+        # 다음 조각이 오지 않아도 간격이 지나면 전송
+        emit = _Collector()
+        pacer = ChunkPacer(emit, mode="coalesce", flush_ms=20)
+        await pacer.feed("a")
+        await pacer.feed("b")
+        await asyncio.sleep(0.1)
+        self.assertEqual(emit.deltas, ["a", "b"])
+        await pacer.close()
+        self.assertEqual(emit.deltas, ["a", "b"])
+
+    async def test_typing(self):
+        """3. typing은 프레임마다 설정 속도만큼 잘라서 전송하고, close 시 남은 텍스트까지 전송"""
+        emit = _Collector()
+        pacer = ChunkPacer(emit, mode="typing", flush_ms=10, chars_per_second=2000)
+        text = "가" * 100
+        started = time.monotonic()
+        await pacer.feed(text)
+        await pacer.close()
+        elapsed = time.monotonic() - started
+
+        self.assertEqual("".join(emit.deltas), text)
+        self.assertGreater(len(emit.deltas), 1)
+        self.assertTrue(all(len(d) <= 20 for d in emit.deltas))
+        self.assertGreaterEqual(elapsed, 0.04)
+
+        with self.assertRaises(ValueError):
+            ChunkPacer(emit, mode="typing", chars_per_second=0)
+
+    async def test_cancel_drops_pending(self):
+        """4. cancel 시 남은 텍스트는 버리고 예약된 전송 중단"""
+        emit = _Collector()
+        pacer = ChunkPacer(emit, mode="typing", flush_ms=10, chars_per_second=100)
+        await pacer.feed("x" * 100)
+        await asyncio.sleep(0.05)
+        pacer.cancel()
+        sent = "".join(emit.deltas)
+        await asyncio.sleep(0.05)
+        self.assertEqual("".join(emit.deltas), sent)
+        self.assertLess(len(sent), 100)
+
+    def test_build_from_settings(self):
+        """5. 설정값으로 전송 방식 선택"""
+        with patch.object(settings, "chat_stream_pacing", "typing"), \
+             patch.object(settings, "chat_typing_chars_per_second", 30.0):
+            pacer = build_chunk_pacer(_Collector())
+        self.assertEqual(pacer.mode, "typing")
+        self.assertEqual(pacer._chars_per_second, 30.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
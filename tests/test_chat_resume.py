@@ -0,0 +1,137 @@
+import unittest
+import os
+import sys
+import asyncio
+from unittest.mock import MagicMock, patch
+
+# Ensure project root is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from app.core.sse import format_sse
+from app.main import app
+from app.services.report.chat_broker import InMemoryChatStreamBroker, ReplayGapError
+from app.services.report.chat_service import ChatService
+
+
+async def _ids(broker, message_id, after=0) -> list:
+    return [e.id async for e in broker.subscribe(message_id, after)]
+
+
+def _service(broker) -> ChatService:
+    with patch("app.services.report.chat_service.get_gemini_client", return_value=MagicMock()), \
+         patch("app.services.report.chat_service.get_chat_stream_broker", return_value=broker):
+        return ChatService()
+
+
+class TestReplayBuffer(unittest.IsolatedAsyncioTestCase):
+    """
+    memory 브로커의 재연결용 이벤트 보관(Ring Buffer) 검증
+    """
+
+    async def test_resume_within_window(self):
+        """1. 전달된 이벤트는 최근 replay_events개만 보관하고, 그 범위 안에서는 이어서 구독"""
+        broker = InMemoryChatStreamBroker(replay_events=2)
+        await broker.open(1)
+        for _ in range(5):
+            await broker.publish(1, "chunk", {})
+        await broker.publish(1, "complete", {})
+
+        self.assertEqual(await _ids(broker, 1), [1, 2, 3, 4, 5, 6])
+        self.assertEqual(broker.stats()["buffered_events"], 2)
+        self.assertEqual(await _ids(broker, 1, after=4), [5, 6])
+
+        with self.assertRaises(ReplayGapError):
+            await _ids(broker, 1, after=2)
+
+    async def test_lagging_subscriber_keeps_range(self):
+        """2. 뒤처진 구독자가 읽는 중인 이벤트는 다른 구독자가 읽어도 버리지 않음"""
+        broker = InMemoryChatStreamBroker(replay_events=0)
+        await broker.open(2)
+        await broker.publish(2, "chunk", {})
+        await broker.publish(2, "chunk", {})
+
+        lagging = broker.subscribe(2, after=0)
+        self.assertEqual((await lagging.__anext__()).id, 1)
+        await broker.publish(2, "complete", {})
+        self.assertEqual(await _ids(broker, 2, after=2), [3])
+        self.assertEqual([e.id async for e in lagging], [2, 3])
+
+    async def test_disconnect_starts_idle_clock(self):
+        """3. 구독 중인 스트림은 정리 대상이 아니고, 마지막 구독자가 끊기면 대기 시간 측정 시작"""
+        broker = InMemoryChatStreamBroker()
+        await broker.open(3)
+        await broker.publish(3, "chunk", {})
+        reader = broker.subscribe(3)
+        await reader.__anext__()
+        self.assertEqual(await broker.orphaned_streams(0), [])
+
+        await reader.aclose()
+        self.assertEqual(await broker.orphaned_streams(0), [3])
+
+
+class TestChatServiceResume(unittest.IsolatedAsyncioTestCase):
+    """
+    ChatService.stream의 id 필드 / Last-Event-ID 재연결 검증
+    """
+
+    async def test_reconnect_after_disconnect(self):
+        """1. 연결이 끊겨도 스트림을 유지하고, Last-Event-ID 이후 이벤트부터 이어서 전달"""
+        broker = InMemoryChatStreamBroker(replay_events=8)
+        service = _service(broker)
+        await broker.open(10)
+        await broker.publish(10, "start", {"messageId": 10})
+        await broker.publish(10, "chunk", {"delta": "안녕"})
+
+        first = service.stream(1, 10)
+        self.assertEqual(await first.__anext__(), format_sse("start", {"messageId": 10}, event_id=1))
+        await first.aclose()
+        self.assertTrue(await broker.exists(10))
+
+        await broker.publish(10, "complete", {"status": "COMPLETED"})
+        resumed = [line async for line in service.stream(1, 10, last_event_id=1)]
+        self.assertTrue(resumed[0].startswith("id: 2\nevent: chunk\n"))
+        self.assertTrue(resumed[1].startswith("id: 3\nevent: complete\n"))
+        # 끝까지 전달한 뒤에는 세션 정리
+        self.assertFalse(await broker.exists(10))
+
+    async def test_replay_gap(self):
+        """2. 보관 범위를 벗어난 재연결은 REPLAY_UNAVAILABLE 에러 이벤트로 응답"""
+        broker = InMemoryChatStreamBroker(replay_events=0)
+        service = _service(broker)
+        await broker.open(11)
+        await broker.publish(11, "chunk", {})
+        await broker.publish(11, "chunk", {})
+        reader = broker.subscribe(11)
+        await reader.__anext__()
+        await reader.aclose()
+
+        lines = [line async for line in service.stream(1, 11, last_event_id=0)]
+        self.assertEqual(len(lines), 1)
+        self.assertIn("REPLAY_UNAVAILABLE", lines[0])
+
+
+class TestChatStreamEndpoint(unittest.TestCase):
+    """
+    GET /ai/v2/reports/{reportId}/chat/respond/{messageId}/stream 의 Last-Event-ID 헤더 전달 검증
+    """
+
+    def test_last_event_id_header(self):
+        """1. Last-Event-ID 헤더를 last_event_id로 전달 (없으면 0)"""
+        calls = []
+
+        async def fake_stream(report_id, message_id, last_event_id=0):
+            calls.append(last_event_id)
+            yield format_sse("complete", {}, event_id=last_event_id + 1)
+
+        client = TestClient(app)
+        url = "/ai/v2/reports/1/chat/respond/5/stream"
+        with patch("app.api.v2.endpoints.chat.chat_service.stream", side_effect=fake_stream):
+            self.assertIn("id: 8\n", client.get(url, headers={"Last-Event-ID": "7"}).text)
+            client.get(url)
+        self.assertEqual(calls, [7, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,13 +7,16 @@ from unittest.mock import patch, AsyncMock, ANY, MagicMock
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from fastapi import HTTPException
 from google.genai.errors import APIError
-from app.services.report.chat_service import ChatService, _active_sessions
+from app.services.report.chat_broker import InMemoryChatStreamBroker
+from app.services.report.chat_service import ChatService, _generation_tasks
 from app.models.chat import ChatRespondRequest, ChatHistoryMessage, SenderType, MessageType
 
 @pytest.fixture
 def chat_service():
-    with patch("app.services.report.chat_service.get_gemini_client") as mock_get_client:
+    with patch("app.services.report.chat_service.get_gemini_client") as mock_get_client, \
+         patch("app.services.report.chat_service.get_chat_stream_broker", return_value=InMemoryChatStreamBroker()):
         mock_gemini = MagicMock()
         mock_aio = AsyncMock()
         mock_gemini.client.aio = mock_aio
@@ -23,7 +26,7 @@ def chat_service():
         yield service
         
         # Cleanup
-        _active_sessions.clear()
+        _generation_tasks.clear()
 
 @pytest.fixture
 def sample_request():
@@ -45,7 +48,7 @@ def sample_request():
 async def test_respond_creates_session(chat_service, sample_request):
     """
     POST respond 호출 시:
-    ACK를 반환하고 _active_sessions에 내역이 저장되는지 확인
+    ACK를 반환하고 브로커에 스트림이, 프로세스에 생성 Task가 등록되는지 확인
     """
     report_id = 1
     response = await chat_service.respond(report_id, sample_request)
@@ -54,30 +57,31 @@ async def test_respond_creates_session(chat_service, sample_request):
     assert response.data.message_id == 123
     
     # 세션 확인
-    assert 123 in _active_sessions
-    assert "queue" in _active_sessions[123]
-    assert "task" in _active_sessions[123]
+    assert await chat_service.broker.exists(123)
+    assert 123 in _generation_tasks
+
+    # 같은 messageId 재요청은 409
+    with pytest.raises(HTTPException) as exc_info:
+        await chat_service.respond(report_id, sample_request)
+    assert exc_info.value.status_code == 409
     
     # 생성된 백그라운드 태스크 정리 (cancel)
-    _active_sessions[123]["task"].cancel()
+    _generation_tasks[123].cancel()
 
 @pytest.mark.asyncio
 async def test_stream_returns_format(chat_service, sample_request):
     """
-    stream 제너레이터가 Queue의 데이터를 SSE 포맷으로 올바르게 꺼내는지 확인
+    stream 제너레이터가 브로커의 이벤트를 SSE 포맷으로 올바르게 꺼내는지 확인
     """
     report_id = 1
     message_id = 123
+    broker = chat_service.broker
     
-    # 큐 수동 주입
-    queue = asyncio.Queue()
-    _active_sessions[message_id] = {"queue": queue, "task": None}
-    
-    # 이벤트 적재
-    await queue.put(("start", {"messageId": message_id}))
-    await queue.put(("chunk", {"messageId": message_id, "delta": "Hi", "sequence": 1}))
-    await queue.put(("complete", {"messageId": message_id, "status": "COMPLETED"}))
-    await queue.put(None)
+    # 스트림 수동 등록 + 이벤트 발행
+    await broker.open(message_id)
+    await broker.publish(message_id, "start", {"messageId": message_id})
+    await broker.publish(message_id, "chunk", {"messageId": message_id, "delta": "Hi", "sequence": 1})
+    await broker.publish(message_id, "complete", {"messageId": message_id, "status": "COMPLETED"})
     
     events = []
     async for item in chat_service.stream(report_id, message_id):
@@ -90,7 +94,7 @@ async def test_stream_returns_format(chat_service, sample_request):
     assert 'event: complete' in events[2]
     
     # 스트림 종료 후 세션이 삭제되는지 확인
-    assert message_id not in _active_sessions
+    assert not await broker.exists(message_id)
 
 
 @pytest.mark.asyncio
@@ -99,8 +103,7 @@ async def test_generate_task_fallback_logic(chat_service, sample_request):
     _generate_task 내에서 503 에러 발생 시 재시도 및 Fallback이 일어나는지 검증
     """
     message_id = 123
-    queue = asyncio.Queue()
-    _active_sessions[message_id] = {"queue": queue, "task": asyncio.current_task()} # 더미 타스크
+    await chat_service.broker.open(message_id)
     
     # Mock AsyncGenerator 반환 
     async def mock_async_generator():
@@ -134,12 +137,8 @@ async def test_generate_task_fallback_logic(chat_service, sample_request):
     last_call_kwargs = mock_generate.call_args.kwargs
     assert last_call_kwargs["model"] == "gemini-3-flash-preview"
     
-    # Queue 이벤트 수집하여 정상 chunk가 들어갔는지 확인
-    events = []
-    while not queue.empty():
-        item = await queue.get()
-        if item is not None:
-            events.append(item)
+    # 브로커 이벤트 수집하여 정상 chunk가 들어갔는지 확인
+    events = [(item.event, item.data) async for item in chat_service.broker.subscribe(message_id)]
             
     # start, chunk1, chunk2, complete
     assert events[0][0] == "start"
@@ -154,11 +153,13 @@ async def test_generate_task_fallback_logic(chat_service, sample_request):
 async def test_cancel_removes_session(chat_service, sample_request):
     message_id = 123
     dummy_task = asyncio.create_task(asyncio.sleep(10))
-    _active_sessions[message_id] = {"queue": asyncio.Queue(), "task": dummy_task}
+    await chat_service.broker.open(message_id)
+    _generation_tasks[message_id] = dummy_task
     
     success = await chat_service.cancel(message_id)
     assert success is True
-    assert message_id not in _active_sessions
+    assert not await chat_service.broker.exists(message_id)
+    assert await chat_service.cancel(message_id) is False
     # Cancellation propagates next event loop tick
     await asyncio.sleep(0)
     assert dummy_task.cancelled() or dummy_task.cancelling()
@@ -0,0 +1,130 @@
+import unittest
+import os
+import sys
+import asyncio
+from unittest.mock import patch
+
+# Ensure project root is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import HTTPException
+
+from app.services.report.chat_broker import EVENT_OVERHEAD_BYTES, InMemoryChatStreamBroker
+from app.services.report.chat_sessions import (
+    CHAT_STREAM_LIMIT_REJECTIONS_TOTAL, CHAT_STREAMS_REAPED_TOTAL, ChatSessionManager
+)
+
+
+async def _collect(broker, message_id, after=0) -> list:
+    return [e.id async for e in broker.subscribe(message_id, after)]
+
+
+class TestBoundedBuffer(unittest.IsolatedAsyncioTestCase):
+    """
+    memory 브로커의 스트림별 버퍼 상한(Backpressure) / 메모리 추정 검증
+    """
+
+    async def test_publish_waits_when_full(self):
+        """1. 읽지 않은 이벤트가 상한이면 발행이 대기하고, 구독자가 읽으면 재개"""
+        broker = InMemoryChatStreamBroker(max_buffered_events=2)
+        await broker.open(1)
+        await broker.publish(1, "chunk", {"delta": "a"})
+        await broker.publish(1, "chunk", {"delta": "b"})
+
+        blocked = asyncio.create_task(broker.publish(1, "complete", {}))
+        await asyncio.sleep(0.02)
+        self.assertFalse(blocked.done())
+        self.assertEqual(broker.stats()["buffered_events"], 2)
+
+        self.assertEqual(await asyncio.wait_for(_collect(broker, 1), 1), [1, 2, 3])
+        self.assertEqual(await blocked, 3)
+        # 모든 구독자가 읽은 이벤트는 버림
+        self.assertEqual(broker.stats()["buffered_events"], 0)
+        self.assertEqual(broker.stats()["buffered_bytes"], 0)
+
+    async def test_close_releases_blocked_publisher(self):
+        """2. 대기 중인 발행은 스트림 삭제 시 0을 반환하고 종료"""
+        broker = InMemoryChatStreamBroker(max_buffered_events=1)
+        await broker.open(2)
+        await broker.publish(2, "chunk", {"delta": "a"})
+        blocked = asyncio.create_task(broker.publish(2, "chunk", {"delta": "b"}))
+        await asyncio.sleep(0.01)
+        await broker.close(2)
+        self.assertEqual(await asyncio.wait_for(blocked, 1), 0)
+
+    async def test_buffered_bytes(self):
+        """3. 보관 중인 이벤트의 추정 메모리 합계"""
+        broker = InMemoryChatStreamBroker()
+        await broker.open(3)
+        await broker.publish(3, "chunk", {"delta": "x" * 1000})
+        await broker.publish(3, "chunk", {"delta": "y" * 10})
+        self.assertEqual(broker.stats()["buffered_bytes"], 2 * EVENT_OVERHEAD_BYTES + 1010)
+
+
+class TestChatSessionManager(unittest.IsolatedAsyncioTestCase):
+    """
+    사용자별 동시 스트림 상한 / 구독자 없는 스트림 정리 검증
+    """
+
+    async def test_user_limit(self):
+        """1. 진행 중 스트림이 상한이면 429, 종료 이벤트 후에는 다시 허용"""
+        broker = InMemoryChatStreamBroker()
+        manager = ChatSessionManager(broker, max_streams_per_user=2)
+        await broker.open(1, user_id=7)
+        await broker.open(2, user_id=7)
+        await broker.open(3, user_id=8)
+
+        before = CHAT_STREAM_LIMIT_REJECTIONS_TOTAL.value()
+        with self.assertRaises(HTTPException) as ctx:
+            await manager.check_user_limit(7)
+        self.assertEqual(ctx.exception.status_code, 429)
+        self.assertEqual(CHAT_STREAM_LIMIT_REJECTIONS_TOTAL.value(), before + 1)
+        await manager.check_user_limit(8)
+
+        await broker.publish(1, "complete", {})
+        await manager.check_user_limit(7)
+
+        # 0이면 비활성화
+        await ChatSessionManager(broker, max_streams_per_user=0).check_user_limit(7)
+
+    async def test_reap_orphaned(self):
+        """2. TTL 동안 구독되지 않은 스트림은 생성 Task 취소 후 삭제, 구독된 스트림은 유지"""
+        broker = InMemoryChatStreamBroker()
+        cancelled = []
+        broker.on_cancel(cancelled.append)
+        manager = ChatSessionManager(broker, idle_ttl_seconds=0.01)
+        await broker.open(1)
+        await broker.open(2)
+        reader = asyncio.create_task(_collect(broker, 2))
+        await asyncio.sleep(0.02)
+
+        before = CHAT_STREAMS_REAPED_TOTAL.value()
+        self.assertEqual(await manager.reap_once(), [1])
+        self.assertEqual(cancelled, [1])
+        self.assertFalse(await broker.exists(1))
+        self.assertTrue(await broker.exists(2))
+        self.assertEqual(CHAT_STREAMS_REAPED_TOTAL.value(), before + 1)
+
+        await broker.publish(2, "complete", {})
+        await reader
+
+    async def test_reaper_task(self):
+        """3. 정리 Task는 한 번만 시작되고 shutdown 시 중단 (TTL 0이면 시작하지 않음)"""
+        broker = InMemoryChatStreamBroker()
+        ChatSessionManager(broker, idle_ttl_seconds=0).ensure_reaper()
+
+        manager = ChatSessionManager(broker, idle_ttl_seconds=0.01)
+        with patch.object(manager, "reap_once") as reap_once:
+            manager.ensure_reaper()
+            reaper = manager._reaper
+            manager.ensure_reaper()
+            self.assertIs(manager._reaper, reaper)
+            # 확인 간격은 최소 1초
+            await asyncio.sleep(1.1)
+            self.assertGreaterEqual(reap_once.call_count, 1)
+        await manager.shutdown()
+        self.assertTrue(reaper.cancelled())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+import unittest
+import os
+import sys
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+# Ensure project root is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.report.chat_tools import CHAT_SCHEDULE_PREFETCH_TOTAL, ChatToolExecutor
+
+
+def _call(name: str, **args) -> SimpleNamespace:
+    return SimpleNamespace(name=name, args=args)
+
+
+def _day(days_ago: int) -> str:
+    return (datetime.now().date() - timedelta(days=days_ago)).isoformat()
+
+
+def _records() -> tuple[list, list]:
+    planner_data = [
+        {"id": 1, "start_arrange": "09:00", "day_end_time": "22:00", "focus_time_zone": "MORNING", "planner_date": _day(1)},
+        {"id": 2, "start_arrange": "09:00", "day_end_time": "22:00", "focus_time_zone": "MORNING", "planner_date": _day(3)},
+    ]
+    tasks_data = [
+        {"record_id": 1, "title": "어제 할 일", "status": "DONE", "start_at": "09:00", "end_at": "10:00"},
+        {"record_id": 2, "title": "사흘 전 할 일", "status": "TODO", "start_at": "09:00", "end_at": "10:00"},
+    ]
+    return planner_data, tasks_data
+
+
+class TestParallelToolCalls(unittest.IsolatedAsyncioTestCase):
+    """
+    한 턴의 도구 호출 동시 실행 검증
+    """
+
+    async def test_calls_run_concurrently(self):
+        """1. 독립 호출은 동시에 실행되고, 응답 Part는 요청 순서 유지 + user_id 주입"""
+        seen = []
+        events = []
+        # 두 호출이 모두 시작해야 통과하는 장벽 (순차 실행이면 첫 호출이 영원히 대기 -> timeout)
+        barrier = asyncio.Barrier(2)
+
+        async def gated_schedules(user_id, start_date, end_date=None, category=None):
+            seen.append(user_id)
+            events.append("start")
+            await barrier.wait()
+            events.append("finish")
+            return f"schedules {start_date}"
+
+        async def gated_similarity(user_id, query, limit=5):
+            seen.append(user_id)
+            events.append("start")
+            await barrier.wait()
+            events.append("finish")
+            return f"tasks {query}"
+
+        executor = ChatToolExecutor(user_id=7)
+        calls = [
+            _call("search_schedules_by_date", start_date="2026-01-01"),
+            _call("search_tasks_by_similarity", query="운동", user_id=7),
+        ]
+        with patch("app.mcp.server.search_schedules_by_date", side_effect=gated_schedules), \
+             patch("app.mcp.server.search_tasks_by_similarity", side_effect=gated_similarity):
+            parts = await asyncio.wait_for(executor.execute(calls), timeout=5)
+
+        self.assertEqual(events, ["start", "start", "finish", "finish"])
+        self.assertEqual(seen, [7, 7])
+        self.assertEqual([p.function_response.name for p in parts], ["search_schedules_by_date", "search_tasks_by_similarity"])
+        self.assertEqual(parts[0].function_response.response, {"result": "schedules 2026-01-01"})
+        self.assertEqual(parts[1].function_response.response, {"result": "tasks 운동"})
+
+    async def test_errors_are_isolated(self):
+        """2. 한 호출의 실패 / 알 수 없는 도구는 결과 문자열로 전달되고 다른 호출에 영향 없음"""
+        executor = ChatToolExecutor(user_id=7)
+        calls = [
+            _call("search_tasks_by_similarity", query="운동"),
+            _call("unknown_tool"),
+            _call("search_schedules_by_date", start_date="2026-01-01"),
+        ]
+        with patch("app.mcp.server.search_tasks_by_similarity", AsyncMock(side_effect=RuntimeError("boom"))), \
+             patch("app.mcp.server.search_schedules_by_date", AsyncMock(return_value="ok")):
+            parts = await executor.execute(calls)
+
+        results = [p.function_response.response["result"] for p in parts]
+        self.assertEqual(results[0], "Error executing tool search_tasks_by_similarity: boom")
+        self.assertEqual(results[1], "Unknown tool: unknown_tool")
+        self.assertEqual(results[2], "ok")
+
+
+class TestSchedulePrefetch(unittest.IsolatedAsyncioTestCase):
+    """
+    최근 일정 선조회(Prefetch) 검증
+    """
+
+    async def test_hit_within_window(self):
+        """1. 선조회 구간 안의 요청은 DB를 다시 조회하지 않고 해당 날짜만 걸러서 응답"""
+        fetch = AsyncMock(return_value=_records())
+        search = AsyncMock(return_value="db")
+        before = CHAT_SCHEDULE_PREFETCH_TOTAL.value(result="hit")
+
+        with patch("app.mcp.server.fetch_schedule_records", fetch), \
+             patch("app.mcp.server.search_schedules_by_date", search):
+            executor = ChatToolExecutor(user_id=7, prefetch_days=7)
+            executor.start_prefetch()
+            parts = await executor.execute([_call("search_schedules_by_date", start_date=_day(1), end_date=_day(1))])
+            executor.close()
+
+        result = parts[0].function_response.response["result"]
+        self.assertIn("어제 할 일", result)
+        self.assertNotIn("사흘 전 할 일", result)
+        fetch.assert_awaited_once_with(7, _day(7), _day(0))
+        search.assert_not_awaited()
+        self.assertEqual(CHAT_SCHEDULE_PREFETCH_TOTAL.value(result="hit"), before + 1)
+
+    async def test_miss_outside_window(self):
+        """2. 구간 밖 / 다른 사용자 / 선조회 실패 시 일반 조회"""
+        search = AsyncMock(return_value="db")
+        before = CHAT_SCHEDULE_PREFETCH_TOTAL.value(result="miss")
+
+        with patch("app.mcp.server.fetch_schedule_records", AsyncMock(return_value=_records())), \
+             patch("app.mcp.server.search_schedules_by_date", search):
+            executor = ChatToolExecutor(user_id=7, prefetch_days=7)
+            executor.start_prefetch()
+            parts = await executor.execute([
+                _call("search_schedules_by_date", start_date=_day(30), end_date=_day(1)),
+                _call("search_schedules_by_date", start_date=_day(1), user_id=8),
+            ])
+            executor.close()
+
+        self.assertEqual([p.function_response.response["result"] for p in parts], ["db", "db"])
+        self.assertEqual(search.await_count, 2)
+        self.assertEqual(CHAT_SCHEDULE_PREFETCH_TOTAL.value(result="miss"), before + 2)
+
+        with patch("app.mcp.server.fetch_schedule_records", AsyncMock(side_effect=RuntimeError("down"))), \
+             patch("app.mcp.server.search_schedules_by_date", AsyncMock(return_value="db")):
+            executor = ChatToolExecutor(user_id=7, prefetch_days=7)
+            executor.start_prefetch()
+            parts = await executor.execute([_call("search_schedules_by_date", start_date=_day(1))])
+            executor.close()
+        self.assertEqual(parts[0].function_response.response["result"], "db")
+
+    async def test_disabled(self):
+        """3. prefetch_days가 0이면 선조회하지 않음"""
+        fetch = AsyncMock(return_value=_records())
+        with patch("app.mcp.server.fetch_schedule_records", fetch), \
+             patch("app.mcp.server.search_schedules_by_date", AsyncMock(return_value="db")):
+            executor = ChatToolExecutor(user_id=7)
+            executor.start_prefetch()
+            parts = await executor.execute([_call("search_schedules_by_date", start_date=_day(1))])
+            executor.close()
+
+        fetch.assert_not_awaited()
+        self.assertEqual(parts[0].function_response.response["result"], "db")
+
+
+if __name__ == '__main__':
+    unittest.main()
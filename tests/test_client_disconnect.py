@@ -0,0 +1,215 @@
+import unittest
+import os
+import sys
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Ensure project root is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from google.api_core import exceptions as google_exceptions
+
+from app.main import app
+from app.core.config import settings
+from app.core.disconnect import CLIENT_DISCONNECT_CANCELLED_TOTAL, ClientDisconnected, run_until_disconnected
+from app.core.single_flight import SingleFlight
+from app.models.planner.request import ArrangementState
+from app.services.planner.nodes.node1_structure import node1_structure_analysis
+from app.services.planner.pipeline import build_initial_state
+from app.services.planner.response_cache import PlannerResponseCache
+from app.services.report.chat_broker import InMemoryChatStreamBroker
+from app.services.report.chat_sessions import ChatSessionManager
+
+PLANNER_REQUEST = {
+    "user": {"userId": 31, "focusTimeZone": "MORNING", "dayEndTime": "22:00"},
+    "startArrange": "09:00",
+    "schedules": [
+        {"taskId": 1, "dayPlanId": 4, "title": "Study", "type": "FLEX", "estimatedTimeRange": "HOUR_1_TO_2"},
+    ]
+}
+
+
+class _FakeRequest:
+    """is_disconnected()만 흉내 내는 요청 (disconnected를 바꿔 연결 끊김 표현)"""
+
+    def __init__(self, disconnected: bool = False):
+        self.disconnected = disconnected
+
+    async def is_disconnected(self) -> bool:
+        return self.disconnected
+
+
+class TestRunUntilDisconnected(unittest.IsolatedAsyncioTestCase):
+    """
+    연결 끊김 감지 / 유예 시간 후 작업 취소 검증
+    """
+
+    async def test_cancel_after_grace(self):
+        """1. 연결이 끊기면 유예 시간 뒤 작업을 취소하고 ClientDisconnected"""
+        cancelled = asyncio.Event()
+
+        async def work():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        before = CLIENT_DISCONNECT_CANCELLED_TOTAL.value(route="test")
+        with self.assertRaises(ClientDisconnected):
+            await run_until_disconnected(_FakeRequest(True), work(), grace_seconds=0.02, route="test", poll_seconds=0.01)
+        self.assertTrue(cancelled.is_set())
+        self.assertEqual(CLIENT_DISCONNECT_CANCELLED_TOTAL.value(route="test"), before + 1)
+
+    async def test_finishes_within_grace(self):
+        """2. 유예 시간 안에 끝난 작업 / 연결 유지 중인 작업은 결과 반환, 음수면 확인하지 않음"""
+        async def work(delay: float):
+            await asyncio.sleep(delay)
+            return "done"
+
+        self.assertEqual(
+            await run_until_disconnected(_FakeRequest(True), work(0.02), grace_seconds=1, route="test", poll_seconds=0.01),
+            "done"
+        )
+        self.assertEqual(
+            await run_until_disconnected(_FakeRequest(False), work(0.05), grace_seconds=0, route="test", poll_seconds=0.01),
+            "done"
+        )
+        request = MagicMock()
+        self.assertEqual(await run_until_disconnected(request, work(0), grace_seconds=-1, route="test"), "done")
+        request.is_disconnected.assert_not_called()
+
+    async def test_single_flight_cancels_abandoned(self):
+        """3. cancel_abandoned면 마지막 대기자가 취소될 때만 공유 작업 취소"""
+        flight = SingleFlight("test", cancel_abandoned=True)
+        started = asyncio.Event()
+
+        async def slow():
+            started.set()
+            await asyncio.sleep(0.05)
+            return "done"
+
+        first = asyncio.create_task(flight.do("k", slow))
+        second = asyncio.create_task(flight.do("k", slow))
+        await started.wait()
+        first.cancel()
+        self.assertEqual(await second, "done")
+
+        only = asyncio.create_task(flight.do("k2", slow))
+        await asyncio.sleep(0.01)
+        shared = flight._inflight["k2"]
+        only.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await shared
+        self.assertEqual(len(flight), 0)
+
+
+class TestPlannerDisconnect(unittest.IsolatedAsyncioTestCase):
+    """
+    POST /ai/v1/planners 연결 끊김 시 LLM 작업 취소 검증
+    """
+
+    async def test_node1_backoff_is_cancelled(self):
+        """1. 재시도 대기 중 취소되면 다음 LLM 호출을 하지 않음"""
+        client = MagicMock()
+        client.generate = AsyncMock(side_effect=google_exceptions.ServiceUnavailable("down"))
+        state = build_initial_state(ArrangementState.model_validate(PLANNER_REQUEST))
+
+        with patch("app.services.planner.nodes.node1_structure.get_gemini_client", return_value=client):
+            task = asyncio.create_task(node1_structure_analysis(state))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+        self.assertEqual(client.generate.await_count, 1)
+
+    async def test_endpoint_returns_499(self):
+        """2. 파이프라인 실행 중 연결이 끊기면 파이프라인을 취소하고 499"""
+        cancelled = asyncio.Event()
+
+        async def slow_pipeline(_request):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        body = json.dumps(PLANNER_REQUEST).encode()
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+        async def receive():
+            if messages:
+                return messages.pop(0)
+            return {"type": "http.disconnect"}
+
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+            "scheme": "http", "path": "/ai/v1/planners", "raw_path": b"/ai/v1/planners", "query_string": b"",
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+            "client": ("test", 1), "server": ("test", 80), "root_path": "",
+        }
+        with patch("app.api.v1.endpoints.planners.run_planner_pipeline", side_effect=slow_pipeline), \
+             patch("app.api.v1.endpoints.planners.get_planner_response_cache",
+                   return_value=PlannerResponseCache(max_entries=0, ttl_seconds=0)), \
+             patch.object(settings, "planner_disconnect_grace_seconds", 0.0):
+            await asyncio.wait_for(app(scope, receive, send), 5)
+
+        self.assertTrue(cancelled.is_set())
+        self.assertEqual(sent[0]["status"], 499)
+
+
+class TestChatDisconnect(unittest.IsolatedAsyncioTestCase):
+    """
+    챗봇 SSE 연결 끊김 시 생성 취소 검증
+    """
+
+    async def _disconnect(self, broker: InMemoryChatStreamBroker, message_id: int) -> None:
+        reader = broker.subscribe(message_id)
+        await reader.__anext__()
+        await reader.aclose()
+
+    async def test_cancel_when_not_reconnected(self):
+        """1. 유예 시간 안에 재연결되지 않으면 생성 취소, 재연결 / 종료된 스트림은 유지"""
+        broker = InMemoryChatStreamBroker(replay_events=8)
+        cancelled = []
+        broker.on_cancel(cancelled.append)
+        manager = ChatSessionManager(broker, disconnect_grace_seconds=0.02)
+
+        for message_id in (1, 2, 3):
+            await broker.open(message_id)
+            await broker.publish(message_id, "chunk", {})
+            await self._disconnect(broker, message_id)
+            manager.watch_disconnect(message_id)
+
+        # 2: 재연결, 3: 생성 완료
+        reconnected = broker.subscribe(2, after=1)
+        pending = asyncio.create_task(reconnected.__anext__())
+        await broker.publish(3, "complete", {})
+        await asyncio.sleep(0.05)
+
+        self.assertEqual(cancelled, [1])
+        self.assertTrue(await broker.exists(1))
+        pending.cancel()
+
+    async def test_disabled(self):
+        """2. 유예 시간이 음수면 취소하지 않음"""
+        broker = InMemoryChatStreamBroker()
+        cancelled = []
+        broker.on_cancel(cancelled.append)
+        manager = ChatSessionManager(broker, disconnect_grace_seconds=-1)
+        await broker.open(4)
+        await broker.publish(4, "chunk", {})
+        await self._disconnect(broker, 4)
+        manager.watch_disconnect(4)
+        await asyncio.sleep(0.02)
+        self.assertEqual(cancelled, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
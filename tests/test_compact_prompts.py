@@ -0,0 +1,106 @@
+import unittest
+import os
+import re
+import sys
+from unittest.mock import patch
+
+# Ensure project root is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.llm.prompts.compact import ShortIdCodec, format_table
+from app.llm.prompts.node1_prompt import format_tasks_compact
+from app.services.planner.nodes.node1_structure import node1_structure_analysis
+from app.services.planner.nodes.node3_chain_generator import node3_chain_generator
+from benchmarks.prompt_size import SYNTHETIC_ID_OFFSET, measure_prompt_sizes, sample_request_state
+from benchmarks.synthetic import build_synthetic_state
+
+
+class ShortIdGeminiClient:
+    """Compact 프롬프트의 짧은 ID로만 응답하는 Mock LLM"""
+
+    def __init__(self, hallucinate_once=False):
+        self.hallucinate_once = hallucinate_once
+        self.calls = 0
+
+    async def generate(self, system: str, user: str) -> dict:
+        self.calls += 1
+        short_ids = [int(s) for s in re.findall(r"^(\d+),", user, re.M)]
+        if self.hallucinate_once and self.calls == 1:
+            short_ids = short_ids + [len(short_ids) + 1]
+        if "chainId" in system and "timeZoneQueues" in system and "tasks(id,title,cat" in user:
+            return {"candidates": [{"chainId": "C1", "timeZoneQueues": {"MORNING": short_ids}}]}
+        return {"tasks": [{"taskId": s, "category": "학업", "cognitiveLoad": "HIGH"} for s in short_ids]}
+
+
+class TestCompactEncoding(unittest.TestCase):
+    """
+    Compact 프롬프트 인코딩 검증
+    """
+
+    def test_short_id_round_trip_and_table(self):
+        """1. 짧은 ID 왕복 변환, 목록에 없는 ID는 ValueError, 쉼표 포함 제목은 따옴표 처리"""
+        codec = ShortIdCodec([99999999999, 12345678901, 99999999999])
+        self.assertEqual(len(codec), 2)
+        self.assertEqual(codec.encode(12345678901), 2)
+        self.assertEqual(codec.decode("2"), 12345678901)
+        with self.assertRaises(ValueError):
+            codec.decode(3)
+
+        table = format_table("tasks", ("id", "title"), [(1, "a, b"), (2, None)])
+        self.assertEqual(table, 'tasks(id,title)\n1,"a, b"\n2,')
+
+    def test_compact_prompts_are_smaller(self):
+        """2. test_request.json / 합성 대규모 일정 모두 Compact 형식의 토큰 수가 더 적음"""
+        for state in (sample_request_state(), build_synthetic_state(100, id_offset=SYNTHETIC_ID_OFFSET)):
+            for node, sizes in measure_prompt_sizes(state).items():
+                self.assertLess(sizes["tokens_after"], sizes["tokens_before"], node)
+
+        prompt, codec = format_tasks_compact(sample_request_state().flexTasks)
+        self.assertNotIn("99999999999", prompt)
+        self.assertNotIn("TaskID", prompt)
+
+
+class TestCompactNodes(unittest.IsolatedAsyncioTestCase):
+    """
+    Node 1 / Node 3가 짧은 ID 응답을 원래 taskId로 복원하는지 검증
+    """
+
+    def setUp(self):
+        # Compact 프롬프트는 opt-in (기본 False)
+        patcher = patch.object(settings, "planner_compact_prompts", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_nodes_map_short_ids_back(self):
+        """1. Node 1 / Node 3 응답의 짧은 ID가 원래 taskId로 복원"""
+        state = sample_request_state()
+        client = ShortIdGeminiClient()
+        with patch("app.services.planner.nodes.node1_structure.get_gemini_client", return_value=client), \
+             patch("app.services.planner.nodes.node3_chain_generator.get_gemini_client", return_value=client):
+            node1_state = await node1_structure_analysis(state)
+            node3_state = await node3_chain_generator(state)
+
+        flex_ids = {t.taskId for t in state.flexTasks}
+        self.assertEqual(set(node1_state.taskFeatures), flex_ids)
+        self.assertTrue(all(f.category == "학업" for f in node1_state.taskFeatures.values()))
+        self.assertFalse(node1_state.warnings)
+
+        queue = node3_state.chainCandidates[0].timeZoneQueues["MORNING"]
+        self.assertEqual(node3_state.chainCandidates[0].chainId, "C1")
+        self.assertTrue(set(queue) <= flex_ids)
+
+    async def test_unknown_short_id_is_retried(self):
+        """2. 보낸 적 없는 짧은 ID는 Hallucination으로 보고 재시도"""
+        state = sample_request_state()
+        client = ShortIdGeminiClient(hallucinate_once=True)
+        with patch("app.services.planner.nodes.node1_structure.get_gemini_client", return_value=client), \
+             patch("app.services.planner.nodes.node1_structure.asyncio.sleep"):
+            node1_state = await node1_structure_analysis(state)
+
+        self.assertEqual(client.calls, 2)
+        self.assertEqual(set(node1_state.taskFeatures), {t.taskId for t in state.flexTasks})
+
+
+if __name__ == '__main__':
+    unittest.main()
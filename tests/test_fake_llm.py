@@ -0,0 +1,157 @@
+import unittest
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+# Ensure project root is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.core.config import settings
+from app.llm import gemini_client
+from app.llm.fake_client import FakeGeminiClient, build_fake_client
+from app.models.planner.errors import PlannerErrorCode, is_retryable_error, map_exception_to_error_code
+from app.services.planner.response_cache import PlannerResponseCache
+from benchmarks.load_test import ScenarioStats, drive, planner_payload
+
+
+def _offline_patches(llm):
+    """Fake LLM 주입 + 캐시 / DB 저장 비활성화"""
+    return [
+        patch("app.services.planner.nodes.node1_structure.get_gemini_client", return_value=llm),
+        patch("app.services.planner.nodes.node3_chain_generator.get_gemini_client", return_value=llm),
+        patch("app.api.v1.endpoints.planners.get_planner_response_cache",
+              return_value=PlannerResponseCache(max_entries=0, ttl_seconds=0)),
+        patch("app.db.repositories.planner_repository.PlannerRepository.save_ai_draft", AsyncMock()),
+    ]
+
+
+class TestFakeBackend(unittest.IsolatedAsyncioTestCase):
+    """
+    LLM 백엔드 선택 / Fake LLM 응답 검증
+    """
+
+    def test_backend_selection(self):
+        """1. LLM_BACKEND=fake면 get_gemini_client가 Fake 클라이언트(프로파일 덮어쓰기 반영) 반환"""
+        original = gemini_client._gemini_client
+        gemini_client._gemini_client = None
+        try:
+            with patch.object(settings, "llm_backend", "fake"), \
+                 patch.object(settings, "fake_llm_profile", "quota"), \
+                 patch.object(settings, "fake_llm_latency_seconds", 0.0):
+                client = gemini_client.get_gemini_client()
+            self.assertIsInstance(client, FakeGeminiClient)
+            self.assertEqual(client.profile.latency, 0.0)
+            self.assertEqual(client.profile.rate_limit_rate, 0.3)
+        finally:
+            gemini_client._gemini_client = original
+
+        with self.assertRaises(ValueError):
+            build_fake_client("unknown")
+
+    async def test_error_profiles(self):
+        """2. 429는 Quota 에러 코드로, 503은 재시도 가능 에러로 매핑 (실제 Gemini 에러 타입과 동일)"""
+        client = build_fake_client("instant", rate_limit_rate=1.0)
+        with self.assertRaises(Exception) as ctx:
+            await client.generate("system", "user")
+        self.assertEqual(map_exception_to_error_code(ctx.exception), PlannerErrorCode.PLANNER_RESOURCE_EXHAUSTED)
+
+        client = build_fake_client("instant", error_rate=1.0)
+        with self.assertRaises(Exception) as ctx:
+            await client.generate("system", "user")
+        self.assertEqual(ctx.exception.code, 503)
+        self.assertTrue(is_retryable_error(map_exception_to_error_code(ctx.exception)))
+
+        text = await build_fake_client("instant").generate_text("system", "report input")
+        self.assertEqual(text, await build_fake_client("instant").generate_text("system", "report input"))
+
+    async def test_embeddings(self):
+        """3. 임베딩 스케줄러(동기) / 유사 작업 검색(비동기) 경로의 embed_content가 같은 결정론적 벡터 반환"""
+        client = build_fake_client("instant")
+        sync_result = client.client.models.embed_content(
+            model="gemini-embedding-001", contents="운동", config=SimpleNamespace(output_dimensionality=8)
+        )
+        async_result = await client.client.aio.models.embed_content(
+            model="gemini-embedding-001", contents="운동", config={"output_dimensionality": 8}
+        )
+        vector = sync_result.embeddings[0].values
+        self.assertEqual(len(vector), 8)
+        self.assertEqual(vector, async_result.embeddings[0].values)
+        self.assertAlmostEqual(sum(v * v for v in vector), 1.0)
+
+        other = await client.client.aio.models.embed_content(model="gemini-embedding-001", contents="공부")
+        self.assertEqual(len(other.embeddings[0].values), 768)
+        self.assertNotEqual(other.embeddings[0].values[:8], vector)
+
+
+class TestFakeEndpoints(unittest.TestCase):
+    """
+    Fake LLM으로 플래너 / 챗봇 엔드포인트 전체 흐름 검증
+    """
+
+    def test_planner_and_chat_with_fake_llm(self):
+        """1. 플래너는 Fallback 없이 배정, 챗봇 SSE는 Chunk 후 complete 이벤트로 종료"""
+        llm = build_fake_client("instant")
+        patches = _offline_patches(llm) + [
+            patch("app.api.v2.endpoints.chat.chat_service.gemini", llm),
+            patch("app.db.repositories.report_repository.ReportRepository.fetch_user_id_by_report_id",
+                  AsyncMock(return_value=1)),
+        ]
+        for p in patches:
+            p.start()
+        try:
+            client = TestClient(app)
+            body = client.post("/ai/v1/planners", json=planner_payload(1)).json()
+            self.assertTrue(body["success"])
+            self.assertFalse(body["degraded"])
+            self.assertEqual(llm.calls, 2)
+
+            chat = {"userId": 1, "messageId": 77, "messages": [
+                {"messageId": 1, "senderType": "USER", "messageType": "TEXT", "content": "추천해줘"}
+            ]}
+            self.assertEqual(client.post("/ai/v2/reports/5/chat/respond", json=chat).status_code, 200)
+            stream = client.get("/ai/v2/reports/5/chat/respond/77/stream").text
+            self.assertIn("event: chunk", stream)
+            self.assertIn("event: complete", stream)
+        finally:
+            for p in patches:
+                p.stop()
+
+
+class TestLoadHarness(unittest.IsolatedAsyncioTestCase):
+    """
+    부하 테스트 하네스 검증
+    """
+
+    async def test_drive_planner_in_process(self):
+        """1. 목표 RPS로 플래너 요청 발사 후 처리량 / 분위수 / Fallback 비율 집계"""
+        patches = _offline_patches(build_fake_client("instant"))
+        for p in patches:
+            p.start()
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://load-test") as client:
+                stats, elapsed = await drive(client, "planner", rps=50, duration=0.1, max_inflight=5)
+        finally:
+            for p in patches:
+                p.stop()
+
+        summary = stats.summary(elapsed)
+        self.assertEqual(summary["requests"], 5)
+        self.assertEqual(summary["ok"], 5)
+        self.assertEqual(summary["fallback_rate"], 0.0)
+        self.assertLessEqual(summary["p50_ms"], summary["p99_ms"])
+
+        stats = ScenarioStats("x")
+        stats.record(0.1, 200, ok=True, fallback=True)
+        stats.record(0.3, 503, ok=False)
+        self.assertEqual(stats.summary(1.0)["fallback_rate"], 1.0)
+        self.assertEqual(stats.summary(1.0)["statuses"], {"200": 1, "503": 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,205 @@
+import unittest
+import asyncio
+import json
+import os
+import sys
+import time
+from unittest.mock import AsyncMock, patch
+
+# Ensure project root is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.llm.load_monitor import LLMLoadMonitor
+from app.models.planner.request import ArrangementState
+from app.services.planner.admission import (
+    PlannerAdmissionController, PLANNER_SHED_TOTAL, PLANNER_DEGRADED_TOTAL
+)
+from app.services.planner.pipeline import run_degraded_pipeline
+from app.services.planner.response_cache import PlannerResponseCache
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "test_request.json")
+
+
+def _load_request() -> dict:
+    with open(DATA_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class TestLLMLoadMonitor(unittest.IsolatedAsyncioTestCase):
+    """
+    LLM 호출 부하 추적 검증
+    """
+
+    async def test_in_flight_and_recent_latency(self):
+        """1. 진행 중 호출 수 증감 및 최근 지연 시간(p90) 기록"""
+        monitor = LLMLoadMonitor(window=10)
+        self.assertIsNone(monitor.recent_latency())
+
+        async with monitor.track("m"):
+            self.assertEqual(monitor.in_flight, 1)
+            await asyncio.sleep(0.02)
+        self.assertEqual(monitor.in_flight, 0)
+        self.assertGreaterEqual(monitor.recent_latency(), 0.02)
+
+        # 스트리밍 등 지연 시간 미기록 호출
+        async with monitor.track("m", record_latency=False):
+            pass
+        self.assertEqual(len(monitor._samples), 1)
+
+    async def test_filters_by_stage(self):
+        """2. 구간(stage)별 진행 중 호출 수 / 최근 지연 시간 조회"""
+        monitor = LLMLoadMonitor(window=10)
+        async with monitor.track("m", stage="weekly_report"):
+            async with monitor.track("m", stage="node1"):
+                self.assertEqual(monitor.in_flight, 2)
+                self.assertEqual(monitor.in_flight_for({"node1", "node3"}), 1)
+        self.assertEqual(monitor.in_flight_for({"node1"}), 0)
+
+        monitor._samples.append((time.monotonic(), 60.0, "weekly_report"))
+        self.assertLess(monitor.recent_latency(stages={"node1"}), 60.0)
+        self.assertEqual(monitor.recent_latency(), 60.0)
+        self.assertIsNone(monitor.recent_latency(stages={"node3"}))
+
+
+class TestPlannerAdmission(unittest.TestCase):
+    """
+    플래너 Admission Control 검증
+    """
+
+    def test_sheds_when_admitted_requests_reach_limit(self):
+        """1. 허용된 요청이 상한에 도달하면 'inflight' 사유로 차단, 종료 후 슬롯 반환"""
+        admission = PlannerAdmissionController(max_inflight=1, shed_latency_seconds=0, monitor=LLMLoadMonitor())
+        shed_before = PLANNER_SHED_TOTAL.value(reason="inflight")
+
+        with admission.admit() as first:
+            self.assertIsNone(first)
+            with admission.admit() as second:
+                self.assertEqual(second, "inflight")
+            self.assertEqual(admission.admitted, 1)
+
+        self.assertEqual(admission.admitted, 0)
+        self.assertEqual(PLANNER_SHED_TOTAL.value(reason="inflight"), shed_before + 1)
+
+    def test_sheds_when_recent_latency_is_high(self):
+        """2. 최근 LLM 지연이 상한을 넘으면 'latency' 사유로 차단"""
+        monitor = LLMLoadMonitor()
+        admission = PlannerAdmissionController(max_inflight=0, shed_latency_seconds=5.0, monitor=monitor)
+
+        with patch.object(monitor, "recent_latency", return_value=1.0):
+            with admission.admit() as reason:
+                self.assertIsNone(reason)
+        with patch.object(monitor, "recent_latency", return_value=30.0):
+            with admission.admit() as reason:
+                self.assertEqual(reason, "latency")
+
+
+class TestPlannerAdmissionScope(unittest.IsolatedAsyncioTestCase):
+    """
+    플래너 Admission Control 집계 범위 / 회복 검증
+    """
+
+    async def test_report_calls_do_not_shed_planner(self):
+        """1. 주간 레포트 LLM 호출(진행 중 / 느린 지연)은 플래너 요청을 차단하지 않음"""
+        monitor = LLMLoadMonitor()
+        admission = PlannerAdmissionController(max_inflight=1, shed_latency_seconds=5.0, monitor=monitor)
+        monitor._samples.append((time.monotonic(), 60.0, "weekly_report"))
+
+        async with monitor.track("m", stage="weekly_report"), monitor.track("m", stage="weekly_report"):
+            with admission.admit() as reason:
+                self.assertIsNone(reason)
+
+        # 플래너 구간 호출은 그대로 집계
+        async with monitor.track("m", stage="node1"):
+            with admission.admit() as reason:
+                self.assertEqual(reason, "inflight")
+
+    async def test_latency_shedding_admits_probe(self):
+        """2. 지연 기준 차단 중에도 probe_interval_seconds마다 1건은 허용하여 지연 표본 갱신"""
+        monitor = LLMLoadMonitor()
+        admission = PlannerAdmissionController(
+            max_inflight=0, shed_latency_seconds=5.0, monitor=monitor, probe_interval_seconds=5.0
+        )
+        clock = iter([100.0, 102.0, 106.0, 107.0])
+        reasons = []
+        with patch.object(monitor, "recent_latency", return_value=30.0), \
+             patch("app.services.planner.admission.time.monotonic", side_effect=lambda: next(clock)):
+            for _ in range(4):
+                with admission.admit() as reason:
+                    reasons.append(reason)
+
+        self.assertEqual(reasons, ["latency", "latency", None, "latency"])
+
+
+class TestDegradedPipeline(unittest.TestCase):
+    """
+    Degraded 경로(LLM 호출 없음) 검증
+    """
+
+    def test_degraded_pipeline_assigns_without_llm(self):
+        """1. LLM 클라이언트를 호출하지 않고 배정 결과 생성"""
+        request = ArrangementState.model_validate(_load_request())
+        with patch("app.services.planner.nodes.node1_structure.get_gemini_client") as node1_llm, \
+             patch("app.services.planner.nodes.node3_chain_generator.get_gemini_client") as node3_llm:
+            state = run_degraded_pipeline(request, reason="test")
+
+        node1_llm.assert_not_called()
+        node3_llm.assert_not_called()
+        self.assertEqual(len(state.finalResults), len(state.flexTasks))
+        self.assertTrue(any(r.assignmentStatus == "ASSIGNED" for r in state.finalResults))
+        self.assertIn("Degraded mode: test", state.warnings)
+
+    def test_endpoint_returns_degraded_marker_when_shed(self):
+        """2. 차단된 요청은 전체 파이프라인 없이 degraded=True로 응답하고 캐시하지 않음"""
+        pipeline = AsyncMock()
+        cache = PlannerResponseCache(max_entries=10, ttl_seconds=60)
+        admission = PlannerAdmissionController(max_inflight=0, shed_latency_seconds=1.0, monitor=LLMLoadMonitor())
+        degraded_before = PLANNER_DEGRADED_TOTAL.value()
+
+        with patch.object(admission._monitor, "recent_latency", return_value=10.0), \
+             patch("app.api.v1.endpoints.planners.get_planner_admission", return_value=admission), \
+             patch("app.api.v1.endpoints.planners.run_planner_pipeline", pipeline), \
+             patch("app.api.v1.endpoints.planners.get_planner_response_cache", return_value=cache), \
+             patch("app.db.repositories.planner_repository.PlannerRepository.save_ai_draft", AsyncMock()):
+            client = TestClient(app)
+            body = client.post("/ai/v1/planners", json=_load_request()).json()
+
+        pipeline.assert_not_awaited()
+        self.assertTrue(body["success"])
+        self.assertTrue(body["degraded"])
+        self.assertTrue(body["results"])
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(PLANNER_DEGRADED_TOTAL.value(), degraded_before + 1)
+
+    def test_replan_endpoint_is_shed(self):
+        """3. 재배치 요청도 차단 시 전체 파이프라인 / 증분 재배치(LLM) 없이 degraded=True로 응답"""
+        pipeline = AsyncMock()
+        replan = AsyncMock()
+        admission = PlannerAdmissionController(max_inflight=0, shed_latency_seconds=1.0, monitor=LLMLoadMonitor())
+        shed_before = PLANNER_SHED_TOTAL.value(reason="latency")
+
+        with patch.object(admission._monitor, "recent_latency", return_value=10.0), \
+             patch("app.api.v1.endpoints.planners.get_planner_admission", return_value=admission), \
+             patch("app.api.v1.endpoints.planners.run_planner_pipeline", pipeline), \
+             patch("app.api.v1.endpoints.planners.replan_pipeline", replan), \
+             patch("app.db.repositories.planner_repository.PlannerRepository.save_ai_draft", AsyncMock()):
+            client = TestClient(app)
+            # 이전 결과 없음 (전체 파이프라인 경로)
+            first = client.post("/ai/v1/planners/replan", json=_load_request()).json()
+            # 이전 결과 있음 (증분 재배치 경로)
+            second = client.post(
+                "/ai/v1/planners/replan", json={**_load_request(), "traceId": first["traceId"]}
+            ).json()
+
+        pipeline.assert_not_awaited()
+        replan.assert_not_awaited()
+        self.assertTrue(first["degraded"])
+        self.assertTrue(second["degraded"])
+        self.assertTrue(second["results"])
+        self.assertEqual(PLANNER_SHED_TOTAL.value(reason="latency"), shed_before + 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+import sys
+import os
+import random
+import threading
+from unittest.mock import patch
+
+# Ensure project root is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import build_synthetic_state
+from app.services.planner.nodes.node4_chain_judgement import node4_chain_judgement, calculate_chain_score
+from app.services.planner.nodes.node4_local_search import node4_local_search, _ChainLocalSearch
+from app.services.planner.pipeline import run_planner_pipeline
+from app.services.planner.utils.state_index import get_state_index
+
+
+class TestLocalSearch(unittest.TestCase):
+    """
+    Node 4 이후 로컬 서치 최적화 검증
+    """
+
+    def setUp(self):
+        self.state = node4_chain_judgement(build_synthetic_state(60, num_sessions=6, num_candidates=3, seed=7))
+
+    def _score(self, state, chain_id):
+        chain = next(c for c in state.chainCandidates if c.chainId == chain_id)
+        score, _ = calculate_chain_score(
+            chain, state.taskFeatures, get_state_index(state).capacity,
+            state.weights, state.request.user.focusTimeZone
+        )
+        return score
+
+    def test_disabled_by_default(self):
+        """1. 예산이 0이면 state를 그대로 반환"""
+        self.assertIs(node4_local_search(self.state, budget_ms=0), self.state)
+
+    def test_improves_selected_chain_within_budget(self):
+        """2. 점수가 개선된 경우에만 새 체인을 선택"""
+        before = self._score(self.state, self.state.selectedChainId)
+
+        result = node4_local_search(self.state, budget_ms=50, seed=1)
+
+        after = self._score(result, result.selectedChainId)
+        self.assertGreater(result.localSearchGain, 0)
+        self.assertEqual(result.selectedChainId, f"{self.state.selectedChainId}_ls")
+        self.assertAlmostEqual(after - before, result.localSearchGain, places=6)
+
+    def test_result_respects_group_closure_and_order(self):
+        """3. 결과 체인은 그룹 Closure를 만족하고, 그룹 내 순서가 큐에서 유지됨"""
+        result = node4_local_search(self.state, budget_ms=30, seed=2)
+        chain = next(c for c in result.chainCandidates if c.chainId == result.selectedChainId)
+        features = result.taskFeatures
+
+        included = {tid for ids in chain.timeZoneQueues.values() for tid in ids}
+        for gid, members in get_state_index(result).group_members.items():
+            orders = [order for order, tid in members if tid in included]
+            if orders:
+                self.assertEqual(sorted(orders), list(range(1, max(orders) + 1)), f"group {gid}")
+
+        for ids in chain.timeZoneQueues.values():
+            last_order: dict[str, int] = {}
+            for tid in ids:
+                f = features[tid]
+                if f.groupId and f.orderInGroup is not None:
+                    self.assertGreater(f.orderInGroup, last_order.get(f.groupId, 0))
+                    last_order[f.groupId] = f.orderInGroup
+
+    def test_incremental_score_matches_full_score(self):
+        """4. 증분(Delta) 점수가 전체 재계산 점수와 일치"""
+        index = get_state_index(self.state)
+        chain = next(c for c in self.state.chainCandidates if c.chainId == self.state.selectedChainId)
+        search = _ChainLocalSearch(
+            chain=chain,
+            task_features=self.state.taskFeatures,
+            group_members=index.group_members,
+            capacity=index.capacity,
+            weights=self.state.weights,
+            focus_timezone=self.state.request.user.focusTimeZone,
+            rng=random.Random(3)
+        )
+        search.run(10)
+        search.best_zone_of = dict(search.zone_of)
+
+        full, _ = calculate_chain_score(
+            search.best_chain(), self.state.taskFeatures, index.capacity,
+            self.state.weights, self.state.request.user.focusTimeZone
+        )
+        self.assertAlmostEqual(search.score, full, places=6)
+
+
+
+class TestLocalSearchInPipeline(unittest.IsolatedAsyncioTestCase):
+    """
+    파이프라인에서의 로컬 서치 실행 위치 검증
+    """
+
+    async def test_runs_off_event_loop(self):
+        """1. 예산이 있으면 이벤트 루프를 막지 않도록 워커 스레드에서 실행, 0이면 호출하지 않음"""
+        state = build_synthetic_state(20, num_sessions=4, num_candidates=2, seed=5)
+        threads = []
+
+        async def node1(s):
+            return s.model_copy(update={"taskFeatures": state.taskFeatures})
+
+        async def node3(s):
+            return s.model_copy(update={"chainCandidates": state.chainCandidates})
+
+        def local_search(s):
+            threads.append(threading.get_ident())
+            return s
+
+        for budget in (10, 0):
+            with patch("app.services.planner.pipeline.node1_structure_analysis", side_effect=node1), \
+                 patch("app.services.planner.pipeline.node3_chain_generator", side_effect=node3), \
+                 patch("app.services.planner.pipeline.node4_local_search", side_effect=local_search), \
+                 patch("app.services.planner.pipeline.settings.planner_local_search_ms", budget):
+                await run_planner_pipeline(state.request)
+
+        self.assertEqual(len(threads), 1)
+        self.assertNotEqual(threads[0], threading.get_ident())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+import asyncio
+import os
+import sys
+from unittest.mock import AsyncMock, patch
+
+# Ensure project root is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.core.metrics import MetricsRegistry
+from app.core.prometheus import render_prometheus
+from app.core.timing import LLM_FALLBACK_TOTAL, LLM_RETRIES_TOTAL
+from app.llm.load_monitor import get_llm_load_monitor
+from app.services.planner.nodes.node1_structure import node1_structure_analysis
+from app.models.report import WeeklyReportGenerateRequest
+from app.services.report.weekly_report_service import REPORT_BATCH_PENDING_USERS, generate_batch_reports
+from benchmarks.prompt_size import sample_request_state
+
+
+class TestPrometheusFormat(unittest.TestCase):
+    """
+    Prometheus 텍스트 포맷 변환 검증
+    """
+
+    def test_render_counter_gauge_histogram(self):
+        """1. Counter / Gauge(라벨 이스케이프) / Histogram(+Inf, sum, count) / Collector 갱신"""
+        registry = MetricsRegistry()
+        registry.counter("jobs_total", "Jobs", ("kind",)).inc(3, kind="a")
+        gauge = registry.gauge("queue_depth", "Depth", ("name",))
+        registry.register_collector(lambda: gauge.set(7, name='q"1'))
+        registry.histogram("latency_seconds", "Latency", buckets=(0.5, 1.0)).observe(0.75)
+
+        text = render_prometheus(registry)
+        self.assertIn("# TYPE jobs_total counter\njobs_total{kind=\"a\"} 3\n", text)
+        self.assertIn('queue_depth{name="q\\"1"} 7\n', text)
+        self.assertIn('latency_seconds_bucket{le="0.5"} 0\n', text)
+        self.assertIn('latency_seconds_bucket{le="1"} 1\n', text)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 1\n', text)
+        self.assertIn("latency_seconds_sum 0.75\nlatency_seconds_count 1\n", text)
+
+
+class TestMetricsEndpoint(unittest.TestCase):
+    """
+    /metrics 엔드포인트 및 메트릭 수집 지점 검증
+    """
+
+    def test_route_template_label(self):
+        """1. 경로 파라미터 대신 라우트 템플릿으로 지연 시간 기록, 주요 시계열 노출"""
+        client = TestClient(app)
+        client.get("/ai/v2/reports/1/chat/respond/2/stream")
+        response = client.get("/metrics")
+
+        self.assertTrue(response.headers["content-type"].startswith("text/plain; version=0.0.4"))
+        self.assertIn(
+            'http_request_duration_seconds_count{method="GET",'
+            'route="/ai/v2/reports/{reportId}/chat/respond/{messageId}/stream",status="200"}',
+            response.text
+        )
+        for name in ("chat_active_streams", "db_pool_connections_in_use", "weekly_report_batch_pending_users"):
+            self.assertIn(f"\n{name} ", response.text)
+
+
+class FailingGeminiClient:
+    """항상 실패하는 Mock LLM (부하 추적 경로는 실제 GeminiClient와 동일하게 통과)"""
+
+    async def generate(self, system: str, user: str) -> dict:
+        async with get_llm_load_monitor().track("mock-model"):
+            raise ValueError("Invalid JSON format: missing 'tasks' key")
+
+
+class TestLLMMetrics(unittest.IsolatedAsyncioTestCase):
+    """
+    LLM 재시도 / Fallback 메트릭 검증
+    """
+
+    async def test_retries_by_model_and_fallback(self):
+        """1. 재시도는 직전 호출 모델 라벨로, 최종 실패는 Fallback으로 집계"""
+        retries = LLM_RETRIES_TOTAL.value(model="mock-model", stage="unknown")
+        fallbacks = LLM_FALLBACK_TOTAL.value(stage="unknown")
+        with patch("app.services.planner.nodes.node1_structure.get_gemini_client", return_value=FailingGeminiClient()), \
+             patch("app.services.planner.nodes.node1_structure.asyncio.sleep", AsyncMock()):
+            state = await node1_structure_analysis(sample_request_state())
+
+        self.assertTrue(state.warnings)
+        self.assertEqual(LLM_RETRIES_TOTAL.value(model="mock-model", stage="unknown"), retries + 4)
+        self.assertEqual(LLM_FALLBACK_TOTAL.value(stage="unknown"), fallbacks + 1)
+        self.assertGreaterEqual(
+            get_llm_load_monitor()._calls_total.value(model="mock-model", outcome="error"), 5
+        )
+
+
+
+class TestReportBatchMetrics(unittest.IsolatedAsyncioTestCase):
+    """
+    주간 레포트 배치 진행률 메트릭 검증
+    """
+
+    async def test_cancelled_batch_releases_pending_users(self):
+        """1. 청크 사이 대기 중 배치가 취소되어도 대기 유저 수는 원래대로 돌아옴"""
+        request = WeeklyReportGenerateRequest.model_validate({
+            "baseDate": "2026-01-12",
+            "users": [{"userId": i, "reportId": 100 + i} for i in range(15)]
+        })
+        before = REPORT_BATCH_PENDING_USERS.value()
+
+        with patch("app.services.report.weekly_report_service._generate_single_report", AsyncMock(return_value=True)):
+            batch = asyncio.create_task(generate_batch_reports(request))
+            await asyncio.sleep(0.05)
+            # 첫 청크(10명)만 Task가 생성된 상태
+            batch.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await batch
+            await asyncio.sleep(0.01)
+
+        self.assertEqual(REPORT_BATCH_PENDING_USERS.value(), before)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Ensure project root is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.repositories.planner_repository import RECORD_TASK_COLUMNS, build_record_task_rows
+from app.services.planner.nodes.node5_time_assignment import node5_time_assignment
+from benchmarks.microbench import (
+    CASES, DEFAULT_SIZES, compare, load_baseline, run_suite, save_baseline, _fixed_schedules
+)
+from benchmarks.synthetic import build_synthetic_state
+
+
+class TestMicrobenchSuite(unittest.TestCase):
+    """
+    마이크로벤치마크 스위트 / 기준선 비교 검증
+    """
+
+    def test_suite_runs_all_cases(self):
+        """1. 모든 케이스가 작은 합성 일정에서 실행되고 저장된 기준선이 전체 케이스 / 크기를 포함"""
+        results = run_suite(sizes=[5], repeat=1)
+        self.assertEqual(set(results), set(CASES))
+        for by_size in results.values():
+            self.assertGreater(by_size["5"], 0)
+
+        baseline = load_baseline()
+        self.assertIsNotNone(baseline)
+        self.assertGreater(baseline["calibration_seconds"], 0)
+        for name in CASES:
+            self.assertEqual(set(baseline["results"][name]), {str(n) for n in DEFAULT_SIZES})
+
+    def test_compare_detects_regression(self):
+        """2. 보정 비율 반영 후 허용치를 넘은 케이스만 회귀로 판단 (기준선에 없는 크기는 건너뜀)"""
+        baseline = {"calibration_seconds": 1.0, "results": {"node5_time_assignment": {"500": 0.010}}}
+        results = {"node5_time_assignment": {"500": 0.016, "2000": 1.0}}
+
+        rows = compare(results, baseline, calibration=1.0, tolerance=0.5)
+        self.assertEqual(len(rows), 1)
+        self.assertTrue(rows[0]["regressed"])
+        self.assertAlmostEqual(rows[0]["ratio"], 1.6)
+
+        # 2배 느린 기계라면 기준선도 2배로 보정되어 회귀 아님
+        rows = compare(results, baseline, calibration=2.0, tolerance=0.5)
+        self.assertFalse(rows[0]["regressed"])
+
+    def test_save_baseline_merges(self):
+        """3. 기준선 갱신 시 측정한 케이스 / 크기만 덮어쓰기"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "baselines" / "microbench.json"
+            save_baseline({"apply_closure": {"5": 1.0, "50": 2.0}}, calibration=0.5, path=path)
+            save_baseline({"apply_closure": {"50": 3.0}}, calibration=0.7, path=path)
+
+            baseline = load_baseline(path)
+            self.assertEqual(baseline["results"]["apply_closure"], {"5": 1.0, "50": 3.0})
+            self.assertEqual(baseline["calibration_seconds"], 0.7)
+
+
+class TestRecordTaskRows(unittest.TestCase):
+    """
+    save_ai_draft의 record_tasks 행 생성 검증
+    """
+
+    def test_rows_cover_flex_split_and_fixed(self):
+        """1. FLEX(분할 시 자식 행 포함) + FIXED 행이 모두 같은 컬럼으로 생성"""
+        state = node5_time_assignment(build_synthetic_state(50))
+        state.fixedTasks = _fixed_schedules(3)
+
+        rows = build_record_task_rows(state, record_id=7)
+        split_children = sum(len(r.children or []) for r in state.finalResults)
+
+        self.assertEqual(len(rows), len(state.taskFeatures) + split_children + 3)
+        self.assertTrue(all(list(r.keys()) == RECORD_TASK_COLUMNS for r in rows))
+        self.assertTrue(all(r["record_id"] == 7 for r in rows))
+        self.assertEqual([r["task_type"] for r in rows[-3:]], ["FIXED"] * 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+import sys
+import os
+
+# Ensure project root is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.planner.internal import FreeSession, TaskFeature
+from app.services.planner.nodes.node5_time_assignment import assign_tasks_to_sessions
+
+
+class TestNode5Scaling(unittest.TestCase):
+    """
+    Node 5 배정 엔진의 분할 정합성 검증 (수행 시간 스케일링은 benchmarks/node5_scaling.py)
+    """
+
+    def test_long_task_split_across_many_sessions(self):
+        """1. 하나의 긴 작업이 여러 세션에 걸쳐 순서대로 분할됨"""
+        feature = TaskFeature(
+            taskId=1, dayPlanId=1, title="Long", type="FLEX",
+            durationPlanMin=300, durationMinChunk=30, durationMaxChunk=300
+        )
+        sessions = [
+            FreeSession(start=540 + i * 90, end=540 + i * 90 + 60, duration=60, timeZoneProfile={"MORNING": 60})
+            for i in range(6)
+        ]
+        results, assigned = assign_tasks_to_sessions(sessions, {"MORNING": [1]}, {1: feature}, user_id=1)
+
+        self.assertEqual(assigned, {1})
+        self.assertEqual(len(results), 1)
+        children = results[0].children
+        self.assertEqual(len(children), 5)
+        self.assertEqual([c.title for c in children], [f"Long - {i}" for i in range(1, 6)])
+        self.assertEqual(children[0].startAt, "09:00")
+        self.assertEqual(children[-1].endAt, "16:00")
+
+
+if __name__ == '__main__':
+    unittest.main()
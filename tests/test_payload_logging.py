@@ -0,0 +1,72 @@
+import unittest
+import os
+import sys
+import contextvars
+from unittest.mock import MagicMock, patch
+
+# Ensure project root is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.core.payload_logging import diff_fields, log_payload, start_payload_sampling, summarize
+from app.services.planner.nodes.node2_importance import node2_importance
+from benchmarks.prompt_size import sample_request_state
+
+
+class TestPayloadLogging(unittest.TestCase):
+    """
+    Payload 로깅 수준 / Head Sampling / Lazy 직렬화 검증
+    (요청마다 별도 Context에서 실행되는 것과 같도록 각 케이스를 새 Context에서 실행)
+    """
+
+    def _log(self, level: str, sample_rate: float, error: bool = False):
+        payload = MagicMock(return_value={"big": "payload"})
+        logfire_info = MagicMock()
+
+        def run():
+            start_payload_sampling(sample_rate)
+            log_payload("Node X", payload, lambda: {"count": 3}, error=error)
+            log_payload("Node Y", payload, lambda: {"count": 4})
+
+        with patch.object(settings, "payload_log_level", level), \
+             patch("app.core.payload_logging.logfire.info", logfire_info):
+            contextvars.copy_context().run(run)
+        return payload, logfire_info
+
+    def test_levels_and_lazy_payload(self):
+        """1. off는 기록 없음, summary / 미샘플 요청은 요약만 (Payload 함수 호출 없음), full은 전체"""
+        payload, logfire_info = self._log("off", 1.0)
+        logfire_info.assert_not_called()
+        payload.assert_not_called()
+
+        for level, rate in (("summary", 1.0), ("sampled", 0.0)):
+            payload, logfire_info = self._log(level, rate)
+            payload.assert_not_called()
+            logfire_info.assert_any_call("Node X", count=3)
+
+        payload, logfire_info = self._log("full", 0.0)
+        self.assertEqual(payload.call_count, 2)
+        logfire_info.assert_any_call("Node Y", payload={"big": "payload"}, count=4)
+
+    def test_head_sampling_and_errors(self):
+        """2. 샘플링된 요청은 전체 기록, 에러가 난 요청은 샘플링과 관계없이 이후까지 전체 기록"""
+        payload, _ = self._log("sampled", 1.0)
+        self.assertEqual(payload.call_count, 2)
+
+        payload, logfire_info = self._log("sampled", 0.0, error=True)
+        self.assertEqual(payload.call_count, 2)
+        logfire_info.assert_any_call("Node Y", payload={"big": "payload"}, count=4)
+
+    def test_state_diff_and_summary(self):
+        """3. 노드 결과는 바뀐 필드만, 요약은 컬렉션 건수로 기록"""
+        state = sample_request_state()
+        result = node2_importance(state)
+
+        self.assertEqual(list(diff_fields(state, result)), ["taskFeatures"])
+        summary = summarize(state)
+        self.assertEqual(summary["flexTasks"], len(state.flexTasks))
+        self.assertNotIn("request", summary)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+import json
+import os
+import sys
+from unittest.mock import AsyncMock, patch
+
+# Ensure project root is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.core.sse import format_sse, format_ndjson
+from app.services.planner.nodes.node1_structure import _create_fallback_feature
+from app.services.planner.nodes.node3_chain_generator import _create_fallback_chain
+from app.services.planner.response_cache import PlannerResponseCache
+from app.services.report.chat_service import ChatService
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "test_request.json")
+
+
+def _load_request() -> dict:
+    with open(DATA_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+async def fake_node1(state):
+    """LLM 대신 Fallback Feature 사용"""
+    return state.model_copy(update={
+        "taskFeatures": {t.taskId: _create_fallback_feature(t) for t in state.flexTasks}
+    })
+
+
+async def fake_node3(state):
+    """LLM 대신 Fallback Chain 사용"""
+    return state.model_copy(update={"chainCandidates": [_create_fallback_chain(state)]})
+
+
+def _parse_sse(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestStreamFormat(unittest.TestCase):
+    """
+    공용 스트리밍 이벤트 포맷 검증
+    """
+
+    def test_chat_service_uses_shared_sse_format(self):
+        """1. ChatService SSE 포맷이 기존과 동일, NDJSON은 한 줄에 이벤트 하나"""
+        data = {"messageId": 1, "text": "안녕"}
+        expected = 'event: chunk\ndata: {"messageId": 1, "text": "안녕"}\n\n'
+        self.assertEqual(format_sse("chunk", data), expected)
+        self.assertEqual(ChatService.__new__(ChatService)._format_sse("chunk", data), expected)
+        self.assertEqual(json.loads(format_ndjson("chunk", data)), {"event": "chunk", "data": data})
+
+
+class TestPlannerStreamEndpoint(unittest.TestCase):
+    """
+    POST /ai/v1/planners/stream 단계별 이벤트 검증
+    """
+
+    def setUp(self):
+        self.patches = [
+            patch("app.services.planner.pipeline.node1_structure_analysis", side_effect=fake_node1),
+            patch("app.services.planner.pipeline.node3_chain_generator", side_effect=fake_node3),
+            patch("app.api.v1.endpoints.planners.get_planner_response_cache",
+                  return_value=PlannerResponseCache(max_entries=0, ttl_seconds=0)),
+            patch("app.db.repositories.planner_repository.PlannerRepository.save_ai_draft", AsyncMock()),
+        ]
+        for p in self.patches:
+            p.start()
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+
+    def test_sse_events_arrive_in_stage_order(self):
+        """1. sessions -> features -> chain -> result 순서, result는 일반 엔드포인트와 동일한 배정"""
+        request = _load_request()
+        response = self.client.post("/ai/v1/planners/stream", json=request)
+        self.assertTrue(response.headers["content-type"].startswith("text/event-stream"))
+
+        events = _parse_sse(response.text)
+        self.assertEqual([name for name, _ in events], ["sessions", "features", "chain", "result"])
+
+        sessions, features, chain, result = (data for _, data in events)
+        fixed_count = sum(1 for s in request["schedules"] if s["type"] == "FIXED")
+        self.assertEqual(len(sessions["fixedTasks"]), fixed_count)
+        self.assertTrue(sessions["freeSessions"])
+        self.assertTrue(features["tasks"])
+        self.assertTrue(chain["chainId"])
+        self.assertTrue(result["success"])
+
+        plain = self.client.post("/ai/v1/planners", json=request).json()
+        strip = lambda results: [(r["taskId"], r["assignmentStatus"], r["startAt"]) for r in results]
+        self.assertEqual(strip(result["results"]), strip(plain["results"]))
+
+    def test_ndjson_format_and_error_event(self):
+        """2. format=ndjson 지원, 파이프라인 예외는 error 이벤트로 전달"""
+        response = self.client.post("/ai/v1/planners/stream?format=ndjson", json=_load_request())
+        self.assertTrue(response.headers["content-type"].startswith("application/x-ndjson"))
+        lines = [json.loads(line) for line in response.text.strip().split("\n")]
+        self.assertEqual(lines[-1]["event"], "result")
+
+        with patch("app.services.planner.pipeline.node3_chain_generator", side_effect=RuntimeError("boom")):
+            events = _parse_sse(self.client.post("/ai/v1/planners/stream", json=_load_request()).text)
+        self.assertEqual([name for name, _ in events], ["sessions", "features", "error"])
+        self.assertFalse(events[-1][1]["success"])
+        self.assertEqual(events[-1][1]["message"], "boom")
+
+
+if __name__ == '__main__':
+    unittest.main()
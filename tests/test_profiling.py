@@ -0,0 +1,104 @@
+import unittest
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+# Ensure project root is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.core.config import settings
+from app.core.profiling import SamplingProfiler, should_profile
+from benchmarks.profile_pipeline import load_request, profile_pipeline
+
+
+def busy_loop(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(100))
+
+
+class TestSamplingProfiler(unittest.TestCase):
+    """
+    샘플링 프로파일러 / 프로파일링 대상 선택 검증
+    """
+
+    def test_samples_hot_function(self):
+        """1. 실행 중인 함수가 상위 함수 / Collapsed Stack에 포함"""
+        with SamplingProfiler(interval=0.001) as profiler:
+            busy_loop(0.2)
+
+        self.assertGreater(profiler.sample_count, 0)
+        top = {row["function"]: row for row in profiler.top_functions()}
+        self.assertIn(f"{__name__}:busy_loop", top)
+        self.assertGreater(top[f"{__name__}:busy_loop"]["total"], 0)
+        self.assertRegex(profiler.folded(limit=1), rf"{__name__}:busy_loop[^ ]* \d+$")
+
+    def test_should_profile(self):
+        """2. 관리자 토큰 일치 또는 샘플링 비율에 걸린 요청만 선택"""
+        with patch.object(settings, "profiling_admin_token", "secret"), \
+             patch.object(settings, "profiling_sample_rate", 0.0):
+            self.assertTrue(should_profile("secret"))
+            self.assertFalse(should_profile("wrong"))
+            self.assertFalse(should_profile(None))
+        with patch.object(settings, "profiling_admin_token", None), \
+             patch.object(settings, "profiling_sample_rate", 1.0):
+            self.assertTrue(should_profile(None))
+
+
+class TestProfilingMiddleware(unittest.TestCase):
+    """
+    On-demand 프로파일링 미들웨어 검증
+    """
+
+    def test_admin_header_attaches_profile(self):
+        """1. X-Profile-Token 헤더가 있는 요청만 프로파일 결과를 logfire에 첨부"""
+        client = TestClient(app)
+        with patch.object(settings, "profiling_admin_token", "secret"), \
+             patch("app.core.profiling.logfire.info") as logfire_info:
+            client.get("/health")
+            logfire_info.assert_not_called()
+
+            client.get("/health", headers={"X-Profile-Token": "secret"})
+            logfire_info.assert_called_once()
+            self.assertEqual(logfire_info.call_args.args[0], "Request Profile")
+            self.assertEqual(logfire_info.call_args.kwargs["path"], "/health")
+            self.assertIn("top_functions", logfire_info.call_args.kwargs)
+
+    def test_artifact_is_written_off_event_loop(self):
+        """2. PROFILING_OUTPUT_DIR 설정 시 Collapsed Stack 파일을 이벤트 루프 밖(to_thread)에서 저장"""
+        client = TestClient(app)
+        with tempfile.TemporaryDirectory() as output_dir, \
+             patch.object(settings, "profiling_admin_token", "secret"), \
+             patch.object(settings, "profiling_output_dir", output_dir), \
+             patch("app.core.profiling.asyncio.to_thread", wraps=asyncio.to_thread) as to_thread, \
+             patch("app.core.profiling.logfire.info") as logfire_info:
+            client.get("/health", headers={"X-Profile-Token": "secret"})
+
+            to_thread.assert_called_once()
+            artifact = logfire_info.call_args.kwargs["artifact"]
+            self.assertTrue(artifact.startswith(output_dir))
+            self.assertTrue(os.path.exists(artifact))
+
+
+class TestProfileBenchmark(unittest.TestCase):
+    """
+    Fake LLM 파이프라인 프로파일링 벤치마크 검증
+    """
+
+    def test_profile_pipeline_with_fake_llm(self):
+        """1. Fake LLM으로 전체 파이프라인이 실행되고 파이프라인 함수가 샘플링됨"""
+        profiler, elapsed = profile_pipeline(load_request(60), iterations=3, interval=0.001)
+
+        self.assertGreater(elapsed, 0)
+        self.assertGreater(profiler.sample_count, 0)
+        self.assertIn("app.services.planner", profiler.folded())
+
+
+if __name__ == '__main__':
+    unittest.main()
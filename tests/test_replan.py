@@ -0,0 +1,168 @@
+import unittest
+import os
+import re
+import sys
+from unittest.mock import patch
+
+# Ensure project root is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.planner.request import ArrangementState
+from app.services.planner.pipeline import run_planner_pipeline, combine_results
+from app.services.planner.replan import replan_pipeline
+from app.services.planner.state_store import PlannerStateStore
+from app.services.planner.utils.time_utils import hhmm_to_minutes
+
+BASE_REQUEST = {
+    "user": {"userId": 7, "focusTimeZone": "MORNING", "dayEndTime": "22:00"},
+    "startArrange": "09:00",
+    "schedules": [
+        {"taskId": 101, "dayPlanId": 1, "title": "Lunch", "type": "FIXED", "startAt": "12:00", "endAt": "13:00"},
+        {"taskId": 102, "dayPlanId": 1, "title": "Dinner", "type": "FIXED", "startAt": "18:00", "endAt": "19:00"},
+        {"taskId": 301, "dayPlanId": 1, "title": "Report", "type": "FLEX", "estimatedTimeRange": "HOUR_1_TO_2", "focusLevel": 8},
+        {"taskId": 302, "dayPlanId": 1, "title": "Email", "type": "FLEX", "estimatedTimeRange": "MINUTE_UNDER_30", "focusLevel": 3},
+        {"taskId": 303, "dayPlanId": 1, "title": "Run", "type": "FLEX", "estimatedTimeRange": "MINUTE_30_TO_60", "focusLevel": 5},
+        {"taskId": 304, "dayPlanId": 1, "title": "Reading", "type": "FLEX", "estimatedTimeRange": "MINUTE_30_TO_60", "focusLevel": 6},
+        {"taskId": 305, "dayPlanId": 1, "title": "Laundry", "type": "FLEX", "estimatedTimeRange": "MINUTE_UNDER_30", "focusLevel": 2},
+    ]
+}
+
+CHAIN = {
+    "MORNING": [301, 302],
+    "AFTERNOON": [303, 304],
+    "EVENING": [305],
+    "NIGHT": []
+}
+
+
+class RecordingGeminiClient:
+    """Node 1 / Node 3 호출을 기록하는 Mock LLM"""
+
+    def __init__(self):
+        self.node1_calls: list[list[int]] = []
+        self.node3_calls = 0
+
+    async def generate(self, system: str, user: str) -> dict:
+        if "NODE 3" in system or "chain" in system:
+            self.node3_calls += 1
+            return {"candidates": [{"chainId": "c1", "timeZoneQueues": CHAIN, "rationaleTags": ["mock"]}]}
+        task_ids = [int(t) for t in re.findall(r"TaskID: (\d+)", user)]
+        self.node1_calls.append(task_ids)
+        return {"tasks": [{"taskId": t, "category": "업무", "cognitiveLoad": "MED"} for t in task_ids]}
+
+
+def _request(schedules_patch=None, drop=(), add=()):
+    schedules = [dict(s) for s in BASE_REQUEST["schedules"] if s["taskId"] not in drop]
+    for s in schedules:
+        s.update((schedules_patch or {}).get(s["taskId"], {}))
+    schedules += list(add)
+    return ArrangementState.model_validate({**BASE_REQUEST, "schedules": schedules})
+
+
+def _assigned(state):
+    return {r.taskId: r for r in state.finalResults if r.assignmentStatus == "ASSIGNED"}
+
+
+class TestReplan(unittest.IsolatedAsyncioTestCase):
+    """
+    증분 재배치(Incremental Re-plan) 검증
+    """
+
+    async def asyncSetUp(self):
+        self.client = RecordingGeminiClient()
+        self.patchers = [
+            patch("app.services.planner.nodes.node1_structure.get_gemini_client", return_value=self.client),
+            patch("app.services.planner.nodes.node3_chain_generator.get_gemini_client", return_value=self.client),
+        ]
+        for p in self.patchers:
+            p.start()
+        self.prior = await run_planner_pipeline(_request())
+        self.client.node1_calls.clear()
+        self.client.node3_calls = 0
+
+    async def asyncTearDown(self):
+        for p in self.patchers:
+            p.stop()
+
+    async def test_moving_fixed_block_keeps_other_sessions(self):
+        """1. FIXED 이동: LLM 호출 없이 바뀐 세션만 다시 배정"""
+        state = await replan_pipeline(self.prior, _request({102: {"startAt": "19:00", "endAt": "20:00"}}))
+
+        self.assertEqual(self.client.node1_calls, [])
+        self.assertEqual(self.client.node3_calls, 0)
+        self.assertEqual(state.replan_loops, 1)
+
+        # 오전/오후 세션 배정은 그대로
+        prior_assigned, new_assigned = _assigned(self.prior), _assigned(state)
+        for tid in (301, 302, 303, 304):
+            self.assertEqual(new_assigned[tid].model_dump(), prior_assigned[tid].model_dump())
+
+        # 저녁 작업은 새 FIXED와 겹치지 않음
+        laundry = new_assigned[305]
+        start, end = hhmm_to_minutes(laundry.startAt), hhmm_to_minutes(laundry.endAt)
+        self.assertTrue(end <= 19 * 60 or start >= 20 * 60)
+
+    async def test_new_task_runs_node1_only_on_new_task(self):
+        """2. 작업 추가: Node 1은 신규 작업만, Node 3는 호출하지 않음"""
+        new_task = {"taskId": 306, "dayPlanId": 1, "title": "Stretch", "type": "FLEX",
+                    "estimatedTimeRange": "MINUTE_UNDER_30", "focusLevel": 4}
+        state = await replan_pipeline(self.prior, _request(add=[new_task]))
+
+        self.assertEqual(self.client.node1_calls, [[306]])
+        self.assertEqual(self.client.node3_calls, 0)
+        self.assertIn(306, state.taskFeatures)
+        self.assertIn(306, {r.taskId for r in state.finalResults})
+        self.assertIn("replan", state.chainCandidates[0].rationaleTags)
+
+        # 결과에 FLEX 작업이 빠짐없이 한 번씩 포함
+        flex_ids = sorted(r.taskId for r in combine_results(state) if r.type == "FLEX")
+        self.assertEqual(flex_ids, [301, 302, 303, 304, 305, 306])
+
+    async def test_removed_task_frees_its_slot(self):
+        """3. 작업 삭제: 결과에서 제거되고 나머지 작업은 모두 배정 유지"""
+        state = await replan_pipeline(self.prior, _request(drop=(303,)))
+
+        self.assertEqual(self.client.node1_calls, [])
+        self.assertNotIn(303, {r.taskId for r in state.finalResults})
+        self.assertTrue({301, 302, 304, 305} <= set(_assigned(state)))
+
+    async def test_large_change_falls_back_to_full_pipeline(self):
+        """4. 대부분이 새 작업이면 전체 파이프라인 실행"""
+        added = [
+            {"taskId": 400 + i, "dayPlanId": 1, "title": f"New {i}", "type": "FLEX",
+             "estimatedTimeRange": "MINUTE_UNDER_30"}
+            for i in range(10)
+        ]
+        state = await replan_pipeline(self.prior, _request(add=added))
+
+        self.assertEqual(self.client.node3_calls, 1)
+        self.assertEqual(state.replan_loops, 0)
+
+
+class TestPlannerStateStore(unittest.TestCase):
+    """
+    재배치용 state 보관소 검증
+    """
+
+    def test_lookup_by_trace_id_and_day_plan_id(self):
+        """1. traceId / (userId, dayPlanId) 조회 및 다른 사용자 차단"""
+        from app.models.planner.internal import PlannerGraphState
+        from app.models.planner.weights import WeightParams
+
+        store = PlannerStateStore(max_entries=2)
+        states = [
+            PlannerGraphState(request=_request(), weights=WeightParams(), replan_loops=i)
+            for i in range(3)
+        ]
+        for i, state in enumerate(states):
+            store.save(f"trace-{i}", state)
+
+        self.assertEqual(len(store), 2)
+        self.assertIsNone(store.get(trace_id="trace-0"))  # LRU로 밀려남
+        self.assertIs(store.get(trace_id="trace-1"), states[1])
+        self.assertIs(store.get(user_id=7, day_plan_id=1), states[2])
+        self.assertIsNone(store.get(trace_id="trace-1", user_id=8))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+import unittest
+import os
+import sys
+from unittest.mock import AsyncMock, patch
+
+# Ensure project root is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.planner.request import ArrangementState
+from app.models.planner.response import PlannerResponse
+from app.services.planner.pipeline import build_initial_state
+from app.services.planner.response_cache import PlannerResponseCache
+from app.services.planner.utils.fingerprint import request_fingerprint
+
+REQUEST = {
+    "user": {"userId": 11, "focusTimeZone": "MORNING", "dayEndTime": "22:00"},
+    "startArrange": "09:00",
+    "schedules": [
+        {"taskId": 1, "dayPlanId": 5, "title": "Meeting", "type": "FIXED", "startAt": "10:00", "endAt": "11:00"},
+        {"taskId": 2, "dayPlanId": 5, "title": "Study", "type": "FLEX", "estimatedTimeRange": "HOUR_1_TO_2"},
+    ]
+}
+
+
+def _request(**changes) -> ArrangementState:
+    return ArrangementState.model_validate({**REQUEST, **changes})
+
+
+def _response(trace_id="t1") -> PlannerResponse:
+    return PlannerResponse(success=True, processTime=1.5, results=[], traceId=trace_id)
+
+
+class InMemoryCacheRepository:
+    """Postgres 2차 캐시 대체용 (planner_response_cache 테이블 동작 흉내)"""
+
+    def __init__(self):
+        self.rows = {}
+
+    async def get(self, cache_key):
+        return self.rows.get(cache_key, (None, None))[1]
+
+    async def put(self, cache_key, user_id, day_plan_id, response, ttl_seconds):
+        self.rows[cache_key] = ((user_id, day_plan_id), response)
+
+    async def delete_for_user(self, user_id, day_plan_id=None):
+        for key, (owner, _) in list(self.rows.items()):
+            if owner[0] == user_id and (day_plan_id is None or owner[1] == day_plan_id):
+                del self.rows[key]
+
+
+class TestRequestFingerprint(unittest.TestCase):
+    """
+    요청 정규화 해시 검증
+    """
+
+    def test_schedule_order_does_not_matter(self):
+        """1. 일정 순서가 달라도 같은 키, 내용이 다르면 다른 키"""
+        reordered = _request(schedules=list(reversed(REQUEST["schedules"])))
+        self.assertEqual(request_fingerprint(_request()), request_fingerprint(reordered))
+        self.assertNotEqual(request_fingerprint(_request()), request_fingerprint(_request(startArrange="09:10")))
+        self.assertNotEqual(
+            request_fingerprint(_request()), request_fingerprint(_request(), weights_version=2)
+        )
+
+
+class TestPlannerResponseCache(unittest.IsolatedAsyncioTestCase):
+    """
+    플래너 응답 캐시 검증
+    """
+
+    async def test_hit_is_flagged_as_cached(self):
+        """1. 저장 후 동일 요청은 cached=True로 반환"""
+        cache = PlannerResponseCache(max_entries=10, ttl_seconds=60)
+        self.assertIsNone(await cache.get(_request()))
+
+        cache.put(_request(), _response())
+        hit = await cache.get(_request())
+        self.assertTrue(hit.cached)
+        self.assertEqual(hit.traceId, "t1")
+
+    async def test_schedule_change_invalidates_user_entries(self):
+        """2. 같은 dayPlan에 다른 일정이 들어오면 이전 캐시 폐기"""
+        cache = PlannerResponseCache(max_entries=10, ttl_seconds=60)
+        cache.put(_request(), _response())
+
+        changed = dict(REQUEST["schedules"][1], title="Study hard")
+        self.assertIsNone(await cache.get(_request(schedules=[REQUEST["schedules"][0], changed])))
+        # 원래 일정으로 되돌아와도 재사용하지 않음
+        self.assertIsNone(await cache.get(_request()))
+
+    async def test_expired_entry_is_not_served(self):
+        """3. TTL이 지난 항목은 Miss"""
+        cache = PlannerResponseCache(max_entries=10, ttl_seconds=60)
+        cache.put(_request(), _response())
+        with patch("app.services.planner.response_cache.time.monotonic", return_value=1e12):
+            self.assertIsNone(await cache.get(_request()))
+
+    async def test_persistent_tier_is_shared(self):
+        """4. 2차 저장소에 있으면 다른 인스턴스(프로세스)에서도 Hit"""
+        repository = InMemoryCacheRepository()
+        writer = PlannerResponseCache(max_entries=10, ttl_seconds=60, repository=repository)
+        writer.put(_request(), _response())
+        await writer.persist(_request(), _response())
+
+        reader = PlannerResponseCache(max_entries=10, ttl_seconds=60, repository=repository)
+        hit = await reader.get(_request())
+        self.assertTrue(hit.cached)
+
+        await reader.invalidate_user(11)
+        self.assertEqual(repository.rows, {})
+
+    async def test_eviction_drops_schedule_fingerprint(self):
+        """5. dayPlan의 마지막 항목이 LRU / TTL로 밀려나면 일정 해시도 제거 (무한 증가 방지)"""
+        cache = PlannerResponseCache(max_entries=2, ttl_seconds=60)
+        for day_plan_id in range(1, 6):
+            schedules = [dict(s, dayPlanId=day_plan_id) for s in REQUEST["schedules"]]
+            cache.put(_request(schedules=schedules), _response())
+        self.assertEqual(set(cache._schedules_fp), {(11, 4), (11, 5)})
+
+        with patch("app.services.planner.response_cache.time.monotonic", return_value=1e12):
+            schedules = [dict(s, dayPlanId=5) for s in REQUEST["schedules"]]
+            self.assertIsNone(await cache.get(_request(schedules=schedules)))
+        self.assertEqual(set(cache._schedules_fp), {(11, 4)})
+
+        # 항목 없이 조회만 된 dayPlan도 max_entries개까지만 보관
+        for day_plan_id in range(10, 20):
+            schedules = [dict(s, dayPlanId=day_plan_id) for s in REQUEST["schedules"]]
+            await cache.get(_request(schedules=schedules))
+        self.assertLessEqual(len(cache._schedules_fp), 2)
+
+
+class TestPlannerEndpointCache(unittest.TestCase):
+    """
+    generate_planner 엔드포인트의 캐시 적용 검증
+    """
+
+    def test_identical_request_runs_pipeline_once(self):
+        request = _request()
+        pipeline = AsyncMock(return_value=build_initial_state(request))
+        cache = PlannerResponseCache(max_entries=10, ttl_seconds=60)
+
+        with patch("app.api.v1.endpoints.planners.run_planner_pipeline", pipeline), \
+             patch("app.api.v1.endpoints.planners.get_planner_response_cache", return_value=cache), \
+             patch("app.db.repositories.planner_repository.PlannerRepository.save_ai_draft", AsyncMock()):
+            client = TestClient(app)
+            first = client.post("/ai/v1/planners", json=REQUEST).json()
+            second = client.post("/ai/v1/planners", json=REQUEST).json()
+
+        self.assertEqual(pipeline.await_count, 1)
+        self.assertFalse(first["cached"])
+        self.assertTrue(second["cached"])
+        self.assertEqual(first["traceId"], second["traceId"])
+        self.assertEqual(first["results"], second["results"])
+
+
+if __name__ == '__main__':
+    unittest.main()
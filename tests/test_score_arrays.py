@@ -0,0 +1,114 @@
+import unittest
+import sys
+import os
+import random
+
+import numpy as np
+
+# Ensure project root is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.planner.internal import PlannerGraphState, TaskFeature, ChainCandidate
+from app.models.planner.request import ArrangementState
+from app.models.planner.weights import WeightParams
+from app.services.planner.nodes.node2_importance import node2_importance
+from app.services.planner.nodes.node4_chain_judgement import calculate_chain_score, node4_chain_judgement
+from app.services.planner.utils.score_arrays import (
+    build_feature_arrays, build_membership_matrix, score_candidates, TIME_ZONE_ORDER
+)
+from app.services.planner.utils.session_utils import calculate_capacity
+from benchmarks.synthetic import build_synthetic_state
+
+
+class TestScoreArrays(unittest.TestCase):
+    """
+    배열(NumPy) 기반 Node 2 / Node 4 점수 계산이 기존 스칼라 수식과 일치하는지 검증
+    """
+
+    def test_node2_columns_match_formula(self):
+        """1. Node 2 중요도/피로도/소요시간이 기존 수식과 동일"""
+        request = ArrangementState(
+            user={"userId": 1, "focusTimeZone": "MORNING", "dayEndTime": "22:00"},
+            startArrange="09:00",
+            schedules=[
+                {"taskId": 1, "dayPlanId": 1, "title": "A", "type": "FLEX", "focusLevel": 7, "isUrgent": True, "estimatedTimeRange": "HOUR_1_TO_2"},
+                {"taskId": 2, "dayPlanId": 1, "title": "B", "type": "FLEX", "estimatedTimeRange": "MINUTE_UNDER_30"},
+                {"taskId": 3, "dayPlanId": 1, "title": "C", "type": "FLEX", "focusLevel": 3},
+            ]
+        )
+        features = {
+            1: TaskFeature(taskId=1, dayPlanId=1, title="A", type="FLEX", category="학업", cognitiveLoad="HIGH"),
+            2: TaskFeature(taskId=2, dayPlanId=1, title="B", type="FLEX", category="ERROR", cognitiveLoad="LOW"),
+            3: TaskFeature(taskId=3, dayPlanId=1, title="C", type="FLEX", category="운동"),
+            99: TaskFeature(taskId=99, dayPlanId=1, title="Ghost", type="FLEX", category="기타"),
+        }
+        w = WeightParams()
+        state = PlannerGraphState(request=request, weights=w, flexTasks=request.schedules, taskFeatures=features)
+
+        result = node2_importance(state).taskFeatures
+
+        self.assertNotIn(99, result)  # 원본 Task가 없는 feature는 제외
+        self.assertEqual(result[1].importanceScore, (7 * w.w_focus) + w.w_urgent + w.w_category["학업"])
+        self.assertEqual(result[1].fatigueCost, (120 * w.alpha_duration) + (2 * w.beta_load))
+        self.assertEqual(result[1].durationAvgMin, 90)
+        self.assertEqual(result[2].importanceScore, -1.0)
+        self.assertEqual(result[2].durationPlanMin, 30)
+        self.assertEqual(result[3].importanceScore, (3 * w.w_focus) + 0.0 + w.w_category["운동"])
+        self.assertEqual(result[3].fatigueCost, (60 * w.alpha_duration) + (1 * w.beta_load))
+        self.assertIsInstance(result[3].durationPlanMin, int)
+
+    def test_vector_scores_match_scalar(self):
+        """2. 모든 후보의 행렬 기반 점수가 calculate_chain_score와 일치"""
+        state = build_synthetic_state(300, num_sessions=40, num_candidates=12, seed=3)
+        rng = random.Random(7)
+        candidates = list(state.chainCandidates)
+        # 일부 작업 제외 / 중복 포함 후보 추가
+        partial = {tz: [t for t in q if rng.random() < 0.5] for tz, q in candidates[0].timeZoneQueues.items()}
+        partial["MORNING"] += partial["MORNING"][:3]
+        candidates.append(ChainCandidate(chainId="partial", timeZoneQueues=partial))
+
+        capacity = calculate_capacity(state.freeSessions)
+        arrays = build_feature_arrays(state.taskFeatures)
+        scores, details = score_candidates(
+            build_membership_matrix(candidates, arrays), arrays, capacity, state.weights, "AFTERNOON"
+        )
+
+        for i, chain in enumerate(candidates):
+            expected, expected_details = calculate_chain_score(
+                chain, state.taskFeatures, capacity, state.weights, "AFTERNOON"
+            )
+            self.assertTrue(np.isclose(scores[i], expected, rtol=1e-9), chain.chainId)
+            for name, value in expected_details.items():
+                self.assertTrue(np.isclose(details[name][i], value, rtol=1e-9), name)
+
+    def test_membership_matrix_shape_and_unknown_task(self):
+        """3. 멤버십 행렬 차원 및 존재하지 않는 taskId / 시간대 처리"""
+        state = build_synthetic_state(20, num_candidates=3)
+        arrays = build_feature_arrays(state.taskFeatures)
+        membership = build_membership_matrix(state.chainCandidates, arrays)
+        self.assertEqual(membership.shape, (3, len(TIME_ZONE_ORDER), len(state.taskFeatures)))
+
+        with self.assertRaises(KeyError):
+            build_membership_matrix([ChainCandidate(chainId="x", timeZoneQueues={"MORNING": [-1]})], arrays)
+
+        # 검증을 거치지 않은 알 수 없는 시간대는 건너뛰지 않고 에러
+        unknown = ChainCandidate.model_construct(chainId="y", timeZoneQueues={"DAWN": [next(iter(state.taskFeatures))]})
+        with self.assertRaises(ValueError):
+            build_membership_matrix([unknown], arrays)
+
+    def test_node4_selects_best_candidate(self):
+        """4. Node 4가 스칼라 점수 기준 최고 후보를 선택"""
+        state = build_synthetic_state(80, num_sessions=20, num_candidates=6, seed=11)
+        capacity = calculate_capacity(state.freeSessions)
+        result = node4_chain_judgement(state)
+
+        scalar_scores = [
+            calculate_chain_score(c, result.taskFeatures, capacity, state.weights, "AFTERNOON")[0]
+            for c in result.chainCandidates
+        ]
+        best = result.chainCandidates[int(np.argmax(scalar_scores))]
+        self.assertEqual(result.selectedChainId, best.chainId)
+
+
+if __name__ == '__main__':
+    unittest.main()
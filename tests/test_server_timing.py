@@ -0,0 +1,114 @@
+import unittest
+import os
+import re
+import sys
+from unittest.mock import AsyncMock, patch
+
+# Ensure project root is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.core.config import settings
+from app.core.metrics import MetricsRegistry
+from app.core.timing import STAGE_DURATION_SECONDS, record_llm_tokens
+from app.services.planner.response_cache import PlannerResponseCache
+
+REQUEST = {
+    "user": {"userId": 31, "focusTimeZone": "MORNING", "dayEndTime": "22:00"},
+    "startArrange": "09:00",
+    "schedules": [
+        {"taskId": 1, "dayPlanId": 8, "title": "Lunch", "type": "FIXED", "startAt": "12:00", "endAt": "13:00"},
+        {"taskId": 2, "dayPlanId": 8, "title": "Report", "type": "FLEX", "estimatedTimeRange": "HOUR_1_TO_2"},
+        {"taskId": 3, "dayPlanId": 8, "title": "Email", "type": "FLEX", "estimatedTimeRange": "MINUTE_UNDER_30"},
+    ]
+}
+
+
+class FlakyGeminiClient:
+    """Node 1 첫 시도는 실패하고, 호출마다 토큰 사용량을 기록하는 Mock LLM"""
+
+    def __init__(self):
+        self.node1_calls = 0
+
+    async def generate(self, system: str, user: str) -> dict:
+        record_llm_tokens(100, 20)
+        short_ids = [int(s) for s in re.findall(r"^(\d+),", user, re.M)]
+        if "tasks(id,title,cat" in user:
+            return {"candidates": [{"chainId": "C1", "timeZoneQueues": {"MORNING": short_ids}}]}
+        self.node1_calls += 1
+        if self.node1_calls == 1:
+            raise ValueError("Invalid JSON format: missing 'tasks' key")
+        return {"tasks": [{"taskId": s, "category": "업무", "cognitiveLoad": "MED"} for s in short_ids]}
+
+
+class TestHistogram(unittest.TestCase):
+    """
+    히스토그램 메트릭 검증
+    """
+
+    def test_cumulative_buckets(self):
+        """1. 누적 버킷 / 합계 / 관측 횟수"""
+        histogram = MetricsRegistry().histogram("h", "test", ("stage",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 5.0):
+            histogram.observe(value, stage="a")
+
+        (labels, buckets, total, count), = histogram.histogram_samples()
+        self.assertEqual(labels, ("a",))
+        self.assertEqual(buckets, [(0.1, 1), (1.0, 2)])
+        self.assertAlmostEqual(total, 5.55)
+        self.assertEqual(count, 3)
+
+
+class TestServerTiming(unittest.TestCase):
+    """
+    Server-Timing 헤더와 diagnostics 블록 검증
+    """
+
+    def setUp(self):
+        self.client_llm = FlakyGeminiClient()
+        self.patches = [
+            patch("app.services.planner.nodes.node1_structure.get_gemini_client", return_value=self.client_llm),
+            patch("app.services.planner.nodes.node3_chain_generator.get_gemini_client", return_value=self.client_llm),
+            patch("app.services.planner.nodes.node1_structure.asyncio.sleep", AsyncMock()),
+            patch("app.api.v1.endpoints.planners.get_planner_response_cache",
+                  return_value=PlannerResponseCache(max_entries=0, ttl_seconds=0)),
+            patch("app.db.repositories.planner_repository.PlannerRepository.save_ai_draft", AsyncMock()),
+            # Mock LLM은 Compact 프롬프트(표 + 짧은 ID) 형식으로 응답
+            patch.object(settings, "planner_compact_prompts", True),
+        ]
+        for p in self.patches:
+            p.start()
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+
+    def test_header_and_diagnostics_per_node(self):
+        """1. 노드별 구간 헤더, LLM 시도/재시도 대기/토큰 diagnostics, 히스토그램 기록"""
+        node1_observed = STAGE_DURATION_SECONDS.value(stage="node1")
+        response = self.client.post("/ai/v1/planners?diagnostics=true", json=REQUEST)
+
+        header = response.headers["server-timing"]
+        for stage in ("node1", "node2", "node3", "node4", "node5", "response", "total"):
+            self.assertRegex(header, rf"{stage};dur=\d+\.\d")
+
+        stages = response.json()["diagnostics"]["stages"]
+        self.assertEqual(stages["node1"]["llmAttempts"], 2)
+        self.assertEqual(stages["node1"]["retrySleepMs"], 1000.0)
+        self.assertEqual(stages["node1"]["inputTokens"], 200)
+        self.assertEqual(stages["node3"]["llmAttempts"], 1)
+        self.assertEqual(stages["node3"]["outputTokens"], 20)
+        self.assertEqual(STAGE_DURATION_SECONDS.value(stage="node1"), node1_observed + 1)
+
+    def test_diagnostics_is_opt_in(self):
+        """2. diagnostics 미요청 시 응답 본문에는 포함하지 않고 헤더만 추가"""
+        response = self.client.post("/ai/v1/planners", json=REQUEST)
+        self.assertIsNone(response.json()["diagnostics"])
+        self.assertIn("node1;dur=", response.headers["server-timing"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,184 @@
+import unittest
+import asyncio
+import os
+import sys
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Ensure project root is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from app.main import app
+from app.core.config import settings
+from app.core.single_flight import SingleFlight
+from app.models.planner.request import ArrangementState
+from app.models.report import WeeklyReportGenerateRequest
+from app.services.planner.pipeline import build_initial_state
+from app.services.planner.response_cache import PlannerResponseCache
+from app.services.report.weekly_report_service import generate_batch_reports
+
+PLANNER_REQUEST = {
+    "user": {"userId": 21, "focusTimeZone": "MORNING", "dayEndTime": "22:00"},
+    "startArrange": "09:00",
+    "schedules": [
+        {"taskId": 1, "dayPlanId": 3, "title": "Study", "type": "FLEX", "estimatedTimeRange": "HOUR_1_TO_2"},
+    ]
+}
+
+
+class TestSingleFlight(unittest.IsolatedAsyncioTestCase):
+    """
+    동일 키 동시 요청 병합 검증
+    """
+
+    async def test_concurrent_calls_share_one_execution(self):
+        """1. 동시 호출 5회 -> 실행 1회, 모두 같은 결과"""
+        flight = SingleFlight("test")
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return object()
+
+        results = await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+        self.assertEqual(calls, 1)
+        self.assertTrue(all(r is results[0] for r in results))
+        self.assertEqual((flight.executions, flight.coalesced), (1, 4))
+
+        # 완료 후에는 다시 실행
+        await flight.do("k", work)
+        self.assertEqual(calls, 2)
+        self.assertEqual(len(flight), 0)
+
+    async def test_error_is_shared_and_cancelled_waiter_does_not_cancel_work(self):
+        """2. 예외는 모든 대기자에게 전달, 한 대기자 취소가 공유 작업을 취소하지 않음"""
+        flight = SingleFlight("test")
+
+        async def failing():
+            await asyncio.sleep(0.02)
+            raise ValueError("boom")
+
+        outcomes = await asyncio.gather(flight.do("e", failing), flight.do("e", failing), return_exceptions=True)
+        self.assertTrue(all(isinstance(o, ValueError) for o in outcomes))
+
+        async def slow():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        leader = asyncio.create_task(flight.do("c", slow))
+        follower = asyncio.create_task(flight.do("c", slow))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        self.assertEqual(await follower, "done")
+
+
+class TestCoalescedEndpoints(unittest.IsolatedAsyncioTestCase):
+    """
+    플래너 / 주간 레포트 동시 중복 요청 병합 검증
+    """
+
+    async def test_identical_planner_requests_run_pipeline_once(self):
+        """1. 동일 플래너 요청 2건이 동시에 들어오면 파이프라인 1회 실행"""
+        state = build_initial_state(ArrangementState.model_validate(PLANNER_REQUEST))
+
+        async def slow_pipeline(_request):
+            await asyncio.sleep(0.05)
+            return state
+
+        pipeline = AsyncMock(side_effect=slow_pipeline)
+        with patch("app.api.v1.endpoints.planners.run_planner_pipeline", pipeline), \
+             patch("app.api.v1.endpoints.planners.get_planner_response_cache",
+                   return_value=PlannerResponseCache(max_entries=0, ttl_seconds=0)), \
+             patch("app.db.repositories.planner_repository.PlannerRepository.save_ai_draft", AsyncMock()):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                first, second = await asyncio.gather(
+                    client.post("/ai/v1/planners", json=PLANNER_REQUEST),
+                    client.post("/ai/v1/planners", json=PLANNER_REQUEST),
+                )
+
+        self.assertEqual(pipeline.await_count, 1)
+        self.assertEqual(first.json()["traceId"], second.json()["traceId"])
+
+    async def test_side_effects_survive_first_caller_disconnect(self):
+        """2. 먼저 들어온 요청이 끊겨(499) 끝나도 공유 결과의 AI Draft 저장 / 캐시 영속화는 1회 실행"""
+        state = build_initial_state(ArrangementState.model_validate(PLANNER_REQUEST))
+
+        async def slow_pipeline(_request):
+            await asyncio.sleep(0.4)
+            return state
+
+        cache = MagicMock()
+        cache.get = AsyncMock(return_value=None)
+        cache.persist = AsyncMock()
+        save_ai_draft = AsyncMock()
+
+        body = httpx.Request("POST", "http://test", json=PLANNER_REQUEST).content
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+        disconnected = asyncio.Event()
+
+        async def receive():
+            if messages:
+                return messages.pop(0)
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+            "scheme": "http", "path": "/ai/v1/planners", "raw_path": b"/ai/v1/planners", "query_string": b"",
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+            "client": ("test", 1), "server": ("test", 80), "root_path": "",
+        }
+        with patch("app.api.v1.endpoints.planners.run_planner_pipeline", side_effect=slow_pipeline), \
+             patch("app.api.v1.endpoints.planners.get_planner_response_cache", return_value=cache), \
+             patch("app.db.repositories.planner_repository.PlannerRepository.save_ai_draft", save_ai_draft), \
+             patch.object(settings, "planner_disconnect_grace_seconds", 0.0):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                # 첫 요청이 실행을 시작하고 두 번째 요청이 합류한 뒤 첫 요청의 연결이 끊김
+                first = asyncio.create_task(app(scope, receive, send))
+                await asyncio.sleep(0.05)
+                pending = asyncio.create_task(client.post("/ai/v1/planners", json=PLANNER_REQUEST))
+                await asyncio.sleep(0.05)
+                disconnected.set()
+                await first
+                second = await pending
+            await asyncio.sleep(0.01)
+
+        self.assertEqual(sent[0]["status"], 499)
+        self.assertEqual(second.status_code, 200)
+        save_ai_draft.assert_awaited_once()
+        cache.persist.assert_awaited_once()
+
+    async def test_overlapping_report_batches_generate_each_report_once(self):
+        """3. 진행 중인 배치와 겹치는 재시도 배치는 같은 레포트를 다시 생성하지 않음"""
+        async def slow_report(user_id, report_id, base_date):
+            await asyncio.sleep(0.05)
+            return True
+
+        single = AsyncMock(side_effect=slow_report)
+        request = WeeklyReportGenerateRequest.model_validate({
+            "baseDate": "2026-01-12",
+            "users": [{"userId": 1, "reportId": 10}, {"userId": 2, "reportId": 20}]
+        })
+        with patch("app.services.report.weekly_report_service._generate_single_report", single):
+            await asyncio.gather(generate_batch_reports(request), generate_batch_reports(request))
+
+        self.assertEqual(single.await_count, 2)
+        self.assertEqual(
+            sorted(c.kwargs["user_id"] for c in single.await_args_list), [1, 2]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+import unittest
+import asyncio
+import json
+import os
+import sys
+from unittest.mock import patch
+
+# Ensure project root is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.planner.internal import ChainCandidate
+from app.models.planner.request import ArrangementState
+from app.services.planner.nodes.node1_structure import _create_fallback_feature
+from app.services.planner.nodes.node2_importance import node2_importance
+from app.services.planner.pipeline import build_initial_state, run_planner_pipeline
+from app.services.planner.speculative import SPECULATIVE_NODE3_TOTAL, ranking_divergence
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "test_request.json")
+
+
+def _initial_state():
+    with open(DATA_PATH, "r", encoding="utf-8") as f:
+        return build_initial_state(ArrangementState.model_validate(json.load(f)))
+
+
+def _features(state, **category_by_task):
+    """Fallback Feature에 카테고리만 바꾼 Node 1 결과 흉내"""
+    features = {}
+    for task in state.flexTasks:
+        feature = _create_fallback_feature(task)
+        features[task.taskId] = feature.model_copy(update={"category": category_by_task.get(str(task.taskId), feature.category)})
+    return features
+
+
+class FakeNodes:
+    """Node 1 / Node 3 대체 (호출 순서와 입력 기록)"""
+
+    def __init__(self, node1_features, node1_delay=0.05, node3_delay=0.05, node3_warnings=()):
+        self.node1_features = node1_features
+        self.node3_warnings = list(node3_warnings)
+        self.node1_delay = node1_delay
+        self.node3_delay = node3_delay
+        self.events = []
+        self.node3_inputs = []
+        self.cancelled = 0
+
+    async def node1(self, state):
+        self.events.append("node1_start")
+        await asyncio.sleep(self.node1_delay)
+        self.events.append("node1_end")
+        return state.model_copy(update={"taskFeatures": self.node1_features})
+
+    async def node3(self, state):
+        self.events.append("node3_start")
+        self.node3_inputs.append(state)
+        try:
+            await asyncio.sleep(self.node3_delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        queue = sorted(state.taskFeatures, key=lambda t: -state.taskFeatures[t].importanceScore)
+        chain_id = f"c{len(self.node3_inputs)}"
+        return state.model_copy(update={
+            "chainCandidates": [ChainCandidate(chainId=chain_id, timeZoneQueues={"MORNING": queue})],
+            "retry_node3": 4 if self.node3_warnings else state.retry_node3,
+            "warnings": state.warnings + self.node3_warnings
+        })
+
+
+class TestRankingDivergence(unittest.TestCase):
+    """
+    중요도 순위 차이(정규화 Kendall tau 거리) 검증
+    """
+
+    def test_divergence_bounds(self):
+        """1. 같은 순위 0.0, 완전히 뒤집힌 순위 1.0, 작업 집합이 다르면 1.0"""
+        state = _initial_state()
+        base = node2_importance(state.model_copy(update={"taskFeatures": _features(state)})).taskFeatures
+        self.assertEqual(ranking_divergence(base, base), 0.0)
+
+        ids = list(base)
+        reversed_scores = {t: base[t].model_copy(update={"importanceScore": float(i)}) for i, t in enumerate(ids)}
+        ordered_scores = {t: base[t].model_copy(update={"importanceScore": float(-i)}) for i, t in enumerate(ids)}
+        self.assertEqual(ranking_divergence(ordered_scores, reversed_scores), 1.0)
+
+        partial = dict(list(base.items())[1:])
+        self.assertEqual(ranking_divergence(base, partial), 1.0)
+
+    def test_ties_against_ordered_count_as_divergent(self):
+        """2. 임시 점수가 모두 동점이면 실제 순위가 갈린 쌍은 모두 다른 것으로 봄"""
+        state = _initial_state()
+        base = node2_importance(state.model_copy(update={"taskFeatures": _features(state)})).taskFeatures
+        ids = list(base)[:6]
+        tied = {t: base[t].model_copy(update={"importanceScore": 5.0}) for t in ids}
+        split = {t: base[t].model_copy(update={"importanceScore": -1.0 if i < 3 else 8.0}) for i, t in enumerate(ids)}
+        # 15쌍 중 서로 다른 그룹에 걸친 9쌍
+        self.assertAlmostEqual(ranking_divergence(tied, split), 9 / 15)
+        self.assertEqual(ranking_divergence(tied, tied), 0.0)
+
+
+class TestSpeculativePipeline(unittest.IsolatedAsyncioTestCase):
+    """
+    Node 3 추측 실행 Hit / Miss 검증
+    """
+
+    async def _run(self, fakes, enabled=True):
+        state = _initial_state()
+        with patch("app.services.planner.pipeline.node1_structure_analysis", side_effect=fakes.node1), \
+             patch("app.services.planner.pipeline.node3_chain_generator", side_effect=fakes.node3), \
+             patch("app.services.planner.speculative.node3_chain_generator", side_effect=fakes.node3), \
+             patch("app.services.planner.speculative.settings.planner_speculative_node3", enabled):
+            return await run_planner_pipeline(state.request)
+
+    async def test_hit_overlaps_node1_and_node3(self):
+        """1. Node 1 결과가 순위를 바꾸지 않으면 Node 3는 Node 1과 겹쳐 1회만 실행"""
+        state = _initial_state()
+        fakes = FakeNodes(node1_features=_features(state))
+        hits_before = SPECULATIVE_NODE3_TOTAL.value(outcome="hit")
+
+        result = await self._run(fakes)
+
+        # Node 3가 Node 1 종료 전에 시작되어 1회만 실행
+        self.assertEqual(fakes.events.count("node3_start"), 1)
+        self.assertLess(fakes.events.index("node3_start"), fakes.events.index("node1_end"))
+        self.assertEqual(result.selectedChainId, "c1")
+        self.assertEqual(SPECULATIVE_NODE3_TOTAL.value(outcome="hit"), hits_before + 1)
+        # 이후 Node 4/5는 실제 Node 1 Feature 사용
+        self.assertTrue(result.finalResults)
+
+    async def test_hit_keeps_node3_fallback_warnings(self):
+        """2. 추측 실행 중 Node 3 Fallback이 발생하면 Hit이어도 경고 / 재시도 횟수를 유지 (Degraded)"""
+        state = _initial_state()
+        fakes = FakeNodes(node1_features=_features(state), node3_warnings=["Node 3 Fallback triggered: test"])
+
+        result = await self._run(fakes)
+
+        self.assertEqual(fakes.events.count("node3_start"), 1)
+        self.assertEqual(result.warnings, ["Node 3 Fallback triggered: test"])
+        self.assertEqual(result.retry_node3, 4)
+
+    async def test_miss_cancels_and_reruns_with_actual_features(self):
+        """3. 순위가 크게 바뀌면 추측 실행을 취소하고 실제 Feature로 Node 3 재실행"""
+        state = _initial_state()
+        # 일부 작업만 높은 가중치 카테고리로 바꾸고, 나머지는 ERROR(최하위)로 만들어 순위를 뒤집음
+        task_ids = [str(t.taskId) for t in state.flexTasks]
+        changes = {tid: ("학업" if i % 2 else "ERROR") for i, tid in enumerate(task_ids)}
+        fakes = FakeNodes(node1_features=_features(state, **changes), node3_delay=0.2)
+        misses_before = SPECULATIVE_NODE3_TOTAL.value(outcome="miss")
+
+        await self._run(fakes)
+
+        self.assertEqual(fakes.events.count("node3_start"), 2)
+        self.assertLess(fakes.events.index("node3_start"), fakes.events.index("node1_end"))
+        self.assertEqual(fakes.events[-1], "node3_start")
+        self.assertEqual(fakes.cancelled, 1)
+        self.assertEqual(SPECULATIVE_NODE3_TOTAL.value(outcome="miss"), misses_before + 1)
+        rerun_input = fakes.node3_inputs[1]
+        self.assertEqual(rerun_input.taskFeatures[int(task_ids[0])].category, "ERROR")
+
+    async def test_disabled_runs_serially(self):
+        """4. 설정이 꺼져 있으면 기존처럼 Node 1 -> Node 3 순서로 실행"""
+        state = _initial_state()
+        fakes = FakeNodes(node1_features=_features(state))
+        await self._run(fakes, enabled=False)
+        self.assertEqual(fakes.events, ["node1_start", "node1_end", "node3_start"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import sys
+import os
+
+# Ensure project root is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.planner.internal import PlannerGraphState, FreeSession, TaskFeature, ChainCandidate
+from app.models.planner.request import ArrangementState
+from app.models.planner.weights import WeightParams
+from app.services.planner.nodes.node4_chain_judgement import apply_closure
+from app.services.planner.utils.state_index import get_state_index
+
+
+class TestStateIndex(unittest.TestCase):
+    """
+    PlannerGraphState 파생 데이터 인덱스(메모이제이션) 검증
+    """
+
+    def setUp(self):
+        request = ArrangementState(
+            user={"userId": 1, "focusTimeZone": "MORNING", "dayEndTime": "22:00"},
+            startArrange="09:00",
+            schedules=[
+                {"taskId": 1, "dayPlanId": 1, "title": "Parent", "type": "FLEX"},
+                {"taskId": 2, "dayPlanId": 1, "title": "Child A", "type": "FLEX", "parentScheduleId": 1},
+                {"taskId": 3, "dayPlanId": 1, "title": "Child B", "type": "FLEX", "parentScheduleId": 1},
+                {"taskId": 4, "dayPlanId": 1, "title": "Child C", "type": "FLEX", "parentScheduleId": 1},
+            ]
+        )
+        features = {
+            tid: TaskFeature(
+                taskId=tid, dayPlanId=1, title=f"Task {tid}", type="FLEX",
+                groupId="1", orderInGroup=order
+            )
+            for tid, order in [(2, 1), (3, 2), (4, 3)]
+        }
+        self.state = PlannerGraphState(
+            request=request,
+            weights=WeightParams(),
+            flexTasks=request.schedules[1:],
+            freeSessions=[FreeSession(start=540, end=600, duration=60, timeZoneProfile={"MORNING": 60})],
+            taskFeatures=features
+        )
+
+    def test_values_are_memoized_and_shared_with_copies(self):
+        """1. 같은 입력에서는 재계산하지 않고, model_copy된 state와도 공유됨"""
+        index = get_state_index(self.state)
+        capacity = index.capacity
+        self.assertEqual(capacity["MORNING"], 60)
+        self.assertIs(index.capacity, capacity)
+
+        copied = self.state.model_copy(update={"selectedChainId": "c1"})
+        self.assertIs(get_state_index(copied).capacity, capacity)
+
+    def test_replaced_field_is_recomputed(self):
+        """2. 원본 필드가 새 객체로 교체되면 재계산됨"""
+        capacity = get_state_index(self.state).capacity
+        updated = self.state.model_copy(update={
+            "freeSessions": [FreeSession(start=720, end=780, duration=60, timeZoneProfile={"AFTERNOON": 60})]
+        })
+        new_capacity = get_state_index(updated).capacity
+        self.assertIsNot(new_capacity, capacity)
+        self.assertEqual(new_capacity["AFTERNOON"], 60)
+        self.assertEqual(new_capacity["MORNING"], 0)
+
+    def test_lookup_maps(self):
+        """3. taskId/부모/그룹 조회 맵"""
+        index = get_state_index(self.state)
+        self.assertEqual(index.parent_of[3].title, "Parent")
+        self.assertEqual(index.flex_by_id[4].title, "Child C")
+        self.assertEqual(index.group_members["1"], [(1, 2), (2, 3), (3, 4)])
+
+    def test_closed_chain_matches_apply_closure(self):
+        """4. 체인별 closure 결과가 apply_closure와 동일하며 1회만 계산됨"""
+        chain = ChainCandidate(chainId="c1", timeZoneQueues={"MORNING": [2, 4], "AFTERNOON": []})
+        index = get_state_index(self.state)
+
+        closed = index.closed_chain(chain)
+        self.assertEqual(closed.timeZoneQueues["MORNING"], [2])
+        self.assertIn("closure_enforced", closed.rationaleTags)
+        self.assertEqual(
+            closed.timeZoneQueues,
+            apply_closure(chain, self.state.taskFeatures).timeZoneQueues
+        )
+        self.assertIs(index.closed_chain(chain), closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
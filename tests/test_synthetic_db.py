@@ -0,0 +1,83 @@
+import unittest
+import os
+import sys
+from datetime import date
+
+# Ensure project root is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.llm.prompts.report_prompt import format_report_data_for_llm
+from benchmarks.db_queries import summarize
+from benchmarks.synthetic_db import (
+    SYNTHETIC_DB_USER_OFFSET, TABLES, DatasetConfig, IdAllocator,
+    asyncpg_dsn, embedding_pool, encode_csv, generate_rows
+)
+
+
+def _dicts(rows, table):
+    return [dict(zip(TABLES[table], row)) for row in rows.tables[table]]
+
+
+class TestSyntheticDataset(unittest.TestCase):
+    """
+    합성 DB 데이터셋 생성기 검증 (DB 없이 행 생성 / COPY 인코딩만 확인)
+    """
+
+    def setUp(self):
+        self.cfg = DatasetConfig(users=5, days=28, end_date=date(2026, 3, 1), embedding_dim=8, embedding_pool_size=4)
+        self.pool = embedding_pool(self.cfg.embedding_dim, self.cfg.embedding_pool_size)
+        self.rows = generate_rows(self.cfg, range(self.cfg.users), IdAllocator(), self.pool)
+
+    def test_rows_are_consistent(self):
+        """1. 모든 행이 테이블 컬럼 수와 일치하고 FK(record_id / record_task_id)가 생성된 행을 가리킴"""
+        for table, columns in TABLES.items():
+            self.assertTrue(self.rows.tables[table], table)
+            self.assertTrue(all(len(row) == len(columns) for row in self.rows.tables[table]))
+
+        records = {r["id"]: r for r in _dicts(self.rows, "planner_records")}
+        tasks = {t["id"]: t for t in _dicts(self.rows, "record_tasks")}
+        self.assertTrue(all(t["record_id"] in records for t in tasks.values()))
+        self.assertTrue(all(
+            records[h["record_id"]]["record_type"] == "USER_FINAL" for h in _dicts(self.rows, "schedule_histories")
+        ))
+        for e in _dicts(self.rows, "task_embeddings"):
+            self.assertEqual(tasks[e["record_task_id"]]["combined_embedding_text"], e["embedding"])
+        self.assertTrue(all(
+            SYNTHETIC_DB_USER_OFFSET < r["user_id"] <= SYNTHETIC_DB_USER_OFFSET + self.cfg.users
+            for r in records.values()
+        ))
+        self.assertTrue(all(t["assignment_status"] == "EXCLUDED" or t["start_at"] for t in tasks.values()))
+
+    def test_deterministic_per_user(self):
+        """2. 같은 seed면 같은 데이터 (사용자별 난수라 배치 분할과 무관)"""
+        split = generate_rows(self.cfg, range(2), IdAllocator(), self.pool)
+        rest = generate_rows(self.cfg, range(2, self.cfg.users), IdAllocator(), self.pool)
+        strip = lambda rows: [row[2:] for row in rows.tables["record_tasks"]]
+        self.assertEqual(strip(split) + strip(rest), strip(self.rows))
+
+    def test_copy_encoding(self):
+        """3. COPY CSV 인코딩: None -> \\N, bool -> t / f, 콤마 포함 값(벡터)은 인용"""
+        encoded = encode_csv([(1, None, True, "a,b", date(2026, 3, 1))]).decode()
+        self.assertEqual(encoded, '1,\\N,t,"a,b",2026-03-01\n')
+        self.assertEqual(asyncpg_dsn("postgresql+asyncpg://u:p@h:5432/db"), "postgresql://u:p@h:5432/db")
+
+    def test_report_formatting_on_generated_rows(self):
+        """4. 생성한 USER_FINAL 기록이 주간 레포트 입력 포맷팅과 호환"""
+        records = [r for r in _dicts(self.rows, "planner_records") if r["record_type"] == "USER_FINAL"]
+        user_id = records[0]["user_id"]
+        by_record = {}
+        for t in _dicts(self.rows, "record_tasks"):
+            by_record.setdefault(t["record_id"], []).append(t)
+        raw = [
+            {**r, "record_tasks": by_record.get(r["id"], []), "schedule_histories": []}
+            for r in records if r["user_id"] == user_id
+        ]
+        text = format_report_data_for_llm(date(2026, 3, 2), raw)
+        self.assertIn("### 날짜:", text)
+
+        summary = summarize("q", [0.001, 0.002], [3, 5], ["Err: x"])
+        self.assertEqual((summary["runs"], summary["avg_rows"], summary["errors"]), (2, 4.0, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
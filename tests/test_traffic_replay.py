@@ -0,0 +1,192 @@
+import unittest
+import os
+import sys
+import asyncio
+import json
+import tempfile
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+# Ensure project root is in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.llm import gemini_client
+from app.llm.fake_client import build_fake_client
+from app.llm.recording import ReplayGeminiClient
+from app.models.planner.request import ArrangementState
+from app.services.planner import traffic_capture
+from app.services.planner.nodes.node4_local_search import local_search_seed
+from app.services.planner.pipeline import build_initial_state, iter_planner_pipeline, run_planner_pipeline
+from app.services.planner.traffic_capture import (
+    TrafficCaptureWriter, iter_capture_records, load_capture_records, pseudonymize_user_id, sanitize_request
+)
+from benchmarks.replay_traffic import (
+    SLEEP_PATCH_TARGETS, _NoSleepAsyncio, diff_output, replay_record, replay_records, summarize_stages
+)
+
+TEST_REQUEST_PATH = os.path.join(os.path.dirname(__file__), "data", "test_request.json")
+
+
+def _load_request() -> ArrangementState:
+    with open(TEST_REQUEST_PATH, "r", encoding="utf-8") as f:
+        return ArrangementState.model_validate(json.load(f))
+
+
+class TestTrafficCapture(unittest.IsolatedAsyncioTestCase):
+    """
+    플래너 트래픽 캡처 / 재생 검증
+    """
+
+    async def _capture(self, directory: str, llm) -> list[dict]:
+        """캡처 설정 + Fake LLM 싱글톤으로 파이프라인 실행 후 기록된 레코드 반환 (재시도 대기 생략)"""
+        writer = TrafficCaptureWriter(directory)
+        with patch.object(settings, "planner_capture_sample_rate", 1.0), \
+             patch.object(traffic_capture, "_traffic_capture_writer", writer), \
+             patch.object(gemini_client, "_gemini_client", llm), \
+             patch(SLEEP_PATCH_TARGETS[0], _NoSleepAsyncio()), \
+             patch(SLEEP_PATCH_TARGETS[1], _NoSleepAsyncio()):
+            await run_planner_pipeline(_load_request())
+        await asyncio.gather(*traffic_capture._pending_writes)
+        return load_capture_records([directory])
+
+    async def test_capture_is_sanitized(self):
+        """1. 제목은 같은 길이로 마스킹, userId는 가명 처리, Node 1 / Node 3 원본 응답과 결과 요약 기록"""
+        request = _load_request()
+        with tempfile.TemporaryDirectory() as tmp:
+            records = await self._capture(tmp, build_fake_client("instant"))
+
+        self.assertEqual(len(records), 1)
+        record = records[0]
+        self.assertEqual(record["request"], sanitize_request(request))
+        for original, masked in zip(request.schedules, record["request"]["schedules"]):
+            self.assertEqual(len(masked["title"]), len(original.title))
+            self.assertNotIn(original.title.strip()[:1], masked["title"])
+        self.assertNotEqual(record["request"]["user"]["userId"], request.user.userId)
+
+        self.assertEqual([e["stage"] for e in record["llm"]], ["node1", "node3"])
+        self.assertTrue(all("response" in e for e in record["llm"]))
+        self.assertTrue(record["output"]["results"])
+        self.assertEqual(record["config"]["compactPrompts"], settings.planner_compact_prompts)
+        # 로컬 서치 시드는 userId와 무관 (가명 처리된 요청에서도 같은 값)
+        self.assertEqual(record["localSearchSeed"], local_search_seed(build_initial_state(request)))
+        sanitized = ArrangementState.model_validate(record["request"])
+        self.assertEqual(local_search_seed(build_initial_state(sanitized)), record["localSearchSeed"])
+
+    async def test_replay_matches_recording(self):
+        """2. 기록된 응답으로 재생하면 결과 / 프롬프트 길이가 같고 구간별 지연 시간 집계"""
+        with tempfile.TemporaryDirectory() as tmp:
+            records = await self._capture(tmp, build_fake_client("instant"))
+
+        results = await replay_records(records, repeat=2)
+        self.assertEqual(len(results), 2)
+        self.assertTrue(all(r.error is None and r.divergences == [] for r in results))
+
+        stages = {row["stage"]: row for row in summarize_stages(records, results)}
+        self.assertIn("node1", stages)
+        self.assertGreater(stages["node5"]["replayed_p50_ms"], 0)
+
+        # 현재 코드가 다른 결과를 내면 차이로 보고
+        record = json.loads(json.dumps(records[0]))
+        record["output"]["selectedChainId"] = "OTHER"
+        record["output"]["results"][0][2] = "00:00"
+        result = await replay_record(0, record)
+        self.assertEqual(len(result.divergences), 2)
+        self.assertTrue(result.divergences[0].startswith("selectedChainId OTHER"))
+
+    async def test_recorded_errors_are_replayed(self):
+        """3. 기록된 429 에러는 같은 에러로 재생되어 Fallback 경로 재현, 기록이 부족하면 차이로 보고"""
+        with tempfile.TemporaryDirectory() as tmp:
+            records = await self._capture(tmp, build_fake_client("instant", rate_limit_rate=1.0))
+
+        record = records[0]
+        self.assertEqual(record["llm"][0]["error"]["code"], 429)
+        result = await replay_record(0, record)
+        self.assertEqual(result.divergences, [])
+
+        client = ReplayGeminiClient([])
+        with self.assertRaises(RuntimeError):
+            await client.generate("system", "user")
+        self.assertTrue(client.calls[0]["exhausted"])
+
+    async def test_replay_uses_recorded_local_search_seed(self):
+        """4. 로컬 서치가 켜진 기록은 기록된 시드로 재생"""
+        with tempfile.TemporaryDirectory() as tmp:
+            records = await self._capture(tmp, build_fake_client("instant"))
+
+        record = json.loads(json.dumps(records[0]))
+        record["config"]["localSearchMs"] = 10
+        record["localSearchSeed"] = 12345
+        local_search = MagicMock(side_effect=lambda state, seed=None: state)
+        with patch("benchmarks.replay_traffic.node4_local_search", local_search):
+            result = await replay_record(0, record)
+
+        self.assertIsNone(result.error)
+        self.assertEqual(local_search.call_args.kwargs["seed"], 12345)
+
+    async def test_cancelled_requests_are_recorded(self):
+        """5. 취소된 요청 / 중간에 닫힌 스트림도 마지막 단계까지 cancelled로 기록되고, 재생 시 결과 차이로 보지 않음"""
+        with tempfile.TemporaryDirectory() as tmp, \
+             patch.object(settings, "planner_capture_sample_rate", 1.0), \
+             patch.object(traffic_capture, "_traffic_capture_writer", TrafficCaptureWriter(tmp)), \
+             patch.object(gemini_client, "_gemini_client", build_fake_client("instant", latency=30.0)):
+            # Node 1 LLM 호출 대기 중 취소
+            task = asyncio.create_task(run_planner_pipeline(_load_request()))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+            # 첫 단계 이후 소비자가 스트림을 닫음
+            stream = iter_planner_pipeline(_load_request())
+            stage, _ = await anext(stream)
+            self.assertEqual(stage, "sessions")
+            await stream.aclose()
+
+            await asyncio.gather(*traffic_capture._pending_writes)
+            records = load_capture_records([tmp])
+
+        self.assertEqual(sorted(r["error"] for r in records), ["CancelledError", "GeneratorExit"])
+        self.assertTrue(all(r["cancelled"] for r in records))
+
+        for record in records:
+            result = await replay_record(0, record)
+            self.assertEqual(result.divergences, [])
+
+    def test_pseudonym_is_keyed(self):
+        """5. userId 가명은 같은 키에서 고정, 키가 다르면 다른 값 (키 없이 조회표로 되돌릴 수 없음)"""
+        with patch.object(settings, "planner_capture_secret", "key-a"):
+            first = pseudonymize_user_id(1)
+            self.assertEqual(pseudonymize_user_id(1), first)
+            self.assertNotEqual(pseudonymize_user_id(2), first)
+        with patch.object(settings, "planner_capture_secret", "key-b"):
+            self.assertNotEqual(pseudonymize_user_id(1), first)
+
+    def test_truncated_file_keeps_complete_records(self):
+        """6. 기록 도중 잘린 파일도 완전한 레코드까지는 읽음, 크기 초과 시 새 파일로 교체"""
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = TrafficCaptureWriter(tmp, max_file_bytes=1)
+            first = writer.write({"v": 1, "n": 1})
+            second = writer.write({"v": 1, "n": 2})
+            self.assertNotEqual(first, second)
+
+            data = second.read_bytes()
+            second.write_bytes(data + data[: len(data) // 2])
+            self.assertEqual([r["n"] for r in iter_capture_records(second)], [2])
+            self.assertEqual([r["n"] for r in load_capture_records([Path(tmp)])], [1, 2])
+
+    def test_diff_output(self):
+        """7. 작업 누락 / 분할 조각 차이도 작업 단위로 보고"""
+        recorded = {"selectedChainId": "C1", "results": [[1, "ASSIGNED", "10:00", "11:00", []]]}
+        replayed = {"selectedChainId": "C1", "results": [
+            [1, "ASSIGNED", "10:00", "11:00", [["10:00", "10:30"], ["10:40", "11:10"]]],
+            [2, "EXCLUDED", None, None, []],
+        ]}
+        self.assertEqual(diff_output(recorded, replayed), [
+            "task 1: ASSIGNED 10:00-11:00 -> ASSIGNED 10:00-11:00 2 pieces",
+            "task 2: missing -> EXCLUDED None-None",
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()